@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Batch Assembly Throughput Benchmark for PyMADS
+
+Writes many small programs in the style of examples/hello_world.asm and
+assembles them one after another with assemble(), then through the
+asyncio assemble_batch API with process pools of 1, 2, 4, ... workers.
+Reports assemblies per second for each.
+
+Usage:
+    bench_batch.py [--sources=<n>] [--max-jobs=<n>] [--chunk=<n>]
+    bench_batch.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --sources=<n>       Number of programs [default: 1000]
+    --max-jobs=<n>      Largest worker count tried [default: 4]
+    --chunk=<n>         Sources sent to a worker at once [default: 8]
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+from docopt import docopt
+
+from pymads.assembler.assembler import assemble
+from pymads.batch import assemble_batch
+
+PROGRAM = """\
+; Program {number}
+    org ${origin:04X}
+    lda #${number:02X}
+    sta $02
+    ldx #0
+print_loop:
+    lda message,x
+    beq done
+    jsr $f6a4
+    inx
+    jmp print_loop
+done:
+    rts
+message:
+    .byte "HELLO {number}", 0
+"""
+
+
+def generate(directory, count):
+    """Write the programs and return their paths."""
+    paths = []
+    for number in range(count):
+        path = os.path.join(directory, f"program{number:05d}.asm")
+        with open(path, "w") as stream:
+            origin = 0x2000 + (number & 0xFF) * 0x40
+            stream.write(PROGRAM.format(number=number & 0xFF, origin=origin))
+        paths.append(path)
+    return paths
+
+
+async def run_batch(paths, jobs, chunk):
+    """Assemble all paths through assemble_batch; returns the result count."""
+    count = 0
+    async for result in assemble_batch(paths, jobs=jobs, chunk_size=chunk):
+        assert result.error is None, result.error
+        count += 1
+    return count
+
+
+def main():
+    args = docopt(__doc__)
+    max_jobs = int(args['--max-jobs'])
+    chunk = int(args['--chunk'])
+
+    directory = tempfile.mkdtemp()
+    try:
+        paths = generate(directory, int(args['--sources']))
+        print(f"{len(paths)} sources, {os.cpu_count()} CPUs")
+        start = time.perf_counter()
+        for path in paths:
+            assemble(path)
+        elapsed = time.perf_counter() - start
+        print(f"{'sequential':12} {len(paths) / elapsed:8.0f} assemblies/s")
+        jobs = 1
+        while jobs <= max_jobs:
+            start = time.perf_counter()
+            count = asyncio.run(run_batch(paths, jobs, chunk))
+            elapsed = time.perf_counter() - start
+            print(f"{f'batch j={jobs}':12} {count / elapsed:8.0f} assemblies/s")
+            jobs *= 2
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Binary Diff Benchmark for PyMADS
+
+Compares two 16 MB 65816 ROM images that differ in a few scattered places,
+once with the byte-by-byte loop binary_compare.py used to run and once with
+pymads.utils.binary_diff.compare_buffers.
+
+Usage:
+    bench_binary_diff.py [--size=<bytes>] [--diffs=<n>] [--repeat=<n>]
+    bench_binary_diff.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --size=<bytes>      Image size in bytes [default: 16777216]
+    --diffs=<n>         Number of differing regions [default: 100]
+    --repeat=<n>        Number of timed runs [default: 3]
+"""
+
+import random
+import time
+
+from docopt import docopt
+
+from pymads.utils.binary_diff import compare_buffers
+
+
+def byte_loop(data1, data2):
+    """Count differing bytes one index at a time."""
+    count = 0
+    for i in range(min(len(data1), len(data2))):
+        if data1[i] != data2[i]:
+            count += 1
+    return count
+
+
+def build_images(size, diffs):
+    rng = random.Random(6502)
+    data1 = rng.randbytes(size)
+    data2 = bytearray(data1)
+    for _ in range(diffs):
+        start = rng.randrange(size - 16)
+        for i in range(start, start + rng.randrange(1, 16)):
+            data2[i] ^= 0x5A
+    return data1, bytes(data2)
+
+
+def best_of(function, repeat, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    args = docopt(__doc__)
+    size = int(args['--size'])
+    repeat = int(args['--repeat'])
+    data1, data2 = build_images(size, int(args['--diffs']))
+
+    loop_time, loop_count = best_of(byte_loop, 1, data1, data2)
+    diff_time, diff = best_of(compare_buffers, repeat, data1, data2)
+    assert diff.differing_bytes == loop_count, "engines disagree"
+
+    print(f"Image size:        {size} bytes")
+    print(f"Differing bytes:   {loop_count} in {len(diff.ranges)} ranges")
+    print(f"Byte loop:         {loop_time:8.3f} s")
+    print(f"compare_buffers:   {diff_time:8.3f} s")
+    print(f"Speedup:           {loop_time / diff_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
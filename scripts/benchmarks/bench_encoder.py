@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Opcode Encoder Benchmark for PyMADS
+
+Measures instructions encoded per second with the precomputed opcode tables
+for a mix of 6502, 65C02 and 65816 instructions.
+
+Usage:
+    bench_encoder.py [--instructions=<n>]
+    bench_encoder.py (-h | --help)
+
+Options:
+    -h --help               Show this help message.
+    --instructions=<n>      Instructions per CPU [default: 1000000]
+"""
+
+import time
+
+from docopt import docopt
+
+from pymads.assembler.opcodes import M16, OPCODE_TABLES, X16, Cpu, Mode, encode
+
+WORKLOADS = {
+    Cpu.MOS6502: [
+        ("LDA", Mode.IMM, 0x12, 0),
+        ("STA", Mode.ABSX, 0xD000, 0),
+        ("LDA", Mode.INDY, 0x80, 0),
+        ("INX", Mode.IMP, 0, 0),
+        ("BNE", Mode.REL, 0x2000, 0),
+        ("JSR", Mode.ABS, 0xE456, 0),
+    ],
+    Cpu.WDC65C02: [
+        ("STZ", Mode.ABS, 0x1234, 0),
+        ("LDA", Mode.ZPIND, 0x80, 0),
+        ("PHX", Mode.IMP, 0, 0),
+        ("BRA", Mode.REL, 0x2010, 0),
+        ("BIT", Mode.IMM, 0x40, 0),
+        ("INC", Mode.ACC, 0, 0),
+    ],
+    Cpu.WDC65816: [
+        ("LDA", Mode.IMM, 0x1234, M16),
+        ("LDX", Mode.IMM, 0x0100, M16 | X16),
+        ("STA", Mode.LONGX, 0x7E2000, M16),
+        ("LDA", Mode.DPINDLY, 0x10, 0),
+        ("MVN", Mode.BLOCK, 0x7E7F, 0),
+        ("BRL", Mode.RELL, 0x8000, 0),
+    ],
+}
+
+
+def main():
+    """Main entry point for the script."""
+    args = docopt(__doc__)
+    count = int(args['--instructions'])
+
+    for cpu, workload in WORKLOADS.items():
+        table = OPCODE_TABLES[cpu]
+        instructions = (workload * (count // len(workload) + 1))[:count]
+        start = time.perf_counter()
+        for mnemonic, mode, value, flags in instructions:
+            encode(table, mnemonic, mode, value, 0x2000, flags)
+        elapsed = time.perf_counter() - start
+        print(f"{cpu.value:>6}: {count / elapsed:>12,.0f} instructions/s")
+
+
+if __name__ == '__main__':
+    main()
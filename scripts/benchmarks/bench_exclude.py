@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unreferenced Procedure Exclusion Benchmark for PyMADS
+
+Generates a library-heavy project: an include file of many .proc routines
+(each with a loop, a data table and calls to other routines) and a main
+program that calls only some of them. Assembles it with and without
+excluding unreferenced procedures (-x), running the two in turn, and
+reports the best time, the passes and the output size of each, the
+bytes saved and the time spent on the reference graph.
+
+Usage:
+    bench_exclude.py [--procs=<n>] [--used=<n>] [--repeat=<n>]
+    bench_exclude.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --procs=<n>         Library routines to generate [default: 1000]
+    --used=<n>          Routines the main program calls [default: 50]
+    --repeat=<n>        Runs per configuration, best is reported [default: 3]
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from docopt import docopt
+
+from pymads.assembler.assembler import AssemblyOptions, assemble
+
+
+def generate(directory, procs, used):
+    """Write main.asm and the lib.icl it includes; return the main path."""
+    library = []
+    for number in range(procs):
+        # Routines call one earlier and one later routine, so whatever the
+        # main program uses keeps a chain of others.
+        library += [
+            f"r{number} .proc",
+            "loop lda table,x",
+            " sta $0600,x",
+            " dex",
+            " bne loop",
+            f" jsr r{number // 2}" if number else " nop",
+            f" jsr r{(number * 7 + 3) % procs}" if number % 16 == 0 else " nop",
+            " rts",
+            f"table dta {', '.join(str((number + i) & 0xFF) for i in range(16))}",
+            " .endp",
+        ]
+    with open(os.path.join(directory, "lib.icl"), "w") as stream:
+        stream.write("\n".join(library) + "\n")
+    step = max(1, procs // max(1, used))
+    main = [" org $2000", "start ldx #16"]
+    main += [f" jsr r{number}" for number in range(0, procs, step)[:used]]
+    main += [" jmp start", " icl 'lib.icl'", " run start"]
+    path = os.path.join(directory, "main.asm")
+    with open(path, "w") as stream:
+        stream.write("\n".join(main) + "\n")
+    return path
+
+
+def measure(source, configurations, repeat):
+    """Best wall time and the result of each configuration, run in turn."""
+    best = [float("inf")] * len(configurations)
+    results = [None] * len(configurations)
+    for _ in range(repeat):
+        for index, (_, options) in enumerate(configurations):
+            start = time.perf_counter()
+            results[index] = assemble(source, options)
+            best[index] = min(best[index], time.perf_counter() - start)
+    return best, results
+
+
+def main():
+    args = docopt(__doc__)
+    procs = int(args['--procs'])
+
+    directory = tempfile.mkdtemp()
+    try:
+        source = generate(directory, procs, int(args['--used']))
+        configurations = [
+            ("all", AssemblyOptions()),
+            ("-x", AssemblyOptions(exclude_unreferenced=True)),
+        ]
+        times, results = measure(source, configurations, int(args['--repeat']))
+        for (name, _), elapsed, result in zip(configurations, times, results):
+            print(
+                f"{name:4} {elapsed:7.3f} s  {result.passes} passes  "
+                f"{len(result.binary):7d} bytes"
+            )
+        excluded = results[1]
+        print(
+            f"Excluded {len(excluded.excluded)} of {procs} procedures, "
+            f"{excluded.excluded_bytes} bytes; output "
+            f"{len(results[0].binary) - len(excluded.binary)} bytes smaller, "
+            f"build {(1 - times[1] / times[0]) * 100:.0f}% faster"
+        )
+        print(f"Reference graph: {excluded.exclude_time * 1e3:.1f} ms")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
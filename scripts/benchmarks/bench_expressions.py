@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Expression Evaluation Benchmark for PyMADS
+
+Simulates the operands of a macro-heavy source (the same few operand texts
+repeated with a small set of arguments) evaluated over several passes, and
+compares evaluations per second when every operand is parsed again (as the
+Pascal oblicz_wartosc does) with the cached compiled form.
+
+Usage:
+    bench_expressions.py [--operands=<n>] [--passes=<n>]
+    bench_expressions.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --operands=<n>      Operands per pass [default: 200000]
+    --passes=<n>        Number of assembler passes [default: 3]
+"""
+
+import time
+
+from docopt import docopt
+
+from pymads.core.symbols import SymbolTable
+from pymads.parser.expressions import ExpressionCache, compile_uncached
+
+# Operand bodies of typical small macros; {k} is the macro argument.
+MACRO_OPERANDS = [
+    "<(buffer+{k}*2)",
+    ">(buffer+{k}*2)",
+    "sprite_x+{k}",
+    "[screen+40*{k}]+8",
+    "table_len-1",
+    "*+3",
+    "$d000+{k}",
+    "(flags & %{k:04b}) << 4",
+]
+
+
+def build_symbols():
+    """Build a table with the symbols used by the operands."""
+    table = SymbolTable()
+    symbols = {
+        "buffer": 0x4000,
+        "sprite_x": 0xD000,
+        "screen": 0xBC40,
+        "table_len": 32,
+        "flags": 0x5A,
+    }
+    for name, value in symbols.items():
+        table.add_symbol(name)
+        table.define_symbol(name, value)
+    return table
+
+
+def generate_operands(count):
+    """Generate operand texts as produced by macro expansion."""
+    operands = []
+    for i in range(count):
+        template = MACRO_OPERANDS[i % len(MACRO_OPERANDS)]
+        k = (i // len(MACRO_OPERANDS)) % 16
+        operands.append(template.format(k=k))
+    return operands
+
+
+def run(operands, passes, compile_func, table):
+    """Return evaluations per second over all passes."""
+    start = time.perf_counter()
+    for _ in range(passes):
+        for pc, text in enumerate(operands):
+            compile_func(text)(table, pc)
+    return passes * len(operands) / (time.perf_counter() - start)
+
+
+def main():
+    """Main entry point for the script."""
+    args = docopt(__doc__)
+    operands = generate_operands(int(args['--operands']))
+    passes = int(args['--passes'])
+    table = build_symbols()
+
+    cache = ExpressionCache()
+    reparse = run(operands, passes, compile_uncached, table)
+    cached = run(operands, passes, cache.compile, table)
+    print(f"re-parse every time: {reparse:>12,.0f} evaluations/s")
+    print(f"compiled + LRU:      {cached:>12,.0f} evaluations/s "
+          f"({cached / reparse:.1f}x, {cache.hits / (cache.hits + cache.misses):.1%} "
+          f"hit rate, {len(cache)} entries)")
+
+
+if __name__ == '__main__':
+    main()
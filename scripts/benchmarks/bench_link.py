@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Module Link Benchmark for PyMADS
+
+Generates a project of independent .reloc modules that call each other
+through .extrn/.public symbols, assembles them with 1, 2, 4, ... worker
+processes and links the result. Reports the assembly time and speedup for
+each worker count and the time of the single-threaded link step.
+
+Usage:
+    bench_link.py [--modules=<n>] [--lines=<n>] [--max-jobs=<n>]
+    bench_link.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --modules=<n>       Number of modules [default: 16]
+    --lines=<n>         Instructions per module [default: 1000]
+    --max-jobs=<n>      Largest worker count tried [default: 8]
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from docopt import docopt
+
+from pymads.assembler.linker import assemble_modules, link
+
+
+def generate(directory, modules, lines):
+    """Write the module sources and return their paths."""
+    paths = []
+    for number in range(modules):
+        callee = f"entry{(number + 1) % modules}"
+        body = [" .reloc", f" .public entry{number}", f" .extrn {callee}"]
+        body.append(f"entry{number} ldx #0")
+        for line in range(lines // 4):
+            body += [
+                f"l{line} lda table+{line & 0x3F},x",
+                f" sta table+{(line + 1) & 0x3F},x",
+                f" bne l{line}",
+                f" jsr {callee}",
+            ]
+        body += [" rts", "table .ds 64"]
+        path = os.path.join(directory, f"module{number:03d}.asm")
+        with open(path, "w") as stream:
+            stream.write("\n".join(body) + "\n")
+        paths.append(path)
+    return paths
+
+
+def main():
+    args = docopt(__doc__)
+    modules = int(args['--modules'])
+    max_jobs = int(args['--max-jobs'])
+
+    directory = tempfile.mkdtemp()
+    try:
+        paths = generate(directory, modules, int(args['--lines']))
+        print(f"{modules} modules, {os.cpu_count()} CPUs")
+        baseline = None
+        jobs = 1
+        while jobs <= max_jobs:
+            start = time.perf_counter()
+            assembled = assemble_modules(paths, jobs=jobs)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            speedup = baseline / elapsed
+            print(f"jobs={jobs:<3} {elapsed:7.3f} s   speedup {speedup:5.2f}x")
+            jobs *= 2
+        start = time.perf_counter()
+        result = link(assembled, 0x1000)
+        elapsed = time.perf_counter() - start
+        relocations = sum(len(module.relocations) for module in assembled)
+        print(f"{'link':8} {elapsed:7.3f} s   {relocations} relocations, "
+              f"{len(result.binary)} bytes")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Listing Overhead Benchmark for PyMADS
+
+Generates a large source (about 2 MB by default) and assembles it without
+output files, with a streamed listing, and with a listing plus a label
+file. Runs the configurations in turn and reports the best time of each and
+the overhead over plain assembly.
+
+Usage:
+    bench_listing.py [--lines=<n>] [--repeat=<n>]
+    bench_listing.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --lines=<n>         Source lines to generate [default: 100000]
+    --repeat=<n>        Runs per configuration, best is reported [default: 3]
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from docopt import docopt
+
+from pymads.assembler.assembler import AssemblyOptions, assemble
+from pymads.assembler.opcodes import Cpu
+
+
+def generate(path, lines):
+    """Write a 65816 source with labels, forward references and data."""
+    body = [" opt h-", "table equ $80", "buffer equ $C0"]
+    for line in range(lines // 4):
+        if line % 4096 == 0:
+            body.append(f" org ${line // 4096 + 1:02X}0000")  # One bank each
+        body += [
+            f"l{line} lda table+{line & 0x3F},x   ; copy one byte",
+            f" sta buffer+{(line + 1) & 0x3F},x",
+            f" bne l{line}",
+            f" dta a(l{line + 1}&$FFFF),$12,$34",
+        ]
+    body.append(f"l{lines // 4} rts")
+    with open(path, "w") as stream:
+        stream.write("\n".join(body) + "\n")
+
+
+def measure(source, configurations, repeat):
+    """Best wall time of each configuration, running them in turn."""
+    best = [float("inf")] * len(configurations)
+    for _ in range(repeat):
+        for index, (_, options) in enumerate(configurations):
+            start = time.perf_counter()
+            assemble(source, options)
+            best[index] = min(best[index], time.perf_counter() - start)
+    return best
+
+
+def main():
+    args = docopt(__doc__)
+    repeat = int(args['--repeat'])
+
+    directory = tempfile.mkdtemp()
+    try:
+        source = os.path.join(directory, "main.asm")
+        generate(source, int(args['--lines']))
+        size = os.path.getsize(source)
+        listing = os.path.join(directory, "main.lst")
+        labels = os.path.join(directory, "main.lab")
+        configurations = [
+            ("plain", AssemblyOptions(Cpu.WDC65816)),
+            ("listing", AssemblyOptions(Cpu.WDC65816, listing=listing)),
+            (
+                "listing+labels",
+                AssemblyOptions(Cpu.WDC65816, listing=listing, labels=labels),
+            ),
+        ]
+        print(f"Source: {size / 1e6:.1f} MB")
+        times = measure(source, configurations, repeat)
+        baseline = times[0]
+        for (name, _), elapsed in zip(configurations, times):
+            overhead = (elapsed / baseline - 1) * 100
+            print(f"{name:15} {elapsed:7.3f} s   overhead {overhead:5.1f}%")
+        print(f"Listing: {os.path.getsize(listing) / 1e6:.1f} MB")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
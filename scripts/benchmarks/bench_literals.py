@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Literal Scanning Benchmark for PyMADS
+
+Builds a corpus of operand tokens as found in data tables and immediate
+operands ($hex, %binary, decimal, 'c' and "c" literals, with some symbol
+names mixed in) and converts every token:
+
+- try/except: int() guarded by exceptions, as utils.text.str_to_int does,
+  trying each base in turn
+- parser: the general expression tokenizer and parser
+- scan: the literal scanner without its memo
+- scan+memo: scan_literal, answering repeated tokens from its memo
+
+Reports tokens per second for each.
+
+Usage:
+    bench_literals.py [--tokens=<n>] [--distinct=<n>]
+    bench_literals.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --tokens=<n>        Tokens in the corpus [default: 200000]
+    --distinct=<n>      Distinct tokens the corpus is drawn from [default: 800]
+"""
+
+import random
+import time
+
+from docopt import docopt
+
+from pymads.parser import literals
+from pymads.parser.expressions import _Parser
+from pymads.parser.literals import scan_literal
+
+
+def corpus(count, distinct):
+    """Random operand tokens drawn from ``distinct`` different texts."""
+    generator = random.Random(6502)
+    kinds = [
+        lambda n: f"${n & 0xFFFF:02X}",
+        lambda n: f"%{n & 0xFF:08b}",
+        lambda n: str(n & 0xFFFF),
+        lambda n: f"'{chr(65 + n % 26)}'",
+        lambda n: f'"{chr(65 + n % 26)}"',
+        lambda n: f"label{n}",
+    ]
+    texts = [generator.choice(kinds)(number) for number in range(distinct)]
+    return [generator.choice(texts) for _ in range(count)]
+
+
+def try_except(text):
+    """Classify by trying conversions and catching their errors."""
+    for prefix, base in (("$", 16), ("%", 2), ("", 10)):
+        if prefix and not text.startswith(prefix):
+            continue
+        try:
+            return int(text[len(prefix):], base)
+        except ValueError:
+            pass
+    if len(text) == 3 and text[0] == text[2] and text[0] in "'\"":
+        return ord(text[1])
+    return None
+
+
+def parser(text):
+    """Convert with the general expression parser."""
+    node = _Parser(text).parse()
+    return node[1]
+
+
+def measure(convert, tokens):
+    """Tokens per second and the converted values."""
+    start = time.perf_counter()
+    values = [convert(token) for token in tokens]
+    return len(tokens) / (time.perf_counter() - start), values
+
+
+def main():
+    args = docopt(__doc__)
+    tokens = corpus(int(args['--tokens']), int(args['--distinct']))
+
+    reference = None
+    for name, convert in (
+        ("try/except", try_except),
+        ("parser", parser),
+        ("scan", literals._scan),
+        ("scan+memo", scan_literal),
+    ):
+        rate, values = measure(convert, tokens)
+        reference = reference or values
+        assert values == reference, name
+        print(f"{name:12} {rate / 1e6:6.2f} M tokens/s")
+
+
+if __name__ == "__main__":
+    main()
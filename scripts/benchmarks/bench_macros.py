@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Macro Expansion Benchmark for PyMADS
+
+Expands a typical macro body many times, once by substituting the
+parameters into the body text and tokenizing every line again (as the
+Pascal analizuj_makro re-scans the text), once with Macro.expand on the
+pre-tokenized body with a fresh argument tuple per call, and once with
+repeated arguments answered from the expansion memo. Reports expansions
+per second for each.
+
+Usage:
+    bench_macros.py [--count=<n>] [--distinct=<n>]
+    bench_macros.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --count=<n>         Number of expansions per method [default: 100000]
+    --distinct=<n>      Distinct argument tuples in the memoized run [default: 16]
+"""
+
+import re
+import time
+
+from docopt import docopt
+
+from pymads.parser.macros import Macro
+from pymads.parser.tokenizer import tokenize_line
+
+BODY = [
+    "    ldx #:count         ; bytes to fill",
+    "    lda #:value",
+    "loop sta :dest,x",
+    "    dex",
+    "    bne loop",
+    "    inc counter",
+    "    rts",
+]
+PARAMETERS = ["dest", "value", "count"]
+
+_SLOT = re.compile(r":(\w+)")
+
+
+def expand_text(arguments):
+    """Substitute into the body text and tokenize the result."""
+    values = dict(zip(PARAMETERS, arguments))
+    return [
+        tokenize_line(_SLOT.sub(lambda m: values.get(m.group(1), m.group(0)), line))
+        for line in BODY
+    ]
+
+
+def fields(lines):
+    """The label, mnemonic and operand texts of tokenized lines."""
+    return [(t.label_text, t.mnemonic_text, t.operand_text) for t in lines]
+
+
+def measure(expand, argument_sets):
+    """Time one expansion per argument tuple."""
+    start = time.perf_counter()
+    for arguments in argument_sets:
+        expand(arguments)
+    return time.perf_counter() - start
+
+
+def main():
+    args = docopt(__doc__)
+    count = int(args['--count'])
+    distinct = int(args['--distinct'])
+
+    unique = [(f"${n & 0xFFFF:04X}", str(n & 0xFF), "8") for n in range(count)]
+    repeated = [unique[n % distinct] for n in range(count)]
+    fresh = Macro("fill", PARAMETERS, BODY, memo_size=0)
+    memoized = Macro("fill", PARAMETERS, BODY)
+
+    assert fields(fresh.expand(unique[1])) == fields(expand_text(unique[1])), (
+        "expansions differ"
+    )
+    for name, expand, argument_sets in (
+        ("text re-scan", expand_text, unique),
+        ("pre-tokenized", fresh.expand, unique),
+        ("memoized", memoized.expand, repeated),
+    ):
+        elapsed = measure(expand, argument_sets)
+        print(f"{name:14} {count / elapsed:12,.0f} expansions/s")
+    print(f"Memo: {memoized.hits} hits, {memoized.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
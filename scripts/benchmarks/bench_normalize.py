@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Source Normalization Benchmark for PyMADS
+
+Builds a source of the given size (tab-separated fields, mixed-case
+mnemonics) and normalizes it, expanding tabs and folding case:
+
+- per char: up_cas_ on every character, as the Pascal UpCas_ loop does
+- per line: tab2space and ansi_upper_case on every line
+- buffer: expand_tabs and fold_case once over the whole buffer
+
+Reports megabytes per second for each. It then compares, per assembly
+pass, uppercasing every line's mnemonic with reading the keyword the
+tokenizer kept.
+
+Usage:
+    bench_normalize.py [--size=<mb>] [--repeat=<n>]
+    bench_normalize.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --size=<mb>         Source size in megabytes [default: 10]
+    --repeat=<n>        Runs per method; the best is reported [default: 3]
+"""
+
+import time
+
+from docopt import docopt
+
+from pymads.parser.tokenizer import tokenize_lines
+from pymads.utils.text import (
+    ansi_upper_case,
+    expand_tabs,
+    fold_case,
+    tab2space,
+    up_cas_,
+)
+
+_MNEMONICS = ("lda", "Sta", "LDX", "inx", "Bne", "jsr", "dta", "org")
+
+
+def source(size):
+    """Source lines of about ``size`` bytes."""
+    lines = []
+    total = 0
+    number = 0
+    while total < size:
+        mnemonic = _MNEMONICS[number % len(_MNEMONICS)]
+        if number % 4:
+            line = f"\t{mnemonic}\ttable+{number & 0xFF},x\t; Copy"
+        else:
+            line = f"l{number}\t{mnemonic}\t$D01A"
+        lines.append(line)
+        total += len(line) + 1
+        number += 1
+    return lines
+
+
+def per_char(lines):
+    text = expand_tabs("\n".join(lines))
+    return "".join(up_cas_(char) for char in text)
+
+
+def per_line(lines):
+    return "\n".join(ansi_upper_case(tab2space(line)) for line in lines)
+
+
+def buffer(lines):
+    return fold_case(expand_tabs("\n".join(lines)))
+
+
+def uppercased(tokens):
+    return [line.mnemonic_text.upper() for line in tokens]
+
+
+def keywords(tokens):
+    return [line.keyword for line in tokens]
+
+
+def best(function, argument, repeat):
+    """Best time of ``repeat`` runs and the last result."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(argument)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    args = docopt(__doc__)
+    repeat = int(args['--repeat'])
+    lines = source(int(float(args['--size']) * 1e6))
+    size = sum(map(len, lines)) + len(lines)
+    print(f"{len(lines)} lines, {size / 1e6:.1f} MB")
+
+    for name, function in (
+        ("per char", per_char),
+        ("per line", per_line),
+        ("buffer", buffer),
+    ):
+        elapsed, _ = best(function, lines, repeat)
+        print(f"{name:12} {size / elapsed / 1e6:8.1f} MB/s")
+
+    elapsed, tokens = best(tokenize_lines, lines, 1)
+    print(f"{'tokenize':12} {size / elapsed / 1e6:8.1f} MB/s")
+    upper, _ = best(uppercased, tokens, repeat)
+    cached, _ = best(keywords, tokens, repeat)
+    print(
+        f"mnemonics per pass: {upper * 1e3:.0f} ms uppercased, "
+        f"{cached * 1e3:.0f} ms cached"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Scoped Symbol Lookup Benchmark for PyMADS
+
+Measures unqualified symbol lookups per second from scopes nested at
+different depths, for a name found in the innermost scope and for a name
+only defined in the global scope (the longest walk). For comparison the
+naive approach of building a qualified name per enclosing scope and probing
+a flat dictionary is timed as well.
+
+Usage:
+    bench_scope_lookup.py [--lookups=<n>] [<depth>...]
+    bench_scope_lookup.py (-h | --help)
+
+Options:
+    -h --help         Show this help message.
+    --lookups=<n>     Number of lookups per measurement [default: 1000000]
+
+Arguments:
+    <depth>           Scope depths to measure [default: 1 8 32]
+"""
+
+import time
+
+from docopt import docopt
+
+from pymads.core.symbols import SymbolTable
+
+
+def build_table(depth):
+    """
+    Build a symbol table with ``depth`` nested scopes.
+
+    Args:
+        depth (int): Number of nested scopes
+
+    Returns:
+        SymbolTable: Table whose current scope is the innermost one
+    """
+    table = SymbolTable()
+    table.add_symbol("global_label", 1)
+    for level in range(depth):
+        table.enter_scope(f"proc{level}")
+        for i in range(16):
+            table.add_symbol(f"local{i}", i)
+    table.add_symbol("inner_label", 2)
+    return table
+
+
+def naive_lookup(table, name):
+    """Resolve ``name`` by concatenating every enclosing scope prefix."""
+    scope = table.scope
+    while scope is not None:
+        symbol = table.symbols.get(scope.prefix + name)
+        if symbol is not None:
+            return symbol
+        scope = scope.parent
+    raise KeyError(name)
+
+
+def rate(func, name, count):
+    """Return calls per second of ``func(name)``."""
+    start = time.perf_counter()
+    for _ in range(count):
+        func(name)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    """Main entry point for the script."""
+    args = docopt(__doc__)
+    count = int(args['--lookups'])
+    depths = [int(d) for d in args['<depth>']] or [1, 8, 32]
+
+    print(f"{'depth':>5} {'name':>12} {'scoped/s':>12} {'naive/s':>12}")
+    for depth in depths:
+        table = build_table(depth)
+        for name in ("inner_label", "global_label"):
+            scoped = rate(table.lookup, name, count)
+            naive = rate(lambda n: naive_lookup(table, n), name, count)
+            print(f"{depth:>5} {name:>12} {scoped:>12,.0f} {naive:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
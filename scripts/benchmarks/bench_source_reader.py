@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Source Reader Benchmark for PyMADS
+
+Generates a large source file and walks its lines once by reading the whole
+file into a list of strings, as the Pascal GetFile does, and once with the
+memory-mapped iter_source_lines. Reports the time and the peak Python heap
+(tracemalloc) of both; the streaming reader's peak should not grow with the
+file size.
+
+Usage:
+    bench_source_reader.py [--size=<mb>] [--keep]
+    bench_source_reader.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --size=<mb>         Generated source size in megabytes [default: 50]
+    --keep              Keep the generated file
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+from docopt import docopt
+
+from pymads.utils.file_io import iter_source_lines
+
+LINE = "label_{0:06d} lda #${1:02X} ; generated line {0}\n"
+
+
+def generate(path, size):
+    """Write roughly ``size`` bytes of source lines."""
+    with open(path, "w", encoding="latin-1") as stream:
+        written = number = 0
+        while written < size:
+            line = LINE.format(number, number & 0xFF)
+            written += stream.write(line)
+            number += 1
+
+
+def read_whole(path):
+    """Read every line of the file into memory at once."""
+    with open(path, "r", encoding="latin-1") as stream:
+        lines = stream.read().splitlines()
+    return sum(len(line) for line in lines)
+
+
+def read_streaming(path):
+    """Walk the file with the memory-mapped line reader."""
+    return sum(len(line) for _, line in iter_source_lines(path))
+
+
+def measure(function, path):
+    """Time one run, then trace the heap of a second (tracing is slow)."""
+    start = time.perf_counter()
+    total = function(path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return total, elapsed, peak
+
+
+def main():
+    args = docopt(__doc__)
+    size = int(args['--size']) << 20
+
+    descriptor, path = tempfile.mkstemp(suffix=".asm")
+    os.close(descriptor)
+    try:
+        generate(path, size)
+        print(f"Source: {os.path.getsize(path) / 1e6:.1f} MB")
+        results = {}
+        for name, function in (("read+splitlines", read_whole),
+                               ("iter_source_lines", read_streaming)):
+            total, elapsed, peak = measure(function, path)
+            results[name] = total
+            print(f"{name:18} {elapsed:7.3f} s   peak heap {peak / 1e6:8.2f} MB")
+        assert len(set(results.values())) == 1, "readers disagree"
+    finally:
+        if args['--keep']:
+            print(f"Kept {path}")
+        else:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark for PyMADS
+
+Measures how long importing the CLI takes using ``python -X importtime``,
+in fresh interpreters with a warm bytecode cache, and lists the slowest
+imports. ``pymads --help`` and ``--version`` only need pymads.cli; the
+assembler is imported on first use, which is measured separately.
+
+Usage:
+    bench_startup.py [--repeat=<n>] [--top=<n>] [--threshold=<ms>]
+    bench_startup.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --repeat=<n>        Number of interpreter runs per module [default: 10]
+    --top=<n>           Number of slowest imports listed [default: 8]
+    --threshold=<ms>    Exit with status 1 if importing pymads.cli takes
+                        longer than this (median) [default: 60]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from docopt import docopt
+
+MODULES = ("pymads.cli", "pymads.assembler.assembler")
+
+
+def import_times(module, pycache):
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        dict: Cumulative import time in microseconds by module name
+    """
+    environment = dict(os.environ, PYTHONPYCACHEPREFIX=pycache)
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, env=environment,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    args = docopt(__doc__)
+    repeat = int(args['--repeat'])
+    top = int(args['--top'])
+    threshold = float(args['--threshold'])
+
+    with tempfile.TemporaryDirectory() as pycache:
+        results = {}
+        for module in MODULES:
+            import_times(module, pycache)  # populate the bytecode cache
+            runs = [import_times(module, pycache) for _ in range(repeat)]
+            results[module] = runs
+            median = statistics.median(run[module] for run in runs) / 1000
+            print(f"{module}: {median:.1f} ms (median of {repeat})")
+            slowest = sorted(runs[-1].items(), key=lambda item: -item[1])[1:top + 1]
+            for name, cumulative in slowest:
+                print(f"    {cumulative / 1000:7.1f} ms  {name}")
+
+    cli = statistics.median(run["pymads.cli"] for run in results["pymads.cli"]) / 1000
+    if cli > threshold:
+        print(f"pymads.cli import takes {cli:.1f} ms, over the {threshold} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
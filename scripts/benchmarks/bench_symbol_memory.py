@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Symbol Memory Benchmark for PyMADS
+
+Measures the memory used per symbol by the slot-based ``Symbol`` compared to
+the previous dict-backed layout that allocated a ``references`` list for
+every symbol.
+
+Usage:
+    bench_symbol_memory.py [<count>...]
+    bench_symbol_memory.py (-h | --help)
+
+Options:
+    -h --help     Show this help message.
+
+Arguments:
+    <count>       Number of symbols to create [default: 100000 1000000]
+"""
+
+import gc
+import tracemalloc
+
+from docopt import docopt
+
+from pymads.core.symbols import SymbolTable
+
+
+class LegacySymbol:
+    """Dict-backed symbol layout used before the slot-based rewrite."""
+
+    def __init__(self, name, value=0, symbol_type="L"):
+        self.name = name
+        self.value = value
+        self.type = symbol_type
+        self.is_defined = False
+        self.references = []
+
+
+def measure(factory, count):
+    """
+    Measure bytes allocated per symbol.
+
+    Args:
+        factory (callable): Function creating a table of ``count`` symbols
+        count (int): Number of symbols to create
+
+    Returns:
+        float: Bytes allocated per symbol
+    """
+    # Names are built outside the measured region so only symbol storage
+    # and table overhead are counted.
+    names = [f"label_{i:07d}" for i in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    table = factory(names)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del table
+    return current / count
+
+
+def build_legacy(names):
+    """Build a name -> LegacySymbol dict."""
+    return {name: LegacySymbol(name, i) for i, name in enumerate(names)}
+
+
+def build_current(names):
+    """Build a SymbolTable of slot-based symbols."""
+    table = SymbolTable()
+    for i, name in enumerate(names):
+        table.add_symbol(name, i)
+    return table
+
+
+def main():
+    """Main entry point for the script."""
+    args = docopt(__doc__)
+    counts = [int(c) for c in args['<count>']] or [100_000, 1_000_000]
+
+    print(f"{'symbols':>10} {'legacy B/sym':>14} {'slots B/sym':>14} {'saved':>7}")
+    for count in counts:
+        legacy = measure(build_legacy, count)
+        current = measure(build_current, count)
+        saved = 100.0 * (legacy - current) / legacy
+        print(f"{count:>10} {legacy:>14.1f} {current:>14.1f} {saved:>6.1f}%")
+
+
+if __name__ == '__main__':
+    main()
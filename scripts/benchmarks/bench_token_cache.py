@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Token Cache Benchmark for PyMADS
+
+Writes a header of hardware register equates, as shared by every program
+of a large project, and loads it as a new run would: by reading and
+tokenizing it, and from the on-disk token cache of SourceCache. Reports
+the best time of each and the speedup.
+
+Usage:
+    bench_token_cache.py [--equates=<n>] [--repeat=<n>]
+    bench_token_cache.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --equates=<n>       Equates in the header [default: 10000]
+    --repeat=<n>        Loads per method, best is reported [default: 20]
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from docopt import docopt
+
+from pymads.parser.source_cache import SourceCache
+from pymads.parser.tokenizer import tokenize_lines
+from pymads.utils.file_io import read_source_lines
+
+
+def generate(path, equates):
+    """Write a header of equates with comments."""
+    with open(path, "w") as stream:
+        for number in range(equates):
+            stream.write(
+                f"REG{number:05d}\tequ ${0xD000 + number:04X}\t; register {number}\n"
+            )
+
+
+def best(load, repeat):
+    """Best wall time of ``repeat`` calls."""
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed
+
+
+def main():
+    args = docopt(__doc__)
+    repeat = int(args['--repeat'])
+
+    directory = tempfile.mkdtemp()
+    try:
+        header = os.path.join(directory, "hardware.icl")
+        generate(header, int(args['--equates']))
+        tokens = os.path.join(directory, "tokens")
+        SourceCache(tokens).load(header)  # Populate the disk cache
+
+        def cached():
+            # A fresh cache per load, as in a new process
+            cache = SourceCache(tokens)
+            cache.load(header)
+            assert cache.disk_hits == 1
+
+        parsed = best(lambda: tokenize_lines(read_source_lines(header)), repeat)
+        loaded = best(cached, repeat)
+        print(f"Header: {os.path.getsize(header) / 1e3:.0f} KB")
+        print(f"{'tokenize':12} {parsed * 1e3:8.2f} ms")
+        print(f"{'token cache':12} {loaded * 1e3:8.2f} ms   "
+              f"speedup {parsed / loaded:5.2f}x")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tokenizer Benchmark for PyMADS
+
+Compares lines per second of the regex-based tokenize_line with a
+character-at-a-time scan in the style of the Pascal omin_spacje/__inc loop.
+
+Usage:
+    bench_tokenizer.py [--lines=<n>]
+    bench_tokenizer.py (-h | --help)
+
+Options:
+    -h --help       Show this help message.
+    --lines=<n>     Number of generated source lines [default: 100000]
+"""
+
+import time
+
+from docopt import docopt
+
+from pymads.parser.tokenizer import tokenize_line
+
+TEMPLATES = [
+    "label{i}  lda #${v:02x}         ; load the next value",
+    "    sta $d{v:03x},x          ; store to the hardware register",
+    "loop{i}: dex",
+    "    bne loop{i}             // repeat until done",
+    "    .byte \"TEXT;{i}\", 0     ; null-terminated string",
+    "; ---------------------------------------------------------------",
+    "",
+    "const{i} = ${v:04x}          ; size of the table",
+    "    lda (ptr{i}),y",
+    "    adc #<(table{i}+2)*4",
+]
+
+
+def generate_lines(count):
+    """Generate ``count`` MADS-like source lines."""
+    return [
+        TEMPLATES[i % len(TEMPLATES)].format(i=i, v=i & 0xFFF) for i in range(count)
+    ]
+
+
+def skip_spaces(text, position):
+    """Character-at-a-time whitespace skip (original omin_spacje port)."""
+    text_length = len(text)
+    while position < text_length and text[position].isspace():
+        position += 1
+    return position
+
+
+def char_walk_tokenize(line):
+    """Split a line into fields one character at a time."""
+    length = len(line)
+    i = 0
+    label = mnemonic = operand = comment = None
+    if line[:1] == '*':
+        return (None, None, None, (0, length))
+    if i < length and not line[i].isspace() and line[i] != ';':
+        start = i
+        while i < length and not line[i].isspace() and line[i] not in ':=;':
+            i += 1
+        label = (start, i)
+        if i < length and line[i] == ':':
+            i += 1
+    i = skip_spaces(line, i)
+    if i < length and line[i] == '=':
+        mnemonic = (i, i + 1)
+        i += 1
+    elif i < length and line[i] != ';' and line[i:i + 2] != '//':
+        start = i
+        while i < length and not line[i].isspace() and line[i] != ';':
+            i += 1
+        mnemonic = (start, i)
+    i = skip_spaces(line, i)
+    start = i
+    quote = None
+    while i < length:
+        char = line[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '\'"':
+            quote = char
+        elif char == ';' or (char == '/' and line[i + 1:i + 2] == '/'):
+            break
+        i += 1
+    end = i
+    while end > start and line[end - 1].isspace():
+        end -= 1
+    if end > start:
+        operand = (start, end)
+    if i < length:
+        comment = (i, length)
+    return (label, mnemonic, operand, comment)
+
+
+def rate(func, lines):
+    """Return lines per second processed by ``func``."""
+    start = time.perf_counter()
+    for line in lines:
+        func(line)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def main():
+    """Main entry point for the script."""
+    args = docopt(__doc__)
+    lines = generate_lines(int(args['--lines']))
+
+    walk = rate(char_walk_tokenize, lines)
+    regex = rate(tokenize_line, lines)
+    print(f"char walk:     {walk:>12,.0f} lines/s")
+    print(f"tokenize_line: {regex:>12,.0f} lines/s ({regex / walk:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,27 +6,81 @@ This script compares binary outputs from the original MADS assembler and PyMADS
 to verify compatibility and correctness of the Python implementation.
 
 Usage:
-    binary_compare.py compare <pascal_output> <python_output>
+    binary_compare.py compare <pascal_output> <python_output> [--json=<file>]
     binary_compare.py test <asm_file>
-    binary_compare.py batch <test_dir>
+    binary_compare.py batch <test_dir> [--jobs=<n>] [--json=<file>] [--junit=<file>]
     binary_compare.py (-h | --help)
 
 Options:
-    -h --help     Show this help message.
-    
+    -h --help       Show this help message.
+    --jobs=<n>      Number of files tested in parallel [default: 1]
+    --json=<file>   Write a JSON report of the comparison or batch results
+    --junit=<file>  Write a JUnit XML summary of the batch results
+
 Commands:
     compare       Compare two binary files and report differences
     test          Assemble a file with both assemblers and compare results
-    batch         Run tests on all .asm files in a directory
+    batch         Run tests on all .asm files in a directory tree
 """
 
 import os
 import sys
+import json
+import time
 import subprocess
 import difflib
 import binascii
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from docopt import docopt
 
+from pymads.assembler.assembler import AssemblyError, AssemblySession
+from pymads.utils.binary_diff import compare_buffers
+
+
+def pascal_mads_command(asm_file, output_file):
+    """
+    Build the command line running the original Pascal MADS.
+    
+    Args:
+        asm_file (str): Path to the assembly file
+        output_file (str): Output binary file path
+        
+    Returns:
+        list: Command and arguments
+    """
+    pascal_mads_path = os.path.join(os.path.dirname(__file__), 
+                                   '../pascal_env/Mad-Assembler/mads')
+    return [pascal_mads_path, asm_file, '-o:' + output_file]
+
+
+# Assembly session of this process, created on first use
+_session = None
+
+
+def assemble_python(asm_file, output_file):
+    """
+    Assemble a file with PyMADS in this process and write the output.
+    
+    Opcode tables, and through one session per process compiled
+    expressions and the output image, stay warm across calls, so batches
+    avoid paying interpreter startup and imports for every file.
+    
+    Args:
+        asm_file (str): Path to the assembly file
+        output_file (str): Output binary file path
+        
+    Raises:
+        AssemblyError: If PyMADS reports an error
+        OSError: If the source or output cannot be accessed
+    """
+    global _session
+    if _session is None:
+        _session = AssemblySession()
+    result = _session.assemble(asm_file)
+    with open(output_file, 'wb') as f:
+        f.write(result.binary)
+
 
 def run_pascal_mads(asm_file, output_file=None):
     """
@@ -42,11 +96,7 @@ def run_pascal_mads(asm_file, output_file=None):
     if output_file is None:
         output_file = os.path.splitext(asm_file)[0] + '.bin'
     
-    # Construct the command to run the Pascal MADS
-    pascal_mads_path = os.path.join(os.path.dirname(__file__), 
-                                   '../pascal_env/Mad-Assembler/mads')
-    
-    cmd = [pascal_mads_path, asm_file, '-o:' + output_file]
+    cmd = pascal_mads_command(asm_file, output_file)
     
     # Run the command
     try:
@@ -73,31 +123,27 @@ def run_python_mads(asm_file, output_file=None):
     if output_file is None:
         output_file = os.path.splitext(asm_file)[0] + '_py.bin'
     
-    # Construct the command to run PyMADS
-    # This will need to be updated as PyMADS development progresses
-    pymads_path = os.path.join(os.path.dirname(__file__), '../src/pymads/cli.py')
-    
-    cmd = [sys.executable, pymads_path, asm_file, '-o', output_file]
-    
-    # Run the command
     try:
-        subprocess.run(cmd, check=True, capture_output=True, text=True)
+        assemble_python(asm_file, output_file)
         return output_file
-    except subprocess.CalledProcessError as e:
+    except (AssemblyError, OSError) as e:
         print(f"Error running PyMADS: {e}")
-        print(f"STDOUT: {e.stdout}")
-        print(f"STDERR: {e.stderr}")
         sys.exit(1)
 
 
-def compare_binary_files(file1, file2, verbose=True):
+def compare_binary_files(file1, file2, verbose=True, json_file=None):
     """
     Compare two binary files and report differences.
     
+    Differences are found in bulk and coalesced into ranges, which are
+    mapped to Atari DOS segments and load addresses when file1 is a DOS
+    binary.
+    
     Args:
         file1 (str): Path to first binary file
         file2 (str): Path to second binary file
         verbose (bool): Whether to print detailed differences
+        json_file (str, optional): Path of a JSON report to write
         
     Returns:
         bool: True if files are identical, False otherwise
@@ -106,7 +152,14 @@ def compare_binary_files(file1, file2, verbose=True):
         content1 = f1.read()
         content2 = f2.read()
     
-    if content1 == content2:
+    diff = compare_buffers(content1, content2)
+    if json_file:
+        report = diff.to_dict()
+        report.update(file1=file1, file2=file2)
+        with open(json_file, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if diff.identical:
         if verbose:
             print(f"Files are identical: {file1} and {file2}")
             print(f"Size: {len(content1)} bytes")
@@ -118,24 +171,23 @@ def compare_binary_files(file1, file2, verbose=True):
         print(f"Size of {file1}: {len(content1)} bytes")
         print(f"Size of {file2}: {len(content2)} bytes")
         
-        # Find and display differences
         if len(content1) != len(content2):
             print(f"File sizes differ by {abs(len(content1) - len(content2))} bytes")
         
-        # Compare byte by byte and report first differences
-        min_len = min(len(content1), len(content2))
-        diff_count = 0
-        max_diffs = 10  # Maximum number of differences to show
-        
-        for i in range(min_len):
-            if content1[i] != content2[i]:
-                diff_count += 1
-                if diff_count <= max_diffs:
-                    print(f"Difference at byte {i}: "
-                          f"{hex(content1[i])} vs {hex(content2[i])}")
+        print(f"{diff.differing_bytes} differing bytes in "
+              f"{len(diff.ranges)} ranges")
+        max_ranges = 10  # Maximum number of ranges to show
+        for r in diff.ranges[:max_ranges]:
+            location = f"bytes {r.offset}-{r.offset + r.length - 1}"
+            if r.address is not None:
+                location += (f" (segment {r.segment}, "
+                             f"${r.address:04X}-${r.address + r.length - 1:04X})")
+            preview = slice(r.offset, r.offset + min(r.length, 8))
+            print(f"Difference at {location}: "
+                  f"{content1[preview].hex(' ')} vs {content2[preview].hex(' ')}")
         
-        if diff_count > max_diffs:
-            print(f"... and {diff_count - max_diffs} more differences")
+        if len(diff.ranges) > max_ranges:
+            print(f"... and {len(diff.ranges) - max_ranges} more ranges")
     
     return False
 
@@ -164,29 +216,190 @@ def test_assembly_file(asm_file):
     return compare_binary_files(pascal_output, python_output)
 
 
-def batch_test_directory(test_dir):
+def find_assembly_files(test_dir):
     """
-    Test all .asm files in a directory.
+    Find all .asm files below a directory.
+    
+    Args:
+        test_dir (str): Directory to search recursively
+        
+    Returns:
+        list: Sorted paths of the assembly files
+    """
+    found = []
+    for root, dirs, files in os.walk(test_dir):
+        dirs.sort()
+        found.extend(os.path.join(root, name) for name in sorted(files)
+                     if name.endswith('.asm'))
+    return found
+
+
+def first_difference(file1, file2):
+    """
+    Describe how two binary files differ.
+    
+    Args:
+        file1 (str): Path to first binary file
+        file2 (str): Path to second binary file
+        
+    Returns:
+        str: Description of the first difference, or None if identical
+    """
+    with open(file1, 'rb') as f1, open(file2, 'rb') as f2:
+        diff = compare_buffers(f1.read(), f2.read())
+    if diff.identical:
+        return None
+    if not diff.ranges:
+        return f"Sizes differ: {diff.size1} vs {diff.size2} bytes"
+    r = diff.ranges[0]
+    message = (f"{diff.differing_bytes} bytes differ in {len(diff.ranges)} "
+               f"ranges, first at byte {r.offset}")
+    if r.address is not None:
+        message += f" (${r.address:04X})"
+    return message
+
+
+def run_test_case(asm_file):
+    """
+    Assemble a file with both assemblers at the same time and compare.
+    
+    Unlike test_assembly_file this prints nothing and never exits, so it
+    can run in a worker process.
+    
+    Args:
+        asm_file (str): Path to the assembly file
+        
+    Returns:
+        dict: file, status ('passed', 'failed' or 'error'), message and
+            duration in seconds
+    """
+    start = time.perf_counter()
+    pascal_output = os.path.splitext(asm_file)[0] + '_pascal.bin'
+    python_output = os.path.splitext(asm_file)[0] + '_python.bin'
+    result = {'file': asm_file, 'status': 'passed', 'message': ''}
+    
+    try:
+        pascal = subprocess.Popen(
+            pascal_mads_command(asm_file, pascal_output),
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    except OSError as e:
+        result.update(status='error', message=str(e))
+    else:
+        errors = []
+        # PyMADS runs in this process while Pascal MADS runs in its own
+        try:
+            assemble_python(asm_file, python_output)
+        except (AssemblyError, OSError) as e:
+            errors.append(f"PyMADS failed: {e}")
+        stdout, stderr = pascal.communicate()
+        if pascal.returncode != 0:
+            errors.insert(0, f"Pascal MADS failed ({pascal.returncode}): "
+                             f"{(stderr or stdout).strip()}")
+        if errors:
+            result.update(status='error', message='\n'.join(errors))
+        else:
+            difference = first_difference(pascal_output, python_output)
+            if difference is not None:
+                result.update(status='failed', message=difference)
+    
+    result['duration'] = time.perf_counter() - start
+    return result
+
+
+def write_json_summary(results, path):
+    """
+    Write batch results as JSON.
+    
+    Args:
+        results (list): Results returned by run_test_case
+        path (str): Output file path
+    """
+    summary = {
+        'total': len(results),
+        'passed': sum(r['status'] == 'passed' for r in results),
+        'failed': sum(r['status'] == 'failed' for r in results),
+        'errors': sum(r['status'] == 'error' for r in results),
+        'results': sorted(results, key=lambda r: r['file']),
+    }
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+
+def write_junit_summary(results, path):
+    """
+    Write batch results as a JUnit XML report.
+    
+    Args:
+        results (list): Results returned by run_test_case
+        path (str): Output file path
+    """
+    suite = ET.Element('testsuite', {
+        'name': 'binary_compare',
+        'tests': str(len(results)),
+        'failures': str(sum(r['status'] == 'failed' for r in results)),
+        'errors': str(sum(r['status'] == 'error' for r in results)),
+        'time': f"{sum(r['duration'] for r in results):.3f}",
+    })
+    for r in sorted(results, key=lambda r: r['file']):
+        case = ET.SubElement(suite, 'testcase', {
+            'classname': os.path.dirname(r['file']) or '.',
+            'name': os.path.basename(r['file']),
+            'time': f"{r['duration']:.3f}",
+        })
+        if r['status'] == 'failed':
+            ET.SubElement(case, 'failure', {'message': r['message']})
+        elif r['status'] == 'error':
+            ET.SubElement(case, 'error', {'message': r['message']})
+    ET.ElementTree(suite).write(path, encoding='utf-8', xml_declaration=True)
+
+
+def batch_test_directory(test_dir, jobs=1, json_file=None, junit_file=None):
+    """
+    Test all .asm files in a directory tree.
+    
+    Results are printed as each file completes. With more than one job the
+    files are tested in a process pool.
     
     Args:
         test_dir (str): Directory containing assembly files
+        jobs (int): Number of files tested in parallel
+        json_file (str, optional): Path of a JSON summary to write
+        junit_file (str, optional): Path of a JUnit XML summary to write
         
     Returns:
         tuple: (passed_count, total_count)
     """
     print(f"Batch testing files in: {test_dir}")
     
-    passed = 0
-    total = 0
+    files = find_assembly_files(test_dir)
+    results = []
+    
+    def report(result):
+        results.append(result)
+        print(f"[{len(results)}/{len(files)}] {result['status'].upper():6} "
+              f"{result['file']} ({result['duration']:.2f}s)", flush=True)
+        if result['message']:
+            print(f"    {result['message']}", flush=True)
+    
+    start = time.perf_counter()
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(run_test_case, f) for f in files]
+            for future in as_completed(futures):
+                report(future.result())
+    else:
+        for file_path in files:
+            report(run_test_case(file_path))
+    elapsed = time.perf_counter() - start
     
-    for filename in os.listdir(test_dir):
-        if filename.endswith('.asm'):
-            file_path = os.path.join(test_dir, filename)
-            total += 1
-            if test_assembly_file(file_path):
-                passed += 1
+    if json_file:
+        write_json_summary(results, json_file)
+    if junit_file:
+        write_junit_summary(results, junit_file)
     
-    print(f"\nTest results: {passed}/{total} passed")
+    passed = sum(r['status'] == 'passed' for r in results)
+    total = len(results)
+    print(f"\nTest results: {passed}/{total} passed in {elapsed:.2f}s")
     return passed, total
 
 
@@ -197,7 +410,8 @@ def main():
     if args['compare']:
         pascal_output = args['<pascal_output>']
         python_output = args['<python_output>']
-        result = compare_binary_files(pascal_output, python_output)
+        result = compare_binary_files(pascal_output, python_output,
+                                      json_file=args['--json'])
         sys.exit(0 if result else 1)
     
     elif args['test']:
@@ -207,7 +421,12 @@ def main():
     
     elif args['batch']:
         test_dir = args['<test_dir>']
-        passed, total = batch_test_directory(test_dir)
+        passed, total = batch_test_directory(
+            test_dir,
+            jobs=int(args['--jobs']),
+            json_file=args['--json'],
+            junit_file=args['--junit'],
+        )
         sys.exit(0 if passed == total else 1)
 
 
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Opcode Table Generator for PyMADS
+
+Expands the per-mnemonic opcode layers of pymads.assembler.opcodes into flat
+lookup tables and writes them as literal constants to
+src/pymads/assembler/_opcode_tables.py, so importing the assembler does
+not rebuild them. Run it after changing the layers; --check verifies that
+the generated module is up to date.
+
+Usage:
+    generate_opcode_tables.py [--check]
+    generate_opcode_tables.py (-h | --help)
+
+Options:
+    -h --help           Show this help message.
+    --check             Exit with status 1 if the module is out of date
+"""
+
+import os
+import sys
+
+from docopt import docopt
+
+from pymads.assembler.opcodes import (
+    _MOS6502,
+    _WDC65816,
+    _WDC65C02,
+    build_table,
+)
+
+OUTPUT = os.path.join(
+    os.path.dirname(__file__), "..", "src", "pymads", "assembler", "_opcode_tables.py"
+)
+
+HEADER = '''"""
+Precomputed opcode lookup tables.
+
+Generated by scripts/generate_opcode_tables.py from the layers in
+pymads.assembler.opcodes; do not edit. Keys are ``(mnemonic, Mode value,
+register widths)`` and values ``(opcode, operand length)``.
+"""
+
+# fmt: off
+'''
+
+
+def render_table(name, table):
+    lines = [f"{name} = {{"]
+    for (mnemonic, mode, flags), (opcode, length) in table.items():
+        lines.append(
+            f'    ("{mnemonic}", {int(mode)}, {flags}): (0x{opcode:02X}, {length}),'
+        )
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def render():
+    tables = [
+        ("MOS6502", build_table(_MOS6502, widths=1)),
+        ("WDC65C02", build_table(_MOS6502, _WDC65C02, widths=1)),
+        ("WDC65816", build_table(_MOS6502, _WDC65C02, _WDC65816, widths=4)),
+    ]
+    parts = [HEADER]
+    for name, table in tables:
+        parts.append(render_table(name, table) + "\n")
+    for name, table in tables:
+        mnemonics = ", ".join(f'"{m}"' for m in sorted({key[0] for key in table}))
+        parts.append(f"{name}_MNEMONICS = frozenset({{{mnemonics}}})\n")
+    return "\n".join(parts).replace("\n\n\n", "\n\n") + "# fmt: on\n"
+
+
+def main():
+    args = docopt(__doc__)
+    text = render()
+    if args['--check']:
+        with open(OUTPUT) as f:
+            current = f.read()
+        if current != text:
+            print(f"{OUTPUT} is out of date")
+            sys.exit(1)
+        print(f"{OUTPUT} is up to date")
+        return
+    with open(OUTPUT, "w") as f:
+        f.write(text)
+    print(f"Wrote {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1390 @@
+"""
+Precomputed opcode lookup tables.
+
+Generated by scripts/generate_opcode_tables.py from the layers in
+pymads.assembler.opcodes; do not edit. Keys are ``(mnemonic, Mode value,
+register widths)`` and values ``(opcode, operand length)``.
+"""
+
+# fmt: off
+
+MOS6502 = {
+    ("ADC", 2, 0): (0x69, 1),
+    ("ADC", 3, 0): (0x65, 1),
+    ("ADC", 4, 0): (0x75, 1),
+    ("ADC", 6, 0): (0x6D, 2),
+    ("ADC", 7, 0): (0x7D, 2),
+    ("ADC", 8, 0): (0x79, 2),
+    ("ADC", 10, 0): (0x61, 1),
+    ("ADC", 11, 0): (0x71, 1),
+    ("AND", 2, 0): (0x29, 1),
+    ("AND", 3, 0): (0x25, 1),
+    ("AND", 4, 0): (0x35, 1),
+    ("AND", 6, 0): (0x2D, 2),
+    ("AND", 7, 0): (0x3D, 2),
+    ("AND", 8, 0): (0x39, 2),
+    ("AND", 10, 0): (0x21, 1),
+    ("AND", 11, 0): (0x31, 1),
+    ("CMP", 2, 0): (0xC9, 1),
+    ("CMP", 3, 0): (0xC5, 1),
+    ("CMP", 4, 0): (0xD5, 1),
+    ("CMP", 6, 0): (0xCD, 2),
+    ("CMP", 7, 0): (0xDD, 2),
+    ("CMP", 8, 0): (0xD9, 2),
+    ("CMP", 10, 0): (0xC1, 1),
+    ("CMP", 11, 0): (0xD1, 1),
+    ("EOR", 2, 0): (0x49, 1),
+    ("EOR", 3, 0): (0x45, 1),
+    ("EOR", 4, 0): (0x55, 1),
+    ("EOR", 6, 0): (0x4D, 2),
+    ("EOR", 7, 0): (0x5D, 2),
+    ("EOR", 8, 0): (0x59, 2),
+    ("EOR", 10, 0): (0x41, 1),
+    ("EOR", 11, 0): (0x51, 1),
+    ("LDA", 2, 0): (0xA9, 1),
+    ("LDA", 3, 0): (0xA5, 1),
+    ("LDA", 4, 0): (0xB5, 1),
+    ("LDA", 6, 0): (0xAD, 2),
+    ("LDA", 7, 0): (0xBD, 2),
+    ("LDA", 8, 0): (0xB9, 2),
+    ("LDA", 10, 0): (0xA1, 1),
+    ("LDA", 11, 0): (0xB1, 1),
+    ("ORA", 2, 0): (0x09, 1),
+    ("ORA", 3, 0): (0x05, 1),
+    ("ORA", 4, 0): (0x15, 1),
+    ("ORA", 6, 0): (0x0D, 2),
+    ("ORA", 7, 0): (0x1D, 2),
+    ("ORA", 8, 0): (0x19, 2),
+    ("ORA", 10, 0): (0x01, 1),
+    ("ORA", 11, 0): (0x11, 1),
+    ("SBC", 2, 0): (0xE9, 1),
+    ("SBC", 3, 0): (0xE5, 1),
+    ("SBC", 4, 0): (0xF5, 1),
+    ("SBC", 6, 0): (0xED, 2),
+    ("SBC", 7, 0): (0xFD, 2),
+    ("SBC", 8, 0): (0xF9, 2),
+    ("SBC", 10, 0): (0xE1, 1),
+    ("SBC", 11, 0): (0xF1, 1),
+    ("STA", 3, 0): (0x85, 1),
+    ("STA", 4, 0): (0x95, 1),
+    ("STA", 6, 0): (0x8D, 2),
+    ("STA", 7, 0): (0x9D, 2),
+    ("STA", 8, 0): (0x99, 2),
+    ("STA", 10, 0): (0x81, 1),
+    ("STA", 11, 0): (0x91, 1),
+    ("ASL", 1, 0): (0x0A, 0),
+    ("ASL", 3, 0): (0x06, 1),
+    ("ASL", 4, 0): (0x16, 1),
+    ("ASL", 6, 0): (0x0E, 2),
+    ("ASL", 7, 0): (0x1E, 2),
+    ("LSR", 1, 0): (0x4A, 0),
+    ("LSR", 3, 0): (0x46, 1),
+    ("LSR", 4, 0): (0x56, 1),
+    ("LSR", 6, 0): (0x4E, 2),
+    ("LSR", 7, 0): (0x5E, 2),
+    ("ROL", 1, 0): (0x2A, 0),
+    ("ROL", 3, 0): (0x26, 1),
+    ("ROL", 4, 0): (0x36, 1),
+    ("ROL", 6, 0): (0x2E, 2),
+    ("ROL", 7, 0): (0x3E, 2),
+    ("ROR", 1, 0): (0x6A, 0),
+    ("ROR", 3, 0): (0x66, 1),
+    ("ROR", 4, 0): (0x76, 1),
+    ("ROR", 6, 0): (0x6E, 2),
+    ("ROR", 7, 0): (0x7E, 2),
+    ("DEC", 3, 0): (0xC6, 1),
+    ("DEC", 4, 0): (0xD6, 1),
+    ("DEC", 6, 0): (0xCE, 2),
+    ("DEC", 7, 0): (0xDE, 2),
+    ("INC", 3, 0): (0xE6, 1),
+    ("INC", 4, 0): (0xF6, 1),
+    ("INC", 6, 0): (0xEE, 2),
+    ("INC", 7, 0): (0xFE, 2),
+    ("BIT", 3, 0): (0x24, 1),
+    ("BIT", 6, 0): (0x2C, 2),
+    ("CPX", 2, 0): (0xE0, 1),
+    ("CPX", 3, 0): (0xE4, 1),
+    ("CPX", 6, 0): (0xEC, 2),
+    ("CPY", 2, 0): (0xC0, 1),
+    ("CPY", 3, 0): (0xC4, 1),
+    ("CPY", 6, 0): (0xCC, 2),
+    ("LDX", 2, 0): (0xA2, 1),
+    ("LDX", 3, 0): (0xA6, 1),
+    ("LDX", 5, 0): (0xB6, 1),
+    ("LDX", 6, 0): (0xAE, 2),
+    ("LDX", 8, 0): (0xBE, 2),
+    ("LDY", 2, 0): (0xA0, 1),
+    ("LDY", 3, 0): (0xA4, 1),
+    ("LDY", 4, 0): (0xB4, 1),
+    ("LDY", 6, 0): (0xAC, 2),
+    ("LDY", 7, 0): (0xBC, 2),
+    ("STX", 3, 0): (0x86, 1),
+    ("STX", 5, 0): (0x96, 1),
+    ("STX", 6, 0): (0x8E, 2),
+    ("STY", 3, 0): (0x84, 1),
+    ("STY", 4, 0): (0x94, 1),
+    ("STY", 6, 0): (0x8C, 2),
+    ("JMP", 6, 0): (0x4C, 2),
+    ("JMP", 9, 0): (0x6C, 2),
+    ("JSR", 6, 0): (0x20, 2),
+    ("BCC", 12, 0): (0x90, 1),
+    ("BCS", 12, 0): (0xB0, 1),
+    ("BEQ", 12, 0): (0xF0, 1),
+    ("BMI", 12, 0): (0x30, 1),
+    ("BNE", 12, 0): (0xD0, 1),
+    ("BPL", 12, 0): (0x10, 1),
+    ("BVC", 12, 0): (0x50, 1),
+    ("BVS", 12, 0): (0x70, 1),
+    ("BRK", 0, 0): (0x00, 0),
+    ("CLC", 0, 0): (0x18, 0),
+    ("CLD", 0, 0): (0xD8, 0),
+    ("CLI", 0, 0): (0x58, 0),
+    ("CLV", 0, 0): (0xB8, 0),
+    ("DEX", 0, 0): (0xCA, 0),
+    ("DEY", 0, 0): (0x88, 0),
+    ("INX", 0, 0): (0xE8, 0),
+    ("INY", 0, 0): (0xC8, 0),
+    ("NOP", 0, 0): (0xEA, 0),
+    ("PHA", 0, 0): (0x48, 0),
+    ("PHP", 0, 0): (0x08, 0),
+    ("PLA", 0, 0): (0x68, 0),
+    ("PLP", 0, 0): (0x28, 0),
+    ("RTI", 0, 0): (0x40, 0),
+    ("RTS", 0, 0): (0x60, 0),
+    ("SEC", 0, 0): (0x38, 0),
+    ("SED", 0, 0): (0xF8, 0),
+    ("SEI", 0, 0): (0x78, 0),
+    ("TAX", 0, 0): (0xAA, 0),
+    ("TAY", 0, 0): (0xA8, 0),
+    ("TSX", 0, 0): (0xBA, 0),
+    ("TXA", 0, 0): (0x8A, 0),
+    ("TXS", 0, 0): (0x9A, 0),
+    ("TYA", 0, 0): (0x98, 0),
+}
+
+WDC65C02 = {
+    ("ADC", 2, 0): (0x69, 1),
+    ("ADC", 3, 0): (0x65, 1),
+    ("ADC", 4, 0): (0x75, 1),
+    ("ADC", 6, 0): (0x6D, 2),
+    ("ADC", 7, 0): (0x7D, 2),
+    ("ADC", 8, 0): (0x79, 2),
+    ("ADC", 10, 0): (0x61, 1),
+    ("ADC", 11, 0): (0x71, 1),
+    ("AND", 2, 0): (0x29, 1),
+    ("AND", 3, 0): (0x25, 1),
+    ("AND", 4, 0): (0x35, 1),
+    ("AND", 6, 0): (0x2D, 2),
+    ("AND", 7, 0): (0x3D, 2),
+    ("AND", 8, 0): (0x39, 2),
+    ("AND", 10, 0): (0x21, 1),
+    ("AND", 11, 0): (0x31, 1),
+    ("CMP", 2, 0): (0xC9, 1),
+    ("CMP", 3, 0): (0xC5, 1),
+    ("CMP", 4, 0): (0xD5, 1),
+    ("CMP", 6, 0): (0xCD, 2),
+    ("CMP", 7, 0): (0xDD, 2),
+    ("CMP", 8, 0): (0xD9, 2),
+    ("CMP", 10, 0): (0xC1, 1),
+    ("CMP", 11, 0): (0xD1, 1),
+    ("EOR", 2, 0): (0x49, 1),
+    ("EOR", 3, 0): (0x45, 1),
+    ("EOR", 4, 0): (0x55, 1),
+    ("EOR", 6, 0): (0x4D, 2),
+    ("EOR", 7, 0): (0x5D, 2),
+    ("EOR", 8, 0): (0x59, 2),
+    ("EOR", 10, 0): (0x41, 1),
+    ("EOR", 11, 0): (0x51, 1),
+    ("LDA", 2, 0): (0xA9, 1),
+    ("LDA", 3, 0): (0xA5, 1),
+    ("LDA", 4, 0): (0xB5, 1),
+    ("LDA", 6, 0): (0xAD, 2),
+    ("LDA", 7, 0): (0xBD, 2),
+    ("LDA", 8, 0): (0xB9, 2),
+    ("LDA", 10, 0): (0xA1, 1),
+    ("LDA", 11, 0): (0xB1, 1),
+    ("ORA", 2, 0): (0x09, 1),
+    ("ORA", 3, 0): (0x05, 1),
+    ("ORA", 4, 0): (0x15, 1),
+    ("ORA", 6, 0): (0x0D, 2),
+    ("ORA", 7, 0): (0x1D, 2),
+    ("ORA", 8, 0): (0x19, 2),
+    ("ORA", 10, 0): (0x01, 1),
+    ("ORA", 11, 0): (0x11, 1),
+    ("SBC", 2, 0): (0xE9, 1),
+    ("SBC", 3, 0): (0xE5, 1),
+    ("SBC", 4, 0): (0xF5, 1),
+    ("SBC", 6, 0): (0xED, 2),
+    ("SBC", 7, 0): (0xFD, 2),
+    ("SBC", 8, 0): (0xF9, 2),
+    ("SBC", 10, 0): (0xE1, 1),
+    ("SBC", 11, 0): (0xF1, 1),
+    ("STA", 3, 0): (0x85, 1),
+    ("STA", 4, 0): (0x95, 1),
+    ("STA", 6, 0): (0x8D, 2),
+    ("STA", 7, 0): (0x9D, 2),
+    ("STA", 8, 0): (0x99, 2),
+    ("STA", 10, 0): (0x81, 1),
+    ("STA", 11, 0): (0x91, 1),
+    ("ASL", 1, 0): (0x0A, 0),
+    ("ASL", 3, 0): (0x06, 1),
+    ("ASL", 4, 0): (0x16, 1),
+    ("ASL", 6, 0): (0x0E, 2),
+    ("ASL", 7, 0): (0x1E, 2),
+    ("LSR", 1, 0): (0x4A, 0),
+    ("LSR", 3, 0): (0x46, 1),
+    ("LSR", 4, 0): (0x56, 1),
+    ("LSR", 6, 0): (0x4E, 2),
+    ("LSR", 7, 0): (0x5E, 2),
+    ("ROL", 1, 0): (0x2A, 0),
+    ("ROL", 3, 0): (0x26, 1),
+    ("ROL", 4, 0): (0x36, 1),
+    ("ROL", 6, 0): (0x2E, 2),
+    ("ROL", 7, 0): (0x3E, 2),
+    ("ROR", 1, 0): (0x6A, 0),
+    ("ROR", 3, 0): (0x66, 1),
+    ("ROR", 4, 0): (0x76, 1),
+    ("ROR", 6, 0): (0x6E, 2),
+    ("ROR", 7, 0): (0x7E, 2),
+    ("DEC", 3, 0): (0xC6, 1),
+    ("DEC", 4, 0): (0xD6, 1),
+    ("DEC", 6, 0): (0xCE, 2),
+    ("DEC", 7, 0): (0xDE, 2),
+    ("INC", 3, 0): (0xE6, 1),
+    ("INC", 4, 0): (0xF6, 1),
+    ("INC", 6, 0): (0xEE, 2),
+    ("INC", 7, 0): (0xFE, 2),
+    ("BIT", 3, 0): (0x24, 1),
+    ("BIT", 6, 0): (0x2C, 2),
+    ("CPX", 2, 0): (0xE0, 1),
+    ("CPX", 3, 0): (0xE4, 1),
+    ("CPX", 6, 0): (0xEC, 2),
+    ("CPY", 2, 0): (0xC0, 1),
+    ("CPY", 3, 0): (0xC4, 1),
+    ("CPY", 6, 0): (0xCC, 2),
+    ("LDX", 2, 0): (0xA2, 1),
+    ("LDX", 3, 0): (0xA6, 1),
+    ("LDX", 5, 0): (0xB6, 1),
+    ("LDX", 6, 0): (0xAE, 2),
+    ("LDX", 8, 0): (0xBE, 2),
+    ("LDY", 2, 0): (0xA0, 1),
+    ("LDY", 3, 0): (0xA4, 1),
+    ("LDY", 4, 0): (0xB4, 1),
+    ("LDY", 6, 0): (0xAC, 2),
+    ("LDY", 7, 0): (0xBC, 2),
+    ("STX", 3, 0): (0x86, 1),
+    ("STX", 5, 0): (0x96, 1),
+    ("STX", 6, 0): (0x8E, 2),
+    ("STY", 3, 0): (0x84, 1),
+    ("STY", 4, 0): (0x94, 1),
+    ("STY", 6, 0): (0x8C, 2),
+    ("JMP", 6, 0): (0x4C, 2),
+    ("JMP", 9, 0): (0x6C, 2),
+    ("JSR", 6, 0): (0x20, 2),
+    ("BCC", 12, 0): (0x90, 1),
+    ("BCS", 12, 0): (0xB0, 1),
+    ("BEQ", 12, 0): (0xF0, 1),
+    ("BMI", 12, 0): (0x30, 1),
+    ("BNE", 12, 0): (0xD0, 1),
+    ("BPL", 12, 0): (0x10, 1),
+    ("BVC", 12, 0): (0x50, 1),
+    ("BVS", 12, 0): (0x70, 1),
+    ("BRK", 0, 0): (0x00, 0),
+    ("CLC", 0, 0): (0x18, 0),
+    ("CLD", 0, 0): (0xD8, 0),
+    ("CLI", 0, 0): (0x58, 0),
+    ("CLV", 0, 0): (0xB8, 0),
+    ("DEX", 0, 0): (0xCA, 0),
+    ("DEY", 0, 0): (0x88, 0),
+    ("INX", 0, 0): (0xE8, 0),
+    ("INY", 0, 0): (0xC8, 0),
+    ("NOP", 0, 0): (0xEA, 0),
+    ("PHA", 0, 0): (0x48, 0),
+    ("PHP", 0, 0): (0x08, 0),
+    ("PLA", 0, 0): (0x68, 0),
+    ("PLP", 0, 0): (0x28, 0),
+    ("RTI", 0, 0): (0x40, 0),
+    ("RTS", 0, 0): (0x60, 0),
+    ("SEC", 0, 0): (0x38, 0),
+    ("SED", 0, 0): (0xF8, 0),
+    ("SEI", 0, 0): (0x78, 0),
+    ("TAX", 0, 0): (0xAA, 0),
+    ("TAY", 0, 0): (0xA8, 0),
+    ("TSX", 0, 0): (0xBA, 0),
+    ("TXA", 0, 0): (0x8A, 0),
+    ("TXS", 0, 0): (0x9A, 0),
+    ("TYA", 0, 0): (0x98, 0),
+    ("ADC", 13, 0): (0x72, 1),
+    ("AND", 13, 0): (0x32, 1),
+    ("CMP", 13, 0): (0xD2, 1),
+    ("EOR", 13, 0): (0x52, 1),
+    ("LDA", 13, 0): (0xB2, 1),
+    ("ORA", 13, 0): (0x12, 1),
+    ("SBC", 13, 0): (0xF2, 1),
+    ("STA", 13, 0): (0x92, 1),
+    ("BIT", 2, 0): (0x89, 1),
+    ("BIT", 4, 0): (0x34, 1),
+    ("BIT", 7, 0): (0x3C, 2),
+    ("DEC", 1, 0): (0x3A, 0),
+    ("INC", 1, 0): (0x1A, 0),
+    ("JMP", 14, 0): (0x7C, 2),
+    ("BRA", 12, 0): (0x80, 1),
+    ("STZ", 3, 0): (0x64, 1),
+    ("STZ", 4, 0): (0x74, 1),
+    ("STZ", 6, 0): (0x9C, 2),
+    ("STZ", 7, 0): (0x9E, 2),
+    ("TRB", 3, 0): (0x14, 1),
+    ("TRB", 6, 0): (0x1C, 2),
+    ("TSB", 3, 0): (0x04, 1),
+    ("TSB", 6, 0): (0x0C, 2),
+    ("PHX", 0, 0): (0xDA, 0),
+    ("PHY", 0, 0): (0x5A, 0),
+    ("PLX", 0, 0): (0xFA, 0),
+    ("PLY", 0, 0): (0x7A, 0),
+}
+
+WDC65816 = {
+    ("ADC", 2, 0): (0x69, 1),
+    ("ADC", 2, 1): (0x69, 2),
+    ("ADC", 2, 2): (0x69, 1),
+    ("ADC", 2, 3): (0x69, 2),
+    ("ADC", 3, 0): (0x65, 1),
+    ("ADC", 3, 1): (0x65, 1),
+    ("ADC", 3, 2): (0x65, 1),
+    ("ADC", 3, 3): (0x65, 1),
+    ("ADC", 4, 0): (0x75, 1),
+    ("ADC", 4, 1): (0x75, 1),
+    ("ADC", 4, 2): (0x75, 1),
+    ("ADC", 4, 3): (0x75, 1),
+    ("ADC", 6, 0): (0x6D, 2),
+    ("ADC", 6, 1): (0x6D, 2),
+    ("ADC", 6, 2): (0x6D, 2),
+    ("ADC", 6, 3): (0x6D, 2),
+    ("ADC", 7, 0): (0x7D, 2),
+    ("ADC", 7, 1): (0x7D, 2),
+    ("ADC", 7, 2): (0x7D, 2),
+    ("ADC", 7, 3): (0x7D, 2),
+    ("ADC", 8, 0): (0x79, 2),
+    ("ADC", 8, 1): (0x79, 2),
+    ("ADC", 8, 2): (0x79, 2),
+    ("ADC", 8, 3): (0x79, 2),
+    ("ADC", 10, 0): (0x61, 1),
+    ("ADC", 10, 1): (0x61, 1),
+    ("ADC", 10, 2): (0x61, 1),
+    ("ADC", 10, 3): (0x61, 1),
+    ("ADC", 11, 0): (0x71, 1),
+    ("ADC", 11, 1): (0x71, 1),
+    ("ADC", 11, 2): (0x71, 1),
+    ("ADC", 11, 3): (0x71, 1),
+    ("AND", 2, 0): (0x29, 1),
+    ("AND", 2, 1): (0x29, 2),
+    ("AND", 2, 2): (0x29, 1),
+    ("AND", 2, 3): (0x29, 2),
+    ("AND", 3, 0): (0x25, 1),
+    ("AND", 3, 1): (0x25, 1),
+    ("AND", 3, 2): (0x25, 1),
+    ("AND", 3, 3): (0x25, 1),
+    ("AND", 4, 0): (0x35, 1),
+    ("AND", 4, 1): (0x35, 1),
+    ("AND", 4, 2): (0x35, 1),
+    ("AND", 4, 3): (0x35, 1),
+    ("AND", 6, 0): (0x2D, 2),
+    ("AND", 6, 1): (0x2D, 2),
+    ("AND", 6, 2): (0x2D, 2),
+    ("AND", 6, 3): (0x2D, 2),
+    ("AND", 7, 0): (0x3D, 2),
+    ("AND", 7, 1): (0x3D, 2),
+    ("AND", 7, 2): (0x3D, 2),
+    ("AND", 7, 3): (0x3D, 2),
+    ("AND", 8, 0): (0x39, 2),
+    ("AND", 8, 1): (0x39, 2),
+    ("AND", 8, 2): (0x39, 2),
+    ("AND", 8, 3): (0x39, 2),
+    ("AND", 10, 0): (0x21, 1),
+    ("AND", 10, 1): (0x21, 1),
+    ("AND", 10, 2): (0x21, 1),
+    ("AND", 10, 3): (0x21, 1),
+    ("AND", 11, 0): (0x31, 1),
+    ("AND", 11, 1): (0x31, 1),
+    ("AND", 11, 2): (0x31, 1),
+    ("AND", 11, 3): (0x31, 1),
+    ("CMP", 2, 0): (0xC9, 1),
+    ("CMP", 2, 1): (0xC9, 2),
+    ("CMP", 2, 2): (0xC9, 1),
+    ("CMP", 2, 3): (0xC9, 2),
+    ("CMP", 3, 0): (0xC5, 1),
+    ("CMP", 3, 1): (0xC5, 1),
+    ("CMP", 3, 2): (0xC5, 1),
+    ("CMP", 3, 3): (0xC5, 1),
+    ("CMP", 4, 0): (0xD5, 1),
+    ("CMP", 4, 1): (0xD5, 1),
+    ("CMP", 4, 2): (0xD5, 1),
+    ("CMP", 4, 3): (0xD5, 1),
+    ("CMP", 6, 0): (0xCD, 2),
+    ("CMP", 6, 1): (0xCD, 2),
+    ("CMP", 6, 2): (0xCD, 2),
+    ("CMP", 6, 3): (0xCD, 2),
+    ("CMP", 7, 0): (0xDD, 2),
+    ("CMP", 7, 1): (0xDD, 2),
+    ("CMP", 7, 2): (0xDD, 2),
+    ("CMP", 7, 3): (0xDD, 2),
+    ("CMP", 8, 0): (0xD9, 2),
+    ("CMP", 8, 1): (0xD9, 2),
+    ("CMP", 8, 2): (0xD9, 2),
+    ("CMP", 8, 3): (0xD9, 2),
+    ("CMP", 10, 0): (0xC1, 1),
+    ("CMP", 10, 1): (0xC1, 1),
+    ("CMP", 10, 2): (0xC1, 1),
+    ("CMP", 10, 3): (0xC1, 1),
+    ("CMP", 11, 0): (0xD1, 1),
+    ("CMP", 11, 1): (0xD1, 1),
+    ("CMP", 11, 2): (0xD1, 1),
+    ("CMP", 11, 3): (0xD1, 1),
+    ("EOR", 2, 0): (0x49, 1),
+    ("EOR", 2, 1): (0x49, 2),
+    ("EOR", 2, 2): (0x49, 1),
+    ("EOR", 2, 3): (0x49, 2),
+    ("EOR", 3, 0): (0x45, 1),
+    ("EOR", 3, 1): (0x45, 1),
+    ("EOR", 3, 2): (0x45, 1),
+    ("EOR", 3, 3): (0x45, 1),
+    ("EOR", 4, 0): (0x55, 1),
+    ("EOR", 4, 1): (0x55, 1),
+    ("EOR", 4, 2): (0x55, 1),
+    ("EOR", 4, 3): (0x55, 1),
+    ("EOR", 6, 0): (0x4D, 2),
+    ("EOR", 6, 1): (0x4D, 2),
+    ("EOR", 6, 2): (0x4D, 2),
+    ("EOR", 6, 3): (0x4D, 2),
+    ("EOR", 7, 0): (0x5D, 2),
+    ("EOR", 7, 1): (0x5D, 2),
+    ("EOR", 7, 2): (0x5D, 2),
+    ("EOR", 7, 3): (0x5D, 2),
+    ("EOR", 8, 0): (0x59, 2),
+    ("EOR", 8, 1): (0x59, 2),
+    ("EOR", 8, 2): (0x59, 2),
+    ("EOR", 8, 3): (0x59, 2),
+    ("EOR", 10, 0): (0x41, 1),
+    ("EOR", 10, 1): (0x41, 1),
+    ("EOR", 10, 2): (0x41, 1),
+    ("EOR", 10, 3): (0x41, 1),
+    ("EOR", 11, 0): (0x51, 1),
+    ("EOR", 11, 1): (0x51, 1),
+    ("EOR", 11, 2): (0x51, 1),
+    ("EOR", 11, 3): (0x51, 1),
+    ("LDA", 2, 0): (0xA9, 1),
+    ("LDA", 2, 1): (0xA9, 2),
+    ("LDA", 2, 2): (0xA9, 1),
+    ("LDA", 2, 3): (0xA9, 2),
+    ("LDA", 3, 0): (0xA5, 1),
+    ("LDA", 3, 1): (0xA5, 1),
+    ("LDA", 3, 2): (0xA5, 1),
+    ("LDA", 3, 3): (0xA5, 1),
+    ("LDA", 4, 0): (0xB5, 1),
+    ("LDA", 4, 1): (0xB5, 1),
+    ("LDA", 4, 2): (0xB5, 1),
+    ("LDA", 4, 3): (0xB5, 1),
+    ("LDA", 6, 0): (0xAD, 2),
+    ("LDA", 6, 1): (0xAD, 2),
+    ("LDA", 6, 2): (0xAD, 2),
+    ("LDA", 6, 3): (0xAD, 2),
+    ("LDA", 7, 0): (0xBD, 2),
+    ("LDA", 7, 1): (0xBD, 2),
+    ("LDA", 7, 2): (0xBD, 2),
+    ("LDA", 7, 3): (0xBD, 2),
+    ("LDA", 8, 0): (0xB9, 2),
+    ("LDA", 8, 1): (0xB9, 2),
+    ("LDA", 8, 2): (0xB9, 2),
+    ("LDA", 8, 3): (0xB9, 2),
+    ("LDA", 10, 0): (0xA1, 1),
+    ("LDA", 10, 1): (0xA1, 1),
+    ("LDA", 10, 2): (0xA1, 1),
+    ("LDA", 10, 3): (0xA1, 1),
+    ("LDA", 11, 0): (0xB1, 1),
+    ("LDA", 11, 1): (0xB1, 1),
+    ("LDA", 11, 2): (0xB1, 1),
+    ("LDA", 11, 3): (0xB1, 1),
+    ("ORA", 2, 0): (0x09, 1),
+    ("ORA", 2, 1): (0x09, 2),
+    ("ORA", 2, 2): (0x09, 1),
+    ("ORA", 2, 3): (0x09, 2),
+    ("ORA", 3, 0): (0x05, 1),
+    ("ORA", 3, 1): (0x05, 1),
+    ("ORA", 3, 2): (0x05, 1),
+    ("ORA", 3, 3): (0x05, 1),
+    ("ORA", 4, 0): (0x15, 1),
+    ("ORA", 4, 1): (0x15, 1),
+    ("ORA", 4, 2): (0x15, 1),
+    ("ORA", 4, 3): (0x15, 1),
+    ("ORA", 6, 0): (0x0D, 2),
+    ("ORA", 6, 1): (0x0D, 2),
+    ("ORA", 6, 2): (0x0D, 2),
+    ("ORA", 6, 3): (0x0D, 2),
+    ("ORA", 7, 0): (0x1D, 2),
+    ("ORA", 7, 1): (0x1D, 2),
+    ("ORA", 7, 2): (0x1D, 2),
+    ("ORA", 7, 3): (0x1D, 2),
+    ("ORA", 8, 0): (0x19, 2),
+    ("ORA", 8, 1): (0x19, 2),
+    ("ORA", 8, 2): (0x19, 2),
+    ("ORA", 8, 3): (0x19, 2),
+    ("ORA", 10, 0): (0x01, 1),
+    ("ORA", 10, 1): (0x01, 1),
+    ("ORA", 10, 2): (0x01, 1),
+    ("ORA", 10, 3): (0x01, 1),
+    ("ORA", 11, 0): (0x11, 1),
+    ("ORA", 11, 1): (0x11, 1),
+    ("ORA", 11, 2): (0x11, 1),
+    ("ORA", 11, 3): (0x11, 1),
+    ("SBC", 2, 0): (0xE9, 1),
+    ("SBC", 2, 1): (0xE9, 2),
+    ("SBC", 2, 2): (0xE9, 1),
+    ("SBC", 2, 3): (0xE9, 2),
+    ("SBC", 3, 0): (0xE5, 1),
+    ("SBC", 3, 1): (0xE5, 1),
+    ("SBC", 3, 2): (0xE5, 1),
+    ("SBC", 3, 3): (0xE5, 1),
+    ("SBC", 4, 0): (0xF5, 1),
+    ("SBC", 4, 1): (0xF5, 1),
+    ("SBC", 4, 2): (0xF5, 1),
+    ("SBC", 4, 3): (0xF5, 1),
+    ("SBC", 6, 0): (0xED, 2),
+    ("SBC", 6, 1): (0xED, 2),
+    ("SBC", 6, 2): (0xED, 2),
+    ("SBC", 6, 3): (0xED, 2),
+    ("SBC", 7, 0): (0xFD, 2),
+    ("SBC", 7, 1): (0xFD, 2),
+    ("SBC", 7, 2): (0xFD, 2),
+    ("SBC", 7, 3): (0xFD, 2),
+    ("SBC", 8, 0): (0xF9, 2),
+    ("SBC", 8, 1): (0xF9, 2),
+    ("SBC", 8, 2): (0xF9, 2),
+    ("SBC", 8, 3): (0xF9, 2),
+    ("SBC", 10, 0): (0xE1, 1),
+    ("SBC", 10, 1): (0xE1, 1),
+    ("SBC", 10, 2): (0xE1, 1),
+    ("SBC", 10, 3): (0xE1, 1),
+    ("SBC", 11, 0): (0xF1, 1),
+    ("SBC", 11, 1): (0xF1, 1),
+    ("SBC", 11, 2): (0xF1, 1),
+    ("SBC", 11, 3): (0xF1, 1),
+    ("STA", 3, 0): (0x85, 1),
+    ("STA", 3, 1): (0x85, 1),
+    ("STA", 3, 2): (0x85, 1),
+    ("STA", 3, 3): (0x85, 1),
+    ("STA", 4, 0): (0x95, 1),
+    ("STA", 4, 1): (0x95, 1),
+    ("STA", 4, 2): (0x95, 1),
+    ("STA", 4, 3): (0x95, 1),
+    ("STA", 6, 0): (0x8D, 2),
+    ("STA", 6, 1): (0x8D, 2),
+    ("STA", 6, 2): (0x8D, 2),
+    ("STA", 6, 3): (0x8D, 2),
+    ("STA", 7, 0): (0x9D, 2),
+    ("STA", 7, 1): (0x9D, 2),
+    ("STA", 7, 2): (0x9D, 2),
+    ("STA", 7, 3): (0x9D, 2),
+    ("STA", 8, 0): (0x99, 2),
+    ("STA", 8, 1): (0x99, 2),
+    ("STA", 8, 2): (0x99, 2),
+    ("STA", 8, 3): (0x99, 2),
+    ("STA", 10, 0): (0x81, 1),
+    ("STA", 10, 1): (0x81, 1),
+    ("STA", 10, 2): (0x81, 1),
+    ("STA", 10, 3): (0x81, 1),
+    ("STA", 11, 0): (0x91, 1),
+    ("STA", 11, 1): (0x91, 1),
+    ("STA", 11, 2): (0x91, 1),
+    ("STA", 11, 3): (0x91, 1),
+    ("ASL", 1, 0): (0x0A, 0),
+    ("ASL", 1, 1): (0x0A, 0),
+    ("ASL", 1, 2): (0x0A, 0),
+    ("ASL", 1, 3): (0x0A, 0),
+    ("ASL", 3, 0): (0x06, 1),
+    ("ASL", 3, 1): (0x06, 1),
+    ("ASL", 3, 2): (0x06, 1),
+    ("ASL", 3, 3): (0x06, 1),
+    ("ASL", 4, 0): (0x16, 1),
+    ("ASL", 4, 1): (0x16, 1),
+    ("ASL", 4, 2): (0x16, 1),
+    ("ASL", 4, 3): (0x16, 1),
+    ("ASL", 6, 0): (0x0E, 2),
+    ("ASL", 6, 1): (0x0E, 2),
+    ("ASL", 6, 2): (0x0E, 2),
+    ("ASL", 6, 3): (0x0E, 2),
+    ("ASL", 7, 0): (0x1E, 2),
+    ("ASL", 7, 1): (0x1E, 2),
+    ("ASL", 7, 2): (0x1E, 2),
+    ("ASL", 7, 3): (0x1E, 2),
+    ("LSR", 1, 0): (0x4A, 0),
+    ("LSR", 1, 1): (0x4A, 0),
+    ("LSR", 1, 2): (0x4A, 0),
+    ("LSR", 1, 3): (0x4A, 0),
+    ("LSR", 3, 0): (0x46, 1),
+    ("LSR", 3, 1): (0x46, 1),
+    ("LSR", 3, 2): (0x46, 1),
+    ("LSR", 3, 3): (0x46, 1),
+    ("LSR", 4, 0): (0x56, 1),
+    ("LSR", 4, 1): (0x56, 1),
+    ("LSR", 4, 2): (0x56, 1),
+    ("LSR", 4, 3): (0x56, 1),
+    ("LSR", 6, 0): (0x4E, 2),
+    ("LSR", 6, 1): (0x4E, 2),
+    ("LSR", 6, 2): (0x4E, 2),
+    ("LSR", 6, 3): (0x4E, 2),
+    ("LSR", 7, 0): (0x5E, 2),
+    ("LSR", 7, 1): (0x5E, 2),
+    ("LSR", 7, 2): (0x5E, 2),
+    ("LSR", 7, 3): (0x5E, 2),
+    ("ROL", 1, 0): (0x2A, 0),
+    ("ROL", 1, 1): (0x2A, 0),
+    ("ROL", 1, 2): (0x2A, 0),
+    ("ROL", 1, 3): (0x2A, 0),
+    ("ROL", 3, 0): (0x26, 1),
+    ("ROL", 3, 1): (0x26, 1),
+    ("ROL", 3, 2): (0x26, 1),
+    ("ROL", 3, 3): (0x26, 1),
+    ("ROL", 4, 0): (0x36, 1),
+    ("ROL", 4, 1): (0x36, 1),
+    ("ROL", 4, 2): (0x36, 1),
+    ("ROL", 4, 3): (0x36, 1),
+    ("ROL", 6, 0): (0x2E, 2),
+    ("ROL", 6, 1): (0x2E, 2),
+    ("ROL", 6, 2): (0x2E, 2),
+    ("ROL", 6, 3): (0x2E, 2),
+    ("ROL", 7, 0): (0x3E, 2),
+    ("ROL", 7, 1): (0x3E, 2),
+    ("ROL", 7, 2): (0x3E, 2),
+    ("ROL", 7, 3): (0x3E, 2),
+    ("ROR", 1, 0): (0x6A, 0),
+    ("ROR", 1, 1): (0x6A, 0),
+    ("ROR", 1, 2): (0x6A, 0),
+    ("ROR", 1, 3): (0x6A, 0),
+    ("ROR", 3, 0): (0x66, 1),
+    ("ROR", 3, 1): (0x66, 1),
+    ("ROR", 3, 2): (0x66, 1),
+    ("ROR", 3, 3): (0x66, 1),
+    ("ROR", 4, 0): (0x76, 1),
+    ("ROR", 4, 1): (0x76, 1),
+    ("ROR", 4, 2): (0x76, 1),
+    ("ROR", 4, 3): (0x76, 1),
+    ("ROR", 6, 0): (0x6E, 2),
+    ("ROR", 6, 1): (0x6E, 2),
+    ("ROR", 6, 2): (0x6E, 2),
+    ("ROR", 6, 3): (0x6E, 2),
+    ("ROR", 7, 0): (0x7E, 2),
+    ("ROR", 7, 1): (0x7E, 2),
+    ("ROR", 7, 2): (0x7E, 2),
+    ("ROR", 7, 3): (0x7E, 2),
+    ("DEC", 3, 0): (0xC6, 1),
+    ("DEC", 3, 1): (0xC6, 1),
+    ("DEC", 3, 2): (0xC6, 1),
+    ("DEC", 3, 3): (0xC6, 1),
+    ("DEC", 4, 0): (0xD6, 1),
+    ("DEC", 4, 1): (0xD6, 1),
+    ("DEC", 4, 2): (0xD6, 1),
+    ("DEC", 4, 3): (0xD6, 1),
+    ("DEC", 6, 0): (0xCE, 2),
+    ("DEC", 6, 1): (0xCE, 2),
+    ("DEC", 6, 2): (0xCE, 2),
+    ("DEC", 6, 3): (0xCE, 2),
+    ("DEC", 7, 0): (0xDE, 2),
+    ("DEC", 7, 1): (0xDE, 2),
+    ("DEC", 7, 2): (0xDE, 2),
+    ("DEC", 7, 3): (0xDE, 2),
+    ("INC", 3, 0): (0xE6, 1),
+    ("INC", 3, 1): (0xE6, 1),
+    ("INC", 3, 2): (0xE6, 1),
+    ("INC", 3, 3): (0xE6, 1),
+    ("INC", 4, 0): (0xF6, 1),
+    ("INC", 4, 1): (0xF6, 1),
+    ("INC", 4, 2): (0xF6, 1),
+    ("INC", 4, 3): (0xF6, 1),
+    ("INC", 6, 0): (0xEE, 2),
+    ("INC", 6, 1): (0xEE, 2),
+    ("INC", 6, 2): (0xEE, 2),
+    ("INC", 6, 3): (0xEE, 2),
+    ("INC", 7, 0): (0xFE, 2),
+    ("INC", 7, 1): (0xFE, 2),
+    ("INC", 7, 2): (0xFE, 2),
+    ("INC", 7, 3): (0xFE, 2),
+    ("BIT", 3, 0): (0x24, 1),
+    ("BIT", 3, 1): (0x24, 1),
+    ("BIT", 3, 2): (0x24, 1),
+    ("BIT", 3, 3): (0x24, 1),
+    ("BIT", 6, 0): (0x2C, 2),
+    ("BIT", 6, 1): (0x2C, 2),
+    ("BIT", 6, 2): (0x2C, 2),
+    ("BIT", 6, 3): (0x2C, 2),
+    ("CPX", 2, 0): (0xE0, 1),
+    ("CPX", 2, 1): (0xE0, 1),
+    ("CPX", 2, 2): (0xE0, 2),
+    ("CPX", 2, 3): (0xE0, 2),
+    ("CPX", 3, 0): (0xE4, 1),
+    ("CPX", 3, 1): (0xE4, 1),
+    ("CPX", 3, 2): (0xE4, 1),
+    ("CPX", 3, 3): (0xE4, 1),
+    ("CPX", 6, 0): (0xEC, 2),
+    ("CPX", 6, 1): (0xEC, 2),
+    ("CPX", 6, 2): (0xEC, 2),
+    ("CPX", 6, 3): (0xEC, 2),
+    ("CPY", 2, 0): (0xC0, 1),
+    ("CPY", 2, 1): (0xC0, 1),
+    ("CPY", 2, 2): (0xC0, 2),
+    ("CPY", 2, 3): (0xC0, 2),
+    ("CPY", 3, 0): (0xC4, 1),
+    ("CPY", 3, 1): (0xC4, 1),
+    ("CPY", 3, 2): (0xC4, 1),
+    ("CPY", 3, 3): (0xC4, 1),
+    ("CPY", 6, 0): (0xCC, 2),
+    ("CPY", 6, 1): (0xCC, 2),
+    ("CPY", 6, 2): (0xCC, 2),
+    ("CPY", 6, 3): (0xCC, 2),
+    ("LDX", 2, 0): (0xA2, 1),
+    ("LDX", 2, 1): (0xA2, 1),
+    ("LDX", 2, 2): (0xA2, 2),
+    ("LDX", 2, 3): (0xA2, 2),
+    ("LDX", 3, 0): (0xA6, 1),
+    ("LDX", 3, 1): (0xA6, 1),
+    ("LDX", 3, 2): (0xA6, 1),
+    ("LDX", 3, 3): (0xA6, 1),
+    ("LDX", 5, 0): (0xB6, 1),
+    ("LDX", 5, 1): (0xB6, 1),
+    ("LDX", 5, 2): (0xB6, 1),
+    ("LDX", 5, 3): (0xB6, 1),
+    ("LDX", 6, 0): (0xAE, 2),
+    ("LDX", 6, 1): (0xAE, 2),
+    ("LDX", 6, 2): (0xAE, 2),
+    ("LDX", 6, 3): (0xAE, 2),
+    ("LDX", 8, 0): (0xBE, 2),
+    ("LDX", 8, 1): (0xBE, 2),
+    ("LDX", 8, 2): (0xBE, 2),
+    ("LDX", 8, 3): (0xBE, 2),
+    ("LDY", 2, 0): (0xA0, 1),
+    ("LDY", 2, 1): (0xA0, 1),
+    ("LDY", 2, 2): (0xA0, 2),
+    ("LDY", 2, 3): (0xA0, 2),
+    ("LDY", 3, 0): (0xA4, 1),
+    ("LDY", 3, 1): (0xA4, 1),
+    ("LDY", 3, 2): (0xA4, 1),
+    ("LDY", 3, 3): (0xA4, 1),
+    ("LDY", 4, 0): (0xB4, 1),
+    ("LDY", 4, 1): (0xB4, 1),
+    ("LDY", 4, 2): (0xB4, 1),
+    ("LDY", 4, 3): (0xB4, 1),
+    ("LDY", 6, 0): (0xAC, 2),
+    ("LDY", 6, 1): (0xAC, 2),
+    ("LDY", 6, 2): (0xAC, 2),
+    ("LDY", 6, 3): (0xAC, 2),
+    ("LDY", 7, 0): (0xBC, 2),
+    ("LDY", 7, 1): (0xBC, 2),
+    ("LDY", 7, 2): (0xBC, 2),
+    ("LDY", 7, 3): (0xBC, 2),
+    ("STX", 3, 0): (0x86, 1),
+    ("STX", 3, 1): (0x86, 1),
+    ("STX", 3, 2): (0x86, 1),
+    ("STX", 3, 3): (0x86, 1),
+    ("STX", 5, 0): (0x96, 1),
+    ("STX", 5, 1): (0x96, 1),
+    ("STX", 5, 2): (0x96, 1),
+    ("STX", 5, 3): (0x96, 1),
+    ("STX", 6, 0): (0x8E, 2),
+    ("STX", 6, 1): (0x8E, 2),
+    ("STX", 6, 2): (0x8E, 2),
+    ("STX", 6, 3): (0x8E, 2),
+    ("STY", 3, 0): (0x84, 1),
+    ("STY", 3, 1): (0x84, 1),
+    ("STY", 3, 2): (0x84, 1),
+    ("STY", 3, 3): (0x84, 1),
+    ("STY", 4, 0): (0x94, 1),
+    ("STY", 4, 1): (0x94, 1),
+    ("STY", 4, 2): (0x94, 1),
+    ("STY", 4, 3): (0x94, 1),
+    ("STY", 6, 0): (0x8C, 2),
+    ("STY", 6, 1): (0x8C, 2),
+    ("STY", 6, 2): (0x8C, 2),
+    ("STY", 6, 3): (0x8C, 2),
+    ("JMP", 6, 0): (0x4C, 2),
+    ("JMP", 6, 1): (0x4C, 2),
+    ("JMP", 6, 2): (0x4C, 2),
+    ("JMP", 6, 3): (0x4C, 2),
+    ("JMP", 9, 0): (0x6C, 2),
+    ("JMP", 9, 1): (0x6C, 2),
+    ("JMP", 9, 2): (0x6C, 2),
+    ("JMP", 9, 3): (0x6C, 2),
+    ("JSR", 6, 0): (0x20, 2),
+    ("JSR", 6, 1): (0x20, 2),
+    ("JSR", 6, 2): (0x20, 2),
+    ("JSR", 6, 3): (0x20, 2),
+    ("BCC", 12, 0): (0x90, 1),
+    ("BCC", 12, 1): (0x90, 1),
+    ("BCC", 12, 2): (0x90, 1),
+    ("BCC", 12, 3): (0x90, 1),
+    ("BCS", 12, 0): (0xB0, 1),
+    ("BCS", 12, 1): (0xB0, 1),
+    ("BCS", 12, 2): (0xB0, 1),
+    ("BCS", 12, 3): (0xB0, 1),
+    ("BEQ", 12, 0): (0xF0, 1),
+    ("BEQ", 12, 1): (0xF0, 1),
+    ("BEQ", 12, 2): (0xF0, 1),
+    ("BEQ", 12, 3): (0xF0, 1),
+    ("BMI", 12, 0): (0x30, 1),
+    ("BMI", 12, 1): (0x30, 1),
+    ("BMI", 12, 2): (0x30, 1),
+    ("BMI", 12, 3): (0x30, 1),
+    ("BNE", 12, 0): (0xD0, 1),
+    ("BNE", 12, 1): (0xD0, 1),
+    ("BNE", 12, 2): (0xD0, 1),
+    ("BNE", 12, 3): (0xD0, 1),
+    ("BPL", 12, 0): (0x10, 1),
+    ("BPL", 12, 1): (0x10, 1),
+    ("BPL", 12, 2): (0x10, 1),
+    ("BPL", 12, 3): (0x10, 1),
+    ("BVC", 12, 0): (0x50, 1),
+    ("BVC", 12, 1): (0x50, 1),
+    ("BVC", 12, 2): (0x50, 1),
+    ("BVC", 12, 3): (0x50, 1),
+    ("BVS", 12, 0): (0x70, 1),
+    ("BVS", 12, 1): (0x70, 1),
+    ("BVS", 12, 2): (0x70, 1),
+    ("BVS", 12, 3): (0x70, 1),
+    ("BRK", 0, 0): (0x00, 0),
+    ("BRK", 0, 1): (0x00, 0),
+    ("BRK", 0, 2): (0x00, 0),
+    ("BRK", 0, 3): (0x00, 0),
+    ("CLC", 0, 0): (0x18, 0),
+    ("CLC", 0, 1): (0x18, 0),
+    ("CLC", 0, 2): (0x18, 0),
+    ("CLC", 0, 3): (0x18, 0),
+    ("CLD", 0, 0): (0xD8, 0),
+    ("CLD", 0, 1): (0xD8, 0),
+    ("CLD", 0, 2): (0xD8, 0),
+    ("CLD", 0, 3): (0xD8, 0),
+    ("CLI", 0, 0): (0x58, 0),
+    ("CLI", 0, 1): (0x58, 0),
+    ("CLI", 0, 2): (0x58, 0),
+    ("CLI", 0, 3): (0x58, 0),
+    ("CLV", 0, 0): (0xB8, 0),
+    ("CLV", 0, 1): (0xB8, 0),
+    ("CLV", 0, 2): (0xB8, 0),
+    ("CLV", 0, 3): (0xB8, 0),
+    ("DEX", 0, 0): (0xCA, 0),
+    ("DEX", 0, 1): (0xCA, 0),
+    ("DEX", 0, 2): (0xCA, 0),
+    ("DEX", 0, 3): (0xCA, 0),
+    ("DEY", 0, 0): (0x88, 0),
+    ("DEY", 0, 1): (0x88, 0),
+    ("DEY", 0, 2): (0x88, 0),
+    ("DEY", 0, 3): (0x88, 0),
+    ("INX", 0, 0): (0xE8, 0),
+    ("INX", 0, 1): (0xE8, 0),
+    ("INX", 0, 2): (0xE8, 0),
+    ("INX", 0, 3): (0xE8, 0),
+    ("INY", 0, 0): (0xC8, 0),
+    ("INY", 0, 1): (0xC8, 0),
+    ("INY", 0, 2): (0xC8, 0),
+    ("INY", 0, 3): (0xC8, 0),
+    ("NOP", 0, 0): (0xEA, 0),
+    ("NOP", 0, 1): (0xEA, 0),
+    ("NOP", 0, 2): (0xEA, 0),
+    ("NOP", 0, 3): (0xEA, 0),
+    ("PHA", 0, 0): (0x48, 0),
+    ("PHA", 0, 1): (0x48, 0),
+    ("PHA", 0, 2): (0x48, 0),
+    ("PHA", 0, 3): (0x48, 0),
+    ("PHP", 0, 0): (0x08, 0),
+    ("PHP", 0, 1): (0x08, 0),
+    ("PHP", 0, 2): (0x08, 0),
+    ("PHP", 0, 3): (0x08, 0),
+    ("PLA", 0, 0): (0x68, 0),
+    ("PLA", 0, 1): (0x68, 0),
+    ("PLA", 0, 2): (0x68, 0),
+    ("PLA", 0, 3): (0x68, 0),
+    ("PLP", 0, 0): (0x28, 0),
+    ("PLP", 0, 1): (0x28, 0),
+    ("PLP", 0, 2): (0x28, 0),
+    ("PLP", 0, 3): (0x28, 0),
+    ("RTI", 0, 0): (0x40, 0),
+    ("RTI", 0, 1): (0x40, 0),
+    ("RTI", 0, 2): (0x40, 0),
+    ("RTI", 0, 3): (0x40, 0),
+    ("RTS", 0, 0): (0x60, 0),
+    ("RTS", 0, 1): (0x60, 0),
+    ("RTS", 0, 2): (0x60, 0),
+    ("RTS", 0, 3): (0x60, 0),
+    ("SEC", 0, 0): (0x38, 0),
+    ("SEC", 0, 1): (0x38, 0),
+    ("SEC", 0, 2): (0x38, 0),
+    ("SEC", 0, 3): (0x38, 0),
+    ("SED", 0, 0): (0xF8, 0),
+    ("SED", 0, 1): (0xF8, 0),
+    ("SED", 0, 2): (0xF8, 0),
+    ("SED", 0, 3): (0xF8, 0),
+    ("SEI", 0, 0): (0x78, 0),
+    ("SEI", 0, 1): (0x78, 0),
+    ("SEI", 0, 2): (0x78, 0),
+    ("SEI", 0, 3): (0x78, 0),
+    ("TAX", 0, 0): (0xAA, 0),
+    ("TAX", 0, 1): (0xAA, 0),
+    ("TAX", 0, 2): (0xAA, 0),
+    ("TAX", 0, 3): (0xAA, 0),
+    ("TAY", 0, 0): (0xA8, 0),
+    ("TAY", 0, 1): (0xA8, 0),
+    ("TAY", 0, 2): (0xA8, 0),
+    ("TAY", 0, 3): (0xA8, 0),
+    ("TSX", 0, 0): (0xBA, 0),
+    ("TSX", 0, 1): (0xBA, 0),
+    ("TSX", 0, 2): (0xBA, 0),
+    ("TSX", 0, 3): (0xBA, 0),
+    ("TXA", 0, 0): (0x8A, 0),
+    ("TXA", 0, 1): (0x8A, 0),
+    ("TXA", 0, 2): (0x8A, 0),
+    ("TXA", 0, 3): (0x8A, 0),
+    ("TXS", 0, 0): (0x9A, 0),
+    ("TXS", 0, 1): (0x9A, 0),
+    ("TXS", 0, 2): (0x9A, 0),
+    ("TXS", 0, 3): (0x9A, 0),
+    ("TYA", 0, 0): (0x98, 0),
+    ("TYA", 0, 1): (0x98, 0),
+    ("TYA", 0, 2): (0x98, 0),
+    ("TYA", 0, 3): (0x98, 0),
+    ("ADC", 13, 0): (0x72, 1),
+    ("ADC", 13, 1): (0x72, 1),
+    ("ADC", 13, 2): (0x72, 1),
+    ("ADC", 13, 3): (0x72, 1),
+    ("AND", 13, 0): (0x32, 1),
+    ("AND", 13, 1): (0x32, 1),
+    ("AND", 13, 2): (0x32, 1),
+    ("AND", 13, 3): (0x32, 1),
+    ("CMP", 13, 0): (0xD2, 1),
+    ("CMP", 13, 1): (0xD2, 1),
+    ("CMP", 13, 2): (0xD2, 1),
+    ("CMP", 13, 3): (0xD2, 1),
+    ("EOR", 13, 0): (0x52, 1),
+    ("EOR", 13, 1): (0x52, 1),
+    ("EOR", 13, 2): (0x52, 1),
+    ("EOR", 13, 3): (0x52, 1),
+    ("LDA", 13, 0): (0xB2, 1),
+    ("LDA", 13, 1): (0xB2, 1),
+    ("LDA", 13, 2): (0xB2, 1),
+    ("LDA", 13, 3): (0xB2, 1),
+    ("ORA", 13, 0): (0x12, 1),
+    ("ORA", 13, 1): (0x12, 1),
+    ("ORA", 13, 2): (0x12, 1),
+    ("ORA", 13, 3): (0x12, 1),
+    ("SBC", 13, 0): (0xF2, 1),
+    ("SBC", 13, 1): (0xF2, 1),
+    ("SBC", 13, 2): (0xF2, 1),
+    ("SBC", 13, 3): (0xF2, 1),
+    ("STA", 13, 0): (0x92, 1),
+    ("STA", 13, 1): (0x92, 1),
+    ("STA", 13, 2): (0x92, 1),
+    ("STA", 13, 3): (0x92, 1),
+    ("BIT", 2, 0): (0x89, 1),
+    ("BIT", 2, 1): (0x89, 2),
+    ("BIT", 2, 2): (0x89, 1),
+    ("BIT", 2, 3): (0x89, 2),
+    ("BIT", 4, 0): (0x34, 1),
+    ("BIT", 4, 1): (0x34, 1),
+    ("BIT", 4, 2): (0x34, 1),
+    ("BIT", 4, 3): (0x34, 1),
+    ("BIT", 7, 0): (0x3C, 2),
+    ("BIT", 7, 1): (0x3C, 2),
+    ("BIT", 7, 2): (0x3C, 2),
+    ("BIT", 7, 3): (0x3C, 2),
+    ("DEC", 1, 0): (0x3A, 0),
+    ("DEC", 1, 1): (0x3A, 0),
+    ("DEC", 1, 2): (0x3A, 0),
+    ("DEC", 1, 3): (0x3A, 0),
+    ("INC", 1, 0): (0x1A, 0),
+    ("INC", 1, 1): (0x1A, 0),
+    ("INC", 1, 2): (0x1A, 0),
+    ("INC", 1, 3): (0x1A, 0),
+    ("JMP", 14, 0): (0x7C, 2),
+    ("JMP", 14, 1): (0x7C, 2),
+    ("JMP", 14, 2): (0x7C, 2),
+    ("JMP", 14, 3): (0x7C, 2),
+    ("BRA", 12, 0): (0x80, 1),
+    ("BRA", 12, 1): (0x80, 1),
+    ("BRA", 12, 2): (0x80, 1),
+    ("BRA", 12, 3): (0x80, 1),
+    ("STZ", 3, 0): (0x64, 1),
+    ("STZ", 3, 1): (0x64, 1),
+    ("STZ", 3, 2): (0x64, 1),
+    ("STZ", 3, 3): (0x64, 1),
+    ("STZ", 4, 0): (0x74, 1),
+    ("STZ", 4, 1): (0x74, 1),
+    ("STZ", 4, 2): (0x74, 1),
+    ("STZ", 4, 3): (0x74, 1),
+    ("STZ", 6, 0): (0x9C, 2),
+    ("STZ", 6, 1): (0x9C, 2),
+    ("STZ", 6, 2): (0x9C, 2),
+    ("STZ", 6, 3): (0x9C, 2),
+    ("STZ", 7, 0): (0x9E, 2),
+    ("STZ", 7, 1): (0x9E, 2),
+    ("STZ", 7, 2): (0x9E, 2),
+    ("STZ", 7, 3): (0x9E, 2),
+    ("TRB", 3, 0): (0x14, 1),
+    ("TRB", 3, 1): (0x14, 1),
+    ("TRB", 3, 2): (0x14, 1),
+    ("TRB", 3, 3): (0x14, 1),
+    ("TRB", 6, 0): (0x1C, 2),
+    ("TRB", 6, 1): (0x1C, 2),
+    ("TRB", 6, 2): (0x1C, 2),
+    ("TRB", 6, 3): (0x1C, 2),
+    ("TSB", 3, 0): (0x04, 1),
+    ("TSB", 3, 1): (0x04, 1),
+    ("TSB", 3, 2): (0x04, 1),
+    ("TSB", 3, 3): (0x04, 1),
+    ("TSB", 6, 0): (0x0C, 2),
+    ("TSB", 6, 1): (0x0C, 2),
+    ("TSB", 6, 2): (0x0C, 2),
+    ("TSB", 6, 3): (0x0C, 2),
+    ("PHX", 0, 0): (0xDA, 0),
+    ("PHX", 0, 1): (0xDA, 0),
+    ("PHX", 0, 2): (0xDA, 0),
+    ("PHX", 0, 3): (0xDA, 0),
+    ("PHY", 0, 0): (0x5A, 0),
+    ("PHY", 0, 1): (0x5A, 0),
+    ("PHY", 0, 2): (0x5A, 0),
+    ("PHY", 0, 3): (0x5A, 0),
+    ("PLX", 0, 0): (0xFA, 0),
+    ("PLX", 0, 1): (0xFA, 0),
+    ("PLX", 0, 2): (0xFA, 0),
+    ("PLX", 0, 3): (0xFA, 0),
+    ("PLY", 0, 0): (0x7A, 0),
+    ("PLY", 0, 1): (0x7A, 0),
+    ("PLY", 0, 2): (0x7A, 0),
+    ("PLY", 0, 3): (0x7A, 0),
+    ("ADC", 15, 0): (0x6F, 3),
+    ("ADC", 15, 1): (0x6F, 3),
+    ("ADC", 15, 2): (0x6F, 3),
+    ("ADC", 15, 3): (0x6F, 3),
+    ("ADC", 16, 0): (0x7F, 3),
+    ("ADC", 16, 1): (0x7F, 3),
+    ("ADC", 16, 2): (0x7F, 3),
+    ("ADC", 16, 3): (0x7F, 3),
+    ("ADC", 17, 0): (0x67, 1),
+    ("ADC", 17, 1): (0x67, 1),
+    ("ADC", 17, 2): (0x67, 1),
+    ("ADC", 17, 3): (0x67, 1),
+    ("ADC", 18, 0): (0x77, 1),
+    ("ADC", 18, 1): (0x77, 1),
+    ("ADC", 18, 2): (0x77, 1),
+    ("ADC", 18, 3): (0x77, 1),
+    ("ADC", 19, 0): (0x63, 1),
+    ("ADC", 19, 1): (0x63, 1),
+    ("ADC", 19, 2): (0x63, 1),
+    ("ADC", 19, 3): (0x63, 1),
+    ("ADC", 20, 0): (0x73, 1),
+    ("ADC", 20, 1): (0x73, 1),
+    ("ADC", 20, 2): (0x73, 1),
+    ("ADC", 20, 3): (0x73, 1),
+    ("AND", 15, 0): (0x2F, 3),
+    ("AND", 15, 1): (0x2F, 3),
+    ("AND", 15, 2): (0x2F, 3),
+    ("AND", 15, 3): (0x2F, 3),
+    ("AND", 16, 0): (0x3F, 3),
+    ("AND", 16, 1): (0x3F, 3),
+    ("AND", 16, 2): (0x3F, 3),
+    ("AND", 16, 3): (0x3F, 3),
+    ("AND", 17, 0): (0x27, 1),
+    ("AND", 17, 1): (0x27, 1),
+    ("AND", 17, 2): (0x27, 1),
+    ("AND", 17, 3): (0x27, 1),
+    ("AND", 18, 0): (0x37, 1),
+    ("AND", 18, 1): (0x37, 1),
+    ("AND", 18, 2): (0x37, 1),
+    ("AND", 18, 3): (0x37, 1),
+    ("AND", 19, 0): (0x23, 1),
+    ("AND", 19, 1): (0x23, 1),
+    ("AND", 19, 2): (0x23, 1),
+    ("AND", 19, 3): (0x23, 1),
+    ("AND", 20, 0): (0x33, 1),
+    ("AND", 20, 1): (0x33, 1),
+    ("AND", 20, 2): (0x33, 1),
+    ("AND", 20, 3): (0x33, 1),
+    ("CMP", 15, 0): (0xCF, 3),
+    ("CMP", 15, 1): (0xCF, 3),
+    ("CMP", 15, 2): (0xCF, 3),
+    ("CMP", 15, 3): (0xCF, 3),
+    ("CMP", 16, 0): (0xDF, 3),
+    ("CMP", 16, 1): (0xDF, 3),
+    ("CMP", 16, 2): (0xDF, 3),
+    ("CMP", 16, 3): (0xDF, 3),
+    ("CMP", 17, 0): (0xC7, 1),
+    ("CMP", 17, 1): (0xC7, 1),
+    ("CMP", 17, 2): (0xC7, 1),
+    ("CMP", 17, 3): (0xC7, 1),
+    ("CMP", 18, 0): (0xD7, 1),
+    ("CMP", 18, 1): (0xD7, 1),
+    ("CMP", 18, 2): (0xD7, 1),
+    ("CMP", 18, 3): (0xD7, 1),
+    ("CMP", 19, 0): (0xC3, 1),
+    ("CMP", 19, 1): (0xC3, 1),
+    ("CMP", 19, 2): (0xC3, 1),
+    ("CMP", 19, 3): (0xC3, 1),
+    ("CMP", 20, 0): (0xD3, 1),
+    ("CMP", 20, 1): (0xD3, 1),
+    ("CMP", 20, 2): (0xD3, 1),
+    ("CMP", 20, 3): (0xD3, 1),
+    ("EOR", 15, 0): (0x4F, 3),
+    ("EOR", 15, 1): (0x4F, 3),
+    ("EOR", 15, 2): (0x4F, 3),
+    ("EOR", 15, 3): (0x4F, 3),
+    ("EOR", 16, 0): (0x5F, 3),
+    ("EOR", 16, 1): (0x5F, 3),
+    ("EOR", 16, 2): (0x5F, 3),
+    ("EOR", 16, 3): (0x5F, 3),
+    ("EOR", 17, 0): (0x47, 1),
+    ("EOR", 17, 1): (0x47, 1),
+    ("EOR", 17, 2): (0x47, 1),
+    ("EOR", 17, 3): (0x47, 1),
+    ("EOR", 18, 0): (0x57, 1),
+    ("EOR", 18, 1): (0x57, 1),
+    ("EOR", 18, 2): (0x57, 1),
+    ("EOR", 18, 3): (0x57, 1),
+    ("EOR", 19, 0): (0x43, 1),
+    ("EOR", 19, 1): (0x43, 1),
+    ("EOR", 19, 2): (0x43, 1),
+    ("EOR", 19, 3): (0x43, 1),
+    ("EOR", 20, 0): (0x53, 1),
+    ("EOR", 20, 1): (0x53, 1),
+    ("EOR", 20, 2): (0x53, 1),
+    ("EOR", 20, 3): (0x53, 1),
+    ("LDA", 15, 0): (0xAF, 3),
+    ("LDA", 15, 1): (0xAF, 3),
+    ("LDA", 15, 2): (0xAF, 3),
+    ("LDA", 15, 3): (0xAF, 3),
+    ("LDA", 16, 0): (0xBF, 3),
+    ("LDA", 16, 1): (0xBF, 3),
+    ("LDA", 16, 2): (0xBF, 3),
+    ("LDA", 16, 3): (0xBF, 3),
+    ("LDA", 17, 0): (0xA7, 1),
+    ("LDA", 17, 1): (0xA7, 1),
+    ("LDA", 17, 2): (0xA7, 1),
+    ("LDA", 17, 3): (0xA7, 1),
+    ("LDA", 18, 0): (0xB7, 1),
+    ("LDA", 18, 1): (0xB7, 1),
+    ("LDA", 18, 2): (0xB7, 1),
+    ("LDA", 18, 3): (0xB7, 1),
+    ("LDA", 19, 0): (0xA3, 1),
+    ("LDA", 19, 1): (0xA3, 1),
+    ("LDA", 19, 2): (0xA3, 1),
+    ("LDA", 19, 3): (0xA3, 1),
+    ("LDA", 20, 0): (0xB3, 1),
+    ("LDA", 20, 1): (0xB3, 1),
+    ("LDA", 20, 2): (0xB3, 1),
+    ("LDA", 20, 3): (0xB3, 1),
+    ("ORA", 15, 0): (0x0F, 3),
+    ("ORA", 15, 1): (0x0F, 3),
+    ("ORA", 15, 2): (0x0F, 3),
+    ("ORA", 15, 3): (0x0F, 3),
+    ("ORA", 16, 0): (0x1F, 3),
+    ("ORA", 16, 1): (0x1F, 3),
+    ("ORA", 16, 2): (0x1F, 3),
+    ("ORA", 16, 3): (0x1F, 3),
+    ("ORA", 17, 0): (0x07, 1),
+    ("ORA", 17, 1): (0x07, 1),
+    ("ORA", 17, 2): (0x07, 1),
+    ("ORA", 17, 3): (0x07, 1),
+    ("ORA", 18, 0): (0x17, 1),
+    ("ORA", 18, 1): (0x17, 1),
+    ("ORA", 18, 2): (0x17, 1),
+    ("ORA", 18, 3): (0x17, 1),
+    ("ORA", 19, 0): (0x03, 1),
+    ("ORA", 19, 1): (0x03, 1),
+    ("ORA", 19, 2): (0x03, 1),
+    ("ORA", 19, 3): (0x03, 1),
+    ("ORA", 20, 0): (0x13, 1),
+    ("ORA", 20, 1): (0x13, 1),
+    ("ORA", 20, 2): (0x13, 1),
+    ("ORA", 20, 3): (0x13, 1),
+    ("SBC", 15, 0): (0xEF, 3),
+    ("SBC", 15, 1): (0xEF, 3),
+    ("SBC", 15, 2): (0xEF, 3),
+    ("SBC", 15, 3): (0xEF, 3),
+    ("SBC", 16, 0): (0xFF, 3),
+    ("SBC", 16, 1): (0xFF, 3),
+    ("SBC", 16, 2): (0xFF, 3),
+    ("SBC", 16, 3): (0xFF, 3),
+    ("SBC", 17, 0): (0xE7, 1),
+    ("SBC", 17, 1): (0xE7, 1),
+    ("SBC", 17, 2): (0xE7, 1),
+    ("SBC", 17, 3): (0xE7, 1),
+    ("SBC", 18, 0): (0xF7, 1),
+    ("SBC", 18, 1): (0xF7, 1),
+    ("SBC", 18, 2): (0xF7, 1),
+    ("SBC", 18, 3): (0xF7, 1),
+    ("SBC", 19, 0): (0xE3, 1),
+    ("SBC", 19, 1): (0xE3, 1),
+    ("SBC", 19, 2): (0xE3, 1),
+    ("SBC", 19, 3): (0xE3, 1),
+    ("SBC", 20, 0): (0xF3, 1),
+    ("SBC", 20, 1): (0xF3, 1),
+    ("SBC", 20, 2): (0xF3, 1),
+    ("SBC", 20, 3): (0xF3, 1),
+    ("STA", 15, 0): (0x8F, 3),
+    ("STA", 15, 1): (0x8F, 3),
+    ("STA", 15, 2): (0x8F, 3),
+    ("STA", 15, 3): (0x8F, 3),
+    ("STA", 16, 0): (0x9F, 3),
+    ("STA", 16, 1): (0x9F, 3),
+    ("STA", 16, 2): (0x9F, 3),
+    ("STA", 16, 3): (0x9F, 3),
+    ("STA", 17, 0): (0x87, 1),
+    ("STA", 17, 1): (0x87, 1),
+    ("STA", 17, 2): (0x87, 1),
+    ("STA", 17, 3): (0x87, 1),
+    ("STA", 18, 0): (0x97, 1),
+    ("STA", 18, 1): (0x97, 1),
+    ("STA", 18, 2): (0x97, 1),
+    ("STA", 18, 3): (0x97, 1),
+    ("STA", 19, 0): (0x83, 1),
+    ("STA", 19, 1): (0x83, 1),
+    ("STA", 19, 2): (0x83, 1),
+    ("STA", 19, 3): (0x83, 1),
+    ("STA", 20, 0): (0x93, 1),
+    ("STA", 20, 1): (0x93, 1),
+    ("STA", 20, 2): (0x93, 1),
+    ("STA", 20, 3): (0x93, 1),
+    ("BRL", 21, 0): (0x82, 2),
+    ("BRL", 21, 1): (0x82, 2),
+    ("BRL", 21, 2): (0x82, 2),
+    ("BRL", 21, 3): (0x82, 2),
+    ("PER", 21, 0): (0x62, 2),
+    ("PER", 21, 1): (0x62, 2),
+    ("PER", 21, 2): (0x62, 2),
+    ("PER", 21, 3): (0x62, 2),
+    ("COP", 2, 0): (0x02, 1),
+    ("COP", 2, 1): (0x02, 1),
+    ("COP", 2, 2): (0x02, 1),
+    ("COP", 2, 3): (0x02, 1),
+    ("REP", 2, 0): (0xC2, 1),
+    ("REP", 2, 1): (0xC2, 1),
+    ("REP", 2, 2): (0xC2, 1),
+    ("REP", 2, 3): (0xC2, 1),
+    ("SEP", 2, 0): (0xE2, 1),
+    ("SEP", 2, 1): (0xE2, 1),
+    ("SEP", 2, 2): (0xE2, 1),
+    ("SEP", 2, 3): (0xE2, 1),
+    ("WDM", 2, 0): (0x42, 1),
+    ("WDM", 2, 1): (0x42, 1),
+    ("WDM", 2, 2): (0x42, 1),
+    ("WDM", 2, 3): (0x42, 1),
+    ("JML", 15, 0): (0x5C, 3),
+    ("JML", 15, 1): (0x5C, 3),
+    ("JML", 15, 2): (0x5C, 3),
+    ("JML", 15, 3): (0x5C, 3),
+    ("JML", 23, 0): (0xDC, 2),
+    ("JML", 23, 1): (0xDC, 2),
+    ("JML", 23, 2): (0xDC, 2),
+    ("JML", 23, 3): (0xDC, 2),
+    ("JMP", 15, 0): (0x5C, 3),
+    ("JMP", 15, 1): (0x5C, 3),
+    ("JMP", 15, 2): (0x5C, 3),
+    ("JMP", 15, 3): (0x5C, 3),
+    ("JMP", 23, 0): (0xDC, 2),
+    ("JMP", 23, 1): (0xDC, 2),
+    ("JMP", 23, 2): (0xDC, 2),
+    ("JMP", 23, 3): (0xDC, 2),
+    ("JSL", 15, 0): (0x22, 3),
+    ("JSL", 15, 1): (0x22, 3),
+    ("JSL", 15, 2): (0x22, 3),
+    ("JSL", 15, 3): (0x22, 3),
+    ("JSR", 15, 0): (0x22, 3),
+    ("JSR", 15, 1): (0x22, 3),
+    ("JSR", 15, 2): (0x22, 3),
+    ("JSR", 15, 3): (0x22, 3),
+    ("JSR", 14, 0): (0xFC, 2),
+    ("JSR", 14, 1): (0xFC, 2),
+    ("JSR", 14, 2): (0xFC, 2),
+    ("JSR", 14, 3): (0xFC, 2),
+    ("MVN", 22, 0): (0x54, 2),
+    ("MVN", 22, 1): (0x54, 2),
+    ("MVN", 22, 2): (0x54, 2),
+    ("MVN", 22, 3): (0x54, 2),
+    ("MVP", 22, 0): (0x44, 2),
+    ("MVP", 22, 1): (0x44, 2),
+    ("MVP", 22, 2): (0x44, 2),
+    ("MVP", 22, 3): (0x44, 2),
+    ("PEA", 6, 0): (0xF4, 2),
+    ("PEA", 6, 1): (0xF4, 2),
+    ("PEA", 6, 2): (0xF4, 2),
+    ("PEA", 6, 3): (0xF4, 2),
+    ("PEI", 13, 0): (0xD4, 1),
+    ("PEI", 13, 1): (0xD4, 1),
+    ("PEI", 13, 2): (0xD4, 1),
+    ("PEI", 13, 3): (0xD4, 1),
+    ("PHB", 0, 0): (0x8B, 0),
+    ("PHB", 0, 1): (0x8B, 0),
+    ("PHB", 0, 2): (0x8B, 0),
+    ("PHB", 0, 3): (0x8B, 0),
+    ("PHD", 0, 0): (0x0B, 0),
+    ("PHD", 0, 1): (0x0B, 0),
+    ("PHD", 0, 2): (0x0B, 0),
+    ("PHD", 0, 3): (0x0B, 0),
+    ("PHK", 0, 0): (0x4B, 0),
+    ("PHK", 0, 1): (0x4B, 0),
+    ("PHK", 0, 2): (0x4B, 0),
+    ("PHK", 0, 3): (0x4B, 0),
+    ("PLB", 0, 0): (0xAB, 0),
+    ("PLB", 0, 1): (0xAB, 0),
+    ("PLB", 0, 2): (0xAB, 0),
+    ("PLB", 0, 3): (0xAB, 0),
+    ("PLD", 0, 0): (0x2B, 0),
+    ("PLD", 0, 1): (0x2B, 0),
+    ("PLD", 0, 2): (0x2B, 0),
+    ("PLD", 0, 3): (0x2B, 0),
+    ("RTL", 0, 0): (0x6B, 0),
+    ("RTL", 0, 1): (0x6B, 0),
+    ("RTL", 0, 2): (0x6B, 0),
+    ("RTL", 0, 3): (0x6B, 0),
+    ("STP", 0, 0): (0xDB, 0),
+    ("STP", 0, 1): (0xDB, 0),
+    ("STP", 0, 2): (0xDB, 0),
+    ("STP", 0, 3): (0xDB, 0),
+    ("TCD", 0, 0): (0x5B, 0),
+    ("TCD", 0, 1): (0x5B, 0),
+    ("TCD", 0, 2): (0x5B, 0),
+    ("TCD", 0, 3): (0x5B, 0),
+    ("TCS", 0, 0): (0x1B, 0),
+    ("TCS", 0, 1): (0x1B, 0),
+    ("TCS", 0, 2): (0x1B, 0),
+    ("TCS", 0, 3): (0x1B, 0),
+    ("TDC", 0, 0): (0x7B, 0),
+    ("TDC", 0, 1): (0x7B, 0),
+    ("TDC", 0, 2): (0x7B, 0),
+    ("TDC", 0, 3): (0x7B, 0),
+    ("TSC", 0, 0): (0x3B, 0),
+    ("TSC", 0, 1): (0x3B, 0),
+    ("TSC", 0, 2): (0x3B, 0),
+    ("TSC", 0, 3): (0x3B, 0),
+    ("TXY", 0, 0): (0x9B, 0),
+    ("TXY", 0, 1): (0x9B, 0),
+    ("TXY", 0, 2): (0x9B, 0),
+    ("TXY", 0, 3): (0x9B, 0),
+    ("TYX", 0, 0): (0xBB, 0),
+    ("TYX", 0, 1): (0xBB, 0),
+    ("TYX", 0, 2): (0xBB, 0),
+    ("TYX", 0, 3): (0xBB, 0),
+    ("WAI", 0, 0): (0xCB, 0),
+    ("WAI", 0, 1): (0xCB, 0),
+    ("WAI", 0, 2): (0xCB, 0),
+    ("WAI", 0, 3): (0xCB, 0),
+    ("XBA", 0, 0): (0xEB, 0),
+    ("XBA", 0, 1): (0xEB, 0),
+    ("XBA", 0, 2): (0xEB, 0),
+    ("XBA", 0, 3): (0xEB, 0),
+    ("XCE", 0, 0): (0xFB, 0),
+    ("XCE", 0, 1): (0xFB, 0),
+    ("XCE", 0, 2): (0xFB, 0),
+    ("XCE", 0, 3): (0xFB, 0),
+}
+
+MOS6502_MNEMONICS = frozenset({"ADC", "AND", "ASL", "BCC", "BCS", "BEQ", "BIT", "BMI", "BNE", "BPL", "BRK", "BVC", "BVS", "CLC", "CLD", "CLI", "CLV", "CMP", "CPX", "CPY", "DEC", "DEX", "DEY", "EOR", "INC", "INX", "INY", "JMP", "JSR", "LDA", "LDX", "LDY", "LSR", "NOP", "ORA", "PHA", "PHP", "PLA", "PLP", "ROL", "ROR", "RTI", "RTS", "SBC", "SEC", "SED", "SEI", "STA", "STX", "STY", "TAX", "TAY", "TSX", "TXA", "TXS", "TYA"})
+
+WDC65C02_MNEMONICS = frozenset({"ADC", "AND", "ASL", "BCC", "BCS", "BEQ", "BIT", "BMI", "BNE", "BPL", "BRA", "BRK", "BVC", "BVS", "CLC", "CLD", "CLI", "CLV", "CMP", "CPX", "CPY", "DEC", "DEX", "DEY", "EOR", "INC", "INX", "INY", "JMP", "JSR", "LDA", "LDX", "LDY", "LSR", "NOP", "ORA", "PHA", "PHP", "PHX", "PHY", "PLA", "PLP", "PLX", "PLY", "ROL", "ROR", "RTI", "RTS", "SBC", "SEC", "SED", "SEI", "STA", "STX", "STY", "STZ", "TAX", "TAY", "TRB", "TSB", "TSX", "TXA", "TXS", "TYA"})
+
+WDC65816_MNEMONICS = frozenset({"ADC", "AND", "ASL", "BCC", "BCS", "BEQ", "BIT", "BMI", "BNE", "BPL", "BRA", "BRK", "BRL", "BVC", "BVS", "CLC", "CLD", "CLI", "CLV", "CMP", "COP", "CPX", "CPY", "DEC", "DEX", "DEY", "EOR", "INC", "INX", "INY", "JML", "JMP", "JSL", "JSR", "LDA", "LDX", "LDY", "LSR", "MVN", "MVP", "NOP", "ORA", "PEA", "PEI", "PER", "PHA", "PHB", "PHD", "PHK", "PHP", "PHX", "PHY", "PLA", "PLB", "PLD", "PLP", "PLX", "PLY", "REP", "ROL", "ROR", "RTI", "RTL", "RTS", "SBC", "SEC", "SED", "SEI", "SEP", "STA", "STP", "STX", "STY", "STZ", "TAX", "TAY", "TCD", "TCS", "TDC", "TRB", "TSB", "TSC", "TSX", "TXA", "TXS", "TXY", "TYA", "TYX", "WAI", "WDM", "XBA", "XCE"})
+# fmt: on
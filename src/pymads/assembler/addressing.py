@@ -0,0 +1,212 @@
+"""
+Operand syntax analysis and addressing mode selection.
+
+Original Pascal function: oblicz_mnemonik (operand part)
+
+An operand is first classified by its syntax alone (``#expr``, ``expr,x``,
+``(expr),y`` ...). The final addressing mode is then picked from the
+candidates of that syntax by the size of the operand value and by what the
+target CPU supports.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from pymads.assembler.opcodes import OPERAND_LENGTH, Mode, OpcodeTable
+
+# Operand syntax classes.
+IMPLIED = ""
+IMMEDIATE = "#"
+ADDRESS = "a"
+
+# Candidate modes per syntax class, smallest operand first.
+CANDIDATES: Dict[str, Tuple[Mode, ...]] = {
+    IMPLIED: (Mode.IMP, Mode.ACC),
+    IMMEDIATE: (Mode.IMM,),
+    ADDRESS: (Mode.ZP, Mode.ABS, Mode.LONG),
+    "a,x": (Mode.ZPX, Mode.ABSX, Mode.LONGX),
+    "a,y": (Mode.ZPY, Mode.ABSY),
+    "a,s": (Mode.SR,),
+    "(a,x)": (Mode.INDX, Mode.ABSINDX),
+    "(a),y": (Mode.INDY,),
+    "(a)": (Mode.ZPIND, Mode.IND),
+    "(a,s),y": (Mode.SRINDY,),
+    "[a]": (Mode.DPINDL, Mode.ABSINDL),
+    "[a],y": (Mode.DPINDLY,),
+}
+
+_BRANCH_MODES = (Mode.REL, Mode.RELL)
+
+# Mnemonic size suffixes (lda.z, lda.a, lda.l) restricting the operand length.
+SIZE_SUFFIXES: Dict[str, int] = {
+    "Z": 1,
+    "B": 1,
+    "A": 2,
+    "W": 2,
+    "L": 3,
+    "T": 3,
+}
+
+_CLOSE = {"(": ")", "[": "]"}
+
+
+def split_arguments(text: str) -> List[str]:
+    """
+    Split text on commas that are not inside brackets or quotes.
+
+    Args:
+        text: Comma separated arguments
+
+    Returns:
+        List of stripped arguments (empty list for blank text)
+    """
+    arguments = []
+    depth = 0
+    quote = ""
+    start = 0
+    for index, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in "'\"":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            arguments.append(text[start:index].strip())
+            start = index + 1
+    last = text[start:].strip()
+    if last or arguments:
+        arguments.append(last)
+    return arguments
+
+
+def _closing_index(text: str) -> int:
+    """Index of the bracket closing ``text[0]``, or -1."""
+    depth = 0
+    quote = ""
+    for index, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in "'\"":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+            if depth == 0:
+                return index
+    return -1
+
+
+def _index_suffix(arguments: List[str]) -> str:
+    if len(arguments) == 2 and arguments[1].lower() in ("x", "y", "s"):
+        return arguments[1].lower()
+    return ""
+
+
+@lru_cache(maxsize=4096)
+def parse_operand(text: str) -> Tuple[str, str]:
+    """
+    Classify an operand by its syntax.
+
+    Args:
+        text: Operand text
+
+    Returns:
+        Tuple of (syntax class, expression text); the syntax class is a key
+        of CANDIDATES
+
+    Raises:
+        ValueError: If the operand syntax is not recognised
+    """
+    text = text.strip()
+    if not text or text == "@" or text in ("a", "A"):
+        return IMPLIED, ""
+    if text[0] == "#":
+        return IMMEDIATE, text[1:].strip()
+
+    arguments = split_arguments(text)
+    index = _index_suffix(arguments)
+    if index:
+        core = arguments[0]
+    elif len(arguments) == 1:
+        core = text
+    else:
+        raise ValueError(f"Illegal addressing mode '{text}'")
+
+    opening = core[0]
+    if opening in _CLOSE and _closing_index(core) == len(core) - 1:
+        inner_arguments = split_arguments(core[1:-1])
+        inner_index = _index_suffix(inner_arguments)
+        inner = inner_arguments[0] if inner_index else core[1:-1].strip()
+        syntax = opening + "a"
+        if inner_index:
+            syntax += "," + inner_index
+        syntax += _CLOSE[opening]
+        if index:
+            syntax += "," + index
+        if syntax in CANDIDATES:
+            return syntax, inner
+        if inner_index:
+            raise ValueError(f"Illegal addressing mode '{text}'")
+        # A bracketed expression such as (base+1),x is a plain address.
+
+    if index:
+        return f"a,{index}", core
+    return ADDRESS, core
+
+
+def select_mode(
+    table: OpcodeTable,
+    mnemonic: str,
+    syntax: str,
+    value: Optional[int],
+    flags: int = 0,
+    size: int = 0,
+) -> Mode:
+    """
+    Pick the addressing mode for an operand.
+
+    The smallest supported mode the value fits in is chosen. While the value
+    is still unknown (forward reference) a 16-bit mode is preferred, as MADS
+    does in its first pass.
+
+    Args:
+        table: Opcode table of the target CPU
+        mnemonic: Upper-case mnemonic
+        syntax: Syntax class returned by parse_operand
+        value: Operand value, or None if not yet known
+        flags: 65816 register widths
+        size: Forced operand length from a mnemonic suffix (0 for none)
+
+    Returns:
+        The addressing mode
+
+    Raises:
+        ValueError: If the mnemonic does not support the operand syntax
+    """
+    if syntax == ADDRESS:
+        for mode in _BRANCH_MODES:
+            if (mnemonic, mode, flags) in table:
+                return mode
+    modes = [
+        mode
+        for mode in CANDIDATES[syntax]
+        if (mnemonic, mode, flags) in table
+        and (not size or OPERAND_LENGTH[mode] == size)
+    ]
+    if not modes:
+        raise ValueError(f"Illegal addressing mode for {mnemonic}")
+    if value is None:
+        for mode in modes:
+            if OPERAND_LENGTH[mode] >= 2:
+                return mode
+        return modes[-1]
+    for mode in modes:
+        if 0 <= value < 1 << (OPERAND_LENGTH[mode] << 3):
+            return mode
+    return modes[-1]
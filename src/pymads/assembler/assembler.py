@@ -0,0 +1,1832 @@
+"""
+Multi-pass assembler driver.
+
+Original Pascal procedures: analizuj_plik, analizuj_mem, oblicz_dane
+
+Like MADS, the whole source is assembled repeatedly. Symbols keep their
+values from the previous pass, so forward references resolve once their
+definitions have been seen. Assembly stops after the first pass in which no
+symbol was added or changed value; errors that may be caused by values not
+being settled yet (undeclared labels, branches out of range) are only
+reported if they persist in that final pass.
+
+With an IncrementalCache, every ICL is recorded while it is assembled and
+the records of the final pass are stored; later runs replay a file from the
+cache while its content and the symbols it imports are unchanged.
+
+When unreferenced procedures are excluded (MADS -x), the symbols read in
+each pass are added to a ReferenceGraph of .PROC blocks. A block no kept
+code reaches is skipped by the following passes, and its symbols are left
+undefined.
+"""
+
+import io
+import os
+import re
+import time
+from bisect import bisect_right
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from pymads.assembler.addressing import (
+    SIZE_SUFFIXES,
+    parse_operand,
+    select_mode,
+    split_arguments,
+)
+from pymads.assembler.listing import LISTED_BYTES, ListingWriter, write_labels
+from pymads.assembler.opcodes import (
+    M16,
+    MNEMONICS,
+    OPCODE_TABLES,
+    X16,
+    Cpu,
+    Mode,
+    encode,
+)
+from pymads.assembler.output import MEMORY_6502, MEMORY_65816, OutputImage
+from pymads.assembler.relocation import HIGH, LOW, SIZES, WORD, Relocation
+from pymads.core.symbols import (
+    Fixup,
+    ReferenceGraph,
+    Scope,
+    Symbol,
+    SymbolTable,
+    SymbolType,
+)
+from pymads.parser.expressions import CompiledExpression, ExpressionCache
+from pymads.parser.macros import MacroTable
+from pymads.parser.source_cache import SourceCache
+from pymads.parser.tokenizer import LineTokens, tokenize_line, tokenize_lines
+from pymads.utils.file_io import (
+    get_file_path,
+    is_large_file,
+    iter_source_lines,
+    map_binary,
+    read_source_lines,
+    split_source_lines,
+)
+from pymads.utils.text import ata2int
+
+if TYPE_CHECKING:
+    # Imported on first use; hashing and JSON are only needed with a cache.
+    from pymads.assembler.incremental import CacheEntry, IncrementalCache
+    from pymads.assembler.profiler import Profiler
+
+MAX_PASSES = 16
+MAX_MACRO_DEPTH = 32
+
+# Amount module addresses are moved by to find out what depends on them
+_RELOCATION_SHIFT = 0x1000
+
+RUNAD = 0x02E0
+INITAD = 0x02E2
+
+_STRING = re.compile(r"""([cCdD]?)(['"])((?:(?!\2).|\2\2)*)\2(\*?)\Z""")
+_TYPED_LIST = re.compile(r"([aAbBlLhH])\((.*)\)\Z")
+
+
+class AssemblyError(ValueError):
+    """
+    An error in the assembled source.
+
+    Attributes:
+        message: Error description
+        path: Source file the error was found in
+        line: 1-based line number in that file
+    """
+
+    def __init__(
+        self, message: str, path: Optional[str] = None, line: Optional[int] = None
+    ):
+        super().__init__(message)
+        self.message = message
+        self.path = path
+        self.line = line
+
+    def __reduce__(self):
+        # Keep the location when errors cross process boundaries.
+        return type(self), (self.message, self.path, self.line)
+
+    def __str__(self) -> str:
+        if self.path is None:
+            return f"ERROR: {self.message}"
+        return f"{self.path} ({self.line}) ERROR: {self.message}"
+
+
+class _Recording:
+    """An included file being recorded for the incremental cache."""
+
+    __slots__ = ("key", "entry", "depth", "defined", "segments", "segment", "end")
+
+    def __init__(
+        self, key: str, entry: "CacheEntry", depth: int, image: OutputImage
+    ):
+        self.key = key
+        self.entry = entry
+        self.depth = depth
+        self.defined: Set[str] = set()
+        # Writes only ever extend the most recently started segment.
+        self.segments = len(image.segments)
+        self.segment = image.segments[-1] if image.segments else None
+        self.end = self.segment.end if self.segment is not None else 0
+
+    def finish(self, image: OutputImage) -> None:
+        """Collect the bytes written since the recording started."""
+        entry = self.entry
+        written = []
+        segment = self.segment
+        if segment is not None and segment.end > self.end:
+            written.append((self.end, segment.end))
+        written += [(s.start, s.end) for s in image.segments[self.segments :]]
+        entry.ranges = [
+            (start, bytes(image.memory[start:end])) for start, end in written
+        ]
+        entry.exit_pc = image.pc
+        for name in self.defined:
+            entry.imports.pop(name, None)
+
+
+# (scope, name as written, value seen or None) of a symbol read before
+# the current pass defined it
+_Read = Tuple[Scope, str, Optional[int]]
+
+
+class _Patch(Fixup):
+    """
+    A fixed-size output site that read symbols before they were defined.
+
+    The site is registered with the symbol table like any other fixup, so
+    defining one of its symbols later in the pass re-encodes it in place.
+    """
+
+    __slots__ = ("location", "errors", "encode", "listing", "error", "patched")
+
+    def __init__(
+        self,
+        memory: bytearray,
+        address: int,
+        scope: Scope,
+        location: Tuple[Optional[str], Optional[int]],
+        errors: List[AssemblyError],
+        compiled: CompiledExpression,
+        pc: int,
+        encode: Callable[[int], bytes],
+    ):
+        super().__init__(memory, address, 0, lambda t: compiled(t, pc), scope)
+        self.location = location
+        # Errors deferred while the site was first encoded
+        self.errors = errors
+        # Encodes the site from the value of its expression
+        self.encode = encode
+        # (offset, start, end) of the site's line in the listing file
+        self.listing: Optional[Tuple[int, int, int]] = None
+        # Error raised by the last re-encoding, if any
+        self.error: Optional[AssemblyError] = None
+        self.patched = False
+
+    def write(self, value: int) -> None:
+        try:
+            code = self.encode(value)
+        except ValueError as error:
+            self.error = AssemblyError(str(error), *self.location)
+            code = b""
+        else:
+            self.error = None
+        self.target[self.offset : self.offset + len(code)] = code
+        self.patched = True
+
+
+class Assembler:
+    """
+    Assembles MADS sources into an OutputImage.
+
+    Attributes:
+        cpu: Target processor
+        symbols: Symbol table, kept across passes
+        image: Output image of the current pass
+        expressions: Cache of compiled operand expressions
+        macros: Macro definitions, kept across passes with their expansions
+        headers: Whether the output gets Atari DOS headers (OPT H)
+        passes: Number of passes run by the last assembly
+        changes: Number of symbols whose value changed in each pass
+        patched: Sites re-encoded in place by the last assembly instead of
+            running another pass
+        relocatable: Whether the source is a .RELOC module, assembled at 0
+        relocations: Sites the linker has to rewrite (.RELOC and .EXTRN)
+        publics: Names exported with .PUBLIC
+        profiler: Profiler instrumenting this assembler, or None
+        listing: Listing file of the last pass, or None
+        references: Reference graph of the .PROC blocks if unreferenced
+            ones are excluded, else None
+        excluded: Procedures skipped by the last pass
+        excluded_bytes: Bytes those procedures took when last assembled
+        exclude_time: Seconds the last assembly spent on the reference
+            graph and on moving the labels behind excluded procedures
+        errors: Errors of the final pass if the last assembly failed there
+    """
+
+    # Source file readers, replaced per instance by an attached Profiler
+    _read_lines = staticmethod(read_source_lines)
+    _iter_lines = staticmethod(iter_source_lines)
+    _tokenize_lines = staticmethod(tokenize_lines)
+    _tokenize_line = staticmethod(tokenize_line)
+
+    def __init__(
+        self,
+        cpu: Cpu = Cpu.MOS6502,
+        include_paths: Sequence[str] = (),
+        cache: Optional["IncrementalCache"] = None,
+        expressions: Optional[ExpressionCache] = None,
+        sources: Optional[SourceCache] = None,
+        symbols: Optional[SymbolTable] = None,
+        profiler: Optional["Profiler"] = None,
+        listing: Optional[ListingWriter] = None,
+        exclude_unreferenced: bool = False,
+        macros: Optional[MacroTable] = None,
+        image: Optional[OutputImage] = None,
+    ):
+        """
+        Initialize a new assembler.
+
+        Args:
+            cpu: Target processor
+            include_paths: Extra directories searched by ICL and INS
+            cache: Incremental cache for included files (None to disable)
+            expressions: Expression cache to share with other assemblers
+                (must fold case); a private one is created if None
+            sources: Tokenized source cache to share with other assemblers
+            symbols: Symbol table of an earlier assembly of the same source.
+                Its values seed the first pass, so an unchanged program
+                usually converges in one pass; symbols no longer defined
+                by the source are dropped before the result is accepted.
+            profiler: Profiler to instrument this assembler with
+            listing: Listing file to stream the lines of every pass to;
+                each pass replaces the previous one
+            exclude_unreferenced: Whether to skip .PROC blocks that no kept
+                code references (MADS -x)
+            macros: Macro table of an earlier assembly of the same source,
+                reused with its compiled bodies and memoized expansions;
+                a macro is only invoked once the source defines it again
+            image: Output image to reuse (its address space must match
+                ``cpu``); a new one is created if None
+        """
+        self.cpu = cpu
+        self.include_paths = list(include_paths)
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.source_cache = sources
+        self.macros = macros if macros is not None else MacroTable()
+        if image is None:
+            image = OutputImage(MEMORY_65816 if cpu is Cpu.WDC65816 else MEMORY_6502)
+        self.image = image
+        if expressions is None:
+            expressions = ExpressionCache(fold_case=True)
+        self.expressions = expressions
+        self.headers = True
+        self.passes = 0
+        self.changes: List[int] = []
+        self.patched = 0
+        self.flags = 0
+        self.cache = cache
+        self._opcodes = OPCODE_TABLES[cpu]
+        self._mnemonics = MNEMONICS[cpu]
+        self._sources: Dict[str, List[LineTokens]] = {}
+        self._defined: Set[str] = set()
+        self._errors: List[AssemblyError] = []
+        self._reads: List[_Read] = []
+        self._patches: List[_Patch] = []
+        self._ended = False
+        self._scopes: List[str] = []
+        self._location: Tuple[Optional[str], Optional[int]] = (None, None)
+        self._recordings: List[_Recording] = []
+        self._recorded: List[_Recording] = []
+        # Incremental cache lookups of the pass
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._macro_defined: Set[str] = set()
+        self._macro_body: Optional[Tuple[str, List[str], List[str]]] = None
+        self._macro_depth = 0
+        self._macro_calls = 0
+        self.relocatable = False
+        self.relocations: List[Relocation] = []
+        self.publics: List[str] = []
+        self._module = False
+        # Kept across passes, so forward references are classified too
+        self._externals: Dict[str, str] = {}
+        self._relocatable: Set[str] = set()
+        self.listing = listing
+        self._listed = 0
+        # Kept across passes: .PROC symbols by the prefix of their scope,
+        # their sizes when last assembled and the reads already in the graph
+        self.references = ReferenceGraph() if exclude_unreferenced else None
+        self._procs: Dict[str, Symbol] = {}
+        self._proc_sizes: Dict[Symbol, int] = {}
+        self._graphed: Set[Tuple[Scope, str]] = set()
+        self._excluded: Set[Symbol] = set()
+        self._uses: Optional[Set[Tuple[Scope, str]]] = None
+        self._skipped = 0
+        self.excluded: List[str] = []
+        self.excluded_bytes = 0
+        self.exclude_time = 0.0
+        self.errors: List[AssemblyError] = []
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.attach(self)
+
+    # Entry points
+
+    def assemble_file(self, path: str) -> OutputImage:
+        """
+        Assemble a source file.
+
+        Args:
+            path: Source file path
+
+        Returns:
+            The output image
+
+        Raises:
+            AssemblyError: If the source contains errors
+        """
+        return self._assemble(self._resolve_path(path, None))
+
+    def assemble_content(self, path: str, data: bytes) -> OutputImage:
+        """
+        Assemble a source file whose content has already been read.
+
+        Args:
+            path: Source file path, used for errors and to resolve includes
+            data: Content of the file
+
+        Returns:
+            The output image
+
+        Raises:
+            AssemblyError: If the source contains errors
+        """
+        key = os.path.normpath(path)
+        self._sources[key] = self._tokenize_lines(split_source_lines(data))
+        return self._assemble(key)
+
+    def assemble_text(self, text: str, name: str = "<source>") -> OutputImage:
+        """
+        Assemble source text.
+
+        Args:
+            text: Source text
+            name: Name used for the source in error messages
+
+        Returns:
+            The output image
+
+        Raises:
+            AssemblyError: If the source contains errors
+        """
+        self._sources[name] = self._tokenize_lines(text.splitlines())
+        return self._assemble(name)
+
+    def _assemble(self, key: str) -> OutputImage:
+        profiler = self.profiler
+        self.changes = []
+        self.patched = 0
+        self.exclude_time = 0.0
+        self.errors = []
+        for number in range(1, MAX_PASSES + 1):
+            self.passes = number
+            if profiler is not None:
+                profiler.begin_pass()
+            self._begin_pass()
+            self._process_file(key)
+            if profiler is not None:
+                profiler.end_pass()
+            if self._macro_body is not None:
+                raise AssemblyError(f"Missing .ENDM for {self._macro_body[0]}", key)
+            if self._scopes or self._skipped:
+                kind = self._scopes[-1] if self._scopes else "PROC"
+                raise AssemblyError(f"Missing .END for .{kind}", key)
+            self.changes.append(len(self.symbols.changed))
+            if self.references is not None:
+                started = time.perf_counter()
+                changed = self._exclude_unreferenced()
+                self.exclude_time += time.perf_counter() - started
+                if changed:
+                    continue
+            if self._settle():
+                if self._drop_stale_symbols():
+                    continue
+                if self._errors:
+                    self.errors = self._errors
+                    raise self._errors[0]
+                cache = self.cache
+                if cache is not None:
+                    cache.hits += self._cache_hits
+                    cache.misses += self._cache_misses
+                    for recording in self._recorded:
+                        cache.store(recording.key, recording.entry)
+                return self.image
+        raise AssemblyError("Too many passes, symbol values do not settle", key)
+
+    def _settle(self) -> bool:
+        """
+        Check whether the pass is final.
+
+        A pass is final when every symbol it read before defining it had
+        already its final value. Fixed-size sites were registered as fixups
+        and re-encoded when those symbols were defined; any other stale read
+        needs a new pass.
+        """
+        if self._stale(self._reads):
+            return False
+        patches = [patch for patch in self._patches if patch.patched]
+        if not patches:
+            return True
+        segments = sorted(self.image.segments, key=lambda segment: segment.start)
+        if any(a.end > b.start for a, b in zip(segments, segments[1:])):
+            return False  # A later ORG may have overwritten a site
+        memory = self.image.memory
+        resolved = set()
+        for patch in patches:
+            resolved.update(map(id, patch.errors))
+            if patch.error is not None:
+                self._errors.append(patch.error)
+            self.patched += 1
+            if patch.listing is not None:
+                offset, start, end = patch.listing
+                self.listing.update(offset, memory[start:end])
+        self._errors = [error for error in self._errors if id(error) not in resolved]
+        return True
+
+    def _exclude_unreferenced(self) -> bool:
+        """
+        Add the reads of the pass to the reference graph.
+
+        Returns:
+            True if the set of unreferenced procedures changed, so that the
+            next pass has to skip other ones
+        """
+        graph = self.references
+        assert graph is not None and self._uses is not None
+        table = self.symbols
+        graphed = self._graphed
+        for use in self._uses - graphed:
+            scope, name = use
+            table.scope = scope
+            try:
+                symbol = table.lookup(name)
+            except KeyError:
+                continue  # Undeclared; reported unless it goes away
+            graphed.add(use)
+            owner = self._owner(symbol)
+            source = self._proc_of(scope)
+            if owner is not None and owner is not source:
+                graph.add_reference(source, owner)
+        table.scope = table.root
+        for name in self.publics:
+            symbol = table.symbols.get(name)
+            if symbol is not None:
+                owner = self._owner(symbol)
+                if owner is not None:
+                    graph.add_root(owner)
+        excluded = {
+            symbol for symbol in self._procs.values() if not graph.is_live(symbol)
+        }
+        if excluded == self._excluded:
+            return False
+        self._close_gaps(excluded - self._excluded)
+        self._excluded = excluded
+        return True
+
+    def _close_gaps(self, procs: Set[Symbol]) -> None:
+        """
+        Move the labels behind newly excluded procedures down by their sizes.
+
+        The next pass skips the procedures; starting it from the addresses
+        the labels will then have usually makes it the final pass.
+        """
+        gaps = sorted(
+            (symbol.value, symbol.value + self._proc_sizes[symbol])
+            for symbol in procs
+            if symbol.is_defined and symbol in self._proc_sizes
+        )
+        segments = self.image.segments
+        # Gap ends and the total size of the gaps up to each, by segment
+        ends: Dict[int, List[int]] = {}
+        sizes: Dict[int, List[int]] = {}
+        last = -1
+        for start, end in gaps:
+            if start < last:
+                continue  # Nested in the gap of the procedure around it
+            last = end
+            for index, segment in enumerate(segments):
+                if segment.start <= start < segment.end:
+                    ends.setdefault(index, []).append(end)
+                    totals = sizes.setdefault(index, [0])
+                    totals.append(totals[-1] + end - start)
+                    break
+        if not ends:
+            return
+        for symbol in self.symbols.symbols.values():
+            if not symbol.is_defined or symbol.type is not SymbolType.LABEL:
+                continue
+            value = symbol.value
+            for index, segment_ends in ends.items():
+                segment = segments[index]
+                if segment.start <= value <= segment.end:
+                    symbol.value -= sizes[index][bisect_right(segment_ends, value)]
+                    break
+
+    def _proc_of(self, scope: Scope) -> Optional[Symbol]:
+        """The innermost procedure containing a scope, None outside any."""
+        procs = self._procs
+        while scope.parent is not None:
+            symbol = procs.get(scope.prefix)
+            if symbol is not None:
+                return symbol
+            scope = scope.parent
+        return None
+
+    def _owner(self, symbol: Symbol) -> Optional[Symbol]:
+        """The procedure a symbol belongs to (itself for a procedure)."""
+        procs = self._procs
+        name = symbol.name
+        while True:
+            owner = procs.get(name + ".")
+            if owner is not None or "." not in name:
+                return owner
+            name = name.rpartition(".")[0]
+
+    def _stale(self, reads: List[_Read]) -> bool:
+        """Check whether any read saw another value than the final one."""
+        table = self.symbols
+        for scope, name, seen in reads:
+            table.scope = scope
+            try:
+                symbol = table.lookup(name)
+            except KeyError:
+                value = None
+            else:
+                value = symbol.value if symbol.is_defined else None
+            if value != seen:
+                table.scope = table.root
+                return True
+        table.scope = table.root
+        return False
+
+    def _drop_stale_symbols(self) -> bool:
+        """Undefine seeded symbols the source did not define in this pass."""
+        defined = self._defined
+        stale = [
+            symbol
+            for name, symbol in self.symbols.symbols.items()
+            if symbol.is_defined and name not in defined
+        ]
+        for symbol in stale:
+            symbol.is_defined = False
+        return bool(stale)
+
+    def _begin_pass(self) -> None:
+        self.image.reset()
+        self.symbols.scope = self.symbols.root
+        self.symbols.root.anchor = ""
+        self.flags = 0
+        self.headers = True
+        self._defined = set()
+        self._errors = []
+        self._reads = []
+        self._patches = []
+        self.symbols.changed = set()
+        self.symbols.clear_fixups()
+        self._ended = False
+        self._scopes = []
+        self._recordings = []
+        self._recorded = []
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._macro_defined = set()
+        self._macro_body = None
+        self._macro_calls = 0
+        self.relocatable = False
+        self.relocations = []
+        self.publics = []
+        self._module = False
+        if self.references is not None:
+            self._uses = set()
+            self._skipped = 0
+            self.excluded = []
+            self.excluded_bytes = 0
+        if self.listing is not None:
+            self.listing.begin_pass()
+
+    def exports(self) -> Dict[str, Tuple[int, bool]]:
+        """
+        Get the symbols exported with .PUBLIC by the last assembly.
+
+        Returns:
+            ``(value, relocatable)`` by name; relocatable values are
+            relative to the address the module is placed at
+
+        Raises:
+            AssemblyError: If a public symbol is not defined
+        """
+        exports = {}
+        for name in self.publics:
+            symbol = self.symbols.symbols.get(name)
+            if symbol is None or not symbol.is_defined:
+                raise AssemblyError(f"Undeclared public label {name}")
+            exports[name] = (symbol.value, symbol.name in self._relocatable)
+        return exports
+
+    # Sources
+
+    def _resolve_path(self, name: str, parent: Optional[str]) -> str:
+        """Find an ICL/INS file next to its parent or on the include path."""
+        candidates = [name]
+        if parent is not None and not os.path.isabs(name):
+            candidates.insert(0, os.path.join(get_file_path(parent), name))
+        candidates += [os.path.join(path, name) for path in self.include_paths]
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return os.path.normpath(candidate)
+        raise self._error(f"Cannot open file '{name}'")
+
+    def _load(self, path: str) -> Iterable[Tuple[int, LineTokens]]:
+        """
+        Get the numbered, tokenized lines of a source file.
+
+        Files up to STREAM_THRESHOLD are tokenized once and kept for later
+        passes; larger ones are streamed from a memory map on every pass so
+        that memory use stays flat.
+        """
+        lines = self._sources.get(path)
+        if lines is not None:
+            return enumerate(lines, 1)
+        try:
+            if is_large_file(path):
+                tokenize = self._tokenize_line
+                return (
+                    (number, tokenize(line)) for number, line in self._iter_lines(path)
+                )
+            if self.source_cache is not None:
+                lines = self.source_cache.load(
+                    path, self._read_lines, self._tokenize_lines
+                )
+            else:
+                lines = self._tokenize_lines(self._read_lines(path))
+        except OSError as error:
+            raise self._error(f"Cannot open file '{path}': {error.strerror}")
+        self._sources[path] = lines
+        return enumerate(lines, 1)
+
+    def _process_file(self, path: str) -> None:
+        saved = self._location
+        listing = self.listing
+        if listing is not None:
+            self._listed += 1
+            listing.source(path)
+        for number, tokens in self._load(path):
+            if self._ended:
+                break
+            self._location = (path, number)
+            try:
+                if listing is None:
+                    self._process_line(tokens)
+                else:
+                    self._list_line(number, tokens)
+            except AssemblyError:
+                raise
+            except (KeyError, ValueError) as error:
+                message = error.args[0] if error.args else str(error)
+                raise self._error(str(message)) from error
+        self._location = saved
+        if listing is not None and saved[0] is not None:
+            self._listed += 1
+            listing.source(saved[0])
+
+    def _list_line(self, number: int, tokens: LineTokens) -> None:
+        """Process a line and write it to the listing with its bytes."""
+        image = self.image
+        start = image.pc
+        patches = len(self._patches)
+        listed = self._listed
+        self._process_line(tokens)
+        end = min(image.pc, start + LISTED_BYTES)
+        segments = image.segments
+        data = None
+        if (
+            end > start
+            and listed == self._listed  # Not an ICL line
+            and segments
+            and segments[-1].start <= start
+            and end <= segments[-1].end
+        ):
+            data = image.memory[start:end]
+        address = start if data is not None or tokens.label is not None else None
+        located = len(self._patches) > patches and data is not None
+        offset = self.listing.line(number, address, data, tokens.line, located)
+        if located:
+            for patch in self._patches[patches:]:
+                patch.listing = (offset, start, end)
+
+    # Diagnostics
+
+    def _error(self, message: str) -> AssemblyError:
+        return AssemblyError(message, *self._location)
+
+    def _defer(self, message: str) -> None:
+        """Record an error that only counts if it persists in the last pass."""
+        self._errors.append(self._error(message))
+
+    # Symbols and values
+
+    def _define(
+        self, name: str, value: int, symbol_type: SymbolType = SymbolType.LABEL
+    ) -> None:
+        """Define a label; ``name`` is already in upper case."""
+        table = self.symbols
+        scope = table.scope
+        if name[:1] != "?":
+            scope.anchor = name  # The '?' labels after it are local to it
+        key = scope.key(name)
+        qualified = scope.prefix + key
+        if qualified in self._defined:
+            raise self._error(f"Label {name} declared twice")
+        self._defined.add(qualified)
+        if self.relocatable and symbol_type is SymbolType.LABEL:
+            self._relocatable.add(qualified)
+        if self._recordings:
+            self._record_export(name, qualified, value, symbol_type)
+        symbol = scope.symbols.get(key)
+        if symbol is None:
+            symbol = table.add_symbol(key, value, symbol_type)
+        elif symbol.is_defined and symbol.value == value:
+            return
+        table.define_symbol(symbol.name, value)
+
+    def _value(self, text: str) -> Optional[int]:
+        """Evaluate an expression, or return None if it is not resolved yet."""
+        compiled = self.expressions.compile(text)
+        if compiled.constant is not None:
+            return compiled.constant
+        if self._recordings:
+            self._record_imports(compiled.names)
+        table = self.symbols
+        defined = self._defined
+        uses = self._uses
+        key = table.scope.key
+        for name in map(key, compiled.names):
+            if uses is not None:
+                uses.add((table.scope, name))
+            try:
+                symbol = table.lookup(name)
+            except KeyError:
+                self._reads.append((table.scope, name, None))
+                continue
+            if symbol.name not in defined:
+                seen = symbol.value if symbol.is_defined else None
+                self._reads.append((table.scope, name, seen))
+        try:
+            return compiled(table, self.image.pc)
+        except KeyError as error:
+            self._defer(f"Undeclared label {error.args[0]}")
+            return None
+
+    def _required_value(self, text: str) -> int:
+        """Evaluate an expression that must be known in the current pass."""
+        value = self._value(text)
+        if value is None:
+            raise self._errors.pop()
+        return value
+
+    # Incremental cache
+
+    def _scope_path(self, depth: int) -> Tuple[str, ...]:
+        """Names of the current scope and its parents below ``depth``."""
+        path = []
+        scope = self.symbols.scope
+        while scope.depth > depth:
+            path.append(scope.name)
+            scope = scope.parent
+        return tuple(reversed(path))
+
+    def _record_export(
+        self, name: str, qualified: str, value: int, symbol_type: SymbolType
+    ) -> None:
+        for recording in self._recordings:
+            recording.defined.add(qualified)
+            recording.entry.exports.append(
+                (self._scope_path(recording.depth), name, value, symbol_type.value)
+            )
+
+    def _record_imports(self, names: Sequence[str]) -> None:
+        for name in names:
+            try:
+                symbol = self.symbols.lookup(name)
+            except KeyError:
+                # Not declared yet; the pass will not be the final one.
+                continue
+            value = symbol.value if symbol.is_defined else None
+            for recording in self._recordings:
+                recording.entry.imports.setdefault(symbol.name, value)
+
+    def _uncacheable(self) -> None:
+        """Mark the files being recorded as changing assembler state."""
+        for recording in self._recordings:
+            recording.entry.cacheable = False
+
+    def _include(self, path: str) -> None:
+        cache = self.cache
+        if cache is None:
+            self._process_file(path)
+            return
+        scope = self.symbols.scope
+        key = cache.site_key(
+            path, self.image.pc, scope.prefix + scope.anchor, self.cpu.value, self.flags
+        )
+        entry = cache.lookup(key, self.symbols)
+        if entry is not None:
+            self._cache_hits += 1
+            self._replay(entry)
+            return
+        self._cache_misses += 1
+        from pymads.assembler.incremental import CacheEntry
+
+        recording = _Recording(key, CacheEntry(), scope.depth, self.image)
+        recording.entry.files[os.path.abspath(path)] = cache.file_hash(path)
+        self._recordings.append(recording)
+        try:
+            self._process_file(path)
+        finally:
+            self._recordings.pop()
+        recording.finish(self.image)
+        if self.symbols.scope is not scope or self._ended:
+            recording.entry.cacheable = False
+        for outer in self._recordings:
+            outer.entry.files.update(recording.entry.files)
+            outer.entry.cacheable &= recording.entry.cacheable
+        if recording.entry.cacheable:
+            self._recorded.append(recording)
+
+    def _replay(self, entry: "CacheEntry") -> None:
+        """Apply a cached file's symbols and bytes instead of assembling it."""
+        for recording in self._recordings:
+            recording.entry.files.update(entry.files)
+            for name, value in entry.imports.items():
+                recording.entry.imports.setdefault(name, value)
+        table = self.symbols
+        if self._uses is not None:
+            # Which procedure of the file read a symbol is not recorded;
+            # count every read as one from code that is kept.
+            self._uses.update((table.root, name) for name in entry.imports)
+        site = table.scope
+        for path, name, value, symbol_type in entry.exports:
+            for scope_name in path:
+                table.enter_scope(scope_name)
+            self._define(name, value, SymbolType(symbol_type))
+            table.scope = site
+        image = self.image
+        for start, data in entry.ranges:
+            image.org(start)
+            image.write(data)
+        image.org(entry.exit_pc)
+
+    # Lines
+
+    def _process_line(self, tokens: LineTokens) -> None:
+        label = tokens.name
+        mnemonic = tokens.keyword
+        operand = tokens.argument
+        if self._macro_body is not None:
+            if mnemonic in _END_MACRO:
+                self._end_macro(label)
+            else:
+                self._macro_body[2].append(tokens.line)
+            return
+        if self._skipped:
+            if mnemonic == ".PROC":
+                self._skipped += 1
+            elif mnemonic == ".ENDP":
+                self._skipped -= 1
+            return
+        if not mnemonic:
+            if label:
+                self._define(label, self.image.pc)
+            return
+        if mnemonic in ("=", "EQU"):
+            if not label:
+                raise self._error("Label name required")
+            value = self._value(operand)
+            if value is not None:
+                self._define(label, value, SymbolType.CONSTANT)
+                if self._module:
+                    self._relocatable_constant(label, operand)
+            return
+        directive = _DIRECTIVES.get(mnemonic)
+        if directive is not None:
+            directive(self, operand, label)
+            return
+        if label:
+            self._define(label, self.image.pc)
+        if mnemonic in self._macro_defined:
+            self._expand_macro(mnemonic, operand)
+            return
+        self._instruction(mnemonic, operand)
+
+    # Macros
+
+    def _dir_macro(self, operand: str, label: str) -> None:
+        words = operand.replace(",", " ").split()
+        if not label:
+            if not words:
+                raise self._error("Missing macro name")
+            label = words.pop(0)
+        if label in self._macro_defined:
+            raise self._error(f"Macro {label} declared twice")
+        self._uncacheable()
+        self._macro_body = (label, words, [])
+
+    def _end_macro(self, label: str) -> None:
+        assert self._macro_body is not None
+        name, parameters, lines = self._macro_body
+        if label:
+            lines.append(label)
+        self._macro_body = None
+        self.macros.define(name, parameters, lines)
+        self._macro_defined.add(name)
+
+    def _dir_endm(self, operand: str, label: str) -> None:
+        raise self._error(".ENDM without .MACRO")
+
+    def _expand_macro(self, name: str, operand: str) -> None:
+        macro = self.macros.get(name)
+        assert macro is not None
+        if self._macro_depth >= MAX_MACRO_DEPTH:
+            raise self._error(f"Macro {name} nested too deeply")
+        self._uncacheable()
+        lines = macro.expand(split_arguments(operand))
+        # Labels in a macro are local to each invocation.
+        self._macro_calls += 1
+        table = self.symbols
+        scope = table.scope
+        table.enter_scope(f"{name}?{self._macro_calls}").anchor = ""
+        self._macro_depth += 1
+        try:
+            for tokens in lines:
+                if self._ended:
+                    break
+                self._process_line(tokens)
+        finally:
+            self._macro_depth -= 1
+            table.scope = scope
+
+    def _instruction(self, mnemonic: str, operand: str) -> None:
+        base, _, suffix = mnemonic.partition(".")
+        if base not in self._mnemonics or (suffix and suffix not in SIZE_SUFFIXES):
+            raise self._error(f"Illegal instruction '{mnemonic}'")
+        size = SIZE_SUFFIXES[suffix] if suffix else 0
+        table = self._opcodes
+        flags = self.flags if self.cpu is Cpu.WDC65816 else 0
+        pc = self.image.pc
+
+        reads = len(self._reads)
+        errors = len(self._errors)
+        expression = ""
+        relocation = None
+        if (base, Mode.BLOCK, flags) in table:
+            banks = [self._value(arg) for arg in split_arguments(operand)]
+            if len(banks) != 2:
+                raise self._error("Illegal addressing mode")
+            mode = Mode.BLOCK
+            value: Optional[int] = ((banks[0] or 0) & 0xFF) << 8 | (
+                (banks[1] or 0) & 0xFF
+            )
+        else:
+            syntax, expression = parse_operand(operand)
+            value = self._value(expression) if expression else 0
+            if self._module and expression:
+                relocation = self._relocation(expression)
+                # Module addresses are not known yet; never assume zero page.
+                probe = None if relocation is not None else value
+                mode = select_mode(table, base, syntax, probe, flags, size)
+            else:
+                mode = select_mode(table, base, syntax, value, flags, size)
+
+        if value is None:
+            value = pc if mode is Mode.REL or mode is Mode.RELL else 0
+        try:
+            code = encode(table, base, mode, value, pc, flags)
+        except ValueError as error:
+            self._defer(str(error))
+            code = bytes(1 + table[(base, mode, flags)][1])
+        address = self.image.write(code)
+        if relocation is not None:
+            if mode is not Mode.REL and mode is not Mode.RELL:
+                self._relocate(address + 1, len(code) - 1, relocation)
+            elif relocation[1] is not None:
+                raise self._error("Branch to an external symbol")
+
+        if (
+            len(self._reads) == reads
+            or mode is Mode.BLOCK
+            or self._recordings
+            or self._module
+        ):
+            return
+        # A forward reference: if no value could change the operand size,
+        # the site can be re-encoded in place once the symbols are known.
+        for probe in (0, 0xFFFFFF):
+            if select_mode(table, base, syntax, probe, flags, size) is not mode:
+                return
+        self._add_patch(
+            reads,
+            errors,
+            address,
+            expression,
+            pc,
+            lambda value: encode(table, base, mode, value, pc, flags),
+        )
+
+    def _add_patch(
+        self,
+        reads: int,
+        errors: int,
+        address: int,
+        expression: str,
+        pc: int,
+        encode: Callable[[int], bytes],
+    ) -> None:
+        """Register a site with the symbol table in place of its reads."""
+        compiled = self.expressions.compile(expression)
+        symbols = self.symbols
+        patch = _Patch(
+            self.image.memory,
+            address,
+            symbols.scope,
+            self._location,
+            self._errors[errors:],
+            compiled,
+            pc,
+            encode,
+        )
+        symbols.add_fixup(patch, compiled.names, deferred=True)
+        self._patches.append(patch)
+        del self._reads[reads:]
+
+    # Data
+
+    def _string_bytes(self, text: str) -> Optional[bytes]:
+        """Convert a (c/d-prefixed, optionally inverse *) string literal."""
+        match = _STRING.match(text)
+        if match is None:
+            return None
+        prefix, quote, body, inverse = match.groups()
+        data = body.replace(quote * 2, quote).encode("latin-1")
+        if prefix in ("d", "D"):
+            data = bytes(ata2int(byte) for byte in data)
+        if inverse:
+            data = bytes(byte ^ 0x80 for byte in data)
+        return data
+
+    def _emit_values(self, arguments: List[str], width: int, shift: int = 0) -> None:
+        image = self.image
+        compile = self.expressions.compile
+        mask = (1 << (width << 3)) - 1
+        run = bytearray()  # Constant values not written yet
+        for argument in arguments:
+            constant = compile(argument).constant
+            if constant is not None:
+                value = constant >> shift
+                message = _range_error(value, width, shift)
+                if message is not None:
+                    self._defer(message)
+                run += (value & mask).to_bytes(width, "little")
+                continue
+            if run:
+                image.write(run)
+                run.clear()
+            reads = len(self._reads)
+            errors = len(self._errors)
+            pc = image.pc
+            value = self._value(argument)
+            relocation = self._relocation(argument) if self._module else None
+            if value is None:
+                value = 0
+            value >>= shift
+            message = _range_error(value, width, shift)
+            if message is not None:
+                self._defer(message)
+            if width == 1:
+                address = image.put_byte(value)
+            else:
+                address = image.save_word(value)
+            if relocation is not None:
+                self._relocate(address, width, relocation)
+            elif len(self._reads) > reads and not (self._recordings or self._module):
+                self._add_patch(
+                    reads,
+                    errors,
+                    address,
+                    argument,
+                    pc,
+                    self._data_encoder(width, shift),
+                )
+        if run:
+            image.write(run)
+
+    @staticmethod
+    def _data_encoder(width: int, shift: int) -> Callable[[int], bytes]:
+        def encode(value: int) -> bytes:
+            value >>= shift
+            message = _range_error(value, width, shift)
+            if message is not None:
+                raise ValueError(message)
+            return (value & ((1 << (width << 3)) - 1)).to_bytes(width, "little")
+
+        return encode
+
+    def _data(self, operand: str, width: int) -> None:
+        values: List[str] = []  # Plain values, emitted together
+        for argument in split_arguments(operand):
+            data = self._string_bytes(argument)
+            if data is not None and (len(data) != 1 or argument[0] in "cCdD"):
+                self._emit_values(values, width)
+                values = []
+                self.image.write(data)
+                continue
+            typed = _TYPED_LIST.match(argument) if width == 1 else None
+            if typed is not None:
+                self._emit_values(values, width)
+                values = []
+                kind = typed.group(1)
+                arguments = split_arguments(typed.group(2))
+                if kind == "A":
+                    self._emit_values(arguments, 2)
+                elif kind == "B":
+                    self._emit_values(arguments, 1)
+                else:
+                    self._emit_values(
+                        [f"{'<' if kind == 'L' else '>'}({a})" for a in arguments],
+                        1,
+                    )
+                continue
+            values.append(argument)
+        self._emit_values(values, width)
+
+    # Modules
+
+    def _relocation(self, text: str) -> Optional[Tuple[str, Optional[str], int]]:
+        """
+        Classify an expression of a module by what its value depends on.
+
+        The expression is evaluated again with the module's addresses, then
+        with the external symbols, moved by _RELOCATION_SHIFT. A value that
+        moves along with exactly one of them needs relocating.
+
+        Returns:
+            ``(kind, external symbol or None, addend)``, or None if the value
+            is absolute or not known yet
+        """
+        kind = WORD
+        inner = text
+        if text[:1] in ("<", ">"):
+            kind = LOW if text[0] == "<" else HIGH
+            inner = text[1:]
+        compiled = self.expressions.compile(inner)
+        if compiled.constant is not None:
+            return None
+        table = self.symbols
+        internal = []
+        external = []
+        for name in compiled.names:
+            try:
+                symbol = table.lookup(name)
+            except KeyError:
+                return None
+            if symbol.name in self._externals:
+                external.append(symbol)
+            elif symbol.name in self._relocatable:
+                internal.append(symbol)
+        pc = self.image.pc
+        moved_pc = pc + _RELOCATION_SHIFT if self.relocatable else pc
+        try:
+            value = compiled(table, pc)
+            by_external = self._shifted(compiled, external, pc) - value
+            by_module = self._shifted(compiled, internal, moved_pc) - value
+            if kind != WORD:
+                byte = value >> 8 if kind == HIGH else value
+                if self.expressions.compile(text)(table, pc) != byte & 0xFF:
+                    by_module = by_external = -1  # '<a+1' is (<a)+1
+        except KeyError:
+            return None
+        if by_external == 0 and by_module == 0:
+            return None
+        if by_module == 0 and by_external == _RELOCATION_SHIFT:
+            names = {self._externals[symbol.name] for symbol in external}
+            if len(names) == 1:
+                return kind, names.pop(), value
+        if by_external == 0 and by_module == _RELOCATION_SHIFT:
+            return kind, None, value
+        raise self._error(f"Illegal relocatable expression '{text}'")
+
+    def _shifted(
+        self, compiled: CompiledExpression, symbols: List[Symbol], pc: int
+    ) -> int:
+        for symbol in symbols:
+            symbol.value += _RELOCATION_SHIFT
+        try:
+            return compiled(self.symbols, pc)
+        finally:
+            for symbol in symbols:
+                symbol.value -= _RELOCATION_SHIFT
+
+    def _relocate(
+        self, address: int, length: int, relocation: Tuple[str, Optional[str], int]
+    ) -> None:
+        kind, symbol, addend = relocation
+        if SIZES[kind] != length:
+            raise self._error(f"Relocatable value does not fit in {length} bytes")
+        self.relocations.append(Relocation(address, kind, symbol, addend))
+
+    def _relocatable_constant(self, label: str, operand: str) -> None:
+        """Let an equate of a module address move with the module."""
+        relocation = self._relocation(operand)
+        if relocation is None:
+            return
+        if relocation[1] is not None or relocation[0] != WORD:
+            raise self._error(f"Illegal relocatable expression '{operand}'")
+        self._relocatable.add(self.symbols.scope.prefix + label)
+
+    def _dir_reloc(self, operand: str, label: str) -> None:
+        if self.image.segments or self.relocatable:
+            raise self._error(".RELOC must come before any code")
+        self._uncacheable()
+        self.relocatable = True
+        self._module = True
+        self.image.org(0)
+        if label:
+            self._define(label, 0)
+
+    def _dir_extrn(self, operand: str, label: str) -> None:
+        self._uncacheable()
+        self._module = True
+        for name in operand.replace(",", " ").split():
+            if name.startswith("."):
+                continue  # Type (.BYTE, .WORD, .PROC); all are addresses here
+            self._define(name, 0, SymbolType.CONSTANT)
+            self._externals[self.symbols.scope.prefix + name] = name
+
+    def _dir_public(self, operand: str, label: str) -> None:
+        self._module = True
+        self.publics += operand.replace(",", " ").split()
+
+    # Directives
+
+    def _dir_org(self, operand: str, label: str) -> None:
+        if self.relocatable:
+            raise self._error("ORG inside a .RELOC module")
+        self.image.org(self._required_value(operand))
+        if label:
+            self._define(label, self.image.pc)
+
+    def _dir_byte(self, operand: str, label: str) -> None:
+        if label:
+            self._define(label, self.image.pc)
+        self._data(operand, 1)
+
+    def _dir_word(self, operand: str, label: str) -> None:
+        if label:
+            self._define(label, self.image.pc)
+        self._data(operand, 2)
+
+    def _dir_ds(self, operand: str, label: str) -> None:
+        if label:
+            self._define(label, self.image.pc)
+        self.image.org(self.image.pc + self._required_value(operand))
+
+    def _dir_align(self, operand: str, label: str) -> None:
+        arguments = split_arguments(operand) or ["$100"]
+        boundary = self._required_value(arguments[0])
+        if boundary <= 0:
+            raise self._error("Alignment must be positive")
+        pc = self.image.pc
+        padding = -pc % boundary
+        if len(arguments) > 1:
+            self.image.save_nul(padding, self._required_value(arguments[1]))
+        else:
+            self.image.org(pc + padding)
+        if label:
+            self._define(label, self.image.pc)
+
+    def _file_argument(self, operand: str) -> Tuple[str, List[str]]:
+        arguments = split_arguments(operand)
+        data = self._string_bytes(arguments[0]) if arguments else None
+        if data is None:
+            raise self._error("String expected")
+        return self._resolve_path(data.decode("latin-1"), self._location[0]), arguments[
+            1:
+        ]
+
+    def _dir_icl(self, operand: str, label: str) -> None:
+        if label:
+            self._define(label, self.image.pc)
+        path, _ = self._file_argument(operand)
+        self._include(path)
+
+    def _dir_ins(self, operand: str, label: str) -> None:
+        if label:
+            self._define(label, self.image.pc)
+        path, arguments = self._file_argument(operand)
+        if self.cache is not None:
+            for recording in self._recordings:
+                recording.entry.files[os.path.abspath(path)] = self.cache.file_hash(
+                    path
+                )
+        offset = self._required_value(arguments[0]) if arguments else 0
+        length = self._required_value(arguments[1]) if len(arguments) > 1 else -1
+        with map_binary(path) as data:
+            if offset < 0:
+                offset += len(data)
+            end = len(data) if length < 0 else offset + length
+            if not 0 <= offset <= end <= len(data):
+                raise self._error(f"Range out of file '{path}'")
+            with data[offset:end] as chunk:
+                self.image.write(chunk)
+
+    def _vector(self, address: int, operand: str, label: str) -> None:
+        if self.relocatable:
+            raise self._error("RUN/INI inside a .RELOC module")
+        if label:
+            self._define(label, self.image.pc)
+        value = self._value(operand)
+        pc = self.image.pc
+        self.image.org(address)
+        self.image.save_word(value or 0)
+        self.image.org(pc)
+        if self._module:
+            relocation = self._relocation(operand)
+            if relocation is not None:
+                self._relocate(address, 2, relocation)
+
+    def _dir_run(self, operand: str, label: str) -> None:
+        self._vector(RUNAD, operand, label)
+
+    def _dir_ini(self, operand: str, label: str) -> None:
+        self._vector(INITAD, operand, label)
+
+    def _dir_opt(self, operand: str, label: str) -> None:
+        self._uncacheable()
+        for switch, state in re.findall(r"([A-Za-z])([+-])", operand):
+            if switch == "H":
+                self.headers = state == "+"
+
+    def _dir_end(self, operand: str, label: str) -> None:
+        if label:
+            self._define(label, self.image.pc)
+        self._ended = True
+        self._uncacheable()
+
+    def _open_scope(self, kind: str, operand: str, label: str) -> None:
+        name = (label or operand).strip()
+        if not name:
+            raise self._error(f"Missing .{kind} name")
+        table = self.symbols
+        parent = table.scope
+        if kind == "PROC":
+            if self._excluded and parent.symbols.get(name) in self._excluded:
+                self._skip_proc(parent, name)
+                return
+            self._define(name, self.image.pc)
+        scope = table.enter_scope(name)
+        scope.anchor = ""
+        self._scopes.append(kind)
+        if kind == "PROC" and self.references is not None:
+            if scope.prefix not in self._procs:
+                symbol = parent.symbols[name]
+                self._procs[scope.prefix] = symbol
+                # Keeping a nested procedure keeps the one around it
+                outer = self._proc_of(parent)
+                if outer is not None:
+                    self.references.add_reference(symbol, outer)
+
+    def _skip_proc(self, parent: Scope, name: str) -> None:
+        """Skip an unreferenced procedure, leaving its symbols undefined."""
+        symbol = parent.symbols[name]
+        symbol.is_defined = False
+        scopes = [parent.children[name]]
+        while scopes:
+            scope = scopes.pop()
+            for inner in scope.symbols.values():
+                inner.is_defined = False
+            scopes.extend(scope.children.values())
+        self._skipped = 1
+        self.excluded.append(symbol.name)
+        self.excluded_bytes += self._proc_sizes.get(symbol, 0)
+        self._uncacheable()
+
+    def _close_scope(self, kind: str, label: str) -> None:
+        if label:
+            self._define(label, self.image.pc)
+        if not self._scopes or self._scopes[-1] != kind:
+            raise self._error(f"Unexpected .END{kind[0]}")
+        self._scopes.pop()
+        table = self.symbols
+        if kind == "PROC" and self.references is not None:
+            symbol = self._procs[table.scope.prefix]
+            self._proc_sizes[symbol] = max(0, self.image.pc - symbol.value)
+        table.exit_scope()
+
+    def _dir_proc(self, operand: str, label: str) -> None:
+        self._open_scope("PROC", operand, label)
+
+    def _dir_endp(self, operand: str, label: str) -> None:
+        self._close_scope("PROC", label)
+
+    def _dir_local(self, operand: str, label: str) -> None:
+        self._open_scope("LOCAL", operand, label)
+
+    def _dir_endl(self, operand: str, label: str) -> None:
+        self._close_scope("LOCAL", label)
+
+    def _register_width(self, flags: int, wide: bool) -> None:
+        if self.cpu is not Cpu.WDC65816:
+            raise self._error("Register widths require the 65816")
+        self._uncacheable()
+        self.flags = self.flags | flags if wide else self.flags & ~flags
+
+    def _dir_a8(self, operand: str, label: str) -> None:
+        self._register_width(M16, False)
+
+    def _dir_a16(self, operand: str, label: str) -> None:
+        self._register_width(M16, True)
+
+    def _dir_i8(self, operand: str, label: str) -> None:
+        self._register_width(X16, False)
+
+    def _dir_i16(self, operand: str, label: str) -> None:
+        self._register_width(X16, True)
+
+    def _dir_ai8(self, operand: str, label: str) -> None:
+        self._register_width(M16 | X16, False)
+
+    def _dir_ai16(self, operand: str, label: str) -> None:
+        self._register_width(M16 | X16, True)
+
+
+# Shared by every assembler in the process, so it is read-only.
+_DIRECTIVES: Mapping[str, Callable[[Assembler, str, str], None]] = MappingProxyType(
+    {
+        "ORG": Assembler._dir_org,
+        ".BYTE": Assembler._dir_byte,
+        ".BY": Assembler._dir_byte,
+        "DTA": Assembler._dir_byte,
+        ".WORD": Assembler._dir_word,
+        ".WO": Assembler._dir_word,
+        ".DS": Assembler._dir_ds,
+        ".ALIGN": Assembler._dir_align,
+        "ICL": Assembler._dir_icl,
+        "INS": Assembler._dir_ins,
+        "RUN": Assembler._dir_run,
+        "INI": Assembler._dir_ini,
+        "OPT": Assembler._dir_opt,
+        "END": Assembler._dir_end,
+        ".EN": Assembler._dir_end,
+        ".PROC": Assembler._dir_proc,
+        ".ENDP": Assembler._dir_endp,
+        ".LOCAL": Assembler._dir_local,
+        ".ENDL": Assembler._dir_endl,
+        ".A8": Assembler._dir_a8,
+        ".A16": Assembler._dir_a16,
+        ".I8": Assembler._dir_i8,
+        ".I16": Assembler._dir_i16,
+        ".AI8": Assembler._dir_ai8,
+        ".AI16": Assembler._dir_ai16,
+        ".RELOC": Assembler._dir_reloc,
+        ".EXTRN": Assembler._dir_extrn,
+        ".PUBLIC": Assembler._dir_public,
+        ".GLOBAL": Assembler._dir_public,
+        ".MACRO": Assembler._dir_macro,
+        ".ENDM": Assembler._dir_endm,
+        ".MEND": Assembler._dir_endm,
+    }
+)
+
+_END_MACRO = frozenset({".ENDM", ".MEND"})
+
+
+def _range_error(value: int, width: int, shift: int) -> Optional[str]:
+    """Check a DTA value against its width; returns the error message."""
+    if width == 1:
+        if shift == 0 and not -128 <= value <= 255:
+            return f"Value out of range: {value}"
+    elif not -32768 <= value <= 0xFFFF:
+        return f"Value out of range: {value}"
+    return None
+
+
+class AssemblyOptions(NamedTuple):
+    """
+    Options of a library-level assembly.
+
+    Attributes:
+        cpu: Target processor
+        include_paths: Extra directories searched by ICL and INS
+        incremental: Whether to use the incremental cache
+        cache_dir: Incremental cache directory (None for the default)
+        token_cache: Whether to keep tokenized sources in ``cache_dir/tokens``
+            between runs (ignored when a SourceCache is passed in)
+        listing: Listing (.lst) file to write, or None
+        labels: Label (.lab) file to write, or None
+        exclude_unreferenced: Whether to leave out .PROC blocks no kept code
+            references (MADS -x)
+    """
+
+    cpu: Cpu = Cpu.MOS6502
+    include_paths: Tuple[str, ...] = ()
+    incremental: bool = False
+    cache_dir: Optional[str] = None
+    token_cache: bool = False
+    listing: Optional[str] = None
+    labels: Optional[str] = None
+    exclude_unreferenced: bool = False
+
+
+class AssemblyResult(NamedTuple):
+    """
+    Outcome of a library-level assembly.
+
+    Attributes:
+        binary: Output file content
+        passes: Number of passes run
+        symbols: Final symbol table
+        cache_hits: Includes replayed from the incremental cache
+        cache_misses: Includes that had to be assembled
+        changes: Number of symbols whose value changed in each pass
+        patched: Sites re-encoded in place instead of running another pass
+        excluded: Unreferenced procedures left out
+        excluded_bytes: Bytes those procedures would have taken
+        exclude_time: Seconds spent on the reference graph
+    """
+
+    binary: bytes
+    passes: int
+    symbols: SymbolTable
+    cache_hits: int = 0
+    cache_misses: int = 0
+    changes: Tuple[int, ...] = ()
+    patched: int = 0
+    excluded: Tuple[str, ...] = ()
+    excluded_bytes: int = 0
+    exclude_time: float = 0.0
+
+
+def _incremental_cache(options: AssemblyOptions) -> "IncrementalCache":
+    """Create the incremental cache of the options' cache directory."""
+    from pymads.assembler.incremental import DEFAULT_CACHE_DIR, IncrementalCache
+
+    return IncrementalCache(options.cache_dir or DEFAULT_CACHE_DIR)
+
+
+def _source_cache(options: AssemblyOptions) -> SourceCache:
+    """Create the source cache the options ask for."""
+    if not options.token_cache:
+        return SourceCache()
+    from pymads.assembler.incremental import DEFAULT_CACHE_DIR
+
+    directory = options.cache_dir or DEFAULT_CACHE_DIR
+    return SourceCache(os.path.join(directory, "tokens"))
+
+
+def assemble(
+    source: str,
+    options: Optional[AssemblyOptions] = None,
+    sources: Optional[SourceCache] = None,
+    symbols: Optional[SymbolTable] = None,
+    profiler: Optional["Profiler"] = None,
+    content: Optional[bytes] = None,
+    macros: Optional[MacroTable] = None,
+    expressions: Optional[ExpressionCache] = None,
+    cache: Optional["IncrementalCache"] = None,
+    image: Optional[OutputImage] = None,
+    diagnostics: Optional[List[AssemblyError]] = None,
+) -> AssemblyResult:
+    """
+    Assemble a source file in-process.
+
+    Opcode tables and operand syntax stay warm between calls, which makes
+    repeated calls much cheaper than starting the CLI. Anything else an
+    assembly builds up (compiled expressions, the incremental cache, the
+    output image) is private to the call unless passed in; an
+    AssemblySession keeps it for the next call.
+
+    Args:
+        source: Source file path
+        options: Assembly options (defaults if None)
+        sources: Tokenized source cache kept between calls
+        symbols: Symbol table of an earlier assembly of the same source,
+            reused to start from its values
+        profiler: Profiler to record the assembly with; it is finished
+            once the output has been built or the assembly failed
+        content: Content of the source file if it has already been read
+        macros: Macro table of an earlier assembly of the same source
+        expressions: Expression cache to compile operands with (must fold
+            case)
+        cache: Incremental cache to use when ``options.incremental`` is set;
+            one in ``options.cache_dir`` is created if None
+        image: Output image to assemble into, for the CPU of ``options``
+        diagnostics: List the errors of a failed assembly are added to; an
+            assembly that fails in its final pass reports all of them
+
+    Returns:
+        The assembly result
+
+    Raises:
+        AssemblyError: If the source contains errors
+        OSError: If the listing or label file cannot be written
+    """
+    options = options or AssemblyOptions()
+    if not options.incremental:
+        cache = None
+    elif cache is None:
+        cache = _incremental_cache(options)
+    if cache is not None:
+        cache.begin()
+    if options.token_cache and sources is None:
+        sources = _source_cache(options)
+    listing = ListingWriter(options.listing) if options.listing else None
+    assembler = Assembler(
+        options.cpu,
+        options.include_paths,
+        cache,
+        expressions,
+        sources,
+        symbols,
+        profiler,
+        listing,
+        options.exclude_unreferenced,
+        macros,
+        image,
+    )
+    try:
+        try:
+            if content is not None:
+                image = assembler.assemble_content(source, content)
+            else:
+                image = assembler.assemble_file(source)
+        finally:
+            if listing is not None:
+                listing.close()
+        stream = io.BytesIO()
+        try:
+            image.flush(stream, assembler.headers)
+        except ValueError as error:
+            raise AssemblyError(str(error), source) from error
+        if options.labels:
+            with open(options.labels, "wb") as labels:
+                write_labels(assembler.symbols, labels)
+    except AssemblyError as error:
+        if diagnostics is not None:
+            diagnostics.extend(assembler.errors or [error])
+        raise
+    finally:
+        if profiler is not None:
+            profiler.finish(assembler)
+    return AssemblyResult(
+        stream.getvalue(),
+        assembler.passes,
+        assembler.symbols,
+        cache.hits if cache is not None else 0,
+        cache.misses if cache is not None else 0,
+        tuple(assembler.changes),
+        assembler.patched,
+        tuple(assembler.excluded),
+        assembler.excluded_bytes,
+        assembler.exclude_time,
+    )
+
+
+class AssemblySession:
+    """
+    Repeated assemblies with one set of options.
+
+    A session owns all state an assembly leaves behind: the tokenized
+    sources, the compiled expressions and scanned literals, the incremental
+    cache, the output image, the symbol table of each source (which seeds
+    its next assembly), its compiled macros and the diagnostics and result
+    of the last call. Only the opcode and directive tables are shared, and
+    they are read-only, so separate sessions can assemble at the same time
+    in threads of one process. One session serves one call at a time.
+
+    Attributes:
+        options: Options of every assembly in the session
+        sources: Tokenized source cache
+        expressions: Compiled expression cache, with its literal memo
+        cache: Incremental cache if ``options.incremental`` is set, else None
+        image: Output image every assembly of the session writes into
+        symbols: Final symbol table of each source, by absolute path
+        macros: Macro table of each source, by absolute path
+        diagnostics: Errors of the last assembly; all errors of its final
+            pass if it failed there
+        result: Result of the last assembly, or None if it failed
+    """
+
+    def __init__(
+        self,
+        options: Optional[AssemblyOptions] = None,
+        sources: Optional[SourceCache] = None,
+    ):
+        """
+        Initialize a new session.
+
+        Args:
+            options: Assembly options (defaults if None)
+            sources: Tokenized source cache to share with other sessions;
+                one following ``options.token_cache`` is created if None
+        """
+        self.options = options or AssemblyOptions()
+        self.sources = sources if sources is not None else _source_cache(self.options)
+        self.expressions = ExpressionCache(fold_case=True)
+        self.cache = (
+            _incremental_cache(self.options) if self.options.incremental else None
+        )
+        self.image = OutputImage(
+            MEMORY_65816 if self.options.cpu is Cpu.WDC65816 else MEMORY_6502
+        )
+        self.symbols: Dict[str, SymbolTable] = {}
+        self.macros: Dict[str, MacroTable] = {}
+        self.diagnostics: List[AssemblyError] = []
+        self.result: Optional[AssemblyResult] = None
+
+    def assemble(
+        self, source: str, profiler: Optional["Profiler"] = None
+    ) -> AssemblyResult:
+        """
+        Assemble a source file, starting from its last symbol values.
+
+        Args:
+            source: Source file path
+            profiler: Profiler to record the assembly with
+
+        Returns:
+            The assembly result
+
+        Raises:
+            AssemblyError: If the source contains errors
+            OSError: If the listing or label file cannot be written
+        """
+        key = os.path.abspath(source)
+        self.diagnostics = []
+        self.result = None
+        macros = self.macros.get(key)
+        if macros is None:
+            macros = self.macros[key] = MacroTable()
+        try:
+            result = assemble(
+                source,
+                self.options,
+                self.sources,
+                self.symbols.get(key),
+                profiler,
+                macros=macros,
+                expressions=self.expressions,
+                cache=self.cache,
+                image=self.image,
+                diagnostics=self.diagnostics,
+            )
+        except AssemblyError:
+            # The table may be half updated; the next call starts afresh.
+            self.symbols.pop(key, None)
+            raise
+        self.symbols[key] = result.symbols
+        self.result = result
+        return result
+
+    def forget(self, source: str) -> None:
+        """
+        Forget the symbol table and macros kept for one source.
+
+        Args:
+            source: Source file path
+        """
+        key = os.path.abspath(source)
+        self.symbols.pop(key, None)
+        self.macros.pop(key, None)
+
+    def reset(self) -> None:
+        """Forget the symbol tables, macros, sources and expressions of the session."""
+        self.symbols.clear()
+        self.macros.clear()
+        self.sources.clear()
+        self.expressions.clear()
+        self.diagnostics = []
+        self.result = None
@@ -0,0 +1,241 @@
+"""
+On-disk cache for incremental assembly.
+
+An included file is assembled to the same bytes and symbols whenever its
+content, the content of everything it includes, the place it is included at
+and the values of the symbols it uses from outside are unchanged. The cache
+stores, per include site, the content hashes of those files, the imported
+symbol values, the symbols the file exports and the bytes it emitted. On a
+later run a file whose entry still validates is replayed from the cache
+instead of being read, tokenized and assembled again.
+"""
+
+import base64
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from pymads.core.symbols import SymbolTable
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = ".pymads_cache"
+HASH_BLOCK_SIZE = 1 << 20
+
+# (scope path below the include site, name, value, symbol type)
+Export = Tuple[Tuple[str, ...], str, int, str]
+
+
+class CacheEntry:
+    """
+    The recorded result of assembling one included file at one site.
+
+    Attributes:
+        files: Content hash of every file the result depends on, by path
+        imports: Values of the outside symbols used, by qualified name
+        exports: Symbols defined by the file
+        ranges: Emitted bytes as (start address, data) pairs
+        exit_pc: Location counter after the file
+    """
+
+    __slots__ = ("files", "imports", "exports", "ranges", "exit_pc", "cacheable")
+
+    def __init__(self):
+        self.files: Dict[str, str] = {}
+        self.imports: Dict[str, Optional[int]] = {}
+        self.exports: List[Export] = []
+        self.ranges: List[Tuple[int, bytes]] = []
+        self.exit_pc = 0
+        self.cacheable = True
+
+    def to_json(self) -> Dict:
+        """Serialize the entry to a JSON-compatible dictionary."""
+        return {
+            "version": CACHE_VERSION,
+            "files": self.files,
+            "imports": self.imports,
+            "exports": [list(export) for export in self.exports],
+            "ranges": [
+                [start, base64.b64encode(data).decode("ascii")]
+                for start, data in self.ranges
+            ],
+            "exit_pc": self.exit_pc,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "CacheEntry":
+        """
+        Deserialize an entry.
+
+        Args:
+            data: Dictionary produced by to_json
+
+        Returns:
+            The entry
+
+        Raises:
+            ValueError: If the data is from another cache version or malformed
+        """
+        if data.get("version") != CACHE_VERSION:
+            raise ValueError("Incompatible cache entry")
+        entry = cls()
+        try:
+            entry.files = dict(data["files"])
+            entry.imports = dict(data["imports"])
+            entry.exports = [
+                (tuple(path), name, value, symbol_type)
+                for path, name, value, symbol_type in data["exports"]
+            ]
+            entry.ranges = [
+                (start, base64.b64decode(text)) for start, text in data["ranges"]
+            ]
+            entry.exit_pc = data["exit_pc"]
+        except (KeyError, TypeError) as error:
+            raise ValueError(f"Malformed cache entry: {error}") from error
+        return entry
+
+
+class IncrementalCache:
+    """
+    Directory of CacheEntry files keyed by include site.
+
+    Attributes:
+        directory: Cache directory, created on the first store
+        hits: Includes the final pass of the assembly replayed from the cache
+        misses: Includes the final pass of the assembly had to assemble
+
+    Every pass looks its includes up again, so the assembler counts the
+    lookups of a pass and adds them to ``hits`` and ``misses`` only once
+    the pass turns out to be the final one.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        """
+        Initialize a new cache.
+
+        Args:
+            directory: Cache directory
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._hashes: Dict[str, str] = {}
+        self._entries: Dict[str, Optional[CacheEntry]] = {}
+
+    def begin(self) -> None:
+        """
+        Start an assembly.
+
+        Files may have changed since the last assembly that used the cache,
+        so their hashes are computed again; the statistics restart as well.
+        """
+        self.hits = 0
+        self.misses = 0
+        self._hashes.clear()
+
+    @staticmethod
+    def site_key(path: str, pc: int, scope: str, cpu: str, flags: int) -> str:
+        """
+        Build the key of an include site.
+
+        Args:
+            path: Included file path
+            pc: Location counter at the include
+            scope: Qualified prefix of the scope at the include followed by
+                its anchor, under which ``?`` labels in the file are keyed
+            cpu: Target processor
+            flags: 65816 register widths at the include
+
+        Returns:
+            Hex digest identifying the site
+        """
+        site = json.dumps([os.path.abspath(path), pc, scope, cpu, flags])
+        return hashlib.sha256(site.encode("utf-8")).hexdigest()
+
+    def file_hash(self, path: str) -> str:
+        """
+        Get the content hash of a file, hashing it once per assembly.
+
+        Args:
+            path: File path
+
+        Returns:
+            SHA-256 hex digest of the file content, or "" if it can't be read
+        """
+        digest = self._hashes.get(path)
+        if digest is None:
+            hasher = hashlib.sha256()
+            try:
+                with open(path, "rb") as source:
+                    for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b""):
+                        hasher.update(block)
+                digest = hasher.hexdigest()
+            except OSError:
+                digest = ""
+            self._hashes[path] = digest
+        return digest
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        if key in self._entries:
+            return self._entries[key]
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as stream:
+                entry: Optional[CacheEntry] = CacheEntry.from_json(json.load(stream))
+        except (OSError, ValueError):
+            entry = None
+        self._entries[key] = entry
+        return entry
+
+    def lookup(self, key: str, table: SymbolTable) -> Optional[CacheEntry]:
+        """
+        Find a still valid entry for an include site.
+
+        An entry is valid if none of its files changed and every imported
+        symbol still has the recorded value.
+
+        Args:
+            key: Site key from site_key
+            table: Symbol table of the running assembly
+
+        Returns:
+            The entry, or None on a miss
+        """
+        entry = self._load(key)
+        if entry is not None and self._valid(entry, table):
+            return entry
+        return None
+
+    def _valid(self, entry: CacheEntry, table: SymbolTable) -> bool:
+        for path, digest in entry.files.items():
+            if self.file_hash(path) != digest:
+                return False
+        symbols = table.symbols
+        for name, value in entry.imports.items():
+            symbol = symbols.get(name)
+            if symbol is None or not symbol.is_defined or symbol.value != value:
+                return False
+        return True
+
+    def store(self, key: str, entry: CacheEntry) -> None:
+        """
+        Write an entry to the cache directory.
+
+        Args:
+            key: Site key from site_key
+            entry: Entry to store
+        """
+        import tempfile  # only needed when writing; slow to import
+
+        self._entries[key] = entry
+        os.makedirs(self.directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as stream:
+                json.dump(entry.to_json(), stream)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
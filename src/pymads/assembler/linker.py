@@ -0,0 +1,193 @@
+"""
+Parallel assembly and linking of separately assembled modules.
+
+Original Pascal directives: .RELOC, .EXTRN, .PUBLIC
+
+Every module is assembled on its own, with its own SymbolTable, so modules
+can be assembled in a process pool. The link step then runs in one
+process: it places the ``.reloc`` modules one after another from a base
+address, resolves the ``.public`` symbols of all modules and rewrites the
+relocation sites recorded by the assembler.
+"""
+
+import io
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from pymads.assembler.assembler import Assembler, AssemblyError, AssemblyOptions
+from pymads.assembler.opcodes import Cpu
+from pymads.assembler.output import MEMORY_6502, MEMORY_65816, OutputImage
+from pymads.assembler.relocation import Relocation, encode
+
+DEFAULT_BASE = 0x2000
+
+
+class Module(NamedTuple):
+    """
+    An assembled module, ready to be linked.
+
+    Attributes:
+        path: Source file
+        relocatable: Whether the module is placed by the linker
+        size: Length of a .reloc module's address space (its final pc)
+        segments: ``(address, data)`` of every written range
+        exports: ``.public`` symbols as ``(value, relocatable)``
+        relocations: Sites to rewrite when linking
+        headers: Whether the module wants Atari DOS headers (OPT H)
+    """
+
+    path: str
+    relocatable: bool
+    size: int
+    segments: List[Tuple[int, bytes]]
+    exports: Dict[str, Tuple[int, bool]]
+    relocations: List[Relocation]
+    headers: bool
+
+
+class LinkResult(NamedTuple):
+    """
+    Outcome of linking.
+
+    Attributes:
+        binary: Output file content
+        bases: Load address of each module (0 for absolute modules)
+        symbols: Final values of all public symbols
+    """
+
+    binary: bytes
+    bases: List[int]
+    symbols: Dict[str, int]
+
+
+def assemble_module(path: str, options: Optional[AssemblyOptions] = None) -> Module:
+    """
+    Assemble one module.
+
+    Args:
+        path: Source file path
+        options: Assembly options (defaults if None)
+
+    Returns:
+        The module
+
+    Raises:
+        AssemblyError: If the source contains errors or exports an
+            undefined symbol
+    """
+    options = options or AssemblyOptions()
+    assembler = Assembler(options.cpu, options.include_paths)
+    image = assembler.assemble_file(path)
+    try:
+        exports = assembler.exports()
+    except AssemblyError as error:
+        raise AssemblyError(error.message, path) from None
+    return Module(
+        path,
+        assembler.relocatable,
+        image.pc if assembler.relocatable else 0,
+        [
+            (segment.start, bytes(image.segment_view(segment)))
+            for segment in image.segments
+        ],
+        exports,
+        assembler.relocations,
+        assembler.headers,
+    )
+
+
+def assemble_modules(
+    paths: Sequence[str], options: Optional[AssemblyOptions] = None, jobs: int = 1
+) -> List[Module]:
+    """
+    Assemble independent modules, in parallel if asked to.
+
+    Args:
+        paths: Source file paths
+        options: Assembly options shared by all modules
+        jobs: Number of worker processes (1 assembles in this process,
+            0 uses one per CPU)
+
+    Returns:
+        The modules, in the order of ``paths``
+
+    Raises:
+        AssemblyError: For the first module, in order, that fails
+    """
+    if jobs == 1 or len(paths) < 2:
+        return [assemble_module(path, options) for path in paths]
+    # Only pay for the pool machinery when it is used.
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+        return list(executor.map(assemble_module, paths, [options] * len(paths)))
+
+
+def link(
+    modules: Sequence[Module], base: int = DEFAULT_BASE, cpu: Cpu = Cpu.MOS6502
+) -> LinkResult:
+    """
+    Link assembled modules into one output file.
+
+    The .reloc modules are placed one after another from ``base``; absolute
+    modules keep their addresses.
+
+    Args:
+        modules: The modules, in link order
+        base: Load address of the first .reloc module
+        cpu: Target processor (selects the address space)
+
+    Returns:
+        The link result
+
+    Raises:
+        AssemblyError: If a public symbol is exported twice, an external
+            symbol is not exported by any module or a relocated value does
+            not fit
+    """
+    bases = []
+    address = base
+    for module in modules:
+        bases.append(address if module.relocatable else 0)
+        if module.relocatable:
+            address += module.size
+
+    symbols: Dict[str, int] = {}
+    for module, origin in zip(modules, bases):
+        for name, (value, relocatable) in module.exports.items():
+            if name in symbols:
+                raise AssemblyError(f"Label {name} declared twice", module.path)
+            symbols[name] = value + origin if relocatable else value
+
+    image = OutputImage(MEMORY_65816 if cpu is Cpu.WDC65816 else MEMORY_6502)
+    for module, origin in zip(modules, bases):
+        segments = [(start, bytearray(data)) for start, data in module.segments]
+        # Segments stay in file order (INI runs as it loads); look up by address.
+        ordered = sorted(segments, key=lambda segment: segment[0])
+        starts = [start for start, _ in ordered]
+        for relocation in module.relocations:
+            if relocation.symbol is None:
+                value = relocation.addend + origin
+            elif relocation.symbol in symbols:
+                value = relocation.addend + symbols[relocation.symbol]
+            else:
+                raise AssemblyError(
+                    f"Undeclared external label {relocation.symbol}", module.path
+                )
+            try:
+                code = encode(relocation.kind, value)
+            except ValueError as error:
+                raise AssemblyError(str(error), module.path) from error
+            start, data = ordered[bisect_right(starts, relocation.address) - 1]
+            offset = relocation.address - start
+            data[offset : offset + len(code)] = code
+        for start, data in segments:
+            image.org(start + origin)
+            image.write(data)
+
+    stream = io.BytesIO()
+    try:
+        image.flush(stream, all(module.headers for module in modules))
+    except ValueError as error:
+        raise AssemblyError(str(error)) from error
+    return LinkResult(stream.getvalue(), bases, symbols)
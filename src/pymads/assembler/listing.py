@@ -0,0 +1,168 @@
+"""
+Listing and label file writers.
+
+Original Pascal procedures: zapisz_lst, zapisz_lab
+
+The listing is streamed: every source line is written to a buffered file
+as soon as it has been assembled, and the file is truncated when a new
+pass starts, so only the last pass remains. Sites the assembler re-encodes
+at the end of a pass (forward references patched in place) have their
+bytes rewritten where they stand in the file. Tabs in source lines are
+expanded to tab stops, as in MADS listings.
+"""
+
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from pymads.assembler.output import Buffer
+from pymads.core.symbols import SymbolTable
+from pymads.utils.text import expand_tabs
+
+LISTING_BUFFER_SIZE = 1 << 16
+
+# Bytes shown per listing line
+LISTED_BYTES = 4
+
+# Line number, address, bytes and source text
+_LINE = "%6d %04X %-12s%s\n"
+_LINE_NO_ADDRESS = "%6d      %-12s%s\n"
+
+# Bytes field formats by byte count, in uppercase hex like the address
+_BYTES = [" ".join(["%02X"] * count) for count in range(LISTED_BYTES + 1)]
+
+# Symbols formatted per string by write_labels
+LABEL_CHUNK = 1024
+
+_LABEL_LINE = "%02X\t%04X\t%s\n"
+
+
+class ListingWriter:
+    """
+    Listing file of the last pass.
+
+    Each line holds the line number, the address and the first LISTED_BYTES
+    bytes the line produced, and the source text.
+    """
+
+    def __init__(self, path: str, buffer_size: int = LISTING_BUFFER_SIZE):
+        """
+        Create the listing file.
+
+        Args:
+            path: Listing file path
+            buffer_size: Write buffer size
+
+        Raises:
+            OSError: If the file cannot be created
+        """
+        self.path = path
+        self._stream: BinaryIO = open(path, "wb", buffering=buffer_size)
+
+    def begin_pass(self) -> None:
+        """Discard the lines of the previous pass."""
+        self._stream.seek(0)
+        self._stream.truncate()
+
+    def source(self, path: str) -> None:
+        """
+        Note the source file the following lines come from.
+
+        Args:
+            path: Source file path
+        """
+        self._stream.write(f"Source: {path}\n".encode("latin-1", "replace"))
+
+    def line(
+        self,
+        number: int,
+        address: Optional[int],
+        data: Optional[Buffer],
+        text: str,
+        locate: bool = False,
+    ) -> int:
+        """
+        Write one listing line.
+
+        Args:
+            number: Line number in its source file
+            address: Location counter to show, or None
+            data: Up to LISTED_BYTES bytes the line produced, or None
+            text: Source line; tabs are expanded
+            locate: Whether the bytes may have to be rewritten later
+
+        Returns:
+            File offset of the bytes field if ``locate`` is set, else -1
+        """
+        field = _BYTES[len(data)] % tuple(data) if data else ""
+        if "\t" in text:
+            text = expand_tabs(text)
+        if address is None:
+            line = _LINE_NO_ADDRESS % (number, field, text)
+        else:
+            line = _LINE % (number, address, field, text)
+        stream = self._stream
+        # The bytes field is 12 wide, whatever width the address took
+        offset = stream.tell() + len(line) - len(text) - 13 if locate else -1
+        stream.write(line.encode("latin-1", "replace"))
+        return offset
+
+    def update(self, offset: int, data: Buffer) -> None:
+        """
+        Rewrite the bytes field of a line written earlier.
+
+        Args:
+            offset: Offset returned by ``line``
+            data: The line's final bytes, up to LISTED_BYTES
+        """
+        stream = self._stream
+        field = _BYTES[len(data)] % tuple(data)
+        stream.seek(offset)
+        stream.write(f"{field:11}".encode("ascii"))
+        stream.seek(0, 2)
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        self._stream.close()
+
+
+def _label_rows(table: SymbolTable) -> Iterator[List]:
+    """Flattened ``(bank, address, name)`` rows in chunks of LABEL_CHUNK."""
+    symbols = table.symbols
+    row: List = []
+    for name in sorted(symbols):
+        symbol = symbols[name]
+        if not symbol.is_defined:
+            continue
+        value = symbol.value
+        row += (value >> 16 & 0xFF, value & 0xFFFF, name)
+        if len(row) == 3 * LABEL_CHUNK:
+            yield row
+            row = []
+    if row:
+        yield row
+
+
+def write_labels(table: SymbolTable, stream: BinaryIO) -> int:
+    """
+    Write a MADS label (.lab) file.
+
+    The defined symbols are written sorted by name. A chunk of symbols is
+    formatted with a single ``%`` operation, so no string is built per
+    symbol.
+
+    Args:
+        table: Symbol table of the assembly
+        stream: Binary stream to write to
+
+    Returns:
+        Number of symbols written
+    """
+    stream.write(b"mads pymads\nLabel table:\n")
+    count = 0
+    template: Tuple[int, str] = (0, "")
+    for row in _label_rows(table):
+        symbols = len(row) // 3
+        if template[0] != symbols:
+            template = (symbols, _LABEL_LINE * symbols)
+        stream.write((template[1] % tuple(row)).encode("latin-1", "replace"))
+        count += symbols
+    return count
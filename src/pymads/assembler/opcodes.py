@@ -0,0 +1,301 @@
+"""
+Table-driven 6502/65C02/65816 opcode encoder.
+
+Original Pascal function: oblicz_mnemonik
+
+The Pascal code selects opcodes through long case statements. Here the
+tables below are expanded by build_table into one dictionary per CPU keyed
+by ``(mnemonic, addressing mode, register widths)`` and yielding
+``(opcode, operand length)``, so encoding an instruction is a single
+dictionary probe followed by operand packing. The expanded tables are
+generated ahead of time into _opcode_tables, so importing this module only
+loads constants.
+"""
+
+from enum import Enum, IntEnum
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, Tuple
+
+from pymads.assembler import _opcode_tables
+
+
+class Cpu(str, Enum):
+    """Target processor."""
+
+    MOS6502 = "6502"
+    WDC65C02 = "65c02"
+    WDC65816 = "65816"
+
+
+class Mode(IntEnum):
+    """Addressing mode."""
+
+    IMP = 0  # implied
+    ACC = 1  # accumulator: asl @
+    IMM = 2  # #value
+    ZP = 3  # zp
+    ZPX = 4  # zp,x
+    ZPY = 5  # zp,y
+    ABS = 6  # abs
+    ABSX = 7  # abs,x
+    ABSY = 8  # abs,y
+    IND = 9  # (abs)
+    INDX = 10  # (zp,x)
+    INDY = 11  # (zp),y
+    REL = 12  # 8-bit branch
+    ZPIND = 13  # (zp)            65C02
+    ABSINDX = 14  # (abs,x)       65C02
+    LONG = 15  # long             65816
+    LONGX = 16  # long,x          65816
+    DPINDL = 17  # [dp]           65816
+    DPINDLY = 18  # [dp],y        65816
+    SR = 19  # sr,s               65816
+    SRINDY = 20  # (sr,s),y       65816
+    RELL = 21  # 16-bit branch    65816
+    BLOCK = 22  # src,dst banks   65816
+    ABSINDL = 23  # [abs]         65816
+
+
+# Register width flags (65816 status bits M and X cleared = 16-bit).
+M16 = 1
+X16 = 2
+
+OPERAND_LENGTH: Dict[Mode, int] = {
+    Mode.IMP: 0,
+    Mode.ACC: 0,
+    Mode.IMM: 1,
+    Mode.ZP: 1,
+    Mode.ZPX: 1,
+    Mode.ZPY: 1,
+    Mode.ABS: 2,
+    Mode.ABSX: 2,
+    Mode.ABSY: 2,
+    Mode.IND: 2,
+    Mode.INDX: 1,
+    Mode.INDY: 1,
+    Mode.REL: 1,
+    Mode.ZPIND: 1,
+    Mode.ABSINDX: 2,
+    Mode.LONG: 3,
+    Mode.LONGX: 3,
+    Mode.DPINDL: 1,
+    Mode.DPINDLY: 1,
+    Mode.SR: 1,
+    Mode.SRINDY: 1,
+    Mode.RELL: 2,
+    Mode.BLOCK: 2,
+    Mode.ABSINDL: 2,
+}
+
+_M = Mode
+
+_ALU_MODES = (_M.IMM, _M.ZP, _M.ZPX, _M.ABS, _M.ABSX, _M.ABSY, _M.INDX, _M.INDY)
+_SHIFT_MODES = (_M.ACC, _M.ZP, _M.ZPX, _M.ABS, _M.ABSX)
+
+_MOS6502: Dict[str, Dict[Mode, int]] = {
+    "ADC": dict(zip(_ALU_MODES, (0x69, 0x65, 0x75, 0x6D, 0x7D, 0x79, 0x61, 0x71))),
+    "AND": dict(zip(_ALU_MODES, (0x29, 0x25, 0x35, 0x2D, 0x3D, 0x39, 0x21, 0x31))),
+    "CMP": dict(zip(_ALU_MODES, (0xC9, 0xC5, 0xD5, 0xCD, 0xDD, 0xD9, 0xC1, 0xD1))),
+    "EOR": dict(zip(_ALU_MODES, (0x49, 0x45, 0x55, 0x4D, 0x5D, 0x59, 0x41, 0x51))),
+    "LDA": dict(zip(_ALU_MODES, (0xA9, 0xA5, 0xB5, 0xAD, 0xBD, 0xB9, 0xA1, 0xB1))),
+    "ORA": dict(zip(_ALU_MODES, (0x09, 0x05, 0x15, 0x0D, 0x1D, 0x19, 0x01, 0x11))),
+    "SBC": dict(zip(_ALU_MODES, (0xE9, 0xE5, 0xF5, 0xED, 0xFD, 0xF9, 0xE1, 0xF1))),
+    "STA": dict(zip(_ALU_MODES[1:], (0x85, 0x95, 0x8D, 0x9D, 0x99, 0x81, 0x91))),
+    "ASL": dict(zip(_SHIFT_MODES, (0x0A, 0x06, 0x16, 0x0E, 0x1E))),
+    "LSR": dict(zip(_SHIFT_MODES, (0x4A, 0x46, 0x56, 0x4E, 0x5E))),
+    "ROL": dict(zip(_SHIFT_MODES, (0x2A, 0x26, 0x36, 0x2E, 0x3E))),
+    "ROR": dict(zip(_SHIFT_MODES, (0x6A, 0x66, 0x76, 0x6E, 0x7E))),
+    "DEC": {_M.ZP: 0xC6, _M.ZPX: 0xD6, _M.ABS: 0xCE, _M.ABSX: 0xDE},
+    "INC": {_M.ZP: 0xE6, _M.ZPX: 0xF6, _M.ABS: 0xEE, _M.ABSX: 0xFE},
+    "BIT": {_M.ZP: 0x24, _M.ABS: 0x2C},
+    "CPX": {_M.IMM: 0xE0, _M.ZP: 0xE4, _M.ABS: 0xEC},
+    "CPY": {_M.IMM: 0xC0, _M.ZP: 0xC4, _M.ABS: 0xCC},
+    "LDX": {_M.IMM: 0xA2, _M.ZP: 0xA6, _M.ZPY: 0xB6, _M.ABS: 0xAE, _M.ABSY: 0xBE},
+    "LDY": {_M.IMM: 0xA0, _M.ZP: 0xA4, _M.ZPX: 0xB4, _M.ABS: 0xAC, _M.ABSX: 0xBC},
+    "STX": {_M.ZP: 0x86, _M.ZPY: 0x96, _M.ABS: 0x8E},
+    "STY": {_M.ZP: 0x84, _M.ZPX: 0x94, _M.ABS: 0x8C},
+    "JMP": {_M.ABS: 0x4C, _M.IND: 0x6C},
+    "JSR": {_M.ABS: 0x20},
+    "BCC": {_M.REL: 0x90},
+    "BCS": {_M.REL: 0xB0},
+    "BEQ": {_M.REL: 0xF0},
+    "BMI": {_M.REL: 0x30},
+    "BNE": {_M.REL: 0xD0},
+    "BPL": {_M.REL: 0x10},
+    "BVC": {_M.REL: 0x50},
+    "BVS": {_M.REL: 0x70},
+    # fmt: off
+    **{
+        mnemonic: {_M.IMP: opcode}
+        for mnemonic, opcode in (
+            ("BRK", 0x00), ("CLC", 0x18), ("CLD", 0xD8), ("CLI", 0x58),
+            ("CLV", 0xB8), ("DEX", 0xCA), ("DEY", 0x88), ("INX", 0xE8),
+            ("INY", 0xC8), ("NOP", 0xEA), ("PHA", 0x48), ("PHP", 0x08),
+            ("PLA", 0x68), ("PLP", 0x28), ("RTI", 0x40), ("RTS", 0x60),
+            ("SEC", 0x38), ("SED", 0xF8), ("SEI", 0x78), ("TAX", 0xAA),
+            ("TAY", 0xA8), ("TSX", 0xBA), ("TXA", 0x8A), ("TXS", 0x9A),
+            ("TYA", 0x98),
+        )
+    },
+    # fmt: on
+}
+
+_WDC65C02: Dict[str, Dict[Mode, int]] = {
+    "ADC": {_M.ZPIND: 0x72},
+    "AND": {_M.ZPIND: 0x32},
+    "CMP": {_M.ZPIND: 0xD2},
+    "EOR": {_M.ZPIND: 0x52},
+    "LDA": {_M.ZPIND: 0xB2},
+    "ORA": {_M.ZPIND: 0x12},
+    "SBC": {_M.ZPIND: 0xF2},
+    "STA": {_M.ZPIND: 0x92},
+    "BIT": {_M.IMM: 0x89, _M.ZPX: 0x34, _M.ABSX: 0x3C},
+    "DEC": {_M.ACC: 0x3A},
+    "INC": {_M.ACC: 0x1A},
+    "JMP": {_M.ABSINDX: 0x7C},
+    "BRA": {_M.REL: 0x80},
+    "STZ": {_M.ZP: 0x64, _M.ZPX: 0x74, _M.ABS: 0x9C, _M.ABSX: 0x9E},
+    "TRB": {_M.ZP: 0x14, _M.ABS: 0x1C},
+    "TSB": {_M.ZP: 0x04, _M.ABS: 0x0C},
+    "PHX": {_M.IMP: 0xDA},
+    "PHY": {_M.IMP: 0x5A},
+    "PLX": {_M.IMP: 0xFA},
+    "PLY": {_M.IMP: 0x7A},
+}
+
+_LONG_MODES = (_M.LONG, _M.LONGX, _M.DPINDL, _M.DPINDLY, _M.SR, _M.SRINDY)
+
+_WDC65816: Dict[str, Dict[Mode, int]] = {
+    "ADC": dict(zip(_LONG_MODES, (0x6F, 0x7F, 0x67, 0x77, 0x63, 0x73))),
+    "AND": dict(zip(_LONG_MODES, (0x2F, 0x3F, 0x27, 0x37, 0x23, 0x33))),
+    "CMP": dict(zip(_LONG_MODES, (0xCF, 0xDF, 0xC7, 0xD7, 0xC3, 0xD3))),
+    "EOR": dict(zip(_LONG_MODES, (0x4F, 0x5F, 0x47, 0x57, 0x43, 0x53))),
+    "LDA": dict(zip(_LONG_MODES, (0xAF, 0xBF, 0xA7, 0xB7, 0xA3, 0xB3))),
+    "ORA": dict(zip(_LONG_MODES, (0x0F, 0x1F, 0x07, 0x17, 0x03, 0x13))),
+    "SBC": dict(zip(_LONG_MODES, (0xEF, 0xFF, 0xE7, 0xF7, 0xE3, 0xF3))),
+    "STA": dict(zip(_LONG_MODES, (0x8F, 0x9F, 0x87, 0x97, 0x83, 0x93))),
+    "BRL": {_M.RELL: 0x82},
+    "PER": {_M.RELL: 0x62},
+    "COP": {_M.IMM: 0x02},
+    "REP": {_M.IMM: 0xC2},
+    "SEP": {_M.IMM: 0xE2},
+    "WDM": {_M.IMM: 0x42},
+    "JML": {_M.LONG: 0x5C, _M.ABSINDL: 0xDC},
+    "JMP": {_M.LONG: 0x5C, _M.ABSINDL: 0xDC},
+    "JSL": {_M.LONG: 0x22},
+    "JSR": {_M.LONG: 0x22, _M.ABSINDX: 0xFC},
+    "MVN": {_M.BLOCK: 0x54},
+    "MVP": {_M.BLOCK: 0x44},
+    "PEA": {_M.ABS: 0xF4},
+    "PEI": {_M.ZPIND: 0xD4},
+    # fmt: off
+    **{
+        mnemonic: {_M.IMP: opcode}
+        for mnemonic, opcode in (
+            ("PHB", 0x8B), ("PHD", 0x0B), ("PHK", 0x4B), ("PLB", 0xAB),
+            ("PLD", 0x2B), ("RTL", 0x6B), ("STP", 0xDB), ("TCD", 0x5B),
+            ("TCS", 0x1B), ("TDC", 0x7B), ("TSC", 0x3B), ("TXY", 0x9B),
+            ("TYX", 0xBB), ("WAI", 0xCB), ("XBA", 0xEB), ("XCE", 0xFB),
+        )
+    },
+    # fmt: on
+}
+
+# Immediate operands widened to 16 bits by a cleared M or X flag.
+_M_IMMEDIATE = frozenset({"ADC", "AND", "BIT", "CMP", "EOR", "LDA", "ORA", "SBC"})
+_X_IMMEDIATE = frozenset({"CPX", "CPY", "LDX", "LDY"})
+
+OpcodeKey = Tuple[str, Mode, int]
+OpcodeTable = Mapping[OpcodeKey, Tuple[int, int]]
+
+
+def build_table(
+    *layers: Dict[str, Dict[Mode, int]], widths: int
+) -> Dict[OpcodeKey, Tuple[int, int]]:
+    """
+    Expand per-mnemonic opcode layers into a flat lookup table.
+
+    Args:
+        layers: Mnemonic -> {mode: opcode} tables, later layers extending
+            earlier ones
+        widths: Number of register width combinations (1 or 4)
+
+    Returns:
+        Dictionary mapping (mnemonic, mode, flags) to (opcode, operand length)
+    """
+    table: Dict[OpcodeKey, Tuple[int, int]] = {}
+    for layer in layers:
+        for mnemonic, modes in layer.items():
+            for mode, opcode in modes.items():
+                for flags in range(widths):
+                    length = OPERAND_LENGTH[mode]
+                    if mode is Mode.IMM and (
+                        (flags & M16 and mnemonic in _M_IMMEDIATE)
+                        or (flags & X16 and mnemonic in _X_IMMEDIATE)
+                    ):
+                        length = 2
+                    table[(mnemonic, mode, flags)] = (opcode, length)
+    return table
+
+
+# Expanded by scripts/generate_opcode_tables.py; Mode values in the keys
+# compare and hash equal to the Mode members used for lookups. Every
+# assembler in the process reads these tables; none may change them, so
+# the per-CPU tables are read-only views as well.
+OPCODE_TABLES: Mapping[Cpu, OpcodeTable] = MappingProxyType(
+    {
+        Cpu.MOS6502: MappingProxyType(_opcode_tables.MOS6502),
+        Cpu.WDC65C02: MappingProxyType(_opcode_tables.WDC65C02),
+        Cpu.WDC65816: MappingProxyType(_opcode_tables.WDC65816),
+    }
+)
+
+MNEMONICS: Mapping[Cpu, FrozenSet[str]] = MappingProxyType(
+    {
+        Cpu.MOS6502: _opcode_tables.MOS6502_MNEMONICS,
+        Cpu.WDC65C02: _opcode_tables.WDC65C02_MNEMONICS,
+        Cpu.WDC65816: _opcode_tables.WDC65816_MNEMONICS,
+    }
+)
+
+
+def encode(
+    table: OpcodeTable,
+    mnemonic: str,
+    mode: Mode,
+    value: int = 0,
+    pc: int = 0,
+    flags: int = 0,
+) -> bytes:
+    """
+    Encode one instruction.
+
+    Args:
+        table: Opcode table of the target CPU (from OPCODE_TABLES)
+        mnemonic: Upper-case mnemonic
+        mode: Addressing mode
+        value: Operand value; the branch target address for REL/RELL and
+            ``src << 8 | dst`` banks for BLOCK
+        pc: Address of the instruction (used by branches)
+        flags: 65816 register widths (M16 | X16), 0 for 8-bit registers
+
+    Returns:
+        Encoded instruction bytes
+
+    Raises:
+        KeyError: If the CPU has no such mnemonic/addressing mode combination
+        ValueError: If the operand does not fit the addressing mode
+    """
+    opcode, length = table[(mnemonic, mode, flags)]
+    if length == 0:
+        return bytes((opcode,))
+    if mode is Mode.REL or mode is Mode.RELL:
+        value -= pc + 1 + length
+        limit = 1 << ((length << 3) - 1)
+        if not -limit <= value < limit:
+            raise ValueError(f"Branch out of range by {abs(value) - limit} bytes")
+    elif not -(1 << ((length << 3) - 1)) <= value < (1 << (length << 3)):
+        raise ValueError(f"Value out of range: {value}")
+    return bytes((opcode,)) + (value & ((1 << (length << 3)) - 1)).to_bytes(
+        length, "little"
+    )
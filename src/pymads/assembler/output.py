@@ -0,0 +1,241 @@
+"""
+Assembler output image.
+
+Original Pascal procedures: put_dst, save_dst, save_dstW, save_dstS,
+save_nul, flush_dst
+
+The Pascal code emits one byte per call. OutputImage keeps the whole address
+space in a preallocated bytearray, writes words, strings and fills with slice
+assignment and records which address ranges were written as a list of
+segments, each of which is flushed with a single write of a memoryview.
+"""
+
+import mmap
+from typing import BinaryIO, List, Optional, Union
+
+MEMORY_6502 = 0x10000  # 64K address space
+MEMORY_65816 = 0x1000000  # 16M address space
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class Segment:
+    """A contiguous written address range ``[start, end)``."""
+
+    __slots__ = ("start", "end")
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __repr__(self) -> str:
+        return f"Segment(${self.start:04X}, ${self.end:04X})"
+
+
+class OutputImage:
+    """
+    Memory image the assembler writes its output into.
+
+    Attributes:
+        memory: The whole address space; usable as a Fixup target. Address
+            spaces above 64K are anonymous memory maps, so untouched pages
+            of a 16M image cost neither time nor memory.
+        segments: Written ranges in the order they were started
+        pc: Current location counter
+    """
+
+    def __init__(self, size: int = MEMORY_6502):
+        """
+        Initialize a new output image.
+
+        Args:
+            size: Size of the address space (MEMORY_6502 or MEMORY_65816)
+        """
+        self.memory: Union[bytearray, mmap.mmap] = (
+            bytearray(size) if size <= MEMORY_6502 else mmap.mmap(-1, size)
+        )
+        self.segments: List[Segment] = []
+        self.pc = 0
+        self._segment: Optional[Segment] = None
+
+    @property
+    def size(self) -> int:
+        """Size of the address space."""
+        return len(self.memory)
+
+    def reset(self) -> None:
+        """Forget all segments before a new pass."""
+        self.segments = []
+        self.pc = 0
+        self._segment = None
+
+    def org(self, address: int) -> None:
+        """
+        Set the location counter.
+
+        Args:
+            address: New location counter
+
+        Raises:
+            ValueError: If the address is outside the address space
+        """
+        if not 0 <= address < len(self.memory):
+            raise ValueError(f"Address out of range: ${address:X}")
+        self.pc = address
+
+    def _reserve(self, length: int) -> int:
+        """Extend or start the segment at pc and return the write address."""
+        start = self.pc
+        end = start + length
+        if end > len(self.memory):
+            raise ValueError(f"Memory overflow at ${start:X}")
+        segment = self._segment
+        if segment is None or segment.end != start:
+            segment = Segment(start, end)
+            self.segments.append(segment)
+            self._segment = segment
+        else:
+            segment.end = end
+        self.pc = end
+        return start
+
+    def write(self, data: Buffer) -> int:
+        """
+        Write bytes at the location counter.
+
+        Args:
+            data: Bytes to write (any buffer, including a memoryview)
+
+        Returns:
+            Address the data was written to
+        """
+        start = self.pc
+        end = start + len(data)
+        segment = self._segment
+        if segment is not None and segment.end == start and end <= len(self.memory):
+            # Fast path: extend the current segment
+            segment.end = end
+            self.pc = end
+        else:
+            self._reserve(end - start)
+        self.memory[start:end] = data
+        return start
+
+    def put_byte(self, value: int) -> int:
+        """
+        Write one byte.
+
+        Original Pascal procedure: put_dst / save_dst
+
+        Args:
+            value: Byte value (truncated to 8 bits)
+
+        Returns:
+            Address the byte was written to
+        """
+        start = self._reserve(1)
+        self.memory[start] = value & 0xFF
+        return start
+
+    def save_word(self, value: int) -> int:
+        """
+        Write a little-endian 16-bit word.
+
+        Original Pascal procedure: save_dstW
+
+        Args:
+            value: Word value (truncated to 16 bits)
+
+        Returns:
+            Address the word was written to
+        """
+        start = self._reserve(2)
+        self.memory[start : start + 2] = (value & 0xFFFF).to_bytes(2, "little")
+        return start
+
+    def save_string(self, data: Union[str, Buffer]) -> int:
+        """
+        Write a string.
+
+        Original Pascal procedure: save_dstS
+
+        Args:
+            data: Bytes, or a str encoded as Latin-1
+
+        Returns:
+            Address the string was written to
+        """
+        if isinstance(data, str):
+            data = data.encode("latin-1")
+        return self.write(data)
+
+    def save_nul(self, count: int, fill: int = 0) -> int:
+        """
+        Write ``count`` copies of a fill byte.
+
+        Original Pascal procedure: save_nul
+
+        Args:
+            count: Number of bytes
+            fill: Fill byte value
+
+        Returns:
+            Address the fill starts at
+        """
+        start = self._reserve(count)
+        self.memory[start : start + count] = bytes((fill & 0xFF,)) * count
+        return start
+
+    def segment_view(self, segment: Segment) -> memoryview:
+        """
+        Get a zero-copy view of a segment's bytes.
+
+        Args:
+            segment: One of ``segments``
+
+        Returns:
+            memoryview of the segment's bytes
+        """
+        return memoryview(self.memory)[segment.start : segment.end]
+
+    def flush(self, stream: BinaryIO, headers: bool = True) -> int:
+        """
+        Write all segments to a stream.
+
+        Original Pascal procedure: flush_dst
+
+        With headers enabled (MADS ``opt h+``, the default) the output is an
+        Atari DOS binary: an $FFFF marker, then a start/end address header
+        before every segment.
+
+        Args:
+            stream: Binary stream to write to
+            headers: Whether to write Atari DOS segment headers
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            ValueError: If a segment lies above $FFFF and headers are enabled
+        """
+        view = memoryview(self.memory)
+        written = 0
+        marker = b"\xff\xff"
+        for segment in self.segments:
+            if not len(segment):
+                continue
+            if headers:
+                if segment.end > 0x10000:
+                    raise ValueError(
+                        f"Segment ${segment.start:X} does not fit a DOS header"
+                    )
+                header = bytearray(marker)
+                marker = b""
+                header += segment.start.to_bytes(2, "little")
+                header += (segment.end - 1).to_bytes(2, "little")
+                written += stream.write(header)
+            written += stream.write(view[segment.start : segment.end])
+        return written
@@ -0,0 +1,324 @@
+"""
+Opt-in profiling of an assembly.
+
+A Profiler attached to an Assembler replaces a few methods of that one
+assembler, its symbol table and its output image with timing or counting
+wrappers, and puts the originals back when it finishes (a symbol table may
+be reused by later assemblies). The classes themselves carry no
+instrumentation, so an assembly without a profiler runs exactly the code it
+would run otherwise.
+
+Phases are timed exclusively: an expression evaluated while an instruction
+is encoded counts towards "expressions" only. Source lines are timed
+including the phases they run but excluding nested lines, so an ICL or a
+macro invocation is not charged for the lines it pulls in.
+"""
+
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from pymads.assembler.assembler import Assembler
+
+DEFAULT_TOP = 10
+
+# Assembler methods timed as phases, by phase name
+_PHASES = (
+    ("read", "_read_lines"),
+    ("tokenize", "_tokenize_lines"),
+    ("tokenize", "_tokenize_line"),
+    ("expressions", "_value"),
+    ("encoding", "_instruction"),
+    ("encoding", "_data"),
+)
+
+_clock = time.perf_counter
+
+# Marks an attribute the instance did not have before it was replaced
+_MISSING = object()
+
+
+class Profiler:
+    """
+    Timings and counters of one assembly.
+
+    Attributes:
+        total: Wall time from attaching to finishing, in seconds
+        passes: Time of each pass, in seconds
+        phases: Exclusive time of each phase, in seconds
+        calls: Number of calls of each phase
+        counters: Symbol table operation counts
+        caches: ``(hits, misses)`` of each cache used by the assembly
+        lines: Time spent on each ``(path, line)``, in seconds
+    """
+
+    def __init__(self):
+        self.total = 0.0
+        self.passes: List[float] = []
+        self.phases: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {"symbol lookups": 0, "symbol defines": 0}
+        self.caches: Dict[str, Tuple[int, int]] = {}
+        self.lines: Dict[Tuple[Optional[str], Optional[int]], float] = {}
+        self._started = 0.0
+        self._pass_started = 0.0
+        self._phase_stack: List[float] = []
+        self._line_stack: List[float] = []
+        self._baseline: Dict[str, Tuple[int, int]] = {}
+        # (object, attribute, previous instance value) of replaced methods
+        self._replaced: List[Tuple[Any, str, Any]] = []
+
+    def attach(self, assembler: "Assembler") -> None:
+        """
+        Instrument an assembler.
+
+        Args:
+            assembler: The assembler to profile
+        """
+        for name, method in _PHASES:
+            timed = self._phase(name, getattr(assembler, method))
+            self._replace(assembler, method, timed)
+        streamed = self._stream("read", assembler._iter_lines)
+        self._replace(assembler, "_iter_lines", streamed)
+        image = assembler.image
+        self._replace(image, "flush", self._phase("flush", image.flush))
+        self._replace(
+            assembler, "_process_line", self._line(assembler, assembler._process_line)
+        )
+        table = assembler.symbols
+        self._replace(table, "lookup", self._count("symbol lookups", table.lookup))
+        self._replace(
+            table,
+            "define_symbol",
+            self._count("symbol defines", table.define_symbol),
+        )
+        self._baseline = self._cache_counts(assembler)
+        self._started = _clock()
+
+    def _replace(self, instance: Any, name: str, wrapper: Callable) -> None:
+        self._replaced.append((instance, name, vars(instance).get(name, _MISSING)))
+        setattr(instance, name, wrapper)
+
+    def _restore(self) -> None:
+        """Put back the methods replaced by attach, last replaced first."""
+        while self._replaced:
+            instance, name, previous = self._replaced.pop()
+            if previous is _MISSING:
+                delattr(instance, name)
+            else:
+                setattr(instance, name, previous)
+
+    def _phase(self, name: str, function: Callable) -> Callable:
+        stack = self._phase_stack
+        phases = self.phases
+        calls = self.calls
+
+        def timed(*args, **kwargs):
+            stack.append(0.0)
+            start = _clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = _clock() - start
+                phases[name] = phases.get(name, 0.0) + elapsed - stack.pop()
+                calls[name] = calls.get(name, 0) + 1
+                if stack:
+                    stack[-1] += elapsed
+
+        return timed
+
+    def _stream(self, name: str, function: Callable) -> Callable:
+        """Time a function returning an iterator, including the iteration."""
+        stack = self._phase_stack
+        phases = self.phases
+        calls = self.calls
+
+        def timed(*args, **kwargs):
+            calls[name] = calls.get(name, 0) + 1
+            iterator = iter(function(*args, **kwargs))
+            while True:
+                start = _clock()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed = _clock() - start
+                    phases[name] = phases.get(name, 0.0) + elapsed
+                    if stack:
+                        stack[-1] += elapsed
+                yield item
+
+        return timed
+
+    def _line(self, assembler: "Assembler", function: Callable) -> Callable:
+        stack = self._line_stack
+        lines = self.lines
+
+        def timed(tokens):
+            location = assembler._location
+            stack.append(0.0)
+            start = _clock()
+            try:
+                return function(tokens)
+            finally:
+                elapsed = _clock() - start
+                lines[location] = lines.get(location, 0.0) + elapsed - stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+
+        return timed
+
+    def _count(self, name: str, function: Callable) -> Callable:
+        counters = self.counters
+
+        def counted(*args, **kwargs):
+            counters[name] += 1
+            return function(*args, **kwargs)
+
+        return counted
+
+    @staticmethod
+    def _cache_counts(assembler: "Assembler") -> Dict[str, Tuple[int, int]]:
+        counts = {
+            "expressions": (assembler.expressions.hits, assembler.expressions.misses)
+        }
+        if assembler.source_cache is not None:
+            sources = assembler.source_cache
+            counts["sources"] = (sources.hits, sources.misses)
+        if assembler.cache is not None:
+            counts["incremental"] = (assembler.cache.hits, assembler.cache.misses)
+        macros = assembler.macros.macros.values()
+        if macros:
+            counts["macros"] = (
+                sum(macro.hits for macro in macros),
+                sum(macro.misses for macro in macros),
+            )
+        return counts
+
+    def begin_pass(self) -> None:
+        """Mark the start of a pass."""
+        self._pass_started = _clock()
+
+    def end_pass(self) -> None:
+        """Record the time of the pass begun last."""
+        self.passes.append(_clock() - self._pass_started)
+
+    def finish(self, assembler: "Assembler") -> None:
+        """
+        Stop timing, restore the instrumented methods and collect the cache
+        statistics of the assembly.
+
+        Args:
+            assembler: The profiled assembler
+        """
+        self.total = _clock() - self._started
+        self._restore()
+        baseline = self._baseline
+        for name, (hits, misses) in self._cache_counts(assembler).items():
+            old_hits, old_misses = baseline.get(name, (0, 0))
+            self.caches[name] = (hits - old_hits, misses - old_misses)
+
+    def slowest_lines(
+        self, top: int = DEFAULT_TOP
+    ) -> List[Tuple[Optional[str], Optional[int], float]]:
+        """
+        Get the source lines that took longest.
+
+        Args:
+            top: Number of lines
+
+        Returns:
+            ``(path, line, seconds)`` tuples, slowest first
+        """
+        ranked = sorted(self.lines.items(), key=lambda item: item[1], reverse=True)
+        return [(path, line, seconds) for (path, line), seconds in ranked[:top]]
+
+    def slowest_files(self, top: int = DEFAULT_TOP) -> List[Tuple[str, float]]:
+        """
+        Get the source files whose lines took longest.
+
+        Args:
+            top: Number of files
+
+        Returns:
+            ``(path, seconds)`` tuples, slowest first
+        """
+        files: Dict[str, float] = {}
+        for (path, _), seconds in self.lines.items():
+            if path is not None:
+                files[path] = files.get(path, 0.0) + seconds
+        ranked = sorted(files.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:top]
+
+    def to_dict(self, top: int = DEFAULT_TOP) -> Dict:
+        """
+        Convert the profile to a JSON-compatible dictionary.
+
+        Args:
+            top: Number of slowest files and lines included
+
+        Returns:
+            The profile
+        """
+        return {
+            "total": self.total,
+            "passes": list(self.passes),
+            "phases": {
+                name: {"seconds": seconds, "calls": self.calls[name]}
+                for name, seconds in self.phases.items()
+            },
+            "counters": dict(self.counters),
+            "caches": {
+                name: {"hits": hits, "misses": misses, "hit_rate": _rate(hits, misses)}
+                for name, (hits, misses) in self.caches.items()
+            },
+            "slowest_files": [
+                {"file": path, "seconds": seconds}
+                for path, seconds in self.slowest_files(top)
+            ],
+            "slowest_lines": [
+                {"file": path, "line": line, "seconds": seconds}
+                for path, line, seconds in self.slowest_lines(top)
+            ],
+        }
+
+    def format_table(self, top: int = DEFAULT_TOP) -> str:
+        """
+        Format the profile as a text report.
+
+        Args:
+            top: Number of slowest files and lines listed
+
+        Returns:
+            The report
+        """
+        rows = [f"{'Total':28} {self.total * 1e3:10.2f} ms"]
+        for number, seconds in enumerate(self.passes, 1):
+            rows.append(f"  pass {number:<21} {seconds * 1e3:10.2f} ms")
+        rows.append("Phases")
+        for name, seconds in sorted(self.phases.items(), key=lambda item: -item[1]):
+            rows.append(
+                f"  {name:26} {seconds * 1e3:10.2f} ms {self.calls[name]:10} calls"
+            )
+        rows.append("Counters")
+        for name, count in self.counters.items():
+            rows.append(f"  {name:26} {count:10}")
+        rows.append("Caches")
+        for name, (hits, misses) in self.caches.items():
+            rows.append(
+                f"  {name:26} {hits:10} hits {misses:8} misses "
+                f"{_rate(hits, misses):7.1%}"
+            )
+        rows.append("Slowest files")
+        for path, seconds in self.slowest_files(top):
+            rows.append(f"  {seconds * 1e3:10.2f} ms  {path}")
+        rows.append("Slowest lines")
+        for path, line, seconds in self.slowest_lines(top):
+            rows.append(f"  {seconds * 1e3:10.2f} ms  {path} ({line})")
+        return "\n".join(rows)
+
+
+def _rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
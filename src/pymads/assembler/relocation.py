@@ -0,0 +1,59 @@
+"""
+Relocation records of separately assembled modules.
+
+Original Pascal directives: .RELOC, .EXTRN, .PUBLIC
+
+A ``.reloc`` module is assembled at address 0 and placed by the linker.
+Every output site whose value depends on where the module is placed, or on
+an ``.extrn`` symbol of another module, is recorded as a Relocation; the
+linker rewrites exactly those sites.
+"""
+
+from typing import NamedTuple, Optional
+
+WORD = "word"  # Little-endian 16-bit address
+LOW = "low"  # Low byte of an address (<expression)
+HIGH = "high"  # High byte of an address (>expression)
+
+SIZES = {WORD: 2, LOW: 1, HIGH: 1}
+
+
+class Relocation(NamedTuple):
+    """
+    An output site to rewrite when linking.
+
+    Attributes:
+        address: Address of the site in the module's address space
+        kind: WORD, LOW or HIGH
+        symbol: External symbol the value is relative to, or None for the
+            module's own load address
+        addend: Value of the site when the module is placed at 0 and all
+            external symbols are 0
+    """
+
+    address: int
+    kind: str
+    symbol: Optional[str]
+    addend: int
+
+
+def encode(kind: str, value: int) -> bytes:
+    """
+    Encode a relocated value.
+
+    Args:
+        kind: WORD, LOW or HIGH
+        value: Final address
+
+    Returns:
+        The bytes of the site
+
+    Raises:
+        ValueError: If the address does not fit in 16 bits
+    """
+    if not 0 <= value <= 0xFFFF:
+        raise ValueError(f"Relocated value out of range: ${value:X}")
+    if kind == WORD:
+        return value.to_bytes(2, "little")
+    byte = value >> 8 if kind == HIGH else value
+    return bytes((byte & 0xFF,))
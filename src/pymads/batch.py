@@ -0,0 +1,156 @@
+"""
+Asynchronous batch assembly for build servers.
+
+An asyncio build orchestrator hands ``assemble_batch`` any number of
+sources. Source files are read in threads, so reads overlap; assembly is
+CPU-bound and runs in a process pool, in chunks of a few sources so that
+small programs do not pay a pool round trip each. Results are yielded as
+their chunk completes, and at most ``max_in_flight`` sources are read,
+queued or being assembled at any time, so memory stays bounded however
+many sources are given.
+
+Example::
+
+    async for result in assemble_batch(paths, jobs=8):
+        if result.error is None:
+            write(result.source, result.binary)
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import AsyncIterator, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from pymads.assembler.assembler import AssemblyError, AssemblyOptions, assemble
+from pymads.parser.expressions import ExpressionCache
+
+DEFAULT_CHUNK_SIZE = 8
+
+
+class BatchResult(NamedTuple):
+    """
+    Outcome of one assembly of a batch.
+
+    Attributes:
+        source: Source file path, as given
+        binary: Output file content (empty on error)
+        passes: Number of passes run (0 on error)
+        error: Error message, or None on success
+    """
+
+    source: str
+    binary: bytes = b""
+    passes: int = 0
+    error: Optional[str] = None
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as stream:
+        return stream.read()
+
+
+def _assemble(
+    path: str, data: bytes, options: AssemblyOptions, expressions: ExpressionCache
+) -> BatchResult:
+    try:
+        result = assemble(path, options, content=data, expressions=expressions)
+    except AssemblyError as error:
+        return BatchResult(path, error=str(error))
+    except OSError as error:
+        return BatchResult(path, error=f"ERROR: {error}")
+    return BatchResult(path, result.binary, result.passes)
+
+
+def _assemble_chunk(
+    chunk: List[Tuple[str, bytes]], options: AssemblyOptions
+) -> List[BatchResult]:
+    """Assemble a chunk of sources in a worker process."""
+    # The sources of a chunk share compiled expressions and literals
+    expressions = ExpressionCache(fold_case=True)
+    return [_assemble(path, data, options, expressions) for path, data in chunk]
+
+
+async def _process(
+    paths: List[str], options: AssemblyOptions, executor: Executor
+) -> List[BatchResult]:
+    """Read a chunk of sources concurrently, then assemble it in the pool."""
+    loop = asyncio.get_running_loop()
+    contents = await asyncio.gather(
+        *(loop.run_in_executor(None, _read, path) for path in paths),
+        return_exceptions=True,
+    )
+    results = []
+    chunk = []
+    for path, data in zip(paths, contents):
+        if isinstance(data, OSError):
+            results.append(BatchResult(path, error=f"ERROR: {data}"))
+        elif isinstance(data, BaseException):
+            raise data
+        else:
+            chunk.append((path, data))
+    if chunk:
+        results += await loop.run_in_executor(
+            executor, _assemble_chunk, chunk, options
+        )
+    return results
+
+
+async def assemble_batch(
+    sources: Iterable[str],
+    options: Optional[AssemblyOptions] = None,
+    jobs: int = 0,
+    max_in_flight: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[BatchResult]:
+    """
+    Assemble many sources concurrently, yielding results as they complete.
+
+    Errors are reported in the results; one failing source does not stop
+    the batch.
+
+    Args:
+        sources: Source file paths; consumed lazily
+        options: Assembly options shared by all sources
+        jobs: Worker processes of the pool created for the batch (0 for one
+            per CPU); ignored if ``executor`` is given
+        max_in_flight: Most sources read or assembled at once (default:
+            two chunks per worker)
+        executor: Executor to assemble in, e.g. a pool kept by the caller
+            across batches; it is not shut down
+        chunk_size: Sources sent to a worker at once; larger chunks spread
+            the cost of a pool round trip over more small assemblies
+
+    Yields:
+        One BatchResult per source, in completion order
+    """
+    options = options or AssemblyOptions()
+    workers = jobs or os.cpu_count() or 1
+    owned = executor is None
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    chunk_size = max(1, chunk_size)
+    limit = max(1, (max_in_flight or 2 * workers * chunk_size) // chunk_size)
+    pending: Set["asyncio.Future[List[BatchResult]]"] = set()
+    remaining = iter(sources)
+    try:
+        while True:
+            while len(pending) < limit:
+                paths = list(islice(remaining, chunk_size))
+                if not paths:
+                    break
+                pending.add(asyncio.ensure_future(_process(paths, options, executor)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                for result in task.result():
+                    yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        if owned:
+            executor.shutdown(wait=not pending, cancel_futures=True)
@@ -3,46 +3,250 @@
 PyMADS CLI - Command-line interface for the Python Mad-Assembler
 
 Usage:
-    pymads <source_file> [-o <output_file>] [options]
+    pymads serve [--socket=<path>] [-v]
+    pymads stop [--socket=<path>]
+    pymads link <module>... -o <output_file> [--jobs=<n>] [--link-base=<address>]
+                [-I <dir>]... [-v] [options]
+    pymads <source_file> [-o <output_file>] [-I <dir>]... [-v] [--socket=<path>]
+                [options]
     pymads (-h | --help)
     pymads --version
 
 Options:
     -h --help           Show this help message and exit
     --version           Show version and exit
-    -o <output_file>    Output file [default: <source_file_base>.bin]
+    -o <output_file>    Output file (default: the source file with .bin)
     -v --verbose        Enable verbose output
+    --cpu=<cpu>         Target processor: 6502, 65c02 or 65816 [default: 6502]
+    -I <dir>            Also search <dir> for ICL and INS files
     --list              Generate listing file
     --symbols           Generate symbols file
+    -x --exclude-unreferenced  Leave out .PROC blocks no kept code references
+    -i --incremental    Reuse unchanged included files from the cache
+    -t --token-cache    Reuse tokenized sources from <cache-dir>/tokens
+    --cache-dir=<dir>   Cache directory of -i and -t [default: .pymads_cache]
+    --socket=<path>     Daemon socket; when assembling, use the daemon if one
+                        is listening [default: $PYMADS_SOCKET]
+    --profile           Assemble in-process and print where the time went
+    --profile-json=<file>  Assemble in-process and write the profile as JSON
+    -j --jobs=<n>       Modules assembled in parallel, 0 for one per CPU
+                        [default: 0]
+    --link-base=<address>  Load address of the first .reloc module
+                        [default: $2000]
+
+Commands:
+    serve               Run an assembler daemon that keeps caches warm
+    stop                Stop a running daemon
+    link                Assemble modules in parallel and link them
 """
 
 from docopt import docopt
 import os
 import sys
 
+# The assembler, the daemon and its client are imported on first use, so
+# --help, --version and daemon round trips do not pay for loading them.
+
 __version__ = '0.1.0'
 
+SOCKET_ENVIRONMENT = 'PYMADS_SOCKET'
+
+
+def _socket_path(args, required):
+    """Resolve --socket, where $PYMADS_SOCKET stands for the environment."""
+    path = args['--socket']
+    if path == f'${SOCKET_ENVIRONMENT}':
+        path = os.environ.get(SOCKET_ENVIRONMENT)
+    if not path and required:
+        from pymads.server import default_socket_path
+        path = default_socket_path()
+    return path
+
+
+def _serve(args):
+    from pymads.server import AssemblyServer
+
+    path = _socket_path(args, True)
+    try:
+        server = AssemblyServer(path)
+    except OSError as error:
+        print(f"ERROR: {error}", file=sys.stderr)
+        return 1
+    if args['--verbose']:
+        print(f"PyMADS v{__version__} listening on {path}")
+    try:
+        server.serve_until_shutdown()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _stop(args):
+    from pymads.client import send_request
+
+    try:
+        send_request(_socket_path(args, True), {'command': 'shutdown'})
+    except OSError as error:
+        print(f"ERROR: No daemon: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _address(text):
+    """Parse an address written as $hex or a Python integer literal."""
+    if text.startswith('$'):
+        return int(text[1:], 16)
+    return int(text, 0)
+
+
+def _options(args):
+    """Assembly options of the command line, in their JSON form."""
+    return {
+        'cpu': args['--cpu'],
+        'include_paths': [os.path.abspath(path) for path in args['-I']],
+        'incremental': args['--incremental'],
+        'cache_dir': args['--cache-dir'],
+        'token_cache': args['--token-cache'],
+        'exclude_unreferenced': args['--exclude-unreferenced'],
+    }
+
+
+def _link(args):
+    import time
+
+    from pymads.assembler.assembler import AssemblyError
+    from pymads.assembler.linker import assemble_modules, link
+    from pymads.server import options_from_json
+
+    try:
+        base = _address(args['--link-base'])
+        jobs = int(args['--jobs'])
+        options = options_from_json(_options(args))
+    except ValueError as error:
+        print(f"ERROR: {error}", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    try:
+        modules = assemble_modules(args['<module>'], options, jobs)
+        assembled = time.perf_counter()
+        result = link(modules, base, options.cpu)
+        with open(args['-o'], 'wb') as output:
+            output.write(result.binary)
+    except AssemblyError as error:
+        print(error, file=sys.stderr)
+        return 2
+    except OSError as error:
+        print(f"ERROR: {error}", file=sys.stderr)
+        return 2
+    linked = time.perf_counter()
+
+    if args['--verbose']:
+        print(f"PyMADS v{__version__}")
+        for module, origin in zip(modules, result.bases):
+            placed = f"${origin:04X}" if module.relocatable else "absolute"
+            print(f"{module.path}: {placed}, {len(module.relocations)} relocations")
+        print(f"Output file: {args['-o']} ({len(result.binary)} bytes)")
+        print(f"Assembly: {assembled - started:.3f} s, "
+              f"link: {linked - assembled:.3f} s")
+    return 0
+
+
+def _assemble_local(source_file, output_file, options, profiler=None):
+    """Assemble in this process and return a response like the daemon's."""
+    from pymads.assembler.assembler import AssemblyError, assemble
+    from pymads.server import options_from_json
+
+    try:
+        result = assemble(source_file, options_from_json(options),
+                          profiler=profiler)
+        with open(output_file, 'wb') as output:
+            output.write(result.binary)
+    except AssemblyError as error:
+        return {'ok': False, 'error': str(error)}
+    except (OSError, ValueError) as error:
+        return {'ok': False, 'error': f"ERROR: {error}"}
+    return {
+        'ok': True,
+        'bytes': len(result.binary),
+        'passes': result.passes,
+        'cache_hits': result.cache_hits,
+        'cache_misses': result.cache_misses,
+        'changes': list(result.changes),
+        'patched': result.patched,
+        'excluded': list(result.excluded),
+        'excluded_bytes': result.excluded_bytes,
+        'exclude_time': result.exclude_time,
+    }
+
 
 def main():
     """Main entry point for the PyMADS CLI."""
     args = docopt(__doc__, version=f'PyMADS v{__version__}')
-    
-    # This is a placeholder implementation
-    # In the future, this will call the actual assembler
+
+    if args['serve']:
+        return _serve(args)
+    if args['stop']:
+        return _stop(args)
+    if args['link']:
+        return _link(args)
+
     source_file = args['<source_file>']
     output_file = args['-o']
-    
+    verbose = args['--verbose']
+    base_name = os.path.splitext(source_file)[0]
+
     if output_file is None:
-        base_name = os.path.splitext(source_file)[0]
         output_file = f"{base_name}.bin"
-    
-    print(f"PyMADS v{__version__}")
-    print(f"Source file: {source_file}")
-    print(f"Output file: {output_file}")
-    print("Note: This is a placeholder. The actual assembler is not yet implemented.")
-    
-    # Return with error code since we're not actually assembling anything yet
-    return 1
+
+    options = _options(args)
+    if args['--list']:
+        options['listing'] = os.path.abspath(f"{base_name}.lst")
+    if args['--symbols']:
+        options['labels'] = os.path.abspath(f"{base_name}.lab")
+    profiler = None
+    if args['--profile'] or args['--profile-json']:
+        from pymads.assembler.profiler import Profiler
+        profiler = Profiler()
+
+    response = None
+    socket_path = None if profiler else _socket_path(args, False)
+    if socket_path:
+        from pymads.client import assemble_remote
+
+        try:
+            response = assemble_remote(socket_path, source_file, output_file, options)
+        except OSError:
+            response = None  # No daemon; assemble in-process
+    if response is None:
+        response = _assemble_local(source_file, output_file, options, profiler)
+
+    if not response['ok']:
+        print(response['error'], file=sys.stderr)
+        return 2
+
+    if verbose:
+        print(f"PyMADS v{__version__}")
+        print(f"Source file: {source_file}")
+        print(f"Output file: {output_file} ({response['bytes']} bytes)")
+        print(f"Passes: {response['passes']}")
+        changes = ', '.join(str(count) for count in response['changes'])
+        print(f"Changed symbols per pass: {changes}")
+        print(f"Sites patched without a new pass: {response['patched']}")
+        if options['exclude_unreferenced']:
+            print(f"Unreferenced procedures excluded: "
+                  f"{len(response['excluded'])} ({response['excluded_bytes']} bytes) "
+                  f"in {response['exclude_time'] * 1e3:.1f} ms")
+        if options['incremental']:
+            print(f"Cache: {response['cache_hits']} hits, "
+                  f"{response['cache_misses']} misses")
+    if args['--profile']:
+        print(profiler.format_table())
+    if args['--profile-json']:
+        import json
+
+        with open(args['--profile-json'], 'w') as stream:
+            json.dump(profiler.to_dict(), stream, indent=2)
+    return 0
 
 
 if __name__ == '__main__':
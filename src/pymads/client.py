@@ -0,0 +1,80 @@
+"""
+Thin client for the ``pymads serve`` daemon.
+
+The client only depends on the standard library, so a CLI run that hands
+its work to a daemon does not import the assembler at all. Callers fall
+back to assembling in-process when no daemon answers.
+"""
+
+import json
+import os
+import socket
+from typing import Dict, Optional
+
+
+def send_request(path: str, request: Dict, timeout: Optional[float] = None) -> Dict:
+    """
+    Send one request to the daemon and wait for its response.
+
+    Args:
+        path: Daemon socket path
+        request: Request object
+        timeout: Socket timeout in seconds (None to wait indefinitely)
+
+    Returns:
+        The response object
+
+    Raises:
+        OSError: If no daemon is listening or the connection fails
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(path)
+        connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with connection.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("Daemon closed the connection")
+    return json.loads(line)
+
+
+def assemble_remote(
+    path: str, source: str, output: str, options: Optional[Dict] = None
+) -> Dict:
+    """
+    Ask the daemon to assemble a file.
+
+    Relative paths are made absolute, since the daemon may run in another
+    working directory.
+
+    Args:
+        path: Daemon socket path
+        source: Source file path
+        output: Output file path
+        options: AssemblyOptions fields in JSON form
+
+    Returns:
+        The daemon's response (``ok`` plus statistics or ``error``)
+
+    Raises:
+        OSError: If no daemon is listening or the connection fails
+    """
+    options = dict(options or {})
+    if "cache_dir" in options:
+        options["cache_dir"] = os.path.abspath(options["cache_dir"])
+    for name in ("listing", "labels"):
+        if options.get(name):
+            options[name] = os.path.abspath(options[name])
+    if "include_paths" in options:
+        options["include_paths"] = [
+            os.path.abspath(include) for include in options["include_paths"]
+        ]
+    return send_request(
+        path,
+        {
+            "command": "assemble",
+            "source": os.path.abspath(source),
+            "output": os.path.abspath(output),
+            "options": options,
+        },
+    )
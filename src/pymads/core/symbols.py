@@ -1,11 +1,51 @@
+import sys
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+
+class SymbolType(str, Enum):
+    """
+    Kind of a symbol.
+
+    Members compare equal to the single-character codes used by MADS
+    ('L', 'C', 'V'), so existing ``symbol.type == "L"`` checks keep working
+    while every symbol shares one of three singleton objects.
+    """
+
+    LABEL = "L"
+    CONSTANT = "C"
+    VARIABLE = "V"
+
+
 class Symbol:
     """
     Represents a symbol in the assembler.
 
     Original Pascal structure: Similar to the label record in MADS
+
+    Symbols use ``__slots__`` and interned names because large generated
+    sources define hundreds of thousands of labels. The ``references`` list
+    is only allocated once the first reference is recorded.
     """
 
-    def __init__(self, name: str, value: int = 0, symbol_type: str = "L"):
+    __slots__ = ("name", "value", "type", "is_defined", "_references")
+
+    def __init__(
+        self,
+        name: str,
+        value: int = 0,
+        symbol_type: Union[str, SymbolType] = SymbolType.LABEL,
+    ):
         """
         Initialize a new symbol.
 
@@ -13,12 +53,296 @@ class Symbol:
             name: Symbol name
             value: Symbol value (address or constant)
             symbol_type: Symbol type ('L' for label, 'C' for constant, 'V' for variable)
+
+        Raises:
+            ValueError: If the symbol type is unknown
         """
-        self.name = name
+        self.name = sys.intern(name)
         self.value = value
-        self.type = symbol_type
+        self.type = SymbolType(symbol_type)
         self.is_defined = False
-        self.references = []
+        self._references: Optional[List[Any]] = None
+
+    @property
+    def references(self) -> List[Any]:
+        """
+        Fixups and other sites referencing this symbol, allocated on first access.
+
+        Returns:
+            The (possibly new) list of references
+        """
+        if self._references is None:
+            self._references = []
+        return self._references
+
+    @property
+    def has_references(self) -> bool:
+        """True if at least one reference has been recorded."""
+        return bool(self._references)
+
+    def add_reference(self, reference: Any) -> None:
+        """
+        Record a reference to this symbol.
+
+        Args:
+            reference: Reference site (usually a Fixup)
+        """
+        if self._references is None:
+            self._references = [reference]
+        else:
+            self._references.append(reference)
+
+    def __repr__(self) -> str:
+        return (
+            f"Symbol({self.name!r}, {self.value!r}, {self.type.value!r}, "
+            f"is_defined={self.is_defined})"
+        )
+
+
+class Fixup:
+    """
+    An output site whose value depends on symbols that may change.
+
+    Original Pascal mechanism: MADS re-evaluates every operand on each pass;
+    here each symbol used by an expression records the Fixup in its
+    ``references`` so defining the symbol patches the site directly.
+    """
+
+    __slots__ = (
+        "target",
+        "offset",
+        "size",
+        "expression",
+        "scope",
+        "anchor",
+        "resolved",
+    )
+
+    def __init__(
+        self,
+        target: Any,
+        offset: int,
+        size: int,
+        expression: Callable[["SymbolTable"], int],
+        scope: Optional["Scope"] = None,
+    ):
+        """
+        Initialize a new fixup.
+
+        Args:
+            target: Writable buffer receiving the value (e.g. a bytearray)
+            offset: Offset of the site in ``target``
+            size: Number of bytes to write (little-endian)
+            expression: Callable computing the value from a SymbolTable;
+                raises KeyError while a symbol it uses is undefined
+            scope: Scope the expression was written in (None for global)
+        """
+        self.target = target
+        self.offset = offset
+        self.size = size
+        self.expression = expression
+        self.scope = scope
+        self.anchor: Optional[str] = None  # Anchor of the scope when registered
+        self.resolved = False
+
+    def apply(self, table: "SymbolTable") -> bool:
+        """
+        Evaluate the expression and patch the site.
+
+        Args:
+            table: Symbol table to evaluate against
+
+        Returns:
+            True if the site was patched, False if a symbol is still undefined
+        """
+        current = table.scope
+        scope = table.scope = self.scope or table.root
+        anchor = scope.anchor
+        if self.anchor is not None:
+            scope.anchor = self.anchor
+        try:
+            value = self.expression(table)
+        except KeyError:
+            return False
+        finally:
+            scope.anchor = anchor
+            table.scope = current
+        self.write(value)
+        self.resolved = True
+        return True
+
+    def write(self, value: int) -> None:
+        """
+        Store a value at the site; subclasses may encode it otherwise.
+
+        Args:
+            value: Value of the expression
+        """
+        size = self.size
+        self.target[self.offset : self.offset + size] = (
+            value & ((1 << (size << 3)) - 1)
+        ).to_bytes(size, "little")
+
+
+class ReferenceGraph:
+    """
+    Which symbols reference which, and which of them are reachable.
+
+    Original Pascal mechanism: the unused .PROC tracking behind MADS -x
+
+    An edge ``source -> target`` means that code owned by ``source`` uses
+    ``target``. Edges are kept in the graph rather than in
+    ``Symbol.references``: that list is the fixup index, which is cleared
+    every pass, while edges must last for the whole assembly. Roots are
+    always reachable. Reachability is kept up to date as roots and edges
+    are added: a symbol that becomes reachable makes everything it
+    references reachable, so it is never recomputed from scratch.
+
+    Attributes:
+        live: Symbols reachable from a root
+    """
+
+    def __init__(self):
+        self.live: Set[Symbol] = set()
+        self._targets: Dict[Symbol, Set[Symbol]] = {}
+        self._sources: Dict[Symbol, Set[Symbol]] = {}
+
+    def add_root(self, symbol: Symbol) -> None:
+        """
+        Make a symbol, and everything it references, reachable.
+
+        Args:
+            symbol: Root symbol
+        """
+        if symbol in self.live:
+            return
+        live = self.live
+        targets = self._targets
+        stack = [symbol]
+        while stack:
+            symbol = stack.pop()
+            if symbol not in live:
+                live.add(symbol)
+                stack.extend(targets.get(symbol, ()))
+
+    def add_reference(self, source: Optional[Symbol], target: Symbol) -> bool:
+        """
+        Record that ``source`` references ``target``.
+
+        Args:
+            source: Referencing symbol, or None for code that is always
+                kept (``target`` becomes a root)
+            target: Referenced symbol
+
+        Returns:
+            True if the edge is new
+        """
+        if source is None:
+            new = target not in self.live
+            self.add_root(target)
+            return new
+        targets = self._targets.setdefault(source, set())
+        if target in targets:
+            return False
+        targets.add(target)
+        self._sources.setdefault(target, set()).add(source)
+        if source in self.live:
+            self.add_root(target)
+        return True
+
+    def referrers(self, symbol: Symbol) -> Set[Symbol]:
+        """
+        Get the symbols referencing a symbol.
+
+        Args:
+            symbol: Referenced symbol
+
+        Returns:
+            Sources of the edges to ``symbol`` (roots are not included)
+        """
+        return self._sources.get(symbol, set())
+
+    def is_live(self, symbol: Symbol) -> bool:
+        """
+        Check whether a symbol is reachable from a root.
+
+        Args:
+            symbol: Symbol to check
+
+        Returns:
+            True if some root references it, directly or not
+        """
+        return symbol in self.live
+
+
+class Scope:
+    """
+    A single symbol scope (the global scope, a ``.proc`` or a ``.local`` block).
+
+    Each scope owns a dictionary of the symbols declared directly in it,
+    keyed by their unqualified name, and precomputes the chain of dictionaries
+    to probe when resolving a name from inside it (its own first, the global
+    scope last). Lookups therefore never build qualified names.
+
+    A ``?`` label is local to the region after the last other label declared
+    in its scope, the ``anchor``: it is keyed as ``anchor + name``, so the
+    same ``?LOOP`` can be declared once after every label.
+    """
+
+    __slots__ = ("name", "parent", "prefix", "symbols", "children", "chain", "anchor")
+
+    def __init__(self, name: str = "", parent: Optional["Scope"] = None):
+        """
+        Initialize a new scope.
+
+        Args:
+            name: Scope name (empty for the global scope)
+            parent: Enclosing scope, or None for the global scope
+        """
+        self.name = sys.intern(name)
+        self.parent = parent
+        self.symbols: Dict[str, Symbol] = {}
+        self.children: Dict[str, Scope] = {}
+        self.anchor = ""  # Last label declared that does not start with '?'
+        if parent is None:
+            self.prefix = ""
+            self.chain: Tuple[Dict[str, Symbol], ...] = (self.symbols,)
+        else:
+            self.prefix = f"{parent.prefix}{name}."
+            self.chain = (self.symbols,) + parent.chain
+
+    @property
+    def depth(self) -> int:
+        """Nesting depth (0 for the global scope)."""
+        return len(self.chain) - 1
+
+    def key(self, name: str) -> str:
+        """
+        Get the key of a name in ``symbols``.
+
+        Args:
+            name: Unqualified symbol name
+
+        Returns:
+            ``anchor + name`` for a ``?`` label, otherwise the name itself
+        """
+        return self.anchor + name if name[:1] == "?" else name
+
+    def resolve(self, name: str) -> Optional[Symbol]:
+        """
+        Resolve an unqualified name from this scope outwards.
+
+        Args:
+            name: Unqualified symbol name
+
+        Returns:
+            The innermost visible Symbol, or None if no scope defines it
+        """
+        for symbols in self.chain:
+            symbol = symbols.get(name)
+            if symbol is not None:
+                return symbol
+        return None
 
 
 class SymbolTable:
@@ -26,33 +350,169 @@ class SymbolTable:
     Manages symbols and their values.
 
     Original Pascal implementation: Similar to the label handling in MADS
+
+    Symbols live in a tree of scopes mirroring nested ``.proc``/``.local``
+    blocks. ``symbols`` additionally maps every fully qualified name
+    (e.g. ``MAIN.LOOP``) to its Symbol.
     """
 
     def __init__(self):
-        self.symbols = {}  # Dictionary of symbols by name
+        self.symbols = {}  # Dictionary of symbols by qualified name
+        self.root = Scope()
+        self.scope = self.root  # Current scope
+        self.pending: Set[Fixup] = set()  # Fixups waiting for undefined symbols
+        self.changed: Set[str] = set()  # Names whose value define_symbol changed
+        # Fixups using names not declared yet, by the last part of the name
+        self._unbound: Dict[str, List[Tuple[Scope, str, Fixup]]] = {}
+        self._fixed: Set[Symbol] = set()  # Symbols with fixups in references
 
-    def add_symbol(self, name: str, value: int = 0, symbol_type: str = "L") -> Symbol:
+    def enter_scope(self, name: str) -> Scope:
         """
-        Add a symbol to the table.
+        Enter a nested scope of the current scope.
+
+        Re-entering a scope on a later pass reuses the existing one, so
+        symbols declared in earlier passes stay visible.
 
         Args:
-            name: Symbol name
+            name: Scope name
+
+        Returns:
+            The entered Scope
+        """
+        scope = self.scope.children.get(name)
+        if scope is None:
+            scope = Scope(name, self.scope)
+            self.scope.children[scope.name] = scope
+        self.scope = scope
+        return scope
+
+    def exit_scope(self) -> Scope:
+        """
+        Leave the current scope.
+
+        Returns:
+            The enclosing Scope, which becomes current
+
+        Raises:
+            ValueError: If the current scope is the global scope
+        """
+        if self.scope.parent is None:
+            raise ValueError("Cannot leave the global scope")
+        self.scope = self.scope.parent
+        return self.scope
+
+    def add_symbol(
+        self,
+        name: str,
+        value: int = 0,
+        symbol_type: Union[str, SymbolType] = SymbolType.LABEL,
+    ) -> Symbol:
+        """
+        Add a symbol to the current scope.
+
+        Adding a name the scope already has updates that Symbol in place, so
+        the references and fixups recorded with it are kept; a defined
+        symbol is redefined with the new value.
+
+        Args:
+            name: Unqualified symbol name; a ``?`` label is keyed under the
+                scope's anchor
             value: Symbol value
             symbol_type: Symbol type
 
         Returns:
-            The created Symbol object
+            The created or updated Symbol object
         """
-        symbol = Symbol(name, value, symbol_type)
-        self.symbols[name] = symbol
+        scope = self.scope
+        name = scope.key(name)
+        symbol = scope.symbols.get(name)
+        if symbol is not None:
+            symbol.type = SymbolType(symbol_type)
+            if symbol.is_defined:
+                self.define_symbol(symbol.name, value)
+            else:
+                symbol.value = value
+            return symbol
+        symbol = Symbol(scope.prefix + name, value, symbol_type)
+        scope.symbols[sys.intern(name)] = symbol
+        self.symbols[symbol.name] = symbol
+        if name in self._unbound:
+            self._bind(name, symbol)
         return symbol
 
+    def _bind(self, name: str, symbol: Symbol) -> None:
+        """Register waiting fixups with a new symbol if their names find it."""
+        current = self.scope
+        waiting = []
+        for entry in self._unbound.pop(name):
+            scope, written, fixup = entry
+            self.scope = scope
+            try:
+                found = self.lookup(written)
+            except KeyError:
+                found = None
+            if found is symbol:
+                symbol.add_reference(fixup)
+                self._fixed.add(symbol)
+            else:
+                waiting.append(entry)
+        self.scope = current
+        if waiting:
+            self._unbound[name] = waiting
+
+    def lookup(self, name: str) -> Symbol:
+        """
+        Resolve a symbol name as seen from the current scope.
+
+        A leading ``:`` addresses the global scope directly and a dotted name
+        is taken as fully qualified. A ``?`` label is only searched in the
+        region of the current scope it is used in. Any other name is searched
+        from the current scope outwards.
+
+        Args:
+            name: Symbol name as written in the source
+
+        Returns:
+            Symbol object
+
+        Raises:
+            KeyError: If no visible symbol has this name
+        """
+        if name[:1] == ":":
+            return self.root.symbols[name[1:]]
+        if name[:1] == "?":
+            scope = self.scope
+            return scope.symbols[scope.anchor + name]
+        for symbols in self.scope.chain:
+            symbol = symbols.get(name)
+            if symbol is not None:
+                return symbol
+        return self.symbols[name]
+
+    def value_of(self, name: str) -> int:
+        """
+        Get the value of a defined symbol as seen from the current scope.
+
+        Args:
+            name: Symbol name as written in the source
+
+        Returns:
+            Symbol value
+
+        Raises:
+            KeyError: If the symbol doesn't exist or is not defined yet
+        """
+        symbol = self.lookup(name)
+        if not symbol.is_defined:
+            raise KeyError(name)
+        return symbol.value
+
     def get_symbol(self, name: str) -> Symbol:
         """
         Get a symbol by name.
 
         Args:
-            name: Symbol name
+            name: Fully qualified symbol name
 
         Returns:
             Symbol object
@@ -67,7 +527,7 @@ class SymbolTable:
         Check if a symbol exists.
 
         Args:
-            name: Symbol name
+            name: Fully qualified symbol name
 
         Returns:
             True if symbol exists, False otherwise
@@ -78,8 +538,11 @@ class SymbolTable:
         """
         Define a symbol's value.
 
+        The name is added to ``changed`` if the symbol was undefined or had
+        another value; the owner clears that set when it starts a pass.
+
         Args:
-            name: Symbol name
+            name: Fully qualified symbol name
             value: Symbol value
 
         Returns:
@@ -89,6 +552,76 @@ class SymbolTable:
             KeyError: If symbol doesn't exist
         """
         symbol = self.symbols[name]
+        changed = not symbol.is_defined or symbol.value != value
         symbol.value = value
         symbol.is_defined = True
+        if not changed:
+            return symbol
+        self.changed.add(symbol.name)
+        if symbol._references:
+            pending = self.pending
+            for fixup in symbol._references:
+                if fixup.apply(self):
+                    pending.discard(fixup)
         return symbol
+
+    def add_fixup(
+        self, fixup: Fixup, names: Iterable[str], deferred: bool = False
+    ) -> bool:
+        """
+        Register a fixup with every symbol its expression uses.
+
+        A name that is not declared yet waits until a symbol it resolves to
+        from the fixup's scope is added, wherever that symbol is declared.
+        ``?`` labels resolve in the region of the scope the fixup is added in.
+        The fixup is applied immediately if all its symbols are defined.
+
+        Args:
+            fixup: The fixup to register
+            names: Names of the symbols used by the fixup's expression
+            deferred: Leave the site as it is until one of the symbols is
+                defined or changes (its bytes are already current)
+
+        Returns:
+            True if the fixup could be applied immediately
+        """
+        scope = fixup.scope or self.root
+        fixup.anchor = scope.anchor
+        current = self.scope
+        self.scope = scope
+        try:
+            for name in map(scope.key, names):
+                try:
+                    symbol = self.lookup(name)
+                except KeyError:
+                    key = name.rpartition(".")[2].lstrip(":")
+                    self._unbound.setdefault(key, []).append((scope, name, fixup))
+                    continue
+                symbol.add_reference(fixup)
+                self._fixed.add(symbol)
+        finally:
+            self.scope = current
+        if not deferred and fixup.apply(self):
+            return True
+        self.pending.add(fixup)
+        return False
+
+    def clear_fixups(self) -> None:
+        """Forget every fixup, e.g. before a new pass writes their sites again."""
+        for symbol in self._fixed:
+            symbol._references = None
+        self._fixed = set()
+        self._unbound = {}
+        self.pending = set()
+
+    def resolve_fixups(self) -> List[Fixup]:
+        """
+        Retry every pending fixup.
+
+        Returns:
+            The fixups that are still unresolved
+        """
+        for fixup in list(self.pending):
+            if fixup.apply(self):
+                self.pending.discard(fixup)
+        return list(self.pending)
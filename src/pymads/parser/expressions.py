@@ -0,0 +1,427 @@
+"""
+Compiled expression evaluator.
+
+Original Pascal functions: oblicz_wartosc, oblicz_wartosc_noSPC
+
+MADS parses operand text again on every pass. Here an operand is compiled
+once into a tree of closures, with constant subexpressions folded, and the
+compiled form is kept in an LRU cache keyed by the operand text. Later passes
+only re-run the closures against the current SymbolTable.
+
+Operator precedence (highest first), following MADS:
+
+1. unary ``-  +  ~  !  <  >  ^`` (low byte, high byte, bank byte)
+2. ``*  /  %  &  <<  >>``
+3. ``+  -  |  ^``
+4. ``=  ==  <>  !=  <  >  <=  >=``
+5. ``&&``
+6. ``||``
+
+``*`` in operand position is the current location counter.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from pymads.core.symbols import SymbolTable
+from pymads.parser.literals import LiteralCache, scan_literal
+
+Evaluator = Callable[[SymbolTable, int], int]
+
+DEFAULT_CACHE_SIZE = 4096
+
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<hex>\$[0-9A-Fa-f]+)
+      | (?P<bin>%[01]+)
+      | (?P<dec>\d+)
+      | (?P<char>'(?:''|[^'])'|"(?:""|[^"])")
+      | (?P<func>\.(?i:lo|hi)\b)
+      | (?P<name>:?[A-Za-z_?@][\w?@.]*)
+      | (?P<op><<|>>|<=|>=|<>|!=|==|&&|\|\||[-+*/%&|^~!<>=()\[\]])
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+def _div(a: int, b: int) -> int:
+    if b == 0:
+        raise ValueError("Division by zero")
+    quotient = abs(a) // abs(b)  # Pascal div truncates towards zero
+    return quotient if (a < 0) == (b < 0) else -quotient
+
+
+def _mod(a: int, b: int) -> int:
+    if b == 0:
+        raise ValueError("Division by zero")
+    return a - b * _div(a, b)
+
+
+_BINARY: Dict[str, Callable[[int, int], int]] = {
+    "*": lambda a, b: a * b,
+    "/": _div,
+    "%": _mod,
+    "&": lambda a, b: a & b,
+    "<<": lambda a, b: a << b,
+    ">>": lambda a, b: a >> b,
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "|": lambda a, b: a | b,
+    "^": lambda a, b: a ^ b,
+    "=": lambda a, b: int(a == b),
+    "==": lambda a, b: int(a == b),
+    "<>": lambda a, b: int(a != b),
+    "!=": lambda a, b: int(a != b),
+    "<": lambda a, b: int(a < b),
+    ">": lambda a, b: int(a > b),
+    "<=": lambda a, b: int(a <= b),
+    ">=": lambda a, b: int(a >= b),
+    "&&": lambda a, b: int(bool(a) and bool(b)),
+    "||": lambda a, b: int(bool(a) or bool(b)),
+}
+
+# Binary operator levels, loosest first.
+_LEVELS: List[FrozenSet[str]] = [
+    frozenset({"||"}),
+    frozenset({"&&"}),
+    frozenset({"=", "==", "<>", "!=", "<", ">", "<=", ">="}),
+    frozenset({"+", "-", "|", "^"}),
+    frozenset({"*", "/", "%", "&", "<<", ">>"}),
+]
+
+_UNARY: Dict[str, Callable[[int], int]] = {
+    "-": lambda a: -a,
+    "+": lambda a: a,
+    "~": lambda a: ~a,
+    "!": lambda a: int(not a),
+    "<": lambda a: a & 0xFF,
+    ">": lambda a: (a >> 8) & 0xFF,
+    "^": lambda a: (a >> 16) & 0xFF,
+    ".lo": lambda a: a & 0xFF,
+    ".hi": lambda a: (a >> 8) & 0xFF,
+}
+
+_CLOSING = {"(": ")", "[": "]"}
+
+_LITERALS = frozenset({"hex", "bin", "dec", "char"})
+
+# A compiled node: (evaluator, constant value or None when not constant)
+_Node = Tuple[Evaluator, Optional[int]]
+
+
+def _constant(value: int) -> _Node:
+    return (lambda table, pc: value), value
+
+
+class CompiledExpression:
+    """
+    An operand expression compiled into a closure tree.
+
+    Attributes:
+        text: Source text of the expression
+        names: Symbol names the expression uses, in order of appearance
+        constant: Folded value if the expression uses no symbols and no
+            location counter, otherwise None
+    """
+
+    __slots__ = ("text", "names", "constant", "_evaluate")
+
+    def __init__(
+        self,
+        text: str,
+        evaluate: Evaluator,
+        names: Tuple[str, ...],
+        constant: Optional[int],
+    ):
+        self.text = text
+        self.names = names
+        self.constant = constant
+        self._evaluate = evaluate
+
+    def __call__(self, table: SymbolTable, pc: int = 0) -> int:
+        """
+        Evaluate the expression.
+
+        Args:
+            table: Symbol table providing symbol values
+            pc: Current location counter (value of ``*``)
+
+        Returns:
+            Expression value
+
+        Raises:
+            KeyError: If a used symbol is not defined
+            ValueError: On division by zero
+        """
+        return self._evaluate(table, pc)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.text!r})"
+
+
+class _Parser:
+    """Precedence-climbing parser producing closure nodes."""
+
+    def __init__(
+        self,
+        text: str,
+        fold_case: bool = False,
+        literals: Optional[LiteralCache] = None,
+    ):
+        self.text = text
+        self.fold_case = fold_case
+        self.literals = literals
+        self.tokens: List[Tuple[str, str]] = []
+        self.names: List[str] = []
+        self.position = 0
+        end = len(text.rstrip())
+        index = 0
+        while index < end:
+            match = _TOKEN.match(text, index)
+            if match is None or match.end() == index:
+                raise ValueError(f"Invalid expression '{text}' at {index}")
+            self.tokens.append((match.lastgroup or "", match.group(match.lastgroup)))
+            index = match.end()
+
+    def peek(self) -> Optional[Tuple[str, str]]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def take(self) -> Tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of expression '{self.text}'")
+        self.position += 1
+        return token
+
+    def parse(self) -> _Node:
+        if not self.tokens:
+            raise ValueError("Empty expression")
+        node = self.binary(0)
+        token = self.peek()
+        if token is not None:
+            raise ValueError(f"Unexpected '{token[1]}' in expression '{self.text}'")
+        return node
+
+    def binary(self, level: int) -> _Node:
+        if level == len(_LEVELS):
+            return self.unary()
+        operators = _LEVELS[level]
+        left = self.binary(level + 1)
+        while True:
+            token = self.peek()
+            if token is not None and token[0] == "bin" and "%" in operators:
+                # '%' followed by binary digits after an operand is modulo
+                self.tokens[self.position : self.position + 1] = [
+                    ("op", "%"),
+                    ("dec", token[1][1:]),
+                ]
+                token = ("op", "%")
+            if token is None or token[0] != "op" or token[1] not in operators:
+                return left
+            self.position += 1
+            right = self.binary(level + 1)
+            left = self.combine(_BINARY[token[1]], left, right)
+
+    @staticmethod
+    def combine(
+        operator: Callable[[int, int], int], left: _Node, right: _Node
+    ) -> _Node:
+        if left[1] is not None and right[1] is not None:
+            return _constant(operator(left[1], right[1]))
+        left_eval = left[0]
+        right_eval = right[0]
+        return (
+            lambda table, pc: operator(left_eval(table, pc), right_eval(table, pc))
+        ), None
+
+    def unary(self) -> _Node:
+        kind, value = self.take()
+        if (kind == "op" and value in _UNARY) or kind == "func":
+            operator = _UNARY[value.lower()]
+            operand = self.unary()
+            if operand[1] is not None:
+                return _constant(operator(operand[1]))
+            inner = operand[0]
+            return (lambda table, pc: operator(inner(table, pc))), None
+        if kind == "op" and value == "*":
+            return (lambda table, pc: pc), None
+        if kind == "op" and value in _CLOSING:
+            node = self.binary(0)
+            closing = self.take()
+            if closing != ("op", _CLOSING[value]):
+                raise ValueError(f"Unbalanced brackets in expression '{self.text}'")
+            return node
+        if kind in _LITERALS:
+            literal = scan_literal(value, self.literals)
+            assert literal is not None
+            return _constant(literal)
+        if kind == "name":
+            if self.fold_case:
+                value = value.upper()
+            self.names.append(value)
+            return (lambda table, pc: table.value_of(value)), None
+        raise ValueError(f"Unexpected '{value}' in expression '{self.text}'")
+
+
+def compile_uncached(
+    text: str, fold_case: bool = False, literals: Optional[LiteralCache] = None
+) -> CompiledExpression:
+    """
+    Compile an expression without consulting any expression cache.
+
+    Args:
+        text: Expression text
+        fold_case: Upper-case symbol names (MADS labels are case-insensitive)
+        literals: Literal memo to use (default: the module-wide memo)
+
+    Returns:
+        The compiled expression
+
+    Raises:
+        ValueError: If the expression is malformed
+    """
+    value = scan_literal(text, literals)
+    if value is not None:
+        # A lone literal (most data operands) needs no parse
+        evaluate, _ = _constant(value)
+        return CompiledExpression(text, evaluate, (), value)
+    parser = _Parser(text, fold_case, literals)
+    evaluate, constant = parser.parse()
+    return CompiledExpression(text, evaluate, tuple(parser.names), constant)
+
+
+class ExpressionCache:
+    """
+    Bounded LRU cache of compiled expressions keyed by their stripped text.
+
+    Compiled expressions are immutable, so one cache can serve assemblies
+    running in several threads; the statistics are then approximate. Each
+    cache scans literals through a memo of its own.
+
+    Attributes:
+        literals: Literal memo used when compiling
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+        fold_case: bool = False,
+        literals: Optional[LiteralCache] = None,
+    ):
+        """
+        Initialize a new cache.
+
+        Args:
+            maxsize: Maximum number of compiled expressions kept
+            fold_case: Upper-case symbol names when compiling
+            literals: Literal memo to use; a new one is created if None
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        self.fold_case = fold_case
+        self.literals = literals if literals is not None else LiteralCache()
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CompiledExpression]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def compile(self, text: str) -> CompiledExpression:
+        """
+        Get the compiled form of an expression, compiling it on a miss.
+
+        Args:
+            text: Expression text
+
+        Returns:
+            The compiled expression
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        key = text.strip()
+        entries = self._entries
+        compiled = entries.get(key)
+        if compiled is not None:
+            self.hits += 1
+            try:
+                entries.move_to_end(key)
+            except KeyError:  # Evicted by another thread meanwhile
+                entries[key] = compiled
+            return compiled
+        self.misses += 1
+        compiled = compile_uncached(key, self.fold_case, self.literals)
+        entries[key] = compiled
+        if len(entries) > self.maxsize:
+            try:
+                entries.popitem(last=False)
+            except KeyError:
+                pass  # Another thread evicted first
+        return compiled
+
+    def clear(self) -> None:
+        """Drop all cached expressions and literals and reset the statistics."""
+        self._entries.clear()
+        self.literals.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_default_cache = ExpressionCache()
+
+
+def compile_expression(
+    text: str, cache: Optional[ExpressionCache] = None
+) -> CompiledExpression:
+    """
+    Compile an expression using an LRU cache.
+
+    Args:
+        text: Expression text
+        cache: Cache to use (default: the module-wide cache)
+
+    Returns:
+        The compiled expression
+
+    Raises:
+        ValueError: If the expression is malformed
+    """
+    if cache is None:
+        cache = _default_cache
+    return cache.compile(text)
+
+
+def evaluate(
+    text: str,
+    table: SymbolTable,
+    pc: int = 0,
+    cache: Optional[ExpressionCache] = None,
+) -> int:
+    """
+    Evaluate an expression against a symbol table.
+
+    Original Pascal function: oblicz_wartosc
+
+    Args:
+        text: Expression text
+        table: Symbol table providing symbol values
+        pc: Current location counter (value of ``*``)
+        cache: Cache to use (default: the module-wide cache)
+
+    Returns:
+        Expression value
+
+    Raises:
+        ValueError: If the expression is malformed or divides by zero
+        KeyError: If a used symbol is not defined
+    """
+    if cache is None:
+        cache = _default_cache
+    return cache.compile(text)(table, pc)
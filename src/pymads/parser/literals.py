@@ -0,0 +1,103 @@
+"""
+Scanner for MADS numeric and character literals.
+
+Original Pascal functions: oblicz_wartosc (literal cases), StrToInt
+
+MADS writes numbers as ``$hex``, ``%binary`` or decimal, and characters as
+``'c'`` or ``"c"`` (a doubled quote stands for the quote itself). The
+Pascal code converts them character by character. Here one precompiled
+pattern classifies and converts a literal in a single match; a text that
+is not a literal yields None instead of raising, and recently scanned texts
+are answered from a small memo. Each LiteralCache keeps its own memo, so
+assemblies that must not share state can each own one.
+"""
+
+import re
+from typing import Dict, Optional
+
+LITERAL_MEMO_SIZE = 1024
+
+# Groups: 1 hex digits, 2 binary digits, 3 decimal digits, 4/5 character
+_LITERAL = re.compile(
+    r"""\s*(?:\$([0-9A-Fa-f]+)|%([01]+)|(\d+)|'(''|[^'])'|"(""|[^"])")\s*"""
+)
+
+_BASES = (0, 16, 2, 10)
+
+_UNSEEN = object()
+
+
+
+def _scan(text: str) -> Optional[int]:
+    """Convert a literal without consulting the memo."""
+    match = _LITERAL.fullmatch(text)
+    if match is None:
+        return None
+    group = match.lastindex
+    digits = match.group(group)
+    return int(digits, _BASES[group]) if group <= 3 else ord(digits[0])
+
+
+class LiteralCache:
+    """
+    Memo of scanned literal texts, emptied when it reaches its size.
+
+    Attributes:
+        maxsize: Maximum number of texts kept
+    """
+
+    def __init__(self, maxsize: int = LITERAL_MEMO_SIZE):
+        """
+        Initialize a new memo.
+
+        Args:
+            maxsize: Maximum number of texts kept
+        """
+        self.maxsize = maxsize
+        self._memo: Dict[str, Optional[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._memo)
+
+    def scan(self, text: str) -> Optional[int]:
+        """
+        Get the value of a literal.
+
+        Args:
+            text: Literal text, optionally surrounded by whitespace
+
+        Returns:
+            The value, or None if the text is not a single literal
+        """
+        memo = self._memo
+        value = memo.get(text, _UNSEEN)
+        if value is not _UNSEEN:
+            return value  # type: ignore[return-value]
+        value = _scan(text)
+        if len(memo) >= self.maxsize:
+            memo.clear()
+        memo[text] = value
+        return value
+
+    def clear(self) -> None:
+        """Drop all memoized texts."""
+        self._memo.clear()
+
+
+_default_cache = LiteralCache()
+
+
+def scan_literal(text: str, cache: Optional[LiteralCache] = None) -> Optional[int]:
+    """
+    Get the value of a literal.
+
+    Args:
+        text: Literal text, optionally surrounded by whitespace
+        cache: Memo to use (default: the module-wide memo)
+
+    Returns:
+        The value, or None if the text is not a single literal
+    """
+    if cache is None:
+        cache = _default_cache
+    return cache.scan(text)
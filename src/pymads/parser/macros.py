@@ -0,0 +1,235 @@
+"""
+Macro definitions and expansion.
+
+Original Pascal procedures: get_macro, analizuj_makro
+
+The Pascal code keeps a macro body as text and re-scans it, replacing the
+parameter references, on every invocation. Here each body line is tokenized
+once when the macro is defined and its parameter references are turned into
+slots. Lines without slots are reused as they are; in lines whose slots all
+lie in the operand only the operand is rebuilt, with the label and mnemonic
+spans kept from the definition. Expansions are memoized per argument tuple.
+
+Parameters are referenced as ``:1`` .. ``:n`` or ``%%1`` .. ``%%n``,
+``:0`` / ``%%0`` is the number of arguments, and declared parameter names can
+be referenced as ``:name``.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from pymads.parser.tokenizer import LineTokens, fold_operand, tokenize_line
+
+DEFAULT_MEMO_SIZE = 256
+
+_SLOT = re.compile(r"(?::|%%)(\d+|[A-Za-z_]\w*)")
+
+# A line template part: literal text or the index of an argument (0 = count)
+_Part = Union[str, int]
+
+_new = tuple.__new__
+
+
+class _Template:
+    """One pre-tokenized macro body line."""
+
+    __slots__ = ("tokens", "parts", "operand_start")
+
+    def __init__(self, tokens: LineTokens, parts: Tuple[_Part, ...]):
+        self.tokens = tokens
+        # parts is empty for lines without slots. For operand-only slots it
+        # covers just the operand, otherwise the whole line.
+        self.parts = parts
+        self.operand_start = -1
+
+    def expand(self, arguments: Tuple[str, ...]) -> LineTokens:
+        tokens = self.tokens
+        parts = self.parts
+        if not parts:
+            return tokens
+        text = "".join(
+            part if part.__class__ is str else arguments[part]  # type: ignore
+            for part in parts
+        )
+        start = self.operand_start
+        if start < 0:
+            return tokenize_line(text)
+        return _new(
+            LineTokens,
+            (
+                tokens.line[:start] + text,
+                tokens.label,
+                tokens.mnemonic,
+                (start, start + len(text)) if text else None,
+                None,
+                tokens.keyword,
+                tokens.name,
+                fold_operand(text),
+            ),
+        )
+
+
+class Macro:
+    """
+    A defined macro.
+
+    Attributes:
+        name: Macro name (upper case)
+        parameters: Declared parameter names (upper case)
+        lines: Body source lines
+        hits: Number of expansions answered from the memo
+        misses: Number of expansions built
+    """
+
+    def __init__(
+        self,
+        name: str,
+        parameters: Sequence[str],
+        lines: Sequence[str],
+        memo_size: int = DEFAULT_MEMO_SIZE,
+    ):
+        """
+        Define a macro, tokenizing its body.
+
+        Args:
+            name: Macro name
+            parameters: Declared parameter names
+            lines: Body source lines, without .MACRO and .ENDM
+            memo_size: Maximum number of memoized expansions
+        """
+        self.name = name.upper()
+        self.parameters = tuple(parameter.upper() for parameter in parameters)
+        self.lines = tuple(lines)
+        self.hits = 0
+        self.misses = 0
+        self._memo_size = memo_size
+        self._memo: "OrderedDict[Tuple[str, ...], List[LineTokens]]" = OrderedDict()
+        self._templates = [self._compile(line) for line in self.lines]
+
+    def _slot(self, reference: str) -> Optional[int]:
+        if reference.isdigit():
+            return int(reference)
+        try:
+            return self.parameters.index(reference.upper()) + 1
+        except ValueError:
+            return None  # ':label' addresses the global scope
+
+    def _split(self, text: str) -> Tuple[_Part, ...]:
+        parts: List[_Part] = []
+        position = 0
+        for match in _SLOT.finditer(text):
+            slot = self._slot(match.group(1))
+            if slot is None:
+                continue
+            if match.start() > position:
+                parts.append(text[position : match.start()])
+            parts.append(slot)
+            position = match.end()
+        if not parts:
+            return ()
+        if position < len(text):
+            parts.append(text[position:])
+        return tuple(parts)
+
+    def _compile(self, line: str) -> _Template:
+        tokens = tokenize_line(line)
+        code = line if tokens.comment is None else line[: tokens.comment[0]]
+        if not self._split(code):
+            return _Template(tokens, ())
+        operand = tokens.operand
+        if operand is not None and not self._split(code[: operand[0]]):
+            template = _Template(tokens, self._split(tokens.operand_text))
+            template.operand_start = operand[0]
+            return template
+        return _Template(tokens, self._split(code))
+
+    def expand(self, arguments: Sequence[str]) -> List[LineTokens]:
+        """
+        Expand the macro.
+
+        Args:
+            arguments: Argument texts
+
+        Returns:
+            Tokenized body lines with the arguments substituted; the list is
+            shared between identical invocations and must not be modified
+
+        Raises:
+            ValueError: If the body refers to a missing argument
+        """
+        key = tuple(arguments)
+        memo = self._memo
+        lines = memo.get(key)
+        if lines is not None:
+            self.hits += 1
+            memo.move_to_end(key)
+            return lines
+        self.misses += 1
+        values = (str(len(key)),) + key
+        try:
+            lines = [template.expand(values) for template in self._templates]
+        except IndexError:
+            raise ValueError(
+                f"Macro {self.name} needs more than {len(key)} arguments"
+            ) from None
+        memo[key] = lines
+        if len(memo) > self._memo_size:
+            memo.popitem(last=False)
+        return lines
+
+
+class MacroTable:
+    """
+    Macros by name.
+
+    A definition identical to an existing one keeps the existing Macro, so
+    its memoized expansions survive re-definition on every pass.
+    """
+
+    def __init__(self):
+        self.macros: Dict[str, Macro] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.macros
+
+    def __len__(self) -> int:
+        return len(self.macros)
+
+    def get(self, name: str) -> Optional[Macro]:
+        """
+        Find a macro.
+
+        Args:
+            name: Upper-case macro name
+
+        Returns:
+            The macro, or None if it is not defined
+        """
+        return self.macros.get(name)
+
+    def define(
+        self, name: str, parameters: Sequence[str], lines: Sequence[str]
+    ) -> Macro:
+        """
+        Define or redefine a macro.
+
+        Args:
+            name: Macro name
+            parameters: Declared parameter names
+            lines: Body source lines
+
+        Returns:
+            The macro
+        """
+        key = name.upper()
+        macro = self.macros.get(key)
+        if (
+            macro is not None
+            and macro.lines == tuple(lines)
+            and macro.parameters == tuple(p.upper() for p in parameters)
+        ):
+            return macro
+        macro = Macro(key, parameters, lines)
+        self.macros[key] = macro
+        return macro
@@ -0,0 +1,171 @@
+"""
+Cache of tokenized source files shared between assemblies.
+
+A long-running process (the ``pymads serve`` daemon, a batch run) assembles
+the same include files over and over. SourceCache keeps their tokenized
+lines and re-reads a file only when its modification time or size changed.
+
+Given a directory, the cache also keeps the tokens of every file on disk,
+so separate runs (one CLI call per program of a build) share them. An
+entry is a single ``marshal`` record keyed by the file's path and checked
+against its modification time and size; if only the time changed, the
+content hash decides whether the tokens are still valid.
+"""
+
+import hashlib
+import marshal
+import os
+from itertools import starmap
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from pymads.parser.tokenizer import LineTokens, tokenize_lines
+from pymads.utils.file_io import read_source_lines
+
+TOKEN_CACHE_VERSION = 3
+
+# (st_mtime_ns, st_size) of the file the tokens were read from
+_Stamp = Tuple[int, int]
+
+
+def _digest(path: str) -> bytes:
+    """Content hash of a file."""
+    with open(path, "rb") as source:
+        return hashlib.blake2b(source.read(), digest_size=16).digest()
+
+
+class SourceCache:
+    """
+    Tokenized source files by path.
+
+    Attributes:
+        directory: Directory of the on-disk token cache, or None
+        hits: Number of loads answered from memory or disk
+        misses: Number of loads that read and tokenized the file
+        disk_hits: Number of hits answered from the on-disk cache
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize a new cache.
+
+        Args:
+            directory: Directory to keep tokens in between runs; it is
+                created on the first store. None keeps them in memory only.
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries: Dict[str, Tuple[_Stamp, List[LineTokens]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(
+        self,
+        path: str,
+        read: Callable[[str], Iterable[str]] = read_source_lines,
+        tokenize: Callable[[Iterable[str]], List[LineTokens]] = tokenize_lines,
+    ) -> List[LineTokens]:
+        """
+        Get the tokenized lines of a file, reading it only if it changed.
+
+        Args:
+            path: Source file path
+            read: Reads the lines of the file on a miss
+            tokenize: Tokenizes them
+
+        Returns:
+            Tokenized lines
+
+        Raises:
+            OSError: If the file cannot be read or the token cache cannot
+                be written
+        """
+        status = os.stat(path)
+        stamp = (status.st_mtime_ns, status.st_size)
+        key = os.path.abspath(path)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self.hits += 1
+            return entry[1]
+        lines = None
+        if self.directory is not None:
+            lines = self._load_stored(key, stamp)
+        if lines is not None:
+            self.hits += 1
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            digest = _digest(path) if self.directory is not None else b""
+            lines = tokenize(read(path))
+            if self.directory is not None:
+                self._store(key, stamp, digest, lines)
+        self._entries[key] = (stamp, lines)
+        return lines
+
+    def clear(self) -> None:
+        """Drop all cached files from memory and reset the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    # On-disk cache
+
+    def _path(self, key: str) -> str:
+        assert self.directory is not None
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + ".tok")
+
+    def _load_stored(self, key: str, stamp: _Stamp) -> Optional[List[LineTokens]]:
+        """Get a file's tokens from the disk if they are still valid."""
+        try:
+            with open(self._path(key), "rb") as stream:
+                record = marshal.loads(stream.read())
+            version, stored_key, stored_stamp, digest, rows = record
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != TOKEN_CACHE_VERSION or stored_key != key:
+            return None
+        if stored_stamp != stamp:
+            # Touched or checked out again; the content decides.
+            try:
+                if stored_stamp[1] != stamp[1] or _digest(key) != digest:
+                    return None
+            except OSError:
+                return None
+        try:
+            lines = list(starmap(LineTokens, rows))
+        except TypeError:
+            return None
+        if stored_stamp != stamp:
+            self._store(key, stamp, digest, lines)
+        return lines
+
+    def _store(
+        self, key: str, stamp: _Stamp, digest: bytes, lines: List[LineTokens]
+    ) -> None:
+        """Write a file's tokens to the disk, replacing any older record."""
+        import tempfile  # only needed when writing; slow to import
+
+        assert self.directory is not None
+        # Equal spans are stored once; marshal writes references to them,
+        # which makes the record smaller and faster to load.
+        spans: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        rows = [
+            (tokens.line,)
+            + tuple(span and spans.setdefault(span, span) for span in tokens[1:5])
+            + tokens[5:]
+            for tokens in lines
+        ]
+        record = (TOKEN_CACHE_VERSION, key, stamp, digest, rows)
+        os.makedirs(self.directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as stream:
+                marshal.dump(record, stream)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
@@ -0,0 +1,218 @@
+"""
+Whole-line tokenizer for MADS source lines.
+
+Original Pascal functions: the label/mnemonic/operand scanning done in
+analizuj_mem with omin_spacje and __inc
+
+The Pascal code walks a line one character at a time. Here a single compiled
+regular expression splits a line into its label, mnemonic, operand and
+comment fields and the result keeps only their spans. The upper-case
+mnemonic, label and operand are kept as well, so the assembler uses them on
+every pass without folding them again; ``tokenize_lines`` expands tabs and
+folds a whole file in one pass over its buffer to get them. Quoted strings
+keep their case, and tabs inside them are not expanded, because both are
+part of their value.
+"""
+
+import re
+from sys import intern
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from pymads.utils.text import expand_tabs, fold_case
+
+Span = Tuple[int, int]
+
+_LABEL = r"[A-Za-z_?@][\w?@.]*"
+
+_LINE = re.compile(
+    rf"""
+    (?:
+        (?P<star>\*.*)                               # '*' comment line
+      | (?P<label>{_LABEL}):?                        # label in column 0
+      | [ \t]+ (?:(?P<ilabel>{_LABEL}):(?!=))?       # indented 'label:'
+    )?
+    [ \t]*
+    (?P<mnemonic>=|(?!//)[^\s;=]+)?
+    [ \t]*
+    (?P<operand>
+        (?:[^\s;'"/]+|'[^'\r\n]*'|"[^"\r\n]*"|/(?!/)|['"]
+          | [ \t]+(?=[^\s;/]|/(?!/))                  # blanks inside only
+        )*
+    )
+    [ \t]*
+    (?P<comment>(?:;|//)[^\r\n]*)?
+    """,
+    re.VERBOSE,
+)
+
+# Quoted strings of an operand, as the operand pattern above delimits them
+_QUOTED = re.compile(r"'[^'\r\n]*'|\"[^\"\r\n]*\"")
+
+# A tab inside a quoted string (tabs elsewhere are just blanks)
+_QUOTED_TAB = re.compile(r"'[^'\n]*\t[^'\n]*'|\"[^\"\n]*\t[^\"\n]*\"")
+
+
+class LineTokens(NamedTuple):
+    """
+    Spans of the fields of one source line.
+
+    Each field is a ``(start, end)`` span into ``line`` or None when the
+    field is absent. The comment span includes its ``;`` or ``//`` marker.
+    ``keyword`` is the mnemonic in upper case (empty without a mnemonic),
+    ``name`` the label in upper case and ``argument`` the operand in upper
+    case outside its quoted strings (both empty when absent). Tabs in
+    ``line`` are expanded, except inside quoted strings.
+    """
+
+    line: str
+    label: Optional[Span]
+    mnemonic: Optional[Span]
+    operand: Optional[Span]
+    comment: Optional[Span]
+    keyword: str = ""
+    name: str = ""
+    argument: str = ""
+
+    def text(self, span: Optional[Span]) -> str:
+        """
+        Get the text of a span.
+
+        Args:
+            span: One of the span fields of this tuple
+
+        Returns:
+            The spanned text, or an empty string if the span is None
+        """
+        if span is None:
+            return ""
+        return self.line[span[0] : span[1]]
+
+    @property
+    def label_text(self) -> str:
+        """Label text without the trailing colon."""
+        return self.text(self.label)
+
+    @property
+    def mnemonic_text(self) -> str:
+        """Mnemonic or directive text."""
+        return self.text(self.mnemonic)
+
+    @property
+    def operand_text(self) -> str:
+        """Operand text without surrounding whitespace."""
+        return self.text(self.operand)
+
+    @property
+    def comment_text(self) -> str:
+        """Comment text including its marker."""
+        return self.text(self.comment)
+
+
+_NO_SPAN = (-1, -1)
+
+# LineTokens are built with tuple.__new__ directly; the generated NamedTuple
+# constructor costs as much as the regex match itself.
+_new = tuple.__new__
+
+
+def fold_operand(operand: str, folded: Optional[str] = None) -> str:
+    """
+    Upper-case an operand outside its quoted strings.
+
+    Args:
+        operand: Operand text
+        folded: ``fold_case(operand)`` if already computed
+
+    Returns:
+        The operand with names and hex digits in upper case
+    """
+    if folded is None:
+        folded = fold_case(operand)
+    if "'" not in operand and '"' not in operand:
+        return folded
+    # Folding keeps every character in place, so spans match in both.
+    return _QUOTED.sub(lambda match: operand[match.start() : match.end()], folded)
+
+
+def _tokenize(line: str, folded: str) -> LineTokens:
+    """Tokenize a line, taking the folded fields from its folded form."""
+    _, star, label, ilabel, mnemonic, operand, comment = _LINE.match(
+        line
+    ).regs  # type: ignore[union-attr]
+    if star != _NO_SPAN:
+        return _new(LineTokens, (line, None, None, None, star, "", "", ""))
+    if label == _NO_SPAN:
+        label = None if ilabel == _NO_SPAN else ilabel
+    name = "" if label is None else intern(folded[label[0] : label[1]])
+    if mnemonic == _NO_SPAN:
+        mnemonic = None
+        keyword = ""
+    else:
+        keyword = intern(folded[mnemonic[0] : mnemonic[1]])
+    start, end = operand
+    if start == end:
+        operand = None
+        argument = ""
+    else:
+        argument = fold_operand(line[start:end], folded[start:end])
+    return _new(
+        LineTokens,
+        (
+            line,
+            label,
+            mnemonic,
+            operand,
+            None if comment == _NO_SPAN else comment,
+            keyword,
+            name,
+            argument,
+        ),
+    )
+
+
+def tokenize_line(line: str) -> LineTokens:
+    """
+    Split a source line into label, mnemonic, operand and comment spans.
+
+    A label either starts in the first column or is followed by a colon.
+    Semicolons and ``//`` inside quoted strings do not start a comment.
+
+    Args:
+        line: Source line (a trailing newline is allowed)
+
+    Returns:
+        LineTokens with the spans of the fields present in the line
+    """
+    if "\t" in line and _QUOTED_TAB.search(line) is None:
+        line = expand_tabs(line)
+    return _tokenize(line, fold_case(line))
+
+
+def tokenize_lines(lines: Iterable[str]) -> List[LineTokens]:
+    """
+    Tokenize every line of a source.
+
+    Tabs are expanded and the lines case-folded in one pass each over the
+    whole buffer, rather than line by line.
+
+    Args:
+        lines: Source lines, all without or all with their line terminators
+
+    Returns:
+        List of LineTokens, one per line
+    """
+    lines = list(lines)
+    text = "\n".join(lines)
+    if text.count("\n") != len(lines) - 1:
+        # The lines carry their terminators; split the buffer without them.
+        text = "".join(lines)
+        lines = text.splitlines()
+        text = "\n".join(lines)
+    if "\t" in text:
+        expanded = expand_tabs(text).split("\n")
+        for match in _QUOTED_TAB.finditer(text):
+            number = text.count("\n", 0, match.start())
+            expanded[number] = lines[number]
+        lines = expanded
+        text = "\n".join(lines)
+    return list(map(_tokenize, lines, fold_case(text).split("\n")))
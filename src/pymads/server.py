@@ -0,0 +1,258 @@
+"""
+Assembler daemon for editor and build integration.
+
+``pymads serve`` keeps a process running that assembles on request, so
+opcode tables, compiled expressions, tokenized include files and the symbol
+tables of earlier assemblies stay warm. Requests arrive over a Unix socket
+as one JSON object per connection and get one JSON object back; the output
+file is written by the daemon itself.
+
+Request::
+
+    {"command": "assemble", "source": "/abs/main.asm",
+     "output": "/abs/main.xex", "options": {"incremental": false, ...}}
+
+Response::
+
+    {"ok": true, "bytes": 1234, "passes": 2, "cache_hits": 0, ...}
+    {"ok": false, "error": "main.asm (12) ERROR: Undeclared label FOO"}
+"""
+
+import errno
+import json
+import os
+import socket
+import socketserver
+from collections import OrderedDict
+from typing import Any, Dict
+
+from pymads.assembler.assembler import AssemblyError, AssemblyOptions, AssemblySession
+from pymads.assembler.opcodes import Cpu
+from pymads.parser.source_cache import SourceCache
+
+# Sessions kept warm; the least recently used one goes first
+MAX_SESSIONS = 8
+
+
+def default_socket_path() -> str:
+    """
+    Get the per-user default daemon socket path.
+
+    Returns:
+        ``$XDG_RUNTIME_DIR/pymads.sock``, or a file in /tmp named after the
+        user id when XDG_RUNTIME_DIR is not set
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "pymads.sock")
+    return f"/tmp/pymads-{os.getuid()}.sock"
+
+
+def options_from_json(data: Dict) -> AssemblyOptions:
+    """
+    Build AssemblyOptions from their JSON form.
+
+    Args:
+        data: Dictionary of option fields
+
+    Returns:
+        The options
+
+    Raises:
+        ValueError: If a field is unknown or invalid
+    """
+    unknown = set(data) - set(AssemblyOptions._fields)
+    if unknown:
+        raise ValueError(f"Unknown options: {', '.join(sorted(unknown))}")
+    fields = dict(data)
+    if "cpu" in fields:
+        fields["cpu"] = Cpu(fields["cpu"])
+    if "include_paths" in fields:
+        fields["include_paths"] = tuple(fields["include_paths"])
+    return AssemblyOptions(**fields)
+
+
+def options_to_json(options: AssemblyOptions) -> Dict:
+    """
+    Convert AssemblyOptions to their JSON form.
+
+    Args:
+        options: The options
+
+    Returns:
+        Dictionary of option fields
+    """
+    data = options._asdict()
+    data["cpu"] = options.cpu.value
+    data["include_paths"] = list(options.include_paths)
+    return data
+
+
+class AssemblyService:
+    """
+    Warm assembler state shared by all requests of a daemon.
+
+    Each session keeps the symbol table and the compiled macros of every
+    source it assembled, so they stay resident between requests. At most
+    MAX_SESSIONS sets of options keep a session.
+
+    Attributes:
+        sources: Tokenized source files, shared by all sessions
+        sessions: Assembly session of each set of options, least recently
+            used first
+        requests: Number of requests handled
+    """
+
+    def __init__(self):
+        self.sources = SourceCache()
+        self.sessions: "OrderedDict[AssemblyOptions, AssemblySession]" = (
+            OrderedDict()
+        )
+        self.requests = 0
+
+    def handle(self, request: Any) -> Dict:
+        """
+        Handle one decoded request.
+
+        Args:
+            request: The decoded JSON value; anything but an object is
+                answered with an error
+
+        Returns:
+            The response object
+        """
+        self.requests += 1
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Invalid request: not a JSON object"}
+        command = request.get("command")
+        if command == "ping":
+            return {"ok": True, "requests": self.requests}
+        if command != "assemble":
+            return {"ok": False, "error": f"Unknown command {command!r}"}
+        try:
+            source = request["source"]
+            output = request["output"]
+            options = options_from_json(request.get("options", {}))
+        except (KeyError, TypeError, ValueError) as error:
+            return {"ok": False, "error": f"Invalid request: {error}"}
+
+        session = self._session(options)
+        try:
+            result = session.assemble(source)
+            with open(output, "wb") as stream:
+                stream.write(result.binary)
+        except AssemblyError as error:
+            return {"ok": False, "error": str(error)}
+        except OSError as error:
+            return {"ok": False, "error": f"ERROR: {error}"}
+        except Exception as error:
+            # A bug must not take the daemon down, nor leave state behind
+            # that the next request of the source would start from.
+            session.forget(source)
+            return {"ok": False, "error": f"Internal error: {error!r}"}
+        return {
+            "ok": True,
+            "bytes": len(result.binary),
+            "passes": result.passes,
+            "cache_hits": result.cache_hits,
+            "cache_misses": result.cache_misses,
+            "changes": list(result.changes),
+            "patched": result.patched,
+            "excluded": list(result.excluded),
+            "excluded_bytes": result.excluded_bytes,
+            "exclude_time": result.exclude_time,
+        }
+
+    def _session(self, options: AssemblyOptions) -> AssemblySession:
+        """Get the session of a set of options, evicting the oldest if full."""
+        sessions = self.sessions
+        session = sessions.get(options)
+        if session is not None:
+            sessions.move_to_end(options)
+            return session
+        if len(sessions) >= MAX_SESSIONS:
+            sessions.popitem(last=False)
+        session = sessions[options] = AssemblySession(options, self.sources)
+        return session
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "AssemblyServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return  # Closed without a request, e.g. probed by another daemon
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            response = {"ok": False, "error": f"Invalid request: {error}"}
+        else:
+            if isinstance(request, dict) and request.get("command") == "shutdown":
+                response = {"ok": True}
+                self.server.stopping = True
+            else:
+                response = self.server.service.handle(request)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def _answers(path: str) -> bool:
+    """Check whether a process accepts connections on a Unix socket path."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+class AssemblyServer(socketserver.UnixStreamServer):
+    """
+    Unix socket server answering assembly requests one at a time.
+
+    Requests are handled sequentially so that the warm state needs no
+    locking; assemblies are short compared to their cold start.
+
+    Attributes:
+        service: The warm assembler state
+        stopping: Set by a shutdown request
+    """
+
+    def __init__(self, path: str):
+        """
+        Bind the server socket, replacing a stale socket file.
+
+        Args:
+            path: Socket path
+
+        Raises:
+            OSError: If a daemon already answers on the path (EADDRINUSE)
+                or the socket cannot be bound
+        """
+        if os.path.exists(path):
+            if _answers(path):
+                raise OSError(
+                    errno.EADDRINUSE, "A daemon is already listening on", path
+                )
+            os.unlink(path)
+        self.service = AssemblyService()
+        self.stopping = False
+        # Only the owning user may talk to the daemon.
+        umask = os.umask(0o077)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(umask)
+
+    def serve_until_shutdown(self) -> None:
+        """Handle requests until a shutdown request arrives."""
+        try:
+            while not self.stopping:
+                self.handle_request()
+        finally:
+            self.server_close()
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
@@ -0,0 +1,217 @@
+"""
+Bulk comparison of assembler output files.
+
+Two outputs are compared a block at a time with memcmp-speed bytes equality.
+Only blocks that differ are examined further: they are XORed as big
+integers and the non-zero runs of the result located with a regular
+expression, so no Python-level loop touches individual bytes. Mismatching
+runs are coalesced into ranges and, for Atari DOS (XEX) binaries, mapped
+back to the segment and load address they belong to.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+BLOCK_SIZE = 1 << 12
+
+_NONZERO = re.compile(rb"[^\x00]+")
+
+
+class XexSegment(NamedTuple):
+    """
+    One segment of an Atari DOS binary.
+
+    Attributes:
+        offset: File offset of the segment data
+        start: Load address of the first byte
+        end: Load address after the last byte
+    """
+
+    offset: int
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        """Number of data bytes."""
+        return self.end - self.start
+
+
+class DiffRange(NamedTuple):
+    """
+    A coalesced range of differing bytes.
+
+    Attributes:
+        offset: File offset of the first differing byte
+        length: Length of the range in bytes
+        segment: Index of the XEX segment holding the range, or None for
+            raw files and header bytes
+        address: Load address of the first byte, or None outside segments
+    """
+
+    offset: int
+    length: int
+    segment: Optional[int] = None
+    address: Optional[int] = None
+
+
+class BinaryDiff(NamedTuple):
+    """
+    Result of comparing two files.
+
+    Attributes:
+        size1: Length of the first file
+        size2: Length of the second file
+        ranges: Differing ranges within the common length
+        differing_bytes: Number of differing bytes within the common length
+    """
+
+    size1: int
+    size2: int
+    ranges: List[DiffRange]
+    differing_bytes: int
+
+    @property
+    def identical(self) -> bool:
+        """Whether the files are equal."""
+        return self.size1 == self.size2 and not self.ranges
+
+    def to_dict(self) -> Dict:
+        """Convert the result to a JSON-compatible dictionary."""
+        return {
+            "identical": self.identical,
+            "size1": self.size1,
+            "size2": self.size2,
+            "differing_bytes": self.differing_bytes,
+            "ranges": [r._asdict() for r in self.ranges],
+        }
+
+
+def diff_offsets(
+    data1: Buffer, data2: Buffer, gap: int = 0, block_size: int = BLOCK_SIZE
+) -> List[Tuple[int, int]]:
+    """
+    Find the ranges where two buffers differ.
+
+    Only the common length is compared.
+
+    Args:
+        data1: First buffer
+        data2: Second buffer
+        gap: Ranges separated by at most this many equal bytes are merged
+        block_size: Size of the blocks compared at once
+
+    Returns:
+        Sorted, non-overlapping ``(start, end)`` offset ranges
+    """
+    view1 = memoryview(data1).cast("B")
+    view2 = memoryview(data2).cast("B")
+    length = min(len(view1), len(view2))
+    ranges: List[Tuple[int, int]] = []
+    for offset in range(0, length, block_size):
+        end = min(offset + block_size, length)
+        block1 = bytes(view1[offset:end])
+        block2 = bytes(view2[offset:end])
+        if block1 == block2:
+            continue
+        xored = (
+            int.from_bytes(block1, "little") ^ int.from_bytes(block2, "little")
+        ).to_bytes(end - offset, "little")
+        for match in _NONZERO.finditer(xored):
+            start = offset + match.start()
+            stop = offset + match.end()
+            if ranges and start - ranges[-1][1] <= gap:
+                ranges[-1] = (ranges[-1][0], stop)
+            else:
+                ranges.append((start, stop))
+    return ranges
+
+
+def parse_xex_segments(data: Buffer) -> List[XexSegment]:
+    """
+    Locate the segments of an Atari DOS binary.
+
+    Args:
+        data: File content
+
+    Returns:
+        The segments in file order; empty if the data is not a DOS binary
+    """
+    view = memoryview(data).cast("B")
+    if len(view) < 6 or view[0] != 0xFF or view[1] != 0xFF:
+        return []
+    segments = []
+    position = 2
+    while position + 4 <= len(view):
+        start = view[position] | view[position + 1] << 8
+        if start == 0xFFFF:
+            position += 2
+            continue
+        end = (view[position + 2] | view[position + 3] << 8) + 1
+        position += 4
+        if end <= start:
+            break
+        segments.append(XexSegment(position, start, end))
+        position += end - start
+    return segments
+
+
+def _locate(
+    ranges: List[Tuple[int, int]], segments: List[XexSegment]
+) -> List[DiffRange]:
+    """Split offset ranges at segment boundaries and attach load addresses."""
+    located = []
+    for start, end in ranges:
+        position = start
+        for index, segment in enumerate(segments):
+            data_end = segment.offset + segment.length
+            if data_end <= position or segment.offset >= end:
+                continue
+            if position < segment.offset:
+                located.append(DiffRange(position, segment.offset - position))
+                position = segment.offset
+            stop = min(end, data_end)
+            address = segment.start + position - segment.offset
+            located.append(DiffRange(position, stop - position, index, address))
+            position = stop
+            if position >= end:
+                break
+        if position < end:
+            located.append(DiffRange(position, end - position))
+    return located
+
+
+def compare_buffers(data1: Buffer, data2: Buffer, gap: int = 0) -> BinaryDiff:
+    """
+    Compare two assembler outputs.
+
+    Differing ranges are mapped to XEX segments using the segment table of
+    the first buffer, when it is a DOS binary.
+
+    Args:
+        data1: Expected output
+        data2: Actual output
+        gap: Ranges separated by at most this many equal bytes are merged
+
+    Returns:
+        The comparison result
+    """
+    ranges = diff_offsets(data1, data2, gap)
+    differing = 0
+    if ranges:
+        view1 = memoryview(data1).cast("B")
+        view2 = memoryview(data2).cast("B")
+        for start, end in ranges:
+            xored = (
+                int.from_bytes(view1[start:end], "little")
+                ^ int.from_bytes(view2[start:end], "little")
+            ).to_bytes(end - start, "little")
+            differing += end - start - xored.count(0)
+    return BinaryDiff(
+        len(data1),
+        len(data2),
+        _locate(ranges, parse_xex_segments(data1)),
+        differing,
+    )
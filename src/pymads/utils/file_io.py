@@ -1,4 +1,7 @@
+import mmap
 import os
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Optional, Tuple
 
 
 def get_file_path(path: str) -> str:
@@ -29,3 +32,149 @@ def get_file_name(path: str) -> str:
         Filename portion of the path
     """
     return os.path.basename(path)
+
+
+# Sources larger than this are streamed on every pass instead of being kept.
+STREAM_THRESHOLD = 1 << 20
+
+# Amount of a mapped source decoded at a time.
+READ_BLOCK_SIZE = 1 << 16
+
+
+def _map(stream: BinaryIO) -> Optional[mmap.mmap]:
+    """Map an open file read-only, or return None for an empty file."""
+    if os.fstat(stream.fileno()).st_size == 0:
+        return None
+    return mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_source_lines(path: str) -> Iterator[Tuple[int, str]]:
+    """
+    Lazily read the lines of a source file.
+
+    Original Pascal function: GetFile
+
+    The file is memory-mapped and decoded one block at a time as lines are
+    requested, so memory use does not grow with the file size. Lines end at
+    LF, CR LF or a lone CR (Atari EOL $9B is kept as a character).
+
+    Args:
+        path: Source file path
+
+    Yields:
+        Tuples of (1-based line number, line text without its terminator)
+
+    Raises:
+        OSError: If the file cannot be opened
+    """
+    with open(path, "rb") as stream:
+        mapped = _map(stream)
+    if mapped is None:
+        return
+    with mapped:
+        number = 0
+        carry = ""
+        size = len(mapped)
+        for offset in range(0, size, READ_BLOCK_SIZE):
+            text = carry + mapped[offset : offset + READ_BLOCK_SIZE].decode("latin-1")
+            lines = text.split("\n")
+            # The last piece may continue in the next block.
+            carry = lines.pop()
+            for line in lines:
+                if "\r" in line:
+                    if line[-1:] == "\r":
+                        line = line[:-1]
+                    for part in line.split("\r")[:-1]:
+                        number += 1
+                        yield number, part
+                    line = line.rpartition("\r")[2]
+                number += 1
+                yield number, line
+        if carry:
+            if carry[-1] == "\r":
+                carry = carry[:-1]
+            for part in carry.split("\r"):
+                number += 1
+                yield number, part
+
+
+def read_source_lines(path: str) -> List[str]:
+    """
+    Read all lines of a source file.
+
+    Original Pascal function: GetFile
+
+    Args:
+        path: Source file path
+
+    Returns:
+        Lines without their terminators
+
+    Raises:
+        OSError: If the file cannot be opened
+    """
+    return [line for _, line in iter_source_lines(path)]
+
+
+def split_source_lines(data: bytes) -> List[str]:
+    """
+    Split source file content that has already been read into lines.
+
+    Original Pascal function: GetFile
+
+    Args:
+        data: File content
+
+    Returns:
+        The lines read_source_lines returns for a file with this content
+    """
+    text = data.decode("latin-1").replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()  # Terminator of the last line, or an empty file
+    return lines
+
+
+def is_large_file(path: str) -> bool:
+    """
+    Check whether a file should be streamed rather than kept in memory.
+
+    Args:
+        path: File path
+
+    Returns:
+        True if the file is larger than STREAM_THRESHOLD
+    """
+    return os.path.getsize(path) > STREAM_THRESHOLD
+
+
+@contextmanager
+def map_binary(path: str) -> Iterator[memoryview]:
+    """
+    Memory-map a binary file for zero-copy slicing.
+
+    Original Pascal function: TestFile (INS)
+
+    Slices taken from the view must be released (e.g. by using them as
+    context managers) before the block ends.
+
+    Args:
+        path: Binary file path
+
+    Yields:
+        Read-only memoryview of the file content
+
+    Raises:
+        OSError: If the file cannot be opened
+    """
+    with open(path, "rb") as stream:
+        mapped = _map(stream)
+    if mapped is None:
+        yield memoryview(b"")
+        return
+    view = memoryview(mapped)
+    try:
+        yield view
+    finally:
+        view.release()
+        mapped.close()
@@ -1,5 +1,17 @@
 # src/pymads/utils/text.py
 
+import re
+
+_WHITESPACE = re.compile(r"\s*")
+
+# Latin-1 upper case that keeps every character in place: characters whose
+# upper case is longer (like "\xdf") or outside Latin-1 (like "\xff") stay
+# as they are, so spans into a line are also spans into its folded form.
+_FOLD_CASE = "".join(
+    upper if len(upper) == 1 and upper < "\u0100" else char
+    for char, upper in ((chr(code), chr(code).upper()) for code in range(256))
+)
+
 
 def skip_spaces(text: str, position: int) -> int:
     """
@@ -7,6 +19,9 @@ def skip_spaces(text: str, position: int) -> int:
 
     Original Pascal function: omin_spacje
 
+    Kept for compatibility with code ported from Pascal; whole lines should
+    be split with pymads.parser.tokenizer.tokenize_line instead.
+
     Args:
         text: The input string to process
         position: The starting position (0-based index)
@@ -14,13 +29,11 @@ def skip_spaces(text: str, position: int) -> int:
     Returns:
         The new position after skipping spaces
     """
-    text_length = len(text)
+    if position >= len(text):
+        return position
 
     # Skip spaces, tabs, and other whitespace
-    while position < text_length and text[position].isspace():
-        position += 1
-
-    return position
+    return _WHITESPACE.match(text, position).end()
 
 
 def __inc(text: str, position: int) -> int:
@@ -87,6 +100,41 @@ def up_cas_(char: str) -> str:
     return char.upper()
 
 
+def fold_case(text: str) -> str:
+    """
+    Convert a whole source buffer to upper case in one pass.
+
+    Unlike ``str.upper``, the result always has the length of the input
+    (see _FOLD_CASE), so it can be folded once for a whole file and sliced
+    with the spans of its lines.
+
+    Args:
+        text: Source text, any number of lines
+
+    Returns:
+        Upper-case text of the same length
+    """
+    return text.translate(_FOLD_CASE)
+
+
+def expand_tabs(text: str, tab_size: int = 8) -> str:
+    """
+    Expand tabs to tab stops, as MADS listings show source lines.
+
+    Unlike tab2space, a tab advances to the next multiple of ``tab_size``
+    columns, counted from the start of each line, so a whole buffer can be
+    expanded at once.
+
+    Args:
+        text: Source text, any number of lines
+        tab_size: Columns between tab stops (default: 8)
+
+    Returns:
+        Text without tabs
+    """
+    return text.expandtabs(tab_size)
+
+
 def int_to_str(value: int) -> str:
     """
     Convert integer to string.
@@ -125,3 +173,23 @@ def str_to_int(text: str) -> int:
         return int(text)
     except Exception as e:
         raise ValueError(f"Cannot convert '{text}' to integer: {e}") from e
+
+
+def ata2int(value: int) -> int:
+    """
+    Convert an ATASCII character code to the Atari internal (screen) code.
+
+    Original Pascal function: ata2int
+
+    Args:
+        value: ATASCII code (0-255); bit 7 (inverse video) is preserved
+
+    Returns:
+        Internal code
+    """
+    low = value & 0x7F
+    if low < 32:
+        low += 64
+    elif low < 96:
+        low -= 32
+    return low | (value & 0x80)
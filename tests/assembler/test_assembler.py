@@ -0,0 +1,262 @@
+# tests/assembler/test_assembler.py
+
+import io
+import os
+
+import pytest
+from pymads.assembler.assembler import Assembler, AssemblyError
+from pymads.assembler.opcodes import Cpu
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "..", "examples")
+
+
+def _assemble(text, cpu=Cpu.MOS6502):
+    assembler = Assembler(cpu)
+    image = assembler.assemble_text(text)
+    stream = io.BytesIO()
+    image.flush(stream, assembler.headers)
+    return stream.getvalue()
+
+
+def test_hello_world():
+    """Test assembling the bundled example with a forward reference."""
+    assembler = Assembler()
+    image = assembler.assemble_file(os.path.join(EXAMPLES, "hello_world.asm"))
+    stream = io.BytesIO()
+    image.flush(stream)
+
+    assert assembler.passes == 2
+    assert stream.getvalue() == bytes.fromhex(
+        "ffff00201e20a9008502a200bd1320f00720a4f6e84c06206048454c4c4f20574f"
+        "524c4400"
+    )
+
+
+def test_constants_and_data():
+    """Test equates, DTA forms and RUN."""
+    source = """
+    opt h-
+    org $600
+value = $1234
+start dta a(value), l(value), h(value), c'AB', d'A'*
+    .word start
+    """
+    assert _assemble(source) == bytes.fromhex("3412" "34" "12" "4142" "a1" "0006")
+
+
+def test_proc_scopes():
+    """Test that labels inside .proc blocks are local."""
+    source = """
+    opt h-
+    org $2000
+    .proc first
+loop    jmp loop
+    .endp
+    .proc second
+loop    jmp loop
+    .endp
+    jsr first.loop
+    """
+    assert _assemble(source) == bytes.fromhex("4c0020" "4c0320" "200020")
+
+
+def test_exclude_unreferenced_procs():
+    """Test that procedures no kept code reaches are left out (-x)."""
+    source = """
+    opt h-
+    org $2000
+start jsr lib.inner.entry
+    jmp start
+    .proc lib
+    rts
+    .proc inner
+entry rts
+    .endp
+    .endp
+    .proc dead
+loop jsr other
+    bne loop
+    .endp
+    .proc other
+    jmp dead
+    .endp
+end rts
+    """
+    assembler = Assembler(exclude_unreferenced=True)
+    image = assembler.assemble_text(source)
+    assert assembler.excluded == ["DEAD", "OTHER"]
+    assert assembler.passes == 2  # Labels behind them were moved up in advance
+    assert assembler.excluded_bytes == 8
+    assert [(s.start, s.end) for s in image.segments] == [(0x2000, 0x2009)]
+    assert bytes(image.memory[0x2000:0x2009]) == bytes.fromhex(
+        "200720" "4c0020" "60" "60" "60"
+    )
+    symbols = assembler.symbols.symbols
+    assert not symbols["DEAD"].is_defined and not symbols["DEAD.LOOP"].is_defined
+    assert symbols["END"].value == 0x2008
+    assert assembler.references.referrers(symbols["DEAD"]) == {symbols["OTHER"]}
+    assert assembler.exclude_time > 0
+
+    # Public symbols are kept for the code linked against the module.
+    assembler = Assembler(exclude_unreferenced=True)
+    assembler.assemble_text(" .reloc\n .public api\n .proc api\n rts\n .endp\n")
+    assert assembler.excluded == []
+    assert Assembler().exclude_time == 0
+
+
+def test_65816_register_widths():
+    """Test that .a16 widens immediate operands."""
+    source = """
+    opt h-
+    org $8000
+    .a16
+    lda #$1234
+    .a8
+    lda #$12
+    """
+    assert _assemble(source, Cpu.WDC65816) == bytes.fromhex("a93412" "a912")
+
+
+def test_errors():
+    """Test that persistent errors are reported with their location."""
+    with pytest.raises(AssemblyError) as error:
+        _assemble(" org $2000\n lda missing\n")
+    assert str(error.value) == "<source> (2) ERROR: Undeclared label MISSING"
+
+    with pytest.raises(AssemblyError, match="declared twice"):
+        _assemble(" org $2000\nlabel nop\nlabel nop\n")
+
+    with pytest.raises(AssemblyError, match="Branch out of range"):
+        _assemble(" org $2000\n bne far\n .ds 200\nfar nop\n")
+
+
+def test_forward_references_converge_early():
+    """Test that fixed-size forward references are patched in one pass."""
+    assembler = Assembler()
+    source = " org $2000\n jmp end\n bne end\n dta a(end), <end\nend rts\n"
+    image = assembler.assemble_text(source)
+    assert assembler.passes == 1
+    assert assembler.changes == [1]
+    assert assembler.patched == 4
+    assert bytes(image.memory[0x2000:0x2009]) == bytes.fromhex(
+        "4c0820" "d003" "0820" "08" "60"
+    )
+
+    # The operand size of a forward LDA depends on the value.
+    assembler = Assembler()
+    assembler.assemble_text(" org $2000\n lda end\nend rts\n")
+    assert (assembler.passes, assembler.changes) == (2, [1, 0])
+
+    # Sites later overwritten by another ORG are not patched in place.
+    assembler = Assembler()
+    image = assembler.assemble_text(" org $2000\n jmp end\n org $2001\nend rts\n")
+    assert assembler.passes == 2 and assembler.patched == 0
+    assert bytes(image.memory[0x2000:0x2003]) == b"\x4c\x60\x20"
+
+
+def test_macros():
+    """Test macro invocations with arguments and per-invocation labels."""
+    source = """
+    opt h-
+    org $2000
+wait .macro
+loop dex
+    bne loop
+    lda #:1
+    .endm
+    .macro put value, addr
+    lda #:value
+    sta :addr
+    .endm
+    wait 1
+    wait 2
+    put 3, $80
+    """
+    assert _assemble(source) == bytes.fromhex(
+        "ca" "d0fd" "a901" "ca" "d0fd" "a902" "a903" "8580"
+    )
+
+    with pytest.raises(AssemblyError, match="Missing .ENDM for M"):
+        _assemble(" org $2000\nm .macro\n nop\n")
+    with pytest.raises(AssemblyError, match="Macro M declared twice"):
+        _assemble(" org $2000\nm .macro\n .endm\nm .macro\n .endm\n")
+    with pytest.raises(AssemblyError, match="nested too deeply"):
+        _assemble(" org $2000\nm .macro\n m\n .endm\n m\n")
+
+
+def test_ins_slice(tmp_path):
+    """Test INS with an offset and length."""
+    (tmp_path / "blob.bin").write_bytes(bytes(range(10)))
+    (tmp_path / "main.asm").write_text(" opt h-\n org $3000\n ins 'blob.bin',2,3\n")
+    assembler = Assembler()
+    stream = io.BytesIO()
+    assembler.assemble_file(str(tmp_path / "main.asm")).flush(stream, False)
+    assert stream.getvalue() == b"\x02\x03\x04"
+
+
+def test_large_source_is_streamed(tmp_path, monkeypatch):
+    """Test that sources above the threshold are not kept between passes."""
+    monkeypatch.setattr("pymads.utils.file_io.STREAM_THRESHOLD", 8)
+    path = tmp_path / "main.asm"
+    path.write_text(" org $2000\n jmp end\nend rts\n")
+    assembler = Assembler()
+    image = assembler.assemble_file(str(path))
+    assert bytes(image.memory[0x2000:0x2004]) == b"\x4c\x03\x20\x60"
+    assert assembler._sources == {}
+
+
+def test_assemble_api(tmp_path):
+    """Test the library-level entry point used by the CLI."""
+    from pymads.assembler.assembler import AssemblyOptions, assemble
+
+    path = tmp_path / "main.asm"
+    path.write_text(" org $2000\nstart rts\n")
+    result = assemble(str(path))
+    assert result.binary == b"\xff\xff\x00\x20\x00\x20\x60"
+    assert result.symbols.get_symbol("START").value == 0x2000
+
+    options = AssemblyOptions(incremental=True, cache_dir=str(tmp_path / "cache"))
+    assert assemble(str(path), options).binary == result.binary
+
+    path.write_text(" lda undefined\n")
+    with pytest.raises(AssemblyError):
+        assemble(str(path))
+
+
+def test_mixed_case_source():
+    """Test that labels fold to upper case while string data keeps its case."""
+    data = _assemble(" org $2000\nLoop\tdta c'Ab\tc'\n jmp loop\n")
+    assert data[6:] == b"Ab\tc" + bytes([0x4C, 0x00, 0x20])
+
+
+def test_question_labels():
+    """Test that '?' labels are local to the region after each label."""
+    source = """
+    org $2000
+first ldx #2
+?loop dex
+    bne ?loop
+    jmp ?end
+?end
+second ldy #1
+?loop dey
+    bne ?loop
+    """
+    assert _assemble(source)[6:] == bytes.fromhex(
+        "a202" "ca" "d0fd" "4c0820" "a001" "88" "d0fd"
+    )
+
+
+def test_data_runs():
+    """Test constant values written as runs around forward references."""
+    source = """
+    opt h-
+    org $600
+    dta 1, 2, <later, 3, a(4, later, 5), c'AB', 6
+later .word $10, later, 7
+    """
+    assert _assemble(source) == bytes.fromhex(
+        "0102" "0d" "03" "0400" "0d06" "0500" "4142" "06" "1000" "0d06" "0700"
+    )
+    with pytest.raises(AssemblyError, match="Value out of range"):
+        _assemble(" org $600\n dta 1, 256, 2\n")
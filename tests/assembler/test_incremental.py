@@ -0,0 +1,65 @@
+# tests/assembler/test_incremental.py
+
+import io
+
+from pymads.assembler.assembler import Assembler
+from pymads.assembler.incremental import IncrementalCache
+
+
+def _build(source, cache_dir):
+    cache = IncrementalCache(str(cache_dir))
+    assembler = Assembler(cache=cache)
+    stream = io.BytesIO()
+    assembler.assemble_file(str(source)).flush(stream)
+    return stream.getvalue(), cache
+
+
+def _write_project(tmp_path, screen=" lda #0\n sta color\n rts\n"):
+    (tmp_path / "main.asm").write_text(
+        "color = $2c8\n org $2000\n jsr clear\n rts\n icl 'lib.icl'\n"
+    )
+    (tmp_path / "lib.icl").write_text("clear\n" + screen)
+    return tmp_path / "main.asm"
+
+
+def test_unchanged_include_is_replayed(tmp_path):
+    """Test that a second run takes an unchanged include from the cache."""
+    main = _write_project(tmp_path)
+    first, cache = _build(main, tmp_path / "cache")
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    second, cache = _build(main, tmp_path / "cache")
+    assert second == first
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_changed_content_is_reassembled(tmp_path):
+    """Test that editing an include invalidates its entry."""
+    main = _write_project(tmp_path)
+    _build(main, tmp_path / "cache")
+
+    _write_project(tmp_path, " lda #1\n sta color\n rts\n")
+    output, cache = _build(main, tmp_path / "cache")
+    assert cache.misses > 0
+    assert bytes.fromhex("a901") in output
+
+
+def test_changed_import_is_reassembled(tmp_path):
+    """Test that a changed imported symbol invalidates the entry."""
+    main = _write_project(tmp_path)
+    _build(main, tmp_path / "cache")
+
+    main.write_text(main.read_text().replace("$2c8", "$2c6"))
+    output, cache = _build(main, tmp_path / "cache")
+    assert cache.misses > 0
+    assert bytes.fromhex("8dc602") in output
+
+
+def test_lookups_counted_once_per_include(tmp_path):
+    """Test that an include assembled in several passes counts once."""
+    (tmp_path / "main.asm").write_text(" org $2000\n lda value\n icl 'lib.icl'\n")
+    (tmp_path / "lib.icl").write_text("value nop\n")
+    assembler = Assembler(cache=IncrementalCache(str(tmp_path / "cache")))
+    assembler.assemble_file(str(tmp_path / "main.asm"))
+    assert assembler.passes > 1
+    assert (assembler.cache.hits, assembler.cache.misses) == (0, 1)
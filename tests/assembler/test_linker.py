@@ -0,0 +1,91 @@
+# tests/assembler/test_linker.py
+
+import pytest
+from pymads.assembler.assembler import Assembler, AssemblyError
+from pymads.assembler.linker import assemble_modules, link
+from pymads.assembler.relocation import HIGH, LOW, WORD, Relocation
+
+MAIN = """
+    .extrn print, message
+    org $2000
+start ldx #<message
+    ldy #>message
+    jsr print
+    run start
+"""
+
+LIBRARY = """
+    .reloc
+    .public print, message
+print stx ptr
+    bne print
+    rts
+ptr .word message
+message dta c'HI',0
+"""
+
+
+def test_relocations():
+    """Test which sites of a module are recorded for the linker."""
+    assembler = Assembler()
+    assembler.assemble_text(LIBRARY)
+    assert assembler.relocatable
+    # Module addresses force absolute mode although they look like zero page.
+    assert assembler.relocations == [
+        Relocation(1, WORD, None, 6),
+        Relocation(6, WORD, None, 8),
+    ]
+    assert assembler.exports() == {"PRINT": (0, True), "MESSAGE": (8, True)}
+
+    assembler = Assembler()
+    assembler.assemble_text(MAIN)
+    assert assembler.relocations == [
+        Relocation(0x2001, LOW, "MESSAGE", 0),
+        Relocation(0x2003, HIGH, "MESSAGE", 0),
+        Relocation(0x2005, WORD, "PRINT", 0),
+    ]
+
+
+def test_module_errors():
+    """Test expressions and directives a module cannot relocate."""
+    with pytest.raises(AssemblyError, match="Illegal relocatable expression"):
+        Assembler().assemble_text(" .reloc\nstart dta a(start*2)\n")
+    with pytest.raises(AssemblyError, match="ORG inside a .RELOC module"):
+        Assembler().assemble_text(" .reloc\n org $2000\n")
+    with pytest.raises(AssemblyError, match="Branch to an external symbol"):
+        Assembler().assemble_text(" .extrn far\n org $2000\n bne far\n")
+    with pytest.raises(AssemblyError, match="Undeclared public label NOPE"):
+        assembler = Assembler()
+        assembler.assemble_text(" .public nope\n org $2000\n nop\n")
+        assembler.exports()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_link(tmp_path, jobs):
+    """Test assembling modules, in a pool or not, and linking them."""
+    (tmp_path / "main.asm").write_text(MAIN)
+    (tmp_path / "lib.asm").write_text(LIBRARY)
+    paths = [str(tmp_path / "main.asm"), str(tmp_path / "lib.asm")]
+    modules = assemble_modules(paths, jobs=jobs)
+    result = link(modules, 0x3000)
+
+    assert result.bases == [0, 0x3000]
+    assert result.symbols == {"PRINT": 0x3000, "MESSAGE": 0x3008}
+    assert result.binary == bytes.fromhex(
+        "ffff" "0020" "0620" "a208" "a030" "200030"
+        "e002" "e102" "0020"
+        "0030" "0a30" "8e0630" "d0fb" "60" "0830" "484900"
+    )
+
+
+def test_link_errors(tmp_path):
+    """Test missing and duplicate public symbols."""
+    (tmp_path / "main.asm").write_text(MAIN)
+    (tmp_path / "lib.asm").write_text(LIBRARY)
+    main, library = assemble_modules(
+        [str(tmp_path / "main.asm"), str(tmp_path / "lib.asm")]
+    )
+    with pytest.raises(AssemblyError, match="Undeclared external label MESSAGE"):
+        link([main])
+    with pytest.raises(AssemblyError, match="Label PRINT declared twice"):
+        link([main, library, library])
@@ -0,0 +1,91 @@
+# tests/assembler/test_listing.py
+
+import io
+
+from pymads.assembler.assembler import AssemblyOptions, assemble
+from pymads.assembler.listing import LABEL_CHUNK, write_labels
+from pymads.core.symbols import SymbolTable
+
+
+def test_listing(tmp_path):
+    """Test the listing of the last pass, with patched sites rewritten."""
+    (tmp_path / "main.asm").write_text(
+        " org $2000\n icl 'lib.icl'\nstart lda #<end\n jmp end\n"
+        " dta a(end),1,2,3\nend rts\n"
+    )
+    (tmp_path / "lib.icl").write_text(" nop\n")
+    listing = tmp_path / "main.lst"
+    result = assemble(
+        str(tmp_path / "main.asm"), AssemblyOptions(listing=str(listing))
+    )
+
+    assert result.patched == 3
+    lines = listing.read_text().splitlines()
+    assert lines == [
+        f"Source: {tmp_path / 'main.asm'}",
+        "     1                   org $2000",
+        f"Source: {tmp_path / 'lib.icl'}",
+        "     1 2000 EA           nop",
+        f"Source: {tmp_path / 'main.asm'}",
+        "     2                   icl 'lib.icl'",
+        "     3 2001 A9 0B       start lda #<end",
+        "     4 2003 4C 0B 20     jmp end",
+        "     5 2006 0B 20 01 02  dta a(end),1,2,3",
+        "     6 200B 60          end rts",
+    ]
+
+
+def test_listing_keeps_last_pass(tmp_path):
+    """Test that a listing written over several passes holds one pass."""
+    (tmp_path / "main.asm").write_text(" org $2000\n lda end\nend rts\n")
+    listing = tmp_path / "main.lst"
+    result = assemble(
+        str(tmp_path / "main.asm"), AssemblyOptions(listing=str(listing))
+    )
+
+    assert result.passes == 2
+    text = listing.read_text()
+    assert text.count("Source:") == 1
+    assert "     2 2000 AD 03 20     lda end" in text
+
+
+def test_listing_expands_tabs(tmp_path):
+    """Test that tabs go to tab stops, also on lines patched later."""
+    (tmp_path / "main.asm").write_text(" org $2000\n\tlda\tend\nend\trts\n")
+    listing = tmp_path / "main.lst"
+    assemble(str(tmp_path / "main.asm"), AssemblyOptions(listing=str(listing)))
+
+    lines = listing.read_text().splitlines()
+    assert lines[2:] == [
+        "     2 2000 AD 03 20            lda     end",
+        "     3 2003 60          end     rts",
+    ]
+
+
+def test_labels(tmp_path):
+    """Test the label file written after an assembly."""
+    (tmp_path / "main.asm").write_text(" org $2000\nzp equ $80\nstart rts\n")
+    labels = tmp_path / "main.lab"
+    assemble(str(tmp_path / "main.asm"), AssemblyOptions(labels=str(labels)))
+
+    assert labels.read_text().splitlines()[1:] == [
+        "Label table:",
+        "00\t2000\tSTART",
+        "00\t0080\tZP",
+    ]
+
+
+def test_write_labels_chunks():
+    """Test that write_labels writes sorted symbols across chunks."""
+    table = SymbolTable()
+    for number in range(LABEL_CHUNK + 5):
+        table.add_symbol(f"L{number:05d}")
+        table.define_symbol(f"L{number:05d}", 0x10000 + number)
+    table.add_symbol("UNDEFINED")
+    stream = io.BytesIO()
+
+    assert write_labels(table, stream) == LABEL_CHUNK + 5
+    lines = stream.getvalue().decode().splitlines()
+    assert len(lines) == LABEL_CHUNK + 7
+    assert lines[2] == "01\t0000\tL00000"
+    assert lines[-1] == f"01\t{LABEL_CHUNK + 4:04X}\tL{LABEL_CHUNK + 4:05d}"
@@ -0,0 +1,131 @@
+# tests/assembler/test_opcodes.py
+
+import pytest
+from pymads.assembler.addressing import parse_operand, select_mode, split_arguments
+from pymads.assembler.opcodes import M16, OPCODE_TABLES, X16, Cpu, Mode, encode
+
+T6502 = OPCODE_TABLES[Cpu.MOS6502]
+T65C02 = OPCODE_TABLES[Cpu.WDC65C02]
+T65816 = OPCODE_TABLES[Cpu.WDC65816]
+
+
+@pytest.mark.parametrize(
+    "table, mnemonic, mode, value, expected",
+    [
+        (T6502, "NOP", Mode.IMP, 0, b"\xea"),
+        (T6502, "ASL", Mode.ACC, 0, b"\x0a"),
+        (T6502, "LDA", Mode.IMM, 0x12, b"\xa9\x12"),
+        (T6502, "LDA", Mode.IMM, -1, b"\xa9\xff"),
+        (T6502, "STA", Mode.ABSX, 0xD000, b"\x9d\x00\xd0"),
+        (T6502, "LDX", Mode.ZPY, 0x80, b"\xb6\x80"),
+        (T6502, "JMP", Mode.IND, 0x0200, b"\x6c\x00\x02"),
+        (T6502, "LDA", Mode.INDY, 0x80, b"\xb1\x80"),
+        (T65C02, "STZ", Mode.ABS, 0x1234, b"\x9c\x34\x12"),
+        (T65C02, "LDA", Mode.ZPIND, 0x80, b"\xb2\x80"),
+        (T65816, "LDA", Mode.LONG, 0x123456, b"\xaf\x56\x34\x12"),
+        (T65816, "LDA", Mode.SRINDY, 0x03, b"\xb3\x03"),
+        (T65816, "JML", Mode.ABSINDL, 0x1234, b"\xdc\x34\x12"),
+        (T65816, "MVN", Mode.BLOCK, 0x0102, b"\x54\x02\x01"),
+    ],
+)
+def test_encode(table, mnemonic, mode, value, expected):
+    """Test encoding instructions."""
+    assert encode(table, mnemonic, mode, value) == expected
+
+
+def test_encode_register_widths():
+    """Test that 65816 immediate widths follow the M and X flags."""
+    assert encode(T65816, "LDA", Mode.IMM, 0x1234, flags=M16) == b"\xa9\x34\x12"
+    assert encode(T65816, "LDA", Mode.IMM, 0x12, flags=X16) == b"\xa9\x12"
+    assert encode(T65816, "LDX", Mode.IMM, 0x1234, flags=X16) == b"\xa2\x34\x12"
+    assert encode(T65816, "REP", Mode.IMM, 0x30, flags=M16 | X16) == b"\xc2\x30"
+
+
+def test_encode_branches():
+    """Test relative branch offsets and range checks."""
+    assert encode(T6502, "BNE", Mode.REL, 0x2000, pc=0x2000) == b"\xd0\xfe"
+    assert encode(T6502, "BEQ", Mode.REL, 0x2081, pc=0x2000) == b"\xf0\x7f"
+    assert encode(T65816, "BRL", Mode.RELL, 0x3003, pc=0x2000) == b"\x82\x00\x10"
+    with pytest.raises(ValueError):
+        encode(T6502, "BNE", Mode.REL, 0x2082, pc=0x2000)
+
+
+def test_encode_errors():
+    """Test unsupported instructions and out-of-range operands."""
+    with pytest.raises(KeyError):
+        encode(T6502, "STZ", Mode.ZP, 0)
+    with pytest.raises(KeyError):
+        encode(T6502, "LDA", Mode.LONG, 0)
+    with pytest.raises(ValueError):
+        encode(T6502, "LDA", Mode.IMM, 0x100)
+
+
+def test_cpu_tables_extend_each_other():
+    """Test that each CPU table is a superset of the previous one."""
+    assert set(T6502) <= set(T65C02)
+    assert {key for key in T65816 if key[2] == 0} >= set(T65C02)
+    assert len({key[0] for key in T6502}) == 56
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("", ("", "")),
+        ("@", ("", "")),
+        ("#$10", ("#", "$10")),
+        ("label+1", ("a", "label+1")),
+        ("table,x", ("a,x", "table")),
+        ("table , Y", ("a,y", "table")),
+        ("3,s", ("a,s", "3")),
+        ("($80,x)", ("(a,x)", "$80")),
+        ("(ptr),y", ("(a),y", "ptr")),
+        ("(vector)", ("(a)", "vector")),
+        ("(3,s),y", ("(a,s),y", "3")),
+        ("[ptr]", ("[a]", "ptr")),
+        ("[ptr],y", ("[a],y", "ptr")),
+        ("(1+2)*3", ("a", "(1+2)*3")),
+        ("(a+1),x", ("a,x", "(a+1)")),
+    ],
+)
+def test_parse_operand(text, expected):
+    """Test classifying operand syntax."""
+    assert parse_operand(text) == expected
+
+
+def test_parse_operand_invalid():
+    """Test rejecting unknown operand syntax."""
+    with pytest.raises(ValueError):
+        parse_operand("1,2")
+    with pytest.raises(ValueError):
+        parse_operand("(ptr,x),y")
+
+
+def test_select_mode():
+    """Test choosing addressing modes by value size and CPU."""
+    assert select_mode(T6502, "LDA", "a", 0x80) is Mode.ZP
+    assert select_mode(T6502, "LDA", "a", 0x1234) is Mode.ABS
+    assert select_mode(T6502, "LDA", "a", None) is Mode.ABS
+    assert select_mode(T6502, "LDA", "a", 0x80, size=2) is Mode.ABS
+    assert select_mode(T65816, "LDA", "a", 0x123456) is Mode.LONG
+    assert select_mode(T6502, "JMP", "a", 0x10) is Mode.ABS
+    assert select_mode(T6502, "BNE", "a", 0x10) is Mode.REL
+    assert select_mode(T6502, "ASL", "", None) is Mode.ACC
+    assert select_mode(T6502, "LDA", "(a),y", None) is Mode.INDY
+    assert select_mode(T6502, "JMP", "(a)", 0x80) is Mode.IND
+    with pytest.raises(ValueError):
+        select_mode(T6502, "LDA", "[a]", 0)
+
+
+def test_split_arguments():
+    """Test splitting argument lists."""
+    assert split_arguments("1, (2,3), 'a,b'") == ["1", "(2,3)", "'a,b'"]
+    assert split_arguments("  ") == []
+
+
+def test_generated_tables_are_current():
+    """Test that the precomputed tables match the opcode layers."""
+    from pymads.assembler.opcodes import _MOS6502, _WDC65816, _WDC65C02, build_table
+
+    assert T6502 == build_table(_MOS6502, widths=1)
+    assert T65C02 == build_table(_MOS6502, _WDC65C02, widths=1)
+    assert T65816 == build_table(_MOS6502, _WDC65C02, _WDC65816, widths=4)
@@ -0,0 +1,87 @@
+# tests/assembler/test_output.py
+
+import io
+
+import pytest
+from pymads.assembler.output import MEMORY_65816, OutputImage
+
+
+def test_contiguous_writes_form_one_segment():
+    """Test that consecutive writes extend the current segment."""
+    image = OutputImage()
+    image.org(0x2000)
+    image.put_byte(0xA9)
+    image.put_byte(0x100)
+    image.save_word(0x1234)
+    image.save_string("AB")
+    image.save_nul(2, 0xFF)
+
+    assert len(image.segments) == 1
+    assert image.pc == 0x2008
+    assert bytes(image.segment_view(image.segments[0])) == (
+        b"\xa9\x00\x34\x12AB\xff\xff"
+    )
+
+
+def test_org_starts_new_segment():
+    """Test that a jump of the location counter starts a new segment."""
+    image = OutputImage()
+    image.org(0x2000)
+    image.write(b"\x01\x02")
+    image.org(0x02E0)
+    image.save_word(0x2000)
+
+    assert [(s.start, s.end) for s in image.segments] == [
+        (0x2000, 0x2002),
+        (0x02E0, 0x02E2),
+    ]
+
+
+def test_flush_with_headers():
+    """Test writing an Atari DOS binary."""
+    image = OutputImage()
+    image.org(0x2000)
+    image.write(memoryview(b"\xea\x60"))
+    image.org(0x02E0)
+    image.save_word(0x2000)
+    stream = io.BytesIO()
+
+    assert image.flush(stream) == 14
+    assert stream.getvalue() == (
+        b"\xff\xff\x00\x20\x01\x20\xea\x60" b"\xe0\x02\xe1\x02\x00\x20"
+    )
+
+
+def test_flush_raw():
+    """Test writing segments without headers."""
+    image = OutputImage()
+    image.org(0x1000)
+    image.save_nul(3, 0x55)
+    stream = io.BytesIO()
+    image.flush(stream, headers=False)
+    assert stream.getvalue() == b"UUU"
+
+
+def test_reset_and_bounds():
+    """Test resetting between passes and address space limits."""
+    image = OutputImage()
+    image.org(0xFFFF)
+    image.put_byte(1)
+    with pytest.raises(ValueError):
+        image.put_byte(2)
+    with pytest.raises(ValueError):
+        image.org(0x10000)
+
+    image.reset()
+    assert image.segments == []
+    assert image.pc == 0
+
+
+def test_65816_image_headers():
+    """Test that segments above 64K cannot get DOS headers."""
+    image = OutputImage(MEMORY_65816)
+    image.org(0x7E0000)
+    image.put_byte(0)
+    with pytest.raises(ValueError):
+        image.flush(io.BytesIO())
+    assert image.flush(io.BytesIO(), headers=False) == 1
@@ -0,0 +1,99 @@
+# tests/assembler/test_profiler.py
+
+import os
+
+import pytest
+from pymads.assembler.assembler import (
+    Assembler,
+    AssemblyError,
+    AssemblySession,
+    assemble,
+)
+from pymads.assembler.profiler import Profiler
+from pymads.parser.source_cache import SourceCache
+
+
+def test_profile(tmp_path):
+    """Test phases, counters, caches and line timings of one assembly."""
+    (tmp_path / "main.asm").write_text(
+        " org $2000\nstart lda #1\n icl 'lib.icl'\n jmp start\n"
+    )
+    (tmp_path / "lib.icl").write_text(" sta $80\n")
+    profiler = Profiler()
+    result = assemble(str(tmp_path / "main.asm"), profiler=profiler)
+
+    assert len(profiler.passes) == result.passes
+    assert profiler.calls["read"] == profiler.calls["tokenize"] == 2
+    assert profiler.calls["encoding"] == 3 * result.passes
+    assert profiler.calls["flush"] == 1
+    assert profiler.counters["symbol defines"] >= 1
+    assert profiler.counters["symbol lookups"] >= 1
+    hits, misses = profiler.caches["expressions"]
+    assert hits + misses == 4 * result.passes
+    assert profiler.total >= sum(profiler.passes)
+
+    lines = {(path, line) for path, line, _ in profiler.slowest_lines(100)}
+    assert (str(tmp_path / "lib.icl"), 1) in lines
+    assert len(profiler.slowest_files()) == 2
+    assert set(profiler.to_dict()) >= {"phases", "caches", "slowest_lines"}
+    assert "Slowest files" in profiler.format_table()
+
+
+def test_unprofiled_assembler_is_not_instrumented():
+    """Test that without a profiler no method is replaced."""
+    assembler = Assembler()
+    assert "_process_line" not in vars(assembler)
+    assert "lookup" not in vars(assembler.symbols)
+
+
+def test_profiler_restores_symbol_table(tmp_path):
+    """Test that a reused symbol table is not left instrumented."""
+    path = tmp_path / "main.asm"
+    path.write_text(" org $2000\nstart jmp start\n")
+    session = AssemblySession()
+    session.assemble(str(path), Profiler())
+    table = session.symbols[os.path.abspath(path)]
+    assert "lookup" not in vars(table)
+    assert "define_symbol" not in vars(table)
+
+    profiler = Profiler()
+    session.assemble(str(path), profiler)
+    assert profiler.counters["symbol defines"] == 0  # Seeded, already defined
+    assert not vars(table).keys() & {"lookup", "add_symbol", "define_symbol"}
+
+    path.write_text(" org $2000\n jmp missing\n")
+    with pytest.raises(AssemblyError):
+        session.assemble(str(path), Profiler())
+    assert "lookup" not in vars(table)
+
+
+def test_profile_counts_each_define_once(tmp_path):
+    """Test that a new label counts as one symbol define."""
+    (tmp_path / "main.asm").write_text(" org $2000\na nop\nb nop\n")
+    profiler = Profiler()
+    assemble(str(tmp_path / "main.asm"), profiler=profiler)
+    assert profiler.counters["symbol defines"] == 2
+
+
+def test_profile_times_cached_and_streamed_sources(tmp_path, monkeypatch):
+    """Test that reading and tokenizing are timed on every source path."""
+    (tmp_path / "main.asm").write_text(" org $2000\n icl 'lib.icl'\n")
+    (tmp_path / "lib.icl").write_text(" nop\n rts\n")
+    profiler = Profiler()
+    assemble(str(tmp_path / "main.asm"), sources=SourceCache(), profiler=profiler)
+    assert profiler.calls["read"] == profiler.calls["tokenize"] == 2
+
+    monkeypatch.setattr("pymads.utils.file_io.STREAM_THRESHOLD", 8)
+    profiler = Profiler()
+    result = assemble(str(tmp_path / "main.asm"), profiler=profiler)
+    assert profiler.calls["read"] == 2 * result.passes
+    assert profiler.calls["tokenize"] == 4 * result.passes
+    assert profiler.phases["read"] > 0
+
+
+def test_profile_times_source_text():
+    """Test that tokenizing source text is timed like a source file."""
+    profiler = Profiler()
+    Assembler(profiler=profiler).assemble_text(" org $2000\n nop\n")
+    assert profiler.calls["tokenize"] == 1
+    assert "tokenize" in profiler.phases
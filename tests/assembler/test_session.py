@@ -0,0 +1,122 @@
+# tests/assembler/test_session.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pymads.assembler.assembler import AssemblyError, AssemblyOptions, AssemblySession
+from pymads.assembler.opcodes import OPCODE_TABLES, Cpu, Mode
+
+
+def test_session_reuses_symbols(tmp_path):
+    """Test that a session starts the next assembly from the last values."""
+    source = tmp_path / "main.asm"
+    source.write_text(" org $2000\n lda end\nend rts\n")
+    session = AssemblySession()
+
+    assert session.assemble(str(source)).passes == 2
+    result = session.assemble(str(source))
+    assert result.passes == 1
+    assert session.result is result
+    assert session.sources.hits == 1
+    assert list(session.symbols) == [str(source)]
+
+
+def test_session_diagnostics(tmp_path):
+    """Test that a failed assembly is reported and its symbols dropped."""
+    source = tmp_path / "main.asm"
+    source.write_text(" org $2000\nstart jmp start\n")
+    session = AssemblySession()
+    session.assemble(str(source))
+    source.write_text(" org $2000\n jmp nowhere\n")
+
+    with pytest.raises(AssemblyError):
+        session.assemble(str(source))
+    assert "NOWHERE" in str(session.diagnostics[0])
+    assert session.result is None
+    assert session.symbols == {}
+
+
+def test_session_reports_every_final_pass_error(tmp_path):
+    """Test that diagnostics hold all errors of the final pass."""
+    source = tmp_path / "main.asm"
+    source.write_text(" org $2000\n jmp first\n nop\n jmp second\n")
+    session = AssemblySession()
+
+    with pytest.raises(AssemblyError) as raised:
+        session.assemble(str(source))
+    assert [error.line for error in session.diagnostics] == [2, 4]
+    assert session.diagnostics[0] is raised.value
+    assert "SECOND" in str(session.diagnostics[1])
+
+
+def test_sessions_in_threads(tmp_path):
+    """Test that sessions assemble concurrently without sharing state."""
+    paths = []
+    for number in range(8):
+        path = tmp_path / f"main{number}.asm"
+        body = [f" org ${0x2000 + number * 0x100:04X}"]
+        body += [f"l{line} lda #{number}\n bne l{line}" for line in range(200)]
+        path.write_text("\n".join(body) + "\n")
+        paths.append(str(path))
+
+    def build(path):
+        return AssemblySession(AssemblyOptions(Cpu.WDC65C02)).assemble(path)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(build, paths))
+    for number, result in enumerate(results):
+        assert result.binary[2:4] == (0x2000 + number * 0x100).to_bytes(2, "little")
+        assert result.binary[6:8] == bytes((0xA9, number))
+        assert result.symbols.lookup("L199").value == 0x2000 + number * 0x100 + 796
+
+
+def test_session_owns_its_caches(tmp_path):
+    """Test that a session keeps compiled expressions and its image to itself."""
+    source = tmp_path / "main.asm"
+    source.write_text(" org $2000\nstart lda start+$10\n")
+    first = AssemblySession()
+    second = AssemblySession()
+
+    first.assemble(str(source))
+    hits = first.expressions.hits
+    assert "START+$10" in first.expressions._entries
+    assert len(first.expressions.literals) > 0
+    assert len(second.expressions) == 0
+    image = first.image
+    first.assemble(str(source))
+    assert first.expressions.hits > hits
+    assert first.image is image
+    assert second.image is not image
+
+
+def test_session_keeps_incremental_cache(tmp_path):
+    """Test that the incremental cache outlives a call and sees file edits."""
+    (tmp_path / "main.asm").write_text(" org $2000\n icl 'lib.icl'\n")
+    (tmp_path / "lib.icl").write_text(" nop\n")
+    session = AssemblySession(
+        AssemblyOptions(incremental=True, cache_dir=str(tmp_path / "cache"))
+    )
+    cache = session.cache
+    session.assemble(str(tmp_path / "main.asm"))
+    result = session.assemble(str(tmp_path / "main.asm"))
+    assert session.cache is cache
+    assert result.cache_hits > 0
+
+    (tmp_path / "lib.icl").write_text(" rts\n")
+    result = session.assemble(str(tmp_path / "main.asm"))
+    assert result.binary.endswith(b"\x60")
+
+
+def test_shared_tables_are_read_only():
+    """Test that the tables shared by all sessions cannot be replaced."""
+    with pytest.raises(TypeError):
+        OPCODE_TABLES[Cpu.MOS6502] = {}  # type: ignore[index]
+    for table in OPCODE_TABLES.values():
+        with pytest.raises(TypeError):
+            table[("LDA", Mode.IMM, 0)] = (0xEA, 0)  # type: ignore[index]
+        with pytest.raises(TypeError):
+            del table[("LDA", Mode.IMM, 0)]  # type: ignore[attr-defined]
+        with pytest.raises(AttributeError):
+            table.clear()  # type: ignore[attr-defined]
+    assert OPCODE_TABLES[Cpu.MOS6502][("LDA", Mode.IMM, 0)] == (0xA9, 1)
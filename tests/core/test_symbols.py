@@ -0,0 +1,290 @@
+# tests/core/test_symbols.py
+
+import pytest
+from pymads.core.symbols import (
+    Fixup,
+    ReferenceGraph,
+    Symbol,
+    SymbolTable,
+    SymbolType,
+)
+
+
+def test_symbol_uses_slots():
+    """Test that symbols have no per-instance dict."""
+    symbol = Symbol("start", 0x2000)
+    assert not hasattr(symbol, "__dict__")
+    with pytest.raises(AttributeError):
+        symbol.extra = 1
+
+
+def test_symbol_name_is_interned():
+    """Test that equal names share one string object."""
+    name = "".join(["lo", "op"])
+    assert Symbol(name).name is Symbol("loop").name
+
+
+def test_symbol_type_compares_to_char():
+    """Test that the symbol type enum matches the MADS type characters."""
+    assert Symbol("a").type == "L"
+    assert Symbol("b", 1, "C").type is SymbolType.CONSTANT
+    assert Symbol("c", 1, SymbolType.VARIABLE).type == "V"
+
+
+def test_symbol_unknown_type():
+    """Test that unknown symbol types are rejected."""
+    with pytest.raises(ValueError):
+        Symbol("a", 0, "X")
+
+
+def test_symbol_references_are_lazy():
+    """Test that the references list is only allocated when needed."""
+    symbol = Symbol("data")
+    assert symbol._references is None
+    assert not symbol.has_references
+
+    symbol.add_reference(0x10)
+    symbol.references.append(0x20)
+    assert symbol.references == [0x10, 0x20]
+    assert symbol.has_references
+
+
+def test_symbol_table_define():
+    """Test adding and defining symbols."""
+    table = SymbolTable()
+    table.add_symbol("start")
+    assert table.symbol_exists("start")
+    assert not table.get_symbol("start").is_defined
+
+    symbol = table.define_symbol("start", 0x2000)
+    assert symbol.value == 0x2000
+    assert symbol.is_defined
+
+    with pytest.raises(KeyError):
+        table.define_symbol("missing", 1)
+
+
+def test_scoped_symbols_are_qualified():
+    """Test that symbols in nested scopes get qualified names."""
+    table = SymbolTable()
+    table.enter_scope("main")
+    table.add_symbol("loop", 0x2003)
+    table.exit_scope()
+
+    assert table.get_symbol("main.loop").value == 0x2003
+    assert table.root.children["main"].symbols["loop"].name == "main.loop"
+
+
+def test_lookup_walks_outwards():
+    """Test that unqualified lookups resolve the innermost visible symbol."""
+    table = SymbolTable()
+    table.add_symbol("count", 1)
+    table.add_symbol("tmp", 2)
+    table.enter_scope("outer")
+    table.add_symbol("tmp", 3)
+    table.enter_scope("inner")
+
+    assert table.lookup("tmp").name == "outer.tmp"
+    assert table.lookup("count").name == "count"
+    assert table.lookup(":tmp").name == "tmp"
+    assert table.lookup("outer.tmp").value == 3
+    with pytest.raises(KeyError):
+        table.lookup("missing")
+
+
+def test_question_labels_are_local_to_anchor():
+    """Test that '?' labels are keyed under the last other label of the scope."""
+    table = SymbolTable()
+    output = bytearray(2)
+    table.root.anchor = "FIRST"
+    table.add_symbol("?LOOP", 0x2000)
+    fixup = Fixup(output, 0, 1, lambda t: t.value_of("?END"))
+    table.add_fixup(fixup, ["?END"])
+    table.root.anchor = "SECOND"
+    table.add_symbol("?LOOP", 0x2010)
+
+    assert table.lookup("?LOOP").name == "SECOND?LOOP"
+    assert table.get_symbol("FIRST?LOOP").value == 0x2000
+    table.enter_scope("proc")
+    with pytest.raises(KeyError):
+        table.lookup("?LOOP")
+    table.exit_scope()
+
+    table.add_symbol("?END")
+    table.define_symbol("SECOND?END", 0x30)
+    assert output[0] == 0
+    table.root.anchor = "FIRST"
+    table.add_symbol("?END")
+    table.root.anchor = "SECOND"
+    table.define_symbol("FIRST?END", 0x40)
+    assert output[0] == 0x40
+    assert table.root.anchor == "SECOND"
+
+
+def test_add_existing_symbol_keeps_fixups():
+    """Test that adding a declared name again updates its Symbol in place."""
+    table = SymbolTable()
+    symbol = table.add_symbol("x")
+    output = bytearray(1)
+    fixup = Fixup(output, 0, 1, lambda t: t.value_of("x"))
+    table.add_fixup(fixup, ["x"])
+
+    assert table.add_symbol("x", 5, "C") is symbol
+    assert symbol.type == "C" and not symbol.is_defined
+    assert symbol.references == [fixup]
+    table.define_symbol("x", 7)
+    assert output[0] == 7
+    table.add_symbol("x", 9)
+    assert output[0] == 9 and table.get_symbol("x") is symbol
+
+
+def test_reentering_scope_reuses_it():
+    """Test that entering the same scope twice keeps its symbols."""
+    table = SymbolTable()
+    first = table.enter_scope("proc")
+    table.add_symbol("x")
+    table.exit_scope()
+
+    assert table.enter_scope("proc") is first
+    assert table.lookup("x").name == "proc.x"
+    assert first.depth == 1
+
+
+def test_exit_global_scope():
+    """Test that the global scope cannot be left."""
+    with pytest.raises(ValueError):
+        SymbolTable().exit_scope()
+
+
+def test_fixup_patched_on_define():
+    """Test that defining a forward-referenced symbol patches its sites."""
+    table = SymbolTable()
+    output = bytearray(4)
+    fixup = Fixup(output, 1, 2, lambda t: t.value_of("target") + 1)
+
+    assert not table.add_fixup(fixup, ["target"])
+    assert fixup in table.pending
+    assert output == bytearray(4)
+
+    table.add_symbol("target")
+    table.define_symbol("target", 0x2000)
+    assert output == bytearray([0, 0x01, 0x20, 0])
+    assert fixup.resolved
+    assert not table.pending
+
+
+def test_fixup_repatched_when_value_changes():
+    """Test that a changed symbol value re-patches dependent sites."""
+    table = SymbolTable()
+    table.add_symbol("lbl")
+    table.define_symbol("lbl", 0x10)
+    output = bytearray(1)
+    assert table.add_fixup(Fixup(output, 0, 1, lambda t: t.value_of("lbl")), ["lbl"])
+    assert output[0] == 0x10
+
+    table.define_symbol("lbl", 0x1FF)
+    assert output[0] == 0xFF
+
+
+def test_fixup_waits_for_all_symbols():
+    """Test that a fixup using two symbols resolves after both are defined."""
+    table = SymbolTable()
+    output = bytearray(1)
+    fixup = Fixup(output, 0, 1, lambda t: t.value_of("a") - t.value_of("b"))
+    table.add_fixup(fixup, ["a", "b"])
+
+    table.add_symbol("a")
+    table.define_symbol("a", 10)
+    assert not fixup.resolved
+    table.add_symbol("b")
+    table.define_symbol("b", 3)
+    assert output[0] == 7
+    assert table.resolve_fixups() == []
+
+
+def test_fixup_uses_its_scope():
+    """Test that a fixup resolves names from the scope it was created in."""
+    table = SymbolTable()
+    table.add_symbol("x")
+    table.define_symbol("x", 9)
+    scope = table.enter_scope("proc")
+    output = bytearray(2)
+    table.add_fixup(Fixup(output, 0, 1, lambda t: t.value_of("x"), scope), ["x"])
+    table.add_fixup(Fixup(output, 1, 1, lambda t: t.value_of("y"), scope), ["y"])
+    table.exit_scope()
+
+    assert not table.symbol_exists("proc.y")
+    table.enter_scope("proc")
+    table.add_symbol("y")
+    table.exit_scope()
+    table.define_symbol("proc.y", 5)
+    assert output == bytearray([9, 5])
+
+
+def test_fixup_binds_later_outer_symbol():
+    """Test that a forward reference from a scope finds a later global label."""
+    table = SymbolTable()
+    scope = table.enter_scope("proc")
+    output = bytearray(2)
+    fixup = Fixup(output, 0, 2, lambda t: t.value_of("later"), scope)
+    table.add_fixup(fixup, ["later"])
+    table.add_symbol("other")
+    table.exit_scope()
+
+    table.add_symbol("later")
+    table.define_symbol("later", 0x2010)
+    assert output == bytearray([0x10, 0x20])
+    assert not table.symbol_exists("proc.later")
+    assert table.resolve_fixups() == []
+
+
+def test_fixup_binds_nearest_symbol():
+    """Test that a waiting fixup binds the symbol its name resolves to."""
+    table = SymbolTable()
+    output = bytearray(1)
+    fixup = Fixup(output, 0, 1, lambda t: t.value_of("main.loop"))
+    table.add_fixup(fixup, ["main.loop"])
+    table.enter_scope("other")
+    table.add_symbol("loop", 1)
+    table.exit_scope()
+    table.enter_scope("main")
+    table.add_symbol("loop")
+    table.exit_scope()
+
+    table.define_symbol("other.loop", 2)
+    assert output[0] == 0
+    table.define_symbol("main.loop", 3)
+    assert output[0] == 3
+
+
+def test_clear_fixups():
+    """Test that cleared fixups are no longer patched."""
+    table = SymbolTable()
+    table.add_symbol("a")
+    output = bytearray(1)
+    table.add_fixup(Fixup(output, 0, 1, lambda t: t.value_of("a")), ["a", "b"])
+    table.clear_fixups()
+
+    assert not table.pending
+    assert not table.get_symbol("a").has_references
+    table.add_symbol("b", 1)
+    table.define_symbol("a", 5)
+    assert output[0] == 0
+
+
+def test_reference_graph():
+    """Test that reachability follows edges added before and after a root."""
+    a, b, c, d = (Symbol(name) for name in "abcd")
+    graph = ReferenceGraph()
+    assert graph.add_reference(a, b)
+    assert not graph.add_reference(a, b)
+    graph.add_reference(c, d)
+    graph.add_reference(d, c)
+    assert graph.referrers(b) == {a}
+    assert not b.has_references
+    assert not graph.live
+
+    graph.add_reference(None, a)
+    assert graph.live == {a, b}
+    graph.add_reference(b, c)
+    assert graph.is_live(d)
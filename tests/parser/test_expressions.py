@@ -0,0 +1,138 @@
+# tests/parser/test_expressions.py
+
+import pytest
+from pymads.core.symbols import SymbolTable
+from pymads.parser.expressions import (
+    ExpressionCache,
+    compile_expression,
+    compile_uncached,
+    evaluate,
+)
+
+
+@pytest.fixture
+def table():
+    table = SymbolTable()
+    table.add_symbol("start")
+    table.define_symbol("start", 0x2000)
+    table.add_symbol("count")
+    table.define_symbol("count", 10)
+    return table
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("$ff", 255),
+        ("%1010", 10),
+        ("42", 42),
+        ("'A'", 65),
+        ('"a"', 97),
+        ("1+2*3", 7),
+        ("(1+2)*3", 9),
+        ("[1+2]*3", 9),
+        ("7/2", 3),
+        ("-7/2", -3),
+        ("-7%2", -1),
+        ("7%10", 7),
+        ("1<<4|1", 17),
+        ("<$1234", 0x34),
+        (">$1234", 0x12),
+        ("^$123456", 0x12),
+        (".hi($1234)", 0x12),
+        (".LO($1234)", 0x34),
+        ("6^3", 5),
+        ("~0", -1),
+        ("!0", 1),
+        ("3>2 && 2<>2", 0),
+        ("1=1 || 0", 1),
+        ("2 <= 2", 1),
+    ],
+)
+def test_constant_expressions(text, expected, table):
+    """Test evaluating constant expressions."""
+    assert evaluate(text, table) == expected
+
+
+def test_constant_folding():
+    """Test that constant expressions are folded at compile time."""
+    assert compile_uncached("($10+2)*4").constant == 72
+    assert compile_uncached("start+1").constant is None
+    assert compile_uncached("*+1").constant is None
+
+
+def test_symbols_and_location_counter(table):
+    """Test expressions using symbols and the location counter."""
+    compiled = compile_uncached("start+count*2")
+    assert compiled.names == ("start", "count")
+    assert compiled(table) == 0x2014
+    assert evaluate("*+3", table, pc=0x3000) == 0x3003
+    assert evaluate("<start+1", table) == 0x01
+
+
+def test_reevaluation_sees_new_values(table):
+    """Test that a compiled expression uses the current symbol values."""
+    compiled = compile_uncached("count+1")
+    assert compiled(table) == 11
+    table.define_symbol("count", 20)
+    assert compiled(table) == 21
+
+
+def test_undefined_symbol(table):
+    """Test that undefined symbols raise KeyError."""
+    table.add_symbol("later")
+    with pytest.raises(KeyError):
+        evaluate("later+1", table)
+    with pytest.raises(KeyError):
+        evaluate("missing", table)
+
+
+@pytest.mark.parametrize("text", ["", "1+", "(1", "1)", "1 2", "#1", "1/0"])
+def test_invalid_expressions(text, table):
+    """Test that malformed expressions raise ValueError."""
+    with pytest.raises(ValueError):
+        evaluate(text, table, cache=ExpressionCache())
+
+
+def test_cache_is_bounded_lru():
+    """Test LRU eviction and hit counting."""
+    cache = ExpressionCache(maxsize=2)
+    first = cache.compile("1+1")
+    assert cache.compile(" 1+1 ") is first
+    cache.compile("2")
+    cache.compile("1+1")
+    cache.compile("3")  # evicts "2"
+    assert len(cache) == 2
+    assert cache.hits == 2
+    assert cache.misses == 3
+    cache.compile("2")
+    assert cache.misses == 4
+
+    with pytest.raises(ValueError):
+        ExpressionCache(maxsize=0)
+
+
+def test_compile_expression_default_cache():
+    """Test that the module-level cache returns the same object."""
+    assert compile_expression("$10") is compile_expression("$10")
+
+
+def test_compile_expression_given_cache(table):
+    """Test that an empty cache passed in is used, with its own settings."""
+    cache = ExpressionCache(fold_case=True)
+    assert compile_expression("foo+1", cache).names == ("FOO",)
+    assert len(cache) == 1
+    table.add_symbol("FOO")
+    table.define_symbol("FOO", 1)
+    assert evaluate("foo+1", table, cache=cache) == 2
+    assert cache.hits == 1
+
+
+def test_fold_case(table):
+    """Test upper-casing symbol names for case-insensitive labels."""
+    table.add_symbol("LABEL")
+    table.define_symbol("LABEL", 7)
+    cache = ExpressionCache(fold_case=True)
+    compiled = cache.compile("label+Label")
+    assert compiled.names == ("LABEL", "LABEL")
+    assert compiled(table) == 14
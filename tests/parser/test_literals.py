@@ -0,0 +1,62 @@
+# tests/parser/test_literals.py
+
+import pytest
+
+from pymads.parser import literals
+from pymads.parser.expressions import ExpressionCache, compile_uncached
+from pymads.parser.literals import LITERAL_MEMO_SIZE, LiteralCache, scan_literal
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("$FF", 255),
+        ("$00a0", 0xA0),
+        ("%1010", 10),
+        ("1234", 1234),
+        (" 7 ", 7),
+        ("'A'", 65),
+        ('"a"', 97),
+        ("''''", 39),
+        ('""""', 34),
+    ],
+)
+def test_scan_literal(text, expected):
+    """Test every literal form."""
+    assert scan_literal(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text", ["", "$", "%102", "$1G", "label", "1+2", "'ab'", "'''"]
+)
+def test_scan_literal_rejects(text):
+    """Test that other texts yield None without raising."""
+    assert scan_literal(text) is None
+
+
+def test_scan_literal_memo():
+    """Test that the memo stays bounded."""
+    for number in range(LITERAL_MEMO_SIZE + 10):
+        assert scan_literal(f"${number:X}") == number
+    assert len(literals._default_cache) <= LITERAL_MEMO_SIZE
+
+
+def test_literal_caches_are_separate():
+    """Test that each expression cache scans literals into its own memo."""
+    cache = ExpressionCache()
+    other = LiteralCache(maxsize=2)
+    cache.compile("$10+1")
+    assert len(cache.literals) == 3  # The whole text, then each literal
+    assert scan_literal("$10", other) == 16
+    assert len(other) == 1
+    assert len(ExpressionCache().literals) == 0
+    cache.clear()
+    assert len(cache.literals) == 0
+
+
+def test_compile_literal():
+    """Test that a lone literal compiles to a constant without names."""
+    compiled = compile_uncached(" $2000 ")
+    assert compiled.constant == 0x2000
+    assert compiled.names == ()
+    assert compile_uncached("'A'+%1").constant == 66
@@ -0,0 +1,87 @@
+# tests/parser/test_macros.py
+
+import pytest
+from pymads.parser.macros import Macro, MacroTable
+from pymads.parser.tokenizer import tokenize_line
+
+
+def texts(lines):
+    return [
+        (tokens.label_text, tokens.mnemonic_text, tokens.operand_text)
+        for tokens in lines
+    ]
+
+
+def test_numbered_slots():
+    """Test that :n and %%n are replaced in the operand."""
+    macro = Macro("store", [], [" lda #:1", " sta %%2", " rts"])
+    assert texts(macro.expand(["$10", "$2000"])) == [
+        ("", "lda", "#$10"),
+        ("", "sta", "$2000"),
+        ("", "rts", ""),
+    ]
+
+
+def test_expansion_matches_tokenizer():
+    """Test that operand-only rebuilds equal a fresh tokenization."""
+    macro = Macro("store", [], ["loop lda :1,x ; load"])
+    [tokens] = macro.expand(["table"])
+    assert tokens == tokenize_line("loop lda table,x")
+
+
+def test_named_parameters_and_count():
+    """Test declared parameter names and the :0 argument count."""
+    body = [" ldx #:count", " lda #:value", " dta :0"]
+    macro = Macro("fill", ["value", "count"], body)
+    assert texts(macro.expand(["1", "2"])) == [
+        ("", "ldx", "#2"),
+        ("", "lda", "#1"),
+        ("", "dta", "2"),
+    ]
+
+
+def test_unknown_names_are_left_alone():
+    """Test that :label references to globals are not slots."""
+    macro = Macro("jump", [], [" jmp :start"])
+    [tokens] = macro.expand([])
+    assert tokens.operand_text == ":start"
+
+
+def test_slots_outside_the_operand():
+    """Test that slots in the label or mnemonic re-tokenize the line."""
+    macro = Macro("op", [], [" :1 #0"])
+    assert texts(macro.expand(["lda"])) == [("", "lda", "#0")]
+
+
+def test_memoized_expansions():
+    """Test that identical invocations share one expansion."""
+    macro = Macro("inc", [], [" inc :1"])
+    first = macro.expand(["$80"])
+    assert macro.expand(["$80"]) is first
+    assert macro.expand(["$81"]) is not first
+    assert (macro.hits, macro.misses) == (1, 2)
+
+
+def test_memo_is_bounded():
+    """Test that the least recently used expansion is dropped."""
+    macro = Macro("inc", [], [" inc :1"], memo_size=2)
+    first = macro.expand(["1"])
+    macro.expand(["2"])
+    macro.expand(["3"])
+    assert macro.expand(["1"]) is not first
+
+
+def test_missing_argument():
+    """Test that a reference past the last argument is an error."""
+    macro = Macro("store", [], [" sta :2"])
+    with pytest.raises(ValueError, match="STORE needs more than 1 arguments"):
+        macro.expand(["$80"])
+
+
+def test_identical_redefinition_keeps_macro():
+    """Test that re-defining a macro unchanged keeps its memo."""
+    table = MacroTable()
+    macro = table.define("inc", [], [" inc :1"])
+    assert table.define("INC", [], [" inc :1"]) is macro
+    assert table.define("inc", [], [" dec :1"]) is not macro
+    assert "INC" in table and len(table) == 1
@@ -0,0 +1,62 @@
+# tests/parser/test_source_cache.py
+
+import os
+
+from pymads.assembler.assembler import AssemblyOptions, assemble
+from pymads.parser.source_cache import SourceCache
+from pymads.parser.tokenizer import tokenize_lines
+
+
+def test_token_cache(tmp_path):
+    """Test that tokens are shared on disk and revalidated by content."""
+    header = tmp_path / "hardware.icl"
+    header.write_text("COLBK equ $D01A ; background\nWSYNC equ $D40A\n")
+    directory = str(tmp_path / "tokens")
+    expected = tokenize_lines(["COLBK equ $D01A ; background", "WSYNC equ $D40A"])
+
+    first = SourceCache(directory)
+    assert first.load(str(header)) == expected
+    assert (first.hits, first.misses) == (0, 1)
+
+    cache = SourceCache(directory)
+    assert cache.load(str(header)) == expected
+    assert (cache.disk_hits, cache.misses) == (1, 0)
+
+    # Same content, new modification time
+    status = os.stat(header)
+    os.utime(header, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+    cache = SourceCache(directory)
+    assert cache.load(str(header)) == expected
+    assert cache.disk_hits == 1
+
+    header.write_text("COLBK equ $D01A ; changed\nWSYNC equ $D40A\n")
+    cache = SourceCache(directory)
+    assert cache.load(str(header))[0].comment_text == "; changed"
+    assert (cache.disk_hits, cache.misses) == (0, 1)
+
+
+def test_token_cache_corrupt(tmp_path):
+    """Test that an unreadable record is tokenized again and replaced."""
+    source = tmp_path / "main.asm"
+    source.write_text(" nop\n")
+    directory = tmp_path / "tokens"
+    SourceCache(str(directory)).load(str(source))
+    (record,) = directory.iterdir()
+    record.write_bytes(b"\x00garbage")
+
+    cache = SourceCache(str(directory))
+    assert cache.load(str(source)) == tokenize_lines([" nop"])
+    assert cache.misses == 1
+    assert SourceCache(str(directory)).load(str(source)) == tokenize_lines([" nop"])
+
+
+def test_assemble_token_cache(tmp_path):
+    """Test assemble() with the token cache in the cache directory."""
+    (tmp_path / "main.asm").write_text(" org $2000\n icl 'lib.icl'\n")
+    (tmp_path / "lib.icl").write_text(" rts\n")
+    options = AssemblyOptions(token_cache=True, cache_dir=str(tmp_path / "cache"))
+
+    first = assemble(str(tmp_path / "main.asm"), options)
+    second = assemble(str(tmp_path / "main.asm"), options)
+    assert first.binary == second.binary == b"\xff\xff\x00\x20\x00\x20\x60"
+    assert len(list((tmp_path / "cache" / "tokens").iterdir())) == 2
@@ -0,0 +1,99 @@
+# tests/parser/test_tokenizer.py
+
+import pytest
+from pymads.parser.tokenizer import tokenize_line, tokenize_lines
+
+
+def fields(line):
+    tokens = tokenize_line(line)
+    return (
+        tokens.label_text,
+        tokens.mnemonic_text,
+        tokens.operand_text,
+        tokens.comment_text,
+    )
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("start lda #$00 ; init", ("start", "lda", "#$00", "; init")),
+        ("    sta $02         ; Store", ("", "sta", "$02", "; Store")),
+        ("loop: inx", ("loop", "inx", "", "")),
+        ("    done: rts", ("done", "rts", "", "")),
+        ("label", ("label", "", "", "")),
+        ("    rts\n", ("", "rts", "", "")),
+        ("x = 5", ("x", "=", "5", "")),
+        ("x=5", ("x", "=", "5", "")),
+        ("    lda ($80),y", ("", "lda", "($80),y", "")),
+        ("    lda #2*3", ("", "lda", "#2*3", "")),
+        ("    lda 10/2 // half", ("", "lda", "10/2", "// half")),
+    ],
+)
+def test_tokenize_line_fields(line, expected):
+    """Test splitting lines into label, mnemonic, operand and comment."""
+    assert fields(line) == expected
+
+
+def test_tokenize_line_quoted_comment_markers():
+    """Test that comment markers inside strings are part of the operand."""
+    assert fields('    .byte "A;B", \'//\' ; c') == (
+        "",
+        ".byte",
+        '"A;B", \'//\'',
+        "; c",
+    )
+
+
+@pytest.mark.parametrize("line", ["", "   ", "\r\n"])
+def test_tokenize_line_blank(line):
+    """Test that blank lines have no fields."""
+    assert fields(line) == ("", "", "", "")
+
+
+@pytest.mark.parametrize("line", ["; comment", "* comment", "  // comment"])
+def test_tokenize_line_comment_only(line):
+    """Test comment-only lines."""
+    assert fields(line) == ("", "", "", line.strip())
+
+
+def test_tokenize_line_spans():
+    """Test that spans index into the original line."""
+    tokens = tokenize_line("lbl  lda  #1")
+    assert tokens.label == (0, 3)
+    assert tokens.mnemonic == (5, 8)
+    assert tokens.operand == (10, 12)
+    assert tokens.comment is None
+
+
+def test_tokenize_lines():
+    """Test tokenizing several lines at once."""
+    tokens = tokenize_lines(["a nop", " rts"])
+    assert [t.mnemonic_text for t in tokens] == ["nop", "rts"]
+
+
+def test_tokenize_keyword():
+    """Test that the mnemonic is kept in upper case, also for whole files."""
+    lines = ["loop\tLda #1", " sTa $d01a", "; note", "", "x = 1", " \xe9qu\xdf"]
+    keywords = ["LDA", "STA", "", "", "=", "\xc9QU\xdf"]
+    assert [tokenize_line(line).keyword for line in lines] == keywords
+    assert tokenize_lines(lines) == list(map(tokenize_line, lines))
+
+
+def test_tokenize_folds_label_and_operand():
+    """Test that label and operand are folded, except in quoted strings.
+
+    A tab inside a string keeps the whole line unexpanded.
+    """
+    (tokens,) = tokenize_lines(["Start\tdta c'Ab\tc',\"dE\",a(lo+$ff)"])
+    assert tokens.line == "Start\tdta c'Ab\tc',\"dE\",a(lo+$ff)"
+    assert tokens.name == "START"
+    assert tokens.argument == "C'Ab\tc',\"dE\",A(LO+$FF)"
+    assert tokenize_line(tokens.line) == tokens
+
+
+def test_tokenize_lines_with_terminators():
+    """Test that lines keeping their terminators are split the same way."""
+    expected = tokenize_lines(["a nop", "\tRts"])
+    assert tokenize_lines(["a nop\n", "\tRts\r\n"]) == expected
+    assert expected[1].line == "        Rts"
@@ -0,0 +1,49 @@
+# tests/test_batch.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from pymads.batch import assemble_batch
+
+
+async def _collect(*args, **kwargs):
+    return [result async for result in assemble_batch(*args, **kwargs)]
+
+
+def test_assemble_batch(tmp_path):
+    """Test a batch with includes, an error and a missing file."""
+    (tmp_path / "lib.icl").write_text(" rts\n")
+    paths = []
+    for number in range(5):
+        path = tmp_path / f"main{number}.asm"
+        path.write_text(f" org $2000\n lda #{number}\n icl 'lib.icl'\n")
+        paths.append(str(path))
+    (tmp_path / "bad.asm").write_text(" org $2000\n jmp nowhere\n")
+    paths += [str(tmp_path / "bad.asm"), str(tmp_path / "missing.asm")]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = asyncio.run(
+            _collect(paths, executor=executor, max_in_flight=2, chunk_size=2)
+        )
+
+    by_source = {result.source: result for result in results}
+    assert sorted(by_source) == sorted(paths)
+    for number in range(5):
+        result = by_source[paths[number]]
+        assert result.error is None
+        assert result.binary == bytes.fromhex(f"ffff00200220a9{number:02x}60")
+    assert "NOWHERE" in by_source[str(tmp_path / "bad.asm")].error
+    assert by_source[str(tmp_path / "missing.asm")].error.startswith("ERROR:")
+
+
+def test_assemble_batch_processes(tmp_path):
+    """Test a batch assembled in its own process pool."""
+    paths = []
+    for number in range(3):
+        path = tmp_path / f"main{number}.asm"
+        path.write_text(" org $2000\n nop\n")
+        paths.append(str(path))
+
+    results = asyncio.run(_collect(iter(paths), jobs=2, chunk_size=1))
+    binary = b"\xff\xff\x00\x20\x00\x20\xea"
+    assert [result.binary for result in results] == [binary] * 3
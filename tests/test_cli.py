@@ -1,3 +1,5 @@
+import re
+
 import pytest
 from pymads.cli import main
 
@@ -14,3 +16,121 @@ def test_cli_help(monkeypatch, capsys):
     captured = capsys.readouterr()
     assert "PyMADS CLI" in captured.out
     assert "Usage:" in captured.out
+
+
+def test_cli_incremental(monkeypatch, capsys, tmp_path):
+    """Test that --verbose reports incremental cache hits and misses."""
+    (tmp_path / "main.asm").write_text(" org $2000\n icl 'lib.icl'\n")
+    (tmp_path / "lib.icl").write_text(" rts\n")
+    argv = ['pymads', str(tmp_path / "main.asm"), '-o', str(tmp_path / "main.xex"),
+            '-i', '-v', f'--cache-dir={tmp_path / "cache"}']
+    monkeypatch.setattr('sys.argv', argv)
+
+    assert main() == 0
+    assert "Cache: 0 hits, 1 misses" in capsys.readouterr().out
+    assert main() == 0
+    assert "Cache: 1 hits, 0 misses" in capsys.readouterr().out
+    assert (tmp_path / "main.xex").read_bytes() == b"\xff\xff\x00\x20\x00\x20\x60"
+
+
+def test_cli_profile(monkeypatch, capsys, tmp_path):
+    """Test that --profile prints a report and --profile-json writes one."""
+    import json
+
+    (tmp_path / "main.asm").write_text(" org $2000\nstart lda #1\n jmp start\n")
+    argv = ['pymads', str(tmp_path / "main.asm"), '-o', str(tmp_path / "main.xex"),
+            '--profile', f'--profile-json={tmp_path / "profile.json"}']
+    monkeypatch.setattr('sys.argv', argv)
+
+    assert main() == 0
+    out = capsys.readouterr().out
+    assert "Slowest lines" in out and "encoding" in out
+    profile = json.loads((tmp_path / "profile.json").read_text())
+    assert profile["phases"]["encoding"]["calls"] == 2 * len(profile["passes"])
+
+
+def test_cli_link(monkeypatch, capsys, tmp_path):
+    """Test linking a .reloc module against a program using it."""
+    (tmp_path / "main.asm").write_text(" .extrn sub\n org $2000\n jsr sub\n")
+    (tmp_path / "sub.asm").write_text(" .reloc\n .public sub\nsub rts\n")
+    argv = ['pymads', 'link', str(tmp_path / "main.asm"), str(tmp_path / "sub.asm"),
+            '-o', str(tmp_path / "out.xex"), '--link-base=$3000', '-j', '1', '-v']
+    monkeypatch.setattr('sys.argv', argv)
+
+    assert main() == 0
+    assert "sub.asm: $3000, 0 relocations" in capsys.readouterr().out
+    assert (tmp_path / "out.xex").read_bytes() == bytes.fromhex(
+        "ffff002002202000300030003060"
+    )
+
+
+def test_cli_include_paths(monkeypatch, tmp_path):
+    """Test that -I adds a directory searched by ICL."""
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "lib" / "data.icl").write_text(" dta 1,2\n")
+    (tmp_path / "main.asm").write_text(" org $2000\n icl 'data.icl'\n")
+    argv = ['pymads', str(tmp_path / "main.asm"), '-I', str(tmp_path / "lib")]
+    monkeypatch.setattr('sys.argv', argv)
+    monkeypatch.delenv('PYMADS_SOCKET', raising=False)
+
+    assert main() == 0
+    assert (tmp_path / "main.bin").read_bytes()[-2:] == bytes([1, 2])
+
+
+def test_cli_link_options(monkeypatch, capsys, tmp_path):
+    """Test that link assembles modules with the CPU and include paths given."""
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "lib" / "wide.icl").write_text(" rep #$30\n")
+    (tmp_path / "main.asm").write_text(" org $2000\n icl 'wide.icl'\n")
+    argv = ['pymads', 'link', str(tmp_path / "main.asm"), '-o', str(tmp_path / "out"),
+            '-I', str(tmp_path / "lib"), '--cpu=65816']
+    monkeypatch.setattr('sys.argv', argv)
+    assert main() == 0
+    assert (tmp_path / "out").read_bytes()[-2:] == bytes.fromhex("c230")
+
+    monkeypatch.setattr('sys.argv', argv[:-1] + ['--cpu=z80'])
+    assert main() == 2
+    assert "z80" in capsys.readouterr().err
+
+
+def test_cli_listing(monkeypatch, tmp_path):
+    """Test that --list and --symbols write files next to the source."""
+    (tmp_path / "main.asm").write_text(" org $2000\nstart jmp start\n")
+    argv = ['pymads', str(tmp_path / "main.asm"), '-o', str(tmp_path / "main.xex"),
+            '--list', '--symbols']
+    monkeypatch.setattr('sys.argv', argv)
+    monkeypatch.delenv('PYMADS_SOCKET', raising=False)
+
+    assert main() == 0
+    assert "     2 2000 4C 00 20    start jmp start" in (
+        (tmp_path / "main.lst").read_text()
+    )
+    assert "00\t2000\tSTART" in (tmp_path / "main.lab").read_text()
+
+
+def test_cli_exclude_unreferenced(monkeypatch, capsys, tmp_path):
+    """Test that -x leaves out unreferenced procedures and reports them."""
+    (tmp_path / "main.asm").write_text(
+        " org $2000\n rts\n .proc unused\n jmp unused\n .endp\n"
+    )
+    argv = ['pymads', str(tmp_path / "main.asm"), '-o', str(tmp_path / "main.xex"),
+            '-x', '-v']
+    monkeypatch.setattr('sys.argv', argv)
+    monkeypatch.delenv('PYMADS_SOCKET', raising=False)
+
+    assert main() == 0
+    out = capsys.readouterr().out
+    pattern = r"Unreferenced procedures excluded: 1 \(3 bytes\) in [\d.]+ ms"
+    assert re.search(pattern, out)
+    assert (tmp_path / "main.xex").read_bytes() == b"\xff\xff\x00\x20\x00\x20\x60"
+
+
+def test_cli_default_output(monkeypatch, tmp_path):
+    """Test that without -o the output goes next to the source as .bin."""
+    (tmp_path / "main.asm").write_text(" org $2000\n rts\n")
+    monkeypatch.setattr('sys.argv', ['pymads', str(tmp_path / "main.asm")])
+    monkeypatch.delenv('PYMADS_SOCKET', raising=False)
+
+    assert main() == 0
+    assert (tmp_path / "main.bin").read_bytes() == b"\xff\xff\x00\x20\x00\x20\x60"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["main.asm", "main.bin"]
@@ -0,0 +1,181 @@
+# tests/test_server.py
+
+import errno
+import socket
+import threading
+
+import pytest
+from pymads.cli import main
+from pymads.client import assemble_remote, send_request
+from pymads.server import AssemblyServer, AssemblyService
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    path = str(tmp_path / "pymads.sock")
+    server = AssemblyServer(path)
+    thread = threading.Thread(target=server.serve_until_shutdown)
+    thread.start()
+    yield server, path
+    send_request(path, {"command": "shutdown"})
+    thread.join(5)
+
+
+def test_daemon_reuses_warm_state(daemon, tmp_path):
+    """Test that a second request reuses tokens and symbol values."""
+    server, path = daemon
+    source = tmp_path / "main.asm"
+    source.write_text(" org $2000\n lda end\n icl 'lib.icl'\nend rts\n")
+    (tmp_path / "lib.icl").write_text(" nop\n")
+    output = tmp_path / "main.xex"
+
+    first = assemble_remote(path, str(source), str(output))
+    assert first["ok"] and first["passes"] == 2
+    binary = output.read_bytes()
+
+    second = assemble_remote(path, str(source), str(output))
+    assert second["ok"] and second["passes"] == 1
+    assert output.read_bytes() == binary
+    assert server.service.sources.hits == 2
+
+
+def test_daemon_drops_removed_symbols(daemon, tmp_path):
+    """Test that a label removed from the source is not kept from before."""
+    _, path = daemon
+    source = tmp_path / "main.asm"
+    source.write_text(" org $2000\n jmp there\nthere rts\n")
+    output = tmp_path / "main.xex"
+    assert assemble_remote(path, str(source), str(output))["ok"]
+
+    source.write_text(" org $2000\n jmp there\n rts\n")
+    response = assemble_remote(path, str(source), str(output))
+    assert not response["ok"]
+    assert "Undeclared label THERE" in response["error"]
+
+
+def test_cli_uses_daemon_and_falls_back(daemon, tmp_path, monkeypatch, capsys):
+    """Test that the CLI assembles through the daemon or in-process."""
+    server, path = daemon
+    source = tmp_path / "main.asm"
+    source.write_text(" org $2000\n rts\n")
+    output = tmp_path / "main.xex"
+
+    monkeypatch.setattr("sys.argv", ["pymads", str(source), "-o", str(output),
+                                     f"--socket={path}"])
+    assert main() == 0
+    assert server.service.requests == 1
+
+    monkeypatch.setattr("sys.argv", ["pymads", str(source), "-o", str(output),
+                                     f"--socket={tmp_path / 'none.sock'}"])
+    assert main() == 0
+    assert server.service.requests == 1
+    assert output.read_bytes() == b"\xff\xff\x00\x20\x00\x20\x60"
+
+
+def test_daemon_rejects_non_object_requests(daemon):
+    """Test that a JSON value other than an object gets an error response."""
+    server, path = daemon
+    for request in ([], "assemble", 1, None):
+        response = send_request(path, request)
+        assert not response["ok"]
+        assert "Invalid request" in response["error"]
+    assert server.service.handle(["command"])["ok"] is False
+
+
+def test_daemon_does_not_take_over_live_socket(daemon):
+    """Test that a second daemon refuses a socket another one answers on."""
+    _, path = daemon
+    with pytest.raises(OSError) as error:
+        AssemblyServer(path)
+    assert error.value.errno == errno.EADDRINUSE
+    assert send_request(path, {"command": "ping"})["ok"]
+
+
+def test_server_replaces_stale_socket(tmp_path):
+    """Test that a socket file nobody listens on is replaced."""
+    path = str(tmp_path / "pymads.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    server = AssemblyServer(path)
+    server.server_close()
+
+
+def test_daemon_keeps_macros_resident(daemon, tmp_path):
+    """Test that compiled macros and their expansions outlive a request."""
+    server, path = daemon
+    source = tmp_path / "main.asm"
+    source.write_text(
+        " org $2000\n.macro put\n lda #:1\n .endm\n put 1\n put 2\n"
+    )
+    output = tmp_path / "main.xex"
+    assert assemble_remote(path, str(source), str(output))["ok"]
+    (session,) = server.service.sessions.values()
+    macro = session.macros[str(source)].get("PUT")
+
+    assert assemble_remote(path, str(source), str(output))["ok"]
+    assert session.macros[str(source)].get("PUT") is macro
+    assert macro.misses == 2
+
+
+def test_daemon_reports_exclusion(daemon, tmp_path):
+    """Test that the daemon reports excluded procedures and their time."""
+    _, path = daemon
+    source = tmp_path / "main.asm"
+    source.write_text(" org $2000\n rts\n .proc unused\n rts\n .endp\n")
+    output = tmp_path / "main.xex"
+    response = assemble_remote(
+        path, str(source), str(output), {"exclude_unreferenced": True}
+    )
+    assert response["excluded"] == ["UNUSED"]
+    assert response["exclude_time"] > 0
+
+
+def test_service_survives_internal_errors(tmp_path, monkeypatch):
+    """Test that an unexpected exception is answered and drops source state."""
+    source = tmp_path / "main.asm"
+    source.write_text(" org $2000\nstart jmp start\n")
+    request = {
+        "command": "assemble",
+        "source": str(source),
+        "output": str(tmp_path / "main.xex"),
+    }
+    service = AssemblyService()
+    assert service.handle(request)["ok"]
+    (session,) = service.sessions.values()
+    assert str(source) in session.symbols
+
+    def fail(table, tokens):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("pymads.assembler.assembler.Assembler._process_line", fail)
+    response = service.handle(request)
+    assert not response["ok"] and "boom" in response["error"]
+    assert str(source) not in session.symbols
+    assert str(source) not in session.macros
+
+    monkeypatch.undo()
+    assert service.handle(request)["ok"]
+
+
+def test_service_bounds_sessions(tmp_path, monkeypatch):
+    """Test that the least recently used session is evicted."""
+    monkeypatch.setattr("pymads.server.MAX_SESSIONS", 2)
+    source = tmp_path / "main.asm"
+    source.write_text(" org $2000\n nop\n")
+    service = AssemblyService()
+
+    def assemble(cpu):
+        request = {
+            "command": "assemble",
+            "source": str(source),
+            "output": str(tmp_path / "main.xex"),
+            "options": {"cpu": cpu},
+        }
+        assert service.handle(request)["ok"]
+
+    assemble("6502")
+    assemble("65c02")
+    assemble("6502")
+    assemble("65816")
+    assert [options.cpu.value for options in service.sessions] == ["6502", "65816"]
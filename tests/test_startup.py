@@ -0,0 +1,56 @@
+# tests/test_startup.py
+
+import os
+import statistics
+import subprocess
+import sys
+
+# Median cumulative import time of pymads.cli with a warm bytecode cache.
+# Generous against CI noise; bench_startup.py reports the actual figure.
+STARTUP_BUDGET_MS = 100
+
+HEAVY_MODULES = (
+    "pymads.assembler",
+    "pymads.parser",
+    "pymads.server",
+    "pymads.client",
+    "socket",
+    "json",
+)
+
+
+def _import_times(pycache):
+    environment = dict(os.environ, PYTHONPYCACHEPREFIX=str(pycache))
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pymads.cli"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=environment,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:") :].split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_is_light(tmp_path):
+    """Test that importing the CLI loads no assembler or daemon modules."""
+    times = _import_times(tmp_path)
+    loaded = [
+        name
+        for name in times
+        for heavy in HEAVY_MODULES
+        if name == heavy or name.startswith(heavy + ".")
+    ]
+    assert loaded == []
+
+
+def test_cli_import_within_budget(tmp_path):
+    """Test the CLI startup time against its regression budget."""
+    _import_times(tmp_path)  # populate the bytecode cache
+    runs = [_import_times(tmp_path)["pymads.cli"] / 1000 for _ in range(5)]
+    assert statistics.median(runs) < STARTUP_BUDGET_MS
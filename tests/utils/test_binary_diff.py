@@ -0,0 +1,73 @@
+# tests/utils/test_binary_diff.py
+
+from pymads.utils.binary_diff import (
+    DiffRange,
+    XexSegment,
+    compare_buffers,
+    diff_offsets,
+    parse_xex_segments,
+)
+
+
+def test_diff_offsets_coalesces_runs():
+    """Test that adjacent differences form one range, also across blocks."""
+    data1 = bytes(64)
+    data2 = bytearray(data1)
+    data2[3:6] = b"\x01\x02\x03"
+    data2[15:17] = b"\xff\xff"
+    data2[40] = 1
+
+    assert diff_offsets(data1, data2, block_size=16) == [(3, 6), (15, 17), (40, 41)]
+    assert diff_offsets(data1, data2, gap=9, block_size=16) == [(3, 17), (40, 41)]
+    assert diff_offsets(data1, data1) == []
+
+
+def test_diff_offsets_common_length_only():
+    """Test that extra trailing bytes are not reported as ranges."""
+    assert diff_offsets(b"abc", b"abcdef") == []
+    diff = compare_buffers(b"abc", b"abcdef")
+    assert not diff.identical
+    assert diff.ranges == []
+
+
+def test_parse_xex_segments():
+    """Test locating segments, skipping repeated $FFFF markers."""
+    data = (
+        b"\xff\xff\x00\x20\x02\x20\xa9\x00\x60"
+        b"\xff\xff\xe0\x02\xe1\x02\x00\x20"
+    )
+    assert parse_xex_segments(data) == [
+        XexSegment(6, 0x2000, 0x2003),
+        XexSegment(15, 0x02E0, 0x02E2),
+    ]
+    assert parse_xex_segments(b"\xa9\x00\x60") == []
+
+
+def test_compare_buffers_maps_addresses():
+    """Test that differences are reported with segment and load address."""
+    expected = b"\xff\xff\x00\x20\x02\x20\xa9\x00\x60\xe0\x02\xe1\x02\x00\x20"
+    actual = bytearray(expected)
+    actual[7] = 0x01  # operand of lda
+    actual[13:15] = b"\x01\x30"  # RUN vector
+
+    diff = compare_buffers(expected, actual)
+    assert diff.differing_bytes == 3
+    assert diff.ranges == [
+        DiffRange(7, 1, 0, 0x2001),
+        DiffRange(13, 2, 1, 0x02E0),
+    ]
+    assert diff.to_dict()["ranges"][0] == {
+        "offset": 7,
+        "length": 1,
+        "segment": 0,
+        "address": 0x2001,
+    }
+
+
+def test_compare_buffers_header_difference():
+    """Test that a range spanning a header is split."""
+    expected = b"\xff\xff\x00\x20\x00\x20\x60"
+    actual = b"\xff\xff\x01\x20\x00\x20\x61"
+    diff = compare_buffers(expected, actual, gap=8)
+    assert diff.ranges == [DiffRange(2, 4), DiffRange(6, 1, 0, 0x2000)]
+    assert diff.differing_bytes == 2
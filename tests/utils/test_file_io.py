@@ -1,6 +1,10 @@
 from pymads.utils.file_io import (
     get_file_path,
     get_file_name,
+    iter_source_lines,
+    map_binary,
+    read_source_lines,
+    split_source_lines,
 )
 
 import os
@@ -54,4 +58,49 @@ def test_get_file_name(path, expected):
     """
     Test the get_file_name function.
     """
-    assert get_file_name(path) == expected
\ No newline at end of file
+    assert get_file_name(path) == expected
+
+
+def test_iter_source_lines(tmp_path):
+    """Test lazy line reading with mixed line terminators."""
+    path = tmp_path / "source.asm"
+    path.write_bytes(b" lda #1\r\n sta $d020\rloop\n\n jmp loop\xe9\n")
+
+    assert list(iter_source_lines(str(path))) == [
+        (1, " lda #1"),
+        (2, " sta $d020"),
+        (3, "loop"),
+        (4, ""),
+        (5, " jmp loop\xe9"),
+    ]
+    assert read_source_lines(str(path))[2] == "loop"
+
+
+def test_split_source_lines(tmp_path):
+    """Test that content read up front splits like the file is read."""
+    for data in (b" lda #1\r\n sta $d020\rloop\n\n jmp\xe9\n", b"a\r\r", b"x", b""):
+        path = tmp_path / "source.asm"
+        path.write_bytes(data)
+        assert split_source_lines(data) == read_source_lines(str(path))
+
+
+def test_iter_source_lines_empty(tmp_path):
+    """Test that an empty file has no lines."""
+    path = tmp_path / "empty.asm"
+    path.write_bytes(b"")
+    assert list(iter_source_lines(str(path))) == []
+
+
+def test_map_binary(tmp_path):
+    """Test zero-copy slicing of a mapped binary file."""
+    path = tmp_path / "blob.bin"
+    path.write_bytes(bytes(range(16)))
+
+    with map_binary(str(path)) as data:
+        assert len(data) == 16
+        with data[4:8] as chunk:
+            assert bytes(chunk) == b"\x04\x05\x06\x07"
+
+    path.write_bytes(b"")
+    with map_binary(str(path)) as data:
+        assert len(data) == 0
@@ -1,7 +1,7 @@
 # tests/utils/test_text.py
 
 import pytest
-from pymads.utils.text import skip_spaces, __inc, tab2space, ansi_upper_case, up_cas_, int_to_str, str_to_int
+from pymads.utils.text import skip_spaces, __inc, tab2space, ansi_upper_case, up_cas_, int_to_str, str_to_int, ata2int, fold_case, expand_tabs
 
 
 def test_skip_spaces_basic():
@@ -341,3 +341,23 @@ def test_str_to_int_non_integer():
     # Test with set
     with pytest.raises(ValueError):
         str_to_int({1, 2, 3})
+
+
+def test_ata2int():
+    """Test ATASCII to internal code conversion."""
+    assert ata2int(ord("A")) == 0x21
+    assert ata2int(ord(" ")) == 0x00
+    assert ata2int(0x00) == 0x40
+    assert ata2int(ord("a")) == ord("a")
+    assert ata2int(ord("A") | 0x80) == 0xA1
+
+
+def test_fold_case():
+    """Test that case folding keeps every character in place."""
+    assert fold_case("lda #'a'\n\xe9\xdf\xff\xb5ā") == "LDA #'A'\n\xc9\xdf\xff\xb5ā"
+
+
+def test_expand_tabs():
+    """Test that tabs advance to tab stops on every line."""
+    assert expand_tabs("a\tb\nabcdefgh\tc") == "a       b\nabcdefgh        c"
+    assert expand_tabs("ab\tc", 4) == "ab  c"